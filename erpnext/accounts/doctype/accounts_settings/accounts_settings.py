@@ -58,6 +58,8 @@ class AccountsSettings(Document):
 		submit_journal_entries: DF.Check
 		unlink_advance_payment_on_cancelation_of_order: DF.Check
 		unlink_payment_on_cancellation_of_invoice: DF.Check
+		use_gl_balance_snapshot: DF.Check
+		use_voucher_outstanding: DF.Check
 	# end: auto-generated types
 
 	def validate(self):
@@ -84,6 +86,12 @@ class AccountsSettings(Document):
 		if old_doc.acc_frozen_upto != self.acc_frozen_upto:
 			self.validate_pending_reposts()
 
+		if self.use_gl_balance_snapshot and not old_doc.use_gl_balance_snapshot:
+			self.enqueue_gl_balance_snapshot_rebuild()
+
+		if self.use_voucher_outstanding and not old_doc.use_voucher_outstanding:
+			self.enqueue_voucher_outstanding_rebuild()
+
 		if clear_cache:
 			frappe.clear_cache()
 
@@ -108,6 +116,28 @@ class AccountsSettings(Document):
 				validate_fields_for_doctype=False,
 			)
 
+	def enqueue_gl_balance_snapshot_rebuild(self):
+		# balances are read from GL Entry until the rebuild is complete
+		frappe.db.set_default("gl_balance_snapshot_built", 0)
+		frappe.enqueue(
+			"erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot.rebuild_gl_balance_snapshot",
+			queue="long",
+			timeout=3600,
+			enqueue_after_commit=True,
+		)
+		frappe.msgprint(_("GL Balance Snapshots will be built in the background."), alert=True)
+
+	def enqueue_voucher_outstanding_rebuild(self):
+		# reports read the Payment Ledger until the rebuild is complete
+		frappe.db.set_default("voucher_outstanding_built", 0)
+		frappe.enqueue(
+			"erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding.rebuild_voucher_outstanding",
+			queue="long",
+			timeout=3600,
+			enqueue_after_commit=True,
+		)
+		frappe.msgprint(_("Voucher Outstanding will be built in the background."), alert=True)
+
 	def validate_pending_reposts(self):
 		if self.acc_frozen_upto:
 			check_pending_reposting(self.acc_frozen_upto)
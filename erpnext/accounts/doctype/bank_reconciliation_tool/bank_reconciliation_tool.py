@@ -12,6 +12,9 @@ from frappe.utils import cint, flt
 from pypika.terms import Parameter
 
 from erpnext import get_default_cost_center
+from erpnext.accounts.doctype.bank_reconciliation_tool.bank_transaction_matcher import (
+	BankTransactionMatcher,
+)
 from erpnext.accounts.doctype.bank_transaction.bank_transaction import get_total_allocated_amount
 from erpnext.accounts.report.bank_reconciliation_statement.bank_reconciliation_statement import (
 	get_amounts_not_reflected_in_system,
@@ -20,6 +23,10 @@ from erpnext.accounts.report.bank_reconciliation_statement.bank_reconciliation_s
 from erpnext.accounts.utils import get_account_currency, get_balance_on
 from erpnext.setup.utils import get_exchange_rate
 
+DEFAULT_MATCHING_QUERIES = (
+	"erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool.get_matching_queries"
+)
+
 
 class BankReconciliationTool(Document):
 	# begin: auto-generated types
@@ -376,11 +383,11 @@ def auto_reconcile_vouchers(
 	frappe.flags.auto_reconcile_vouchers = True
 	reconciled, partially_reconciled = set(), set()
 
-	bank_transactions = get_bank_transactions(bank_account)
-	for transaction in bank_transactions:
-		linked_payments = get_linked_payments(
-			transaction.name,
-			["payment_entry", "journal_entry"],
+	# match all the transactions at once, unless other apps add their own matching queries
+	matcher = None
+	if frappe.get_hooks("get_matching_queries") == [DEFAULT_MATCHING_QUERIES]:
+		matcher = BankTransactionMatcher(
+			bank_account,
 			from_date,
 			to_date,
 			filter_by_reference_date,
@@ -388,6 +395,21 @@ def auto_reconcile_vouchers(
 			to_reference_date,
 		)
 
+	bank_transactions = get_bank_transactions(bank_account)
+	for transaction in bank_transactions:
+		if matcher:
+			linked_payments = matcher.get_linked_payments(transaction)
+		else:
+			linked_payments = get_linked_payments(
+				transaction.name,
+				["payment_entry", "journal_entry"],
+				from_date,
+				to_date,
+				filter_by_reference_date,
+				from_reference_date,
+				to_reference_date,
+			)
+
 		if not linked_payments:
 			continue
 
@@ -403,6 +425,8 @@ def auto_reconcile_vouchers(
 		)
 
 		updated_transaction = reconcile_vouchers(transaction.name, json.dumps(vouchers))
+		if matcher:
+			matcher.update_cleared_vouchers(vouchers)
 
 		if updated_transaction.status == "Reconciled":
 			reconciled.add(updated_transaction.name)
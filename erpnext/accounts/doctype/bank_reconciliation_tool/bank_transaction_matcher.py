@@ -0,0 +1,170 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+from collections import defaultdict
+
+import frappe
+from frappe.query_builder.custom import ConstantColumn
+from frappe.utils import cint, cstr, flt
+
+# side of the bank account moved by deposits and withdrawals
+PAYMENT_SIDES = {
+	"Receive": {"account_field": "paid_to", "je_amount_field": "debit_in_account_currency"},
+	"Pay": {"account_field": "paid_from", "je_amount_field": "credit_in_account_currency"},
+}
+
+
+class BankTransactionMatcher:
+	"""
+	Matches the bank transactions of a bank account to the Payment Entries and Journal Entries
+	with the same reference number, for auto reconciliation.
+
+	Uncleared vouchers of the date window are loaded once and indexed by reference number,
+	instead of querying them for every bank transaction. Matches are ranked like the matching
+	queries of the Bank Reconciliation Tool.
+	"""
+
+	def __init__(
+		self,
+		bank_account,
+		from_date=None,
+		to_date=None,
+		filter_by_reference_date=None,
+		from_reference_date=None,
+		to_reference_date=None,
+	) -> None:
+		self.gl_account = frappe.db.get_value("Bank Account", bank_account, "account")
+		self.filter_by_reference_date = cint(filter_by_reference_date)
+		if self.filter_by_reference_date:
+			self.from_date, self.to_date = from_reference_date, to_reference_date
+		else:
+			self.from_date, self.to_date = from_date, to_date
+
+		# (payment type, doctype) -> reference number -> vouchers, in date order
+		self.vouchers = defaultdict(lambda: defaultdict(list))
+		# doctype -> vouchers cleared by the bank transactions reconciled so far
+		self.cleared = defaultdict(set)
+
+		for payment_type in PAYMENT_SIDES:
+			self.load_payment_entries(payment_type)
+			self.load_journal_entries(payment_type)
+
+	def load_payment_entries(self, payment_type):
+		pe = frappe.qb.DocType("Payment Entry")
+		account_field = PAYMENT_SIDES[payment_type]["account_field"]
+		date_field = pe.reference_date if self.filter_by_reference_date else pe.posting_date
+
+		query = (
+			frappe.qb.from_(pe)
+			.select(
+				ConstantColumn("Payment Entry").as_("doctype"),
+				pe.name,
+				pe.paid_amount,
+				pe.reference_no,
+				pe.reference_date,
+				pe.party,
+				pe.party_type,
+				pe.posting_date,
+				pe[f"{account_field}_account_currency"].as_("currency"),
+			)
+			.where(pe.docstatus == 1)
+			.where(pe.payment_type.isin([payment_type, "Internal Transfer"]))
+			.where(pe.clearance_date.isnull())
+			.where(pe[account_field] == self.gl_account)
+			.where(pe.paid_amount > 0.0)
+			.where(pe.reference_no.isnotnull())
+			.where(date_field.between(self.from_date, self.to_date))
+			.orderby(date_field)
+		)
+
+		self.index_vouchers(payment_type, "Payment Entry", query.run(as_dict=True))
+
+	def load_journal_entries(self, payment_type):
+		je = frappe.qb.DocType("Journal Entry")
+		jea = frappe.qb.DocType("Journal Entry Account")
+		amount_field = jea[PAYMENT_SIDES[payment_type]["je_amount_field"]]
+		date_field = je.cheque_date if self.filter_by_reference_date else je.posting_date
+
+		query = (
+			frappe.qb.from_(jea)
+			.join(je)
+			.on(jea.parent == je.name)
+			.select(
+				ConstantColumn("Journal Entry").as_("doctype"),
+				je.name,
+				amount_field.as_("paid_amount"),
+				je.cheque_no.as_("reference_no"),
+				je.cheque_date.as_("reference_date"),
+				je.pay_to_recd_from.as_("party"),
+				jea.party_type,
+				je.posting_date,
+				jea.account_currency.as_("currency"),
+			)
+			.where(je.docstatus == 1)
+			.where(je.voucher_type != "Opening Entry")
+			.where(je.clearance_date.isnull())
+			.where(jea.account == self.gl_account)
+			.where(amount_field > 0.0)
+			.where(je.cheque_no.isnotnull())
+			.where(date_field.between(self.from_date, self.to_date))
+			.orderby(date_field)
+		)
+
+		self.index_vouchers(payment_type, "Journal Entry", query.run(as_dict=True))
+
+	def index_vouchers(self, payment_type, doctype, vouchers):
+		index = self.vouchers[(payment_type, doctype)]
+		for voucher in vouchers:
+			index[get_reference_key(voucher.reference_no)].append(voucher)
+
+	def get_linked_payments(self, transaction):
+		"""Uncleared vouchers with the reference number of `transaction`, best ranked first"""
+		if transaction.reference_number is None:
+			return []
+
+		payment_type = "Receive" if transaction.deposit > 0.0 else "Pay"
+		reference_key = get_reference_key(transaction.reference_number)
+
+		matching_vouchers = []
+		for doctype in ("Payment Entry", "Journal Entry"):
+			for voucher in self.vouchers[(payment_type, doctype)].get(reference_key, []):
+				if voucher.name in self.cleared[doctype]:
+					continue
+
+				# matching reference number + 1
+				rank = 2
+				if flt(voucher.paid_amount) == flt(transaction.unallocated_amount):
+					rank += 1
+				if doctype == "Payment Entry" and self.is_party_match(voucher, transaction):
+					rank += 1
+
+				matching_vouchers.append(frappe._dict(voucher, rank=rank))
+
+		return sorted(matching_vouchers, key=lambda x: x["rank"], reverse=True)
+
+	def is_party_match(self, voucher, transaction):
+		return bool(
+			voucher.party
+			and voucher.party_type == transaction.party_type
+			and voucher.party == transaction.party
+		)
+
+	def update_cleared_vouchers(self, vouchers):
+		"""Stop matching the vouchers cleared by reconciling them to a bank transaction"""
+		names_by_doctype = defaultdict(list)
+		for voucher in vouchers:
+			names_by_doctype[voucher["payment_doctype"]].append(voucher["payment_name"])
+
+		for doctype, names in names_by_doctype.items():
+			self.cleared[doctype].update(
+				frappe.get_all(
+					doctype,
+					filters={"name": ("in", names), "clearance_date": ("is", "set")},
+					pluck="name",
+				)
+			)
+
+
+def get_reference_key(reference_no):
+	# compared like the case insensitive, trailing space insensitive database collation
+	return cstr(reference_no).rstrip().lower()
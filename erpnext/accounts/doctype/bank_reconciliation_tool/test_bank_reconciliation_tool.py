@@ -98,3 +98,51 @@ class TestBankReconciliationTool(AccountsTestMixin, FrappeTestCase):
 		# assert API output post reconciliation
 		transactions = get_bank_transactions(self.bank_account, from_date, to_date)
 		self.assertEqual(len(transactions), 0)
+
+	def test_auto_reconcile_multiple_transactions(self):
+		from_date = add_days(today(), -1)
+		to_date = today()
+
+		payments = []
+		for reference_no, amount in (("REF-1", 100), ("REF-2", 250)):
+			payment = create_payment_entry(
+				company=self.company,
+				posting_date=from_date,
+				payment_type="Receive",
+				party_type="Customer",
+				party=self.customer,
+				paid_from=self.debit_to,
+				paid_to=self.bank,
+				paid_amount=amount,
+			)
+			payment.reference_no = reference_no
+			payments.append(payment.save().submit())
+
+		for reference_number, amount in (("ref-2", 250), ("REF-1", 100), ("REF-3", 75)):
+			frappe.get_doc(
+				{
+					"doctype": "Bank Transaction",
+					"date": to_date,
+					"deposit": amount,
+					"bank_account": self.bank_account,
+					"reference_number": reference_number,
+				}
+			).save().submit()
+
+		reconciled, partially_reconciled = auto_reconcile_vouchers(
+			bank_account=self.bank_account,
+			from_date=from_date,
+			to_date=to_date,
+			filter_by_reference_date=False,
+		)
+		self.assertEqual(len(reconciled), 2)
+		self.assertEqual(len(partially_reconciled), 0)
+
+		for payment in payments:
+			self.assertEqual(
+				frappe.db.get_value("Payment Entry", payment.name, "clearance_date"), getdate(to_date)
+			)
+
+		# transaction without a matching voucher is left as it is
+		transactions = get_bank_transactions(self.bank_account, from_date, to_date)
+		self.assertEqual([t.reference_number for t in transactions], ["REF-3"])
@@ -0,0 +1,283 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+from datetime import date
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.model.meta import get_field_precision
+from frappe.query_builder.functions import Extract, Sum
+from frappe.utils import cint, flt, get_first_day, getdate, now
+from pypika.enums import DatePart
+
+SNAPSHOT_KEY_FIELDS = ("company", "account", "cost_center", "party_type", "party", "period_start_date")
+SNAPSHOT_AMOUNT_FIELDS = ("debit", "credit", "debit_in_account_currency", "credit_in_account_currency")
+SNAPSHOT_BATCH_SIZE = 1000
+
+
+class GLBalanceSnapshot(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link | None
+		account_currency: DF.Link | None
+		company: DF.Link | None
+		cost_center: DF.Link | None
+		credit: DF.Currency
+		credit_in_account_currency: DF.Currency
+		debit: DF.Currency
+		debit_in_account_currency: DF.Currency
+		party: DF.DynamicLink | None
+		party_type: DF.Link | None
+		period_start_date: DF.Date | None
+	# end: auto-generated types
+
+	pass
+
+
+def is_gl_balance_snapshot_maintained():
+	"""Snapshots are updated on every GL posting once enabled in Accounts Settings"""
+	return cint(frappe.db.get_single_value("Accounts Settings", "use_gl_balance_snapshot"))
+
+
+def is_gl_balance_snapshot_ready():
+	"""Snapshots can be read only after the initial build from existing GL Entries is done"""
+	return is_gl_balance_snapshot_maintained() and cint(
+		frappe.db.get_default("gl_balance_snapshot_built")
+	)
+
+
+def get_snapshot_key(gle):
+	return (
+		gle.get("company"),
+		gle.get("account"),
+		gle.get("cost_center") or "",
+		gle.get("party_type") or "",
+		gle.get("party") or "",
+		getdate(get_first_day(gle.get("posting_date"))),
+	)
+
+
+def update_gl_balance_snapshot(gl_entries, cancel=False):
+	"""Add the amounts of posted GL Entries to their monthly snapshot rows.
+	With `cancel`, the amounts are removed instead."""
+	if not gl_entries or not is_gl_balance_snapshot_maintained():
+		return
+
+	sign = -1 if cancel else 1
+	movements = {}
+	for gle in gl_entries:
+		if gle.get("is_cancelled") and not cancel:
+			continue
+
+		amounts = movements.setdefault(
+			get_snapshot_key(gle),
+			frappe._dict(dict.fromkeys(SNAPSHOT_AMOUNT_FIELDS, 0.0), account_currency=gle.get("account_currency")),
+		)
+		for fieldname in SNAPSHOT_AMOUNT_FIELDS:
+			amounts[fieldname] += sign * flt(gle.get(fieldname))
+
+	apply_snapshot_movements(movements)
+
+
+def remove_voucher_from_gl_balance_snapshot(voucher_type, voucher_no):
+	"""To be called before GL Entries of a voucher are deleted"""
+	if not is_gl_balance_snapshot_maintained():
+		return
+
+	gl_entries = frappe.get_all(
+		"GL Entry",
+		filters={"voucher_type": voucher_type, "voucher_no": voucher_no, "is_cancelled": 0},
+		fields=["posting_date", "account_currency", *SNAPSHOT_KEY_FIELDS[:-1], *SNAPSHOT_AMOUNT_FIELDS],
+	)
+	update_gl_balance_snapshot(gl_entries, cancel=True)
+
+
+def apply_snapshot_movements(movements):
+	"""Add the amounts of `movements` to their snapshot rows, creating the missing rows.
+
+	Rows are written with one INSERT ... ON DUPLICATE KEY UPDATE per batch of keys, using the
+	unique index on the key fields, so no row is read or locked before it is updated."""
+	if not movements:
+		return
+
+	user = frappe.session.user
+	timestamp = now()
+	fields = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		*SNAPSHOT_KEY_FIELDS,
+		"account_currency",
+		*SNAPSHOT_AMOUNT_FIELDS,
+	]
+	updates = ", ".join(
+		f"`{fieldname}` = `{fieldname}` + values(`{fieldname}`)" for fieldname in SNAPSHOT_AMOUNT_FIELDS
+	)
+	row_placeholder = "({})".format(", ".join(["%s"] * len(fields)))
+
+	# keys in the same order in every transaction, so that concurrent postings do not deadlock
+	rows = sorted(movements.items())
+	for i in range(0, len(rows), SNAPSHOT_BATCH_SIZE):
+		values = []
+		for key, amounts in rows[i : i + SNAPSHOT_BATCH_SIZE]:
+			values.extend(
+				(
+					frappe.generate_hash(length=10),
+					timestamp,
+					timestamp,
+					user,
+					user,
+					*key,
+					amounts.get("account_currency"),
+					*(flt(amounts[fieldname]) for fieldname in SNAPSHOT_AMOUNT_FIELDS),
+				)
+			)
+
+		frappe.db.sql(
+			"""insert into `tabGL Balance Snapshot` ({fields}) values {rows}
+			on duplicate key update {updates}""".format(
+				fields=", ".join(f"`{fieldname}`" for fieldname in fields),
+				rows=", ".join([row_placeholder] * (len(values) // len(fields))),
+				updates=updates,
+			),
+			values,
+		)
+
+
+def get_gl_movements(company=None):
+	"""Monthly debit / credit totals from GL Entry, keyed like the snapshot rows"""
+	gle = frappe.qb.DocType("GL Entry")
+
+	query = (
+		frappe.qb.from_(gle)
+		.select(
+			gle.company,
+			gle.account,
+			gle.cost_center,
+			gle.party_type,
+			gle.party,
+			Extract(DatePart.year, gle.posting_date).as_("posting_year"),
+			Extract(DatePart.month, gle.posting_date).as_("posting_month"),
+			gle.account_currency,
+			*[Sum(gle[fieldname]).as_(fieldname) for fieldname in SNAPSHOT_AMOUNT_FIELDS],
+		)
+		.where(gle.is_cancelled == 0)
+		.groupby(
+			gle.company,
+			gle.account,
+			gle.cost_center,
+			gle.party_type,
+			gle.party,
+			Extract(DatePart.year, gle.posting_date),
+			Extract(DatePart.month, gle.posting_date),
+			gle.account_currency,
+		)
+	)
+
+	if company:
+		query = query.where(gle.company == company)
+
+	movements = {}
+	for row in query.run(as_dict=True):
+		row.posting_date = date(cint(row.posting_year), cint(row.posting_month), 1)
+		amounts = movements.setdefault(
+			get_snapshot_key(row),
+			frappe._dict(dict.fromkeys(SNAPSHOT_AMOUNT_FIELDS, 0.0), account_currency=row.account_currency),
+		)
+		for fieldname in SNAPSHOT_AMOUNT_FIELDS:
+			amounts[fieldname] += flt(row[fieldname])
+
+	return movements
+
+
+def get_snapshot_balances(company=None):
+	filters = {"company": company} if company else {}
+	snapshots = frappe.get_all(
+		"GL Balance Snapshot",
+		filters=filters,
+		fields=["name", *SNAPSHOT_KEY_FIELDS, *SNAPSHOT_AMOUNT_FIELDS],
+	)
+
+	balances = {}
+	for row in snapshots:
+		row.posting_date = row.period_start_date
+		amounts = balances.setdefault(get_snapshot_key(row), dict.fromkeys(SNAPSHOT_AMOUNT_FIELDS, 0.0))
+		for fieldname in SNAPSHOT_AMOUNT_FIELDS:
+			amounts[fieldname] += flt(row[fieldname])
+
+	return balances
+
+
+def rebuild_gl_balance_snapshot(company=None):
+	"""Recreate snapshot rows from GL Entry, for one company or for all"""
+	frappe.db.delete("GL Balance Snapshot", {"company": company} if company else {})
+	apply_snapshot_movements(get_gl_movements(company))
+
+	if not company:
+		frappe.db.set_default("gl_balance_snapshot_built", 1)
+
+
+def verify_gl_balance_snapshot(company=None, repair=False):
+	"""Compare snapshot rows against totals computed from GL Entry.
+
+	Returns the mismatching rows. With `repair`, the snapshot rows are corrected."""
+	precision = get_field_precision(frappe.get_meta("GL Entry").get_field("debit"))
+
+	expected = get_gl_movements(company)
+	actual = get_snapshot_balances(company)
+
+	mismatches = []
+	corrections = {}
+	for key in set(expected) | set(actual):
+		expected_amounts = expected.get(key) or dict.fromkeys(SNAPSHOT_AMOUNT_FIELDS, 0.0)
+		actual_amounts = actual.get(key) or dict.fromkeys(SNAPSHOT_AMOUNT_FIELDS, 0.0)
+
+		difference = frappe._dict(
+			{
+				fieldname: flt(expected_amounts[fieldname] - actual_amounts[fieldname], precision)
+				for fieldname in SNAPSHOT_AMOUNT_FIELDS
+			}
+		)
+		if not any(difference.values()):
+			continue
+
+		mismatches.append(
+			frappe._dict(dict(zip(SNAPSHOT_KEY_FIELDS, key)), expected=expected_amounts, actual=actual_amounts)
+		)
+		difference.account_currency = expected_amounts.get("account_currency")
+		corrections[key] = difference
+
+	if repair and corrections:
+		apply_snapshot_movements(corrections)
+
+	return mismatches
+
+
+def verify_and_repair_gl_balance_snapshot():
+	"""Scheduled daily, logs and fixes snapshot rows which drifted from the GL"""
+	if not is_gl_balance_snapshot_ready():
+		return
+
+	mismatches = verify_gl_balance_snapshot(repair=True)
+	if mismatches:
+		frappe.log_error(
+			title=_("GL Balance Snapshot mismatch"),
+			message=frappe.as_json(mismatches[:100]),
+		)
+
+
+def on_doctype_update():
+	frappe.db.add_unique(
+		"GL Balance Snapshot", list(SNAPSHOT_KEY_FIELDS), constraint_name="unique_gl_balance_snapshot"
+	)
+	frappe.db.add_index("GL Balance Snapshot", ["account", "period_start_date"])
+	frappe.db.add_index("GL Balance Snapshot", ["party_type", "party"])
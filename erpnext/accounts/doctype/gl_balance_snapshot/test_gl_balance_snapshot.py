@@ -0,0 +1,90 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import add_days, add_months, getdate, nowdate
+
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import (
+	rebuild_gl_balance_snapshot,
+	verify_gl_balance_snapshot,
+)
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.utils import get_balance_on
+
+
+class TestGLBalanceSnapshot(FrappeTestCase):
+	def setUp(self):
+		self.account = "_Test Bank - _TC"
+		self.against_account = "_Test Account Cost for Goods Sold - _TC"
+
+	def get_balance(self, date=None, **kwargs):
+		return get_balance_on(self.account, date, company="_Test Company", **kwargs)
+
+	@change_settings("Accounts Settings", {"use_gl_balance_snapshot": 1})
+	def test_balance_from_snapshot(self):
+		rebuild_gl_balance_snapshot()
+
+		dates = [add_months(nowdate(), -2), add_days(add_months(nowdate(), -1), 3), nowdate()]
+		for posting_date in dates:
+			make_journal_entry(
+				self.account, self.against_account, 100, posting_date=posting_date, submit=True
+			)
+
+		check_dates = [*dates, add_days(dates[0], -1), None]
+		snapshot_balances = [self.get_balance(date) for date in check_dates]
+
+		frappe.db.set_default("gl_balance_snapshot_built", 0)
+		ledger_balances = [self.get_balance(date) for date in check_dates]
+		frappe.db.set_default("gl_balance_snapshot_built", 1)
+
+		self.assertEqual(snapshot_balances, ledger_balances)
+		self.assertFalse(verify_gl_balance_snapshot(company="_Test Company"))
+
+	@change_settings("Accounts Settings", {"use_gl_balance_snapshot": 1})
+	def test_snapshot_on_cancel(self):
+		rebuild_gl_balance_snapshot()
+		balance = self.get_balance()
+
+		jv = make_journal_entry(
+			self.account, self.against_account, 100, posting_date=nowdate(), submit=True
+		)
+		self.assertEqual(self.get_balance(), balance + 100)
+
+		jv.cancel()
+		self.assertEqual(self.get_balance(), balance)
+		self.assertFalse(verify_gl_balance_snapshot(company="_Test Company"))
+
+	@change_settings("Accounts Settings", {"use_gl_balance_snapshot": 1})
+	def test_verify_and_repair(self):
+		rebuild_gl_balance_snapshot()
+		make_journal_entry(self.account, self.against_account, 100, posting_date=nowdate(), submit=True)
+
+		snapshot = frappe.qb.DocType("GL Balance Snapshot")
+		(
+			frappe.qb.update(snapshot)
+			.set(snapshot.debit, snapshot.debit + 50)
+			.where(snapshot.account == self.account)
+			.where(snapshot.period_start_date == getdate(nowdate()).replace(day=1))
+		).run()
+
+		mismatches = verify_gl_balance_snapshot(company="_Test Company", repair=True)
+		self.assertEqual(len(mismatches), 1)
+		self.assertEqual(mismatches[0].account, self.account)
+		self.assertFalse(verify_gl_balance_snapshot(company="_Test Company"))
+
+	@change_settings("Accounts Settings", {"use_gl_balance_snapshot": 1})
+	def test_snapshot_row_updated_in_place(self):
+		rebuild_gl_balance_snapshot()
+		filters = {
+			"account": self.account,
+			"cost_center": "_Test Cost Center - _TC",
+			"period_start_date": getdate(nowdate()).replace(day=1),
+		}
+		debit = frappe.db.get_value("GL Balance Snapshot", filters, "sum(debit)") or 0
+
+		for _i in range(2):
+			make_journal_entry(self.account, self.against_account, 100, posting_date=nowdate(), submit=True)
+
+		self.assertEqual(frappe.db.count("GL Balance Snapshot", filters), 1)
+		self.assertEqual(frappe.db.get_value("GL Balance Snapshot", filters, "debit"), debit + 200)
@@ -99,27 +99,40 @@ class GLEntry(Document):
 			validate_balance_type(self.account, adv_adj)
 			validate_frozen_account(self.account, adv_adj)
 
-			if (
-				self.voucher_type == "Journal Entry"
-				and frappe.get_cached_value("Journal Entry", self.voucher_no, "voucher_type")
-				== "Exchange Gain Or Loss"
-			):
-				return
-
-			if frappe.get_cached_value("Account", self.account, "account_type") not in [
-				"Receivable",
-				"Payable",
-			]:
+			outstanding_args = self.get_outstanding_update_args()
+			if outstanding_args:
 				# Update outstanding amt on against voucher
-				if (
-					self.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
-					and self.against_voucher
-					and self.flags.update_outstanding == "Yes"
-					and not frappe.flags.is_reverse_depr_entry
-				):
-					update_outstanding_amt(
-						self.account, self.party_type, self.party, self.against_voucher_type, self.against_voucher
-					)
+				update_outstanding_amt(*outstanding_args)
+
+	def get_outstanding_update_args(self):
+		"""Returns arguments for `update_outstanding_amt` if this entry affects the outstanding
+		of its against voucher, else None"""
+		if (
+			self.voucher_type == "Journal Entry"
+			and frappe.get_cached_value("Journal Entry", self.voucher_no, "voucher_type")
+			== "Exchange Gain Or Loss"
+		):
+			return
+
+		if frappe.get_cached_value("Account", self.account, "account_type") in [
+			"Receivable",
+			"Payable",
+		]:
+			return
+
+		if (
+			self.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
+			and self.against_voucher
+			and self.flags.update_outstanding == "Yes"
+			and not frappe.flags.is_reverse_depr_entry
+		):
+			return (
+				self.account,
+				self.party_type,
+				self.party,
+				self.against_voucher_type,
+				self.against_voucher,
+			)
 
 	def check_mandatory(self):
 		mandatory = ["account", "voucher_type", "voucher_no", "company"]
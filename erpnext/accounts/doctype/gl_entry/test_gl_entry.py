@@ -3,9 +3,11 @@
 
 
 import unittest
+from unittest.mock import patch
 
 import frappe
 from frappe.model.naming import parse_naming_series
+from frappe.tests.utils import change_settings
 
 from erpnext.accounts.doctype.gl_entry.gl_entry import rename_gle_sle_docs
 from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
@@ -79,3 +81,99 @@ class TestGLEntry(unittest.TestCase):
 			"SELECT current from tabSeries where name = %s", naming_series
 		)[0][0]
 		self.assertEqual(old_naming_series_current_value + 2, new_naming_series_current_value)
+
+	def test_bulk_gl_entries(self):
+		def get_ledger(voucher_no):
+			return frappe.get_all(
+				"GL Entry",
+				fields=[
+					"account",
+					"cost_center",
+					"debit",
+					"credit",
+					"debit_in_account_currency",
+					"credit_in_account_currency",
+					"fiscal_year",
+					"is_cancelled",
+				],
+				filters={"voucher_type": "Journal Entry", "voucher_no": voucher_no},
+				order_by="creation",
+			)
+
+		je = make_journal_entry(
+			"_Test Account Cost for Goods Sold - _TC", "_Test Bank - _TC", 100, submit=True
+		)
+
+		with patch("erpnext.accounts.general_ledger.BULK_GL_ENTRY_THRESHOLD", 1):
+			bulk_je = make_journal_entry(
+				"_Test Account Cost for Goods Sold - _TC", "_Test Bank - _TC", 100, submit=True
+			)
+
+		self.assertEqual(get_ledger(je.name), get_ledger(bulk_je.name))
+
+		bulk_je.cancel()
+		self.assertTrue(all(entry.is_cancelled for entry in get_ledger(bulk_je.name)))
+
+	@change_settings("Accounts Settings", {"merge_similar_account_heads": 0})
+	def test_bulk_payment_ledger_entries(self):
+		def make_invoice_entry(submit=True):
+			je = make_journal_entry("Debtors - _TC", "Sales - _TC", 600, save=False)
+			je.accounts[0].update(
+				{
+					"debit_in_account_currency": 100,
+					"party_type": "Customer",
+					"party": "_Test Customer",
+				}
+			)
+			for amount in (200, 300):
+				je.append(
+					"accounts",
+					{
+						"account": "Debtors - _TC",
+						"cost_center": "_Test Cost Center - _TC",
+						"debit_in_account_currency": amount,
+						"party_type": "Customer",
+						"party": "_Test Customer",
+					},
+				)
+			je.insert()
+			je.submit()
+			return je
+
+		def get_payment_ledger(voucher_no):
+			return [
+				(
+					entry.account,
+					entry.party_type,
+					entry.party,
+					entry.against_voucher_type,
+					entry.against_voucher_no == voucher_no,
+					entry.amount,
+					entry.amount_in_account_currency,
+					entry.delinked,
+				)
+				for entry in frappe.get_all(
+					"Payment Ledger Entry",
+					fields=[
+						"account",
+						"party_type",
+						"party",
+						"against_voucher_type",
+						"against_voucher_no",
+						"amount",
+						"amount_in_account_currency",
+						"delinked",
+					],
+					filters={"voucher_type": "Journal Entry", "voucher_no": voucher_no},
+					order_by="creation",
+				)
+			]
+
+		je = make_invoice_entry()
+		with patch("erpnext.accounts.general_ledger.BULK_GL_ENTRY_THRESHOLD", 1):
+			bulk_je = make_invoice_entry()
+
+		ledger = get_payment_ledger(je.name)
+		self.assertEqual(len(ledger), 3)
+		self.assertEqual([entry[5] for entry in ledger], [100, 200, 300])
+		self.assertEqual(get_payment_ledger(bulk_je.name), ledger)
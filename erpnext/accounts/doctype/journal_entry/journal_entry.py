@@ -1110,7 +1110,7 @@ class JournalEntry(AccountsController):
 		return gl_map
 
 	def make_gl_entries(self, cancel=0, adv_adj=0):
-		from erpnext.accounts.general_ledger import make_gl_entries
+		from erpnext.accounts.general_ledger import BULK_GL_ENTRY_THRESHOLD, make_gl_entries
 
 		merge_entries = frappe.db.get_single_value("Accounts Settings", "merge_similar_account_heads")
 
@@ -1127,6 +1127,7 @@ class JournalEntry(AccountsController):
 				adv_adj=adv_adj,
 				merge_entries=merge_entries,
 				update_outstanding=update_outstanding,
+				bulk=len(gl_map) >= BULK_GL_ENTRY_THRESHOLD,
 			)
 			if cancel:
 				cancel_exchange_gain_loss_journal(frappe._dict(doctype=self.doctype, name=self.name))
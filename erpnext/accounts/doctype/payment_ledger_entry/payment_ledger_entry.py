@@ -16,6 +16,9 @@ from erpnext.accounts.doctype.gl_entry.gl_entry import (
 	validate_balance_type,
 	validate_frozen_account,
 )
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	update_voucher_outstanding_for_entries,
+)
 from erpnext.accounts.utils import update_voucher_outstanding
 from erpnext.exceptions import InvalidAccountDimensionError, MandatoryAccountDimensionError
 
@@ -168,13 +171,26 @@ class PaymentLedgerEntry(Document):
 			validate_frozen_account(self.account, adv_adj)
 
 		# update outstanding amount
+		outstanding_args = self.get_outstanding_update_args()
+		if outstanding_args:
+			update_voucher_outstanding(*outstanding_args)
+
+		update_voucher_outstanding_for_entries([self])
+
+	def get_outstanding_update_args(self):
+		"""Returns arguments for `update_voucher_outstanding` if this entry affects the outstanding
+		of its against voucher, else None"""
 		if (
 			self.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
 			and self.flags.update_outstanding == "Yes"
 			and not frappe.flags.is_reverse_depr_entry
 		):
-			update_voucher_outstanding(
-				self.against_voucher_type, self.against_voucher_no, self.account, self.party_type, self.party
+			return (
+				self.against_voucher_type,
+				self.against_voucher_no,
+				self.account,
+				self.party_type,
+				self.party,
 			)
 
 
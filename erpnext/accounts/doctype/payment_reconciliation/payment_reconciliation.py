@@ -410,9 +410,12 @@ class PaymentReconciliation(Document):
 		)
 
 		entries = []
+		invoices = args.get("invoices")
+		# invoices before this one are fully allocated, and not looked at again
+		next_invoice = 0
 		for pay in args.get("payments"):
 			pay.update({"unreconciled_amount": pay.get("amount")})
-			for inv in args.get("invoices"):
+			for inv in invoices[next_invoice:]:
 				if pay.get("amount") >= inv.get("outstanding_amount"):
 					res = self.get_allocated_entry(pay, inv, inv["outstanding_amount"])
 					pay["amount"] = flt(pay.get("amount")) - flt(inv.get("outstanding_amount"))
@@ -431,6 +434,9 @@ class PaymentReconciliation(Document):
 				res.exchange_rate = inv.get("exchange_rate")
 				res.update({"gain_loss_posting_date": pay.get("posting_date")})
 
+				if inv.get("outstanding_amount") == 0:
+					next_invoice += 1
+
 				if pay.get("amount") == 0:
 					entries.append(res)
 					break
@@ -1171,6 +1171,67 @@ class TestPaymentReconciliation(FrappeTestCase):
 		# Should not raise frappe.exceptions.ValidationError: Payment Entry has been modified after you pulled it. Please pull it again.
 		pr.reconcile()
 
+	def test_allocation_of_many_payments_to_many_invoices(self):
+		for _i in range(3):
+			self.create_sales_invoice(qty=1, rate=100)
+		for _i in range(2):
+			self.create_payment_entry(amount=150).save().submit()
+
+		pr = self.create_payment_reconciliation()
+		pr.get_unreconciled_entries()
+		invoices = [x.as_dict() for x in pr.get("invoices")]
+		payments = [x.as_dict() for x in pr.get("payments")]
+		pr.allocate_entries(frappe._dict({"invoices": invoices, "payments": payments}))
+
+		# invoices are allocated in order, fully allocated ones are not allocated again
+		self.assertEqual([row.allocated_amount for row in pr.allocation], [100, 50, 50, 100])
+
+	def test_skip_process_reconciliation_with_nothing_to_reconcile(self):
+		from erpnext.accounts.doctype.process_payment_reconciliation.process_payment_reconciliation import (
+			skip_docs_with_nothing_to_reconcile,
+		)
+
+		def queue_process_reconciliation():
+			ppr = frappe.get_doc(
+				{
+					"doctype": "Process Payment Reconciliation",
+					"company": self.company,
+					"party_type": "Customer",
+					"party": self.customer,
+					"receivable_payable_account": self.debit_to,
+				}
+			).submit()
+			return frappe.get_all(
+				"Process Payment Reconciliation",
+				filters={"name": ppr.name},
+				fields=["name", "company", "party_type", "party", "receivable_payable_account"],
+			)
+
+		# only invoices, nothing to reconcile
+		self.create_sales_invoice(qty=1, rate=100)
+		queued = queue_process_reconciliation()
+		self.assertEqual(skip_docs_with_nothing_to_reconcile(queued), [])
+
+		status, watermark = frappe.db.get_value(
+			"Process Payment Reconciliation", queued[0].name, ["status", "ledger_watermark"]
+		)
+		self.assertEqual(status, "Completed")
+		self.assertTrue(watermark)
+
+		# ledger did not change since, skipped through the watermark
+		queued = queue_process_reconciliation()
+		self.assertEqual(skip_docs_with_nothing_to_reconcile(queued), [])
+
+		# a payment can be reconciled against the invoice
+		self.create_payment_entry(amount=100).save().submit()
+		queued = queue_process_reconciliation()
+		self.assertEqual(
+			[doc.name for doc in skip_docs_with_nothing_to_reconcile(queued)], [queued[0].name]
+		)
+		self.assertEqual(
+			frappe.db.get_value("Process Payment Reconciliation", queued[0].name, "status"), "Queued"
+		)
+
 
 def make_customer(customer_name, currency=None):
 	if not frappe.db.exists("Customer", customer_name):
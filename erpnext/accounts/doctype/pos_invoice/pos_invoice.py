@@ -727,6 +727,62 @@ def get_stock_availability(item_code, warehouse):
 			return 0, is_stock_item
 
 
+def get_stock_availability_for_items(item_codes, warehouse):
+	"""`get_stock_availability` of many items, with one query per table instead of per item"""
+	if not item_codes:
+		return {}
+
+	stock_items = frappe.get_all(
+		"Item", filters={"name": ("in", item_codes), "is_stock_item": 1}, pluck="name"
+	)
+	product_bundles = frappe.get_all(
+		"Product Bundle", filters={"name": ("in", item_codes), "disabled": 0}, pluck="name"
+	)
+
+	bin_qty, pos_reserved_qty = {}, {}
+	if stock_items:
+		bin_qty = dict(
+			frappe.get_all(
+				"Bin",
+				filters={"item_code": ("in", stock_items), "warehouse": warehouse},
+				fields=["item_code", "actual_qty"],
+				as_list=True,
+			)
+		)
+
+		p_inv = frappe.qb.DocType("POS Invoice")
+		p_item = frappe.qb.DocType("POS Invoice Item")
+		pos_reserved_qty = dict(
+			(
+				frappe.qb.from_(p_inv)
+				.from_(p_item)
+				.select(p_item.item_code, Sum(p_item.qty))
+				.where(
+					(p_inv.name == p_item.parent)
+					& (IfNull(p_inv.consolidated_invoice, "") == "")
+					& (p_item.docstatus == 1)
+					& (p_item.item_code.isin(stock_items))
+					& (p_item.warehouse == warehouse)
+				)
+				.groupby(p_item.item_code)
+			).run()
+		)
+
+	availability = {}
+	for item_code in item_codes:
+		if item_code in stock_items:
+			availability[item_code] = (
+				flt(bin_qty.get(item_code)) - flt(pos_reserved_qty.get(item_code)),
+				True,
+			)
+		elif item_code in product_bundles:
+			availability[item_code] = (get_bundle_availability(item_code, warehouse), True)
+		else:
+			availability[item_code] = (0, False)
+
+	return availability
+
+
 def get_bundle_availability(bundle_item_code, warehouse):
 	product_bundle = frappe.get_doc("Product Bundle", bundle_item_code)
 
@@ -8,12 +8,15 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 from frappe.model.mapper import map_child_doc, map_doc
-from frappe.utils import cint, flt, get_time, getdate, nowdate, nowtime
+from frappe.utils import cint, flt, get_time, getdate, now, nowdate, nowtime
 from frappe.utils.background_jobs import enqueue, is_job_enqueued
 from frappe.utils.scheduler import is_scheduler_inactive
 
 from erpnext.accounts.doctype.pos_profile.pos_profile import required_accounting_dimensions
 
+# POS Invoices merged by one merge log, and processed by one background job
+MERGE_LOG_BATCH_SIZE = 1000
+
 
 class POSInvoiceMergeLog(Document):
 	# begin: auto-generated types
@@ -106,9 +109,7 @@ class POSInvoiceMergeLog(Document):
 					frappe.throw(msg)
 
 	def on_submit(self):
-		pos_invoice_docs = [
-			frappe.get_cached_doc("POS Invoice", d.pos_invoice) for d in self.pos_invoices
-		]
+		pos_invoice_docs = get_pos_invoice_docs([d.pos_invoice for d in self.pos_invoices])
 
 		returns = [d for d in pos_invoice_docs if d.get("is_return") == 1]
 		sales = [d for d in pos_invoice_docs if d.get("is_return") == 0]
@@ -175,6 +176,9 @@ class POSInvoiceMergeLog(Document):
 
 		loyalty_amount_sum, loyalty_points_sum, idx = 0, 0, 1
 
+		# rows are merged into the first row with the same key, looked up instead of scanned
+		items_by_key, taxes_by_key, payments_by_key, tax_details = {}, {}, {}, {}
+
 		for doc in data:
 			map_doc(doc, invoice, table_map={"doctype": invoice.doctype})
 
@@ -185,24 +189,14 @@ class POSInvoiceMergeLog(Document):
 				loyalty_amount_sum += doc.loyalty_amount
 
 			for item in doc.get("items"):
-				found = False
-				for i in items:
-					if (
-						i.item_code == item.item_code
-						and not i.serial_no
-						and not i.batch_no
-						and i.uom == item.uom
-						and i.net_rate == item.net_rate
-						and i.warehouse == item.warehouse
-					):
-						found = True
-						i.qty = i.qty + item.qty
-						i.amount = i.amount + item.net_amount
-						i.net_amount = i.amount
-						i.base_amount = i.base_amount + item.base_net_amount
-						i.base_net_amount = i.base_amount
-
-				if not found:
+				key = (item.item_code, item.uom, item.net_rate, item.warehouse)
+				if i := items_by_key.get(key):
+					i.qty = i.qty + item.qty
+					i.amount = i.amount + item.net_amount
+					i.net_amount = i.amount
+					i.base_amount = i.base_amount + item.base_net_amount
+					i.base_net_amount = i.base_amount
+				else:
 					item.rate = item.net_rate
 					item.amount = item.net_amount
 					item.base_amount = item.base_net_amount
@@ -212,15 +206,19 @@ class POSInvoiceMergeLog(Document):
 						si_item.serial_and_batch_bundle = item.serial_and_batch_bundle
 					items.append(si_item)
 
+					# rows with a serial or batch no are not merged into
+					if not si_item.serial_no and not si_item.batch_no:
+						items_by_key[key] = si_item
+
 			for tax in doc.get("taxes"):
-				found = False
-				for t in taxes:
-					if t.account_head == tax.account_head and t.cost_center == tax.cost_center:
-						t.tax_amount = flt(t.tax_amount) + flt(tax.tax_amount_after_discount_amount)
-						t.base_tax_amount = flt(t.base_tax_amount) + flt(tax.base_tax_amount_after_discount_amount)
-						update_item_wise_tax_detail(t, tax)
-						found = True
-				if not found:
+				key = (tax.account_head, tax.cost_center)
+				if t := taxes_by_key.get(key):
+					t.tax_amount = flt(t.tax_amount) + flt(tax.tax_amount_after_discount_amount)
+					t.base_tax_amount = flt(t.base_tax_amount) + flt(tax.base_tax_amount_after_discount_amount)
+					if key not in tax_details:
+						tax_details[key] = json.loads(t.item_wise_tax_detail or "{}") or {}
+					merge_item_wise_tax_detail(tax_details[key], tax)
+				else:
 					tax.charge_type = "Actual"
 					tax.idx = idx
 					idx += 1
@@ -229,22 +227,25 @@ class POSInvoiceMergeLog(Document):
 					tax.base_tax_amount = tax.base_tax_amount_after_discount_amount
 					tax.item_wise_tax_detail = tax.item_wise_tax_detail
 					taxes.append(tax)
+					taxes_by_key[key] = tax
 
 			for payment in doc.get("payments"):
-				found = False
-				for pay in payments:
-					if pay.account == payment.account and pay.mode_of_payment == payment.mode_of_payment:
-						pay.amount = flt(pay.amount) + flt(payment.amount)
-						pay.base_amount = flt(pay.base_amount) + flt(payment.base_amount)
-						found = True
-				if not found:
+				key = (payment.account, payment.mode_of_payment)
+				if pay := payments_by_key.get(key):
+					pay.amount = flt(pay.amount) + flt(payment.amount)
+					pay.base_amount = flt(pay.base_amount) + flt(payment.base_amount)
+				else:
 					payments.append(payment)
+					payments_by_key[key] = payment
 
 			rounding_adjustment += doc.rounding_adjustment
 			rounded_total += doc.rounded_total
 			base_rounding_adjustment += doc.base_rounding_adjustment
 			base_rounded_total += doc.base_rounded_total
 
+		for key, tax_detail in tax_details.items():
+			taxes_by_key[key].item_wise_tax_detail = json.dumps(tax_detail, separators=(",", ":"))
+
 		if loyalty_points_sum:
 			invoice.redeem_loyalty_points = 1
 			invoice.loyalty_points = loyalty_points_sum
@@ -296,6 +297,11 @@ class POSInvoiceMergeLog(Document):
 		return sales_invoice
 
 	def update_pos_invoices(self, invoice_docs, sales_invoice="", credit_note=""):
+		if self.docstatus == 1:
+			set_consolidated_invoice([d.name for d in invoice_docs if not d.is_return], sales_invoice)
+			set_consolidated_invoice([d.name for d in invoice_docs if d.is_return], credit_note)
+			return
+
 		for doc in invoice_docs:
 			doc.load_from_db()
 			doc.update(
@@ -317,12 +323,50 @@ class POSInvoiceMergeLog(Document):
 			si.cancel()
 
 
-def update_item_wise_tax_detail(consolidate_tax_row, tax_row):
-	consolidated_tax_detail = json.loads(consolidate_tax_row.item_wise_tax_detail)
-	tax_row_detail = json.loads(tax_row.item_wise_tax_detail)
+def get_pos_invoice_docs(pos_invoices):
+	"""POS Invoices with their child rows, read with one query per table for every
+	`MERGE_LOG_BATCH_SIZE` invoices instead of one document at a time"""
+	table_fields = frappe.get_meta("POS Invoice").get_table_fields()
+
+	invoices = {}
+	for i in range(0, len(pos_invoices), MERGE_LOG_BATCH_SIZE):
+		names = pos_invoices[i : i + MERGE_LOG_BATCH_SIZE]
+		for invoice in frappe.get_all("POS Invoice", filters={"name": ("in", names)}, fields=["*"]):
+			invoices[invoice.name] = frappe._dict(invoice, doctype="POS Invoice")
+
+		for df in table_fields:
+			for row in frappe.get_all(
+				df.options,
+				filters={"parent": ("in", names), "parenttype": "POS Invoice", "parentfield": df.fieldname},
+				fields=["*"],
+				order_by="idx",
+			):
+				invoices[row.parent].setdefault(df.fieldname, []).append(row)
+
+	return [frappe.get_doc(invoices[name]) for name in pos_invoices if name in invoices]
+
+
+def set_consolidated_invoice(pos_invoices, consolidated_invoice):
+	"""Link submitted POS Invoices to the Sales Invoice they are merged into, with one update
+	per batch instead of saving every invoice"""
+	pos_invoice = frappe.qb.DocType("POS Invoice")
 
-	if not consolidated_tax_detail:
-		consolidated_tax_detail = {}
+	for i in range(0, len(pos_invoices), MERGE_LOG_BATCH_SIZE):
+		(
+			frappe.qb.update(pos_invoice)
+			.set(pos_invoice.consolidated_invoice, consolidated_invoice)
+			.set(pos_invoice.status, "Consolidated")
+			.set(pos_invoice.modified, now())
+			.set(pos_invoice.modified_by, frappe.session.user)
+			.where(pos_invoice.name.isin(pos_invoices[i : i + MERGE_LOG_BATCH_SIZE]))
+		).run()
+
+	for name in pos_invoices:
+		frappe.clear_document_cache("POS Invoice", name)
+
+
+def merge_item_wise_tax_detail(consolidated_tax_detail, tax_row):
+	tax_row_detail = json.loads(tax_row.item_wise_tax_detail)
 
 	for item_code, tax_data in tax_row_detail.items():
 		if consolidated_tax_detail.get(item_code):
@@ -333,10 +377,6 @@ def update_item_wise_tax_detail(consolidate_tax_row, tax_row):
 		else:
 			consolidated_tax_detail.update({item_code: [tax_data[0], tax_data[1]]})
 
-	consolidate_tax_row.item_wise_tax_detail = json.dumps(
-		consolidated_tax_detail, separators=(",", ":")
-	)
-
 
 def get_all_unconsolidated_invoices():
 	filters = {
@@ -376,17 +416,33 @@ def consolidate_pos_invoices(pos_invoices=None, closing_entry=None):
 	if frappe.flags.in_test and not invoices:
 		invoices = get_all_unconsolidated_invoices()
 
+	# on retry, invoices merged by the batches that succeeded are not merged again
+	invoices = get_unmerged_invoices(invoices or [])
 	invoice_by_customer = get_invoice_customer_map(invoices)
 
 	if len(invoices) >= 10 and closing_entry:
 		closing_entry.set_status(update=True, status="Queued")
-		enqueue_job(
-			create_merge_logs, invoice_by_customer=invoice_by_customer, closing_entry=closing_entry
-		)
+		enqueue_merge_log_batches(get_merge_log_batches(invoice_by_customer), closing_entry)
 	else:
 		create_merge_logs(invoice_by_customer, closing_entry)
 
 
+def get_unmerged_invoices(invoices):
+	names = [d.pos_invoice for d in invoices]
+
+	consolidated = set()
+	for i in range(0, len(names), MERGE_LOG_BATCH_SIZE):
+		consolidated.update(
+			frappe.get_all(
+				"POS Invoice",
+				filters={"name": ("in", names[i : i + MERGE_LOG_BATCH_SIZE]), "status": "Consolidated"},
+				pluck="name",
+			)
+		)
+
+	return [d for d in invoices if d.pos_invoice not in consolidated]
+
+
 def unconsolidate_pos_invoices(closing_entry):
 	merge_logs = frappe.get_all(
 		"POS Invoice Merge Log", filters={"pos_closing_entry": closing_entry.name}, pluck="name"
@@ -454,26 +510,85 @@ def split_invoices(invoices):
 	return _invoices
 
 
+def chunk_invoices(invoices):
+	"""Split invoices into chunks of about `MERGE_LOG_BATCH_SIZE`, keeping returns in the chunk
+	of their original invoice"""
+	names = {d.pos_invoice for d in invoices}
+
+	groups = {}
+	for d in invoices:
+		key = d.return_against if d.is_return and d.return_against in names else d.pos_invoice
+		groups.setdefault(key, []).append(d)
+
+	chunks = [[]]
+	for group in groups.values():
+		if chunks[-1] and len(chunks[-1]) + len(group) > MERGE_LOG_BATCH_SIZE:
+			chunks.append([])
+		chunks[-1].extend(group)
+
+	return [chunk for chunk in chunks if chunk]
+
+
+def get_merge_log_batches(invoice_by_customer):
+	"""Group the merge logs to be created into batches of about `MERGE_LOG_BATCH_SIZE`
+	invoices, each of which can be processed by a separate job.
+
+	Every batch is a list of (customer, invoices) with one merge log each. Merge logs that
+	have to be submitted one after the other (see `split_invoices`) are put in the same batch."""
+	units = []
+	for customer, invoices in invoice_by_customer.items():
+		groups = split_invoices(invoices)
+		merge_logs = [(customer, chunk) for group in groups for chunk in chunk_invoices(group)]
+
+		if len(groups) > 1:
+			units.append(merge_logs)
+		else:
+			units.extend([merge_log] for merge_log in merge_logs)
+
+	batches, batch_size = [[]], 0
+	for unit in units:
+		unit_size = sum(len(invoices) for customer, invoices in unit)
+		if batches[-1] and batch_size + unit_size > MERGE_LOG_BATCH_SIZE:
+			batches.append([])
+			batch_size = 0
+
+		batches[-1].extend(unit)
+		batch_size += unit_size
+
+	return [batch for batch in batches if batch]
+
+
 def create_merge_logs(invoice_by_customer, closing_entry=None):
+	batches = get_merge_log_batches(invoice_by_customer)
+	for batch in batches:
+		create_merge_log_batch(batch, closing_entry)
+
+	if closing_entry and not batches:
+		# every invoice was merged before a failure in updating the closing entry
+		create_merge_log_batch([], closing_entry)
+
+
+def create_merge_log_batch(batch, closing_entry=None):
+	"""Create and submit the merge logs of a batch, committed together so that a failure in a
+	later batch does not undo it"""
 	try:
-		for customer, invoices in invoice_by_customer.items():
-			for _invoices in split_invoices(invoices):
-				merge_log = frappe.new_doc("POS Invoice Merge Log")
-				merge_log.posting_date = (
-					getdate(closing_entry.get("posting_date")) if closing_entry else nowdate()
-				)
-				merge_log.posting_time = (
-					get_time(closing_entry.get("posting_time")) if closing_entry else nowtime()
-				)
-				merge_log.customer = customer
-				merge_log.pos_closing_entry = closing_entry.get("name") if closing_entry else None
-				merge_log.set("pos_invoices", _invoices)
-				merge_log.save(ignore_permissions=True)
-				merge_log.submit()
+		for customer, invoices in batch:
+			merge_log = frappe.new_doc("POS Invoice Merge Log")
+			merge_log.posting_date = (
+				getdate(closing_entry.get("posting_date")) if closing_entry else nowdate()
+			)
+			merge_log.posting_time = (
+				get_time(closing_entry.get("posting_time")) if closing_entry else nowtime()
+			)
+			merge_log.customer = customer
+			merge_log.pos_closing_entry = closing_entry.get("name") if closing_entry else None
+			merge_log.set("pos_invoices", invoices)
+			merge_log.save(ignore_permissions=True)
+			merge_log.submit()
+
 		if closing_entry:
-			closing_entry.set_status(update=True, status="Submitted")
-			closing_entry.db_set("error_message", "")
-			closing_entry.update_opening_entry()
+			frappe.db.commit()
+			update_closing_entry_status(closing_entry)
 
 	except Exception as e:
 		frappe.db.rollback()
@@ -492,6 +607,20 @@ def create_merge_logs(invoice_by_customer, closing_entry=None):
 		frappe.publish_realtime("closing_process_complete", user=frappe.session.user)
 
 
+def update_closing_entry_status(closing_entry):
+	"""Mark the closing entry as submitted once all its invoices are merged, by whichever batch
+	finishes last"""
+	# batches running concurrently wait here for each other, and see each other's merge logs
+	frappe.db.get_value("POS Closing Entry", closing_entry.get("name"), "name", for_update=True)
+
+	if get_unmerged_invoices(closing_entry.get("pos_transactions")):
+		return
+
+	closing_entry.set_status(update=True, status="Submitted")
+	closing_entry.db_set("error_message", "")
+	closing_entry.update_opening_entry()
+
+
 def cancel_merge_logs(merge_logs, closing_entry=None):
 	try:
 		for log in merge_logs:
@@ -544,6 +673,27 @@ def enqueue_job(job, **kwargs):
 		frappe.msgprint(msg, alert=1)
 
 
+def enqueue_merge_log_batches(batches, closing_entry):
+	check_scheduler_status()
+
+	for batch in batches:
+		# named after the first invoice, so that a retry does not queue a batch that is still running
+		job_id = f"pos_invoice_merge::{closing_entry.get('name')}::{batch[0][1][0].pos_invoice}"
+		if not is_job_enqueued(job_id):
+			enqueue(
+				create_merge_log_batch,
+				batch=batch,
+				closing_entry=closing_entry,
+				queue="long",
+				timeout=10000,
+				event="processing_merge_logs",
+				job_id=job_id,
+				now=frappe.conf.developer_mode or frappe.flags.in_test
+			)
+
+	frappe.msgprint(_("POS Invoices will be consolidated in a background process"), alert=1)
+
+
 def check_scheduler_status():
 	if is_scheduler_inactive() and not frappe.flags.in_test:
 		frappe.throw(_("Scheduler is inactive. Cannot enqueue job."), title=_("Scheduler Inactive"))
@@ -3,6 +3,7 @@
 
 import json
 import unittest
+from unittest.mock import patch
 
 import frappe
 from frappe.tests.utils import change_settings
@@ -12,6 +13,8 @@ from erpnext.accounts.doctype.pos_invoice.pos_invoice import make_sales_return
 from erpnext.accounts.doctype.pos_invoice.test_pos_invoice import create_pos_invoice
 from erpnext.accounts.doctype.pos_invoice_merge_log.pos_invoice_merge_log import (
 	consolidate_pos_invoices,
+	get_invoice_customer_map,
+	get_merge_log_batches,
 )
 from erpnext.stock.doctype.serial_and_batch_bundle.test_serial_and_batch_bundle import (
 	get_serial_nos_from_bundle,
@@ -452,3 +455,62 @@ class TestPOSInvoiceMergeLog(unittest.TestCase):
 			frappe.set_user("Administrator")
 			frappe.db.sql("delete from `tabPOS Profile`")
 			frappe.db.sql("delete from `tabPOS Invoice`")
+
+	def test_consolidation_in_batches(self):
+		frappe.db.sql("delete from `tabPOS Invoice`")
+
+		try:
+			init_user_and_profile()
+
+			invoices = []
+			for rate in (300, 400, 500):
+				pos_inv = create_pos_invoice(rate=rate, do_not_submit=1)
+				pos_inv.append("payments", {"mode_of_payment": "Cash", "account": "Cash - _TC", "amount": rate})
+				pos_inv.submit()
+				invoices.append(pos_inv)
+
+			pos_inv_cn = make_sales_return(invoices[0].name)
+			pos_inv_cn.paid_amount = -300
+			pos_inv_cn.submit()
+
+			references = [
+				frappe._dict(
+					pos_invoice=d.name,
+					customer=d.customer,
+					is_return=d.is_return,
+					return_against=d.return_against,
+				)
+				for d in [*invoices, pos_inv_cn]
+			]
+
+			with patch(
+				"erpnext.accounts.doctype.pos_invoice_merge_log.pos_invoice_merge_log.MERGE_LOG_BATCH_SIZE", 2
+			):
+				# the return is merged along with its original invoice
+				batches = get_merge_log_batches(get_invoice_customer_map(references))
+				self.assertEqual(
+					[[[d.pos_invoice for d in merge_log[1]] for merge_log in batch] for batch in batches],
+					[[[invoices[0].name, pos_inv_cn.name]], [[invoices[1].name, invoices[2].name]]],
+				)
+
+				consolidate_pos_invoices(pos_invoices=references[:2] + references[3:])
+				merge_logs = frappe.db.count("POS Invoice Merge Log")
+
+				# invoices merged by an earlier run are skipped
+				consolidate_pos_invoices(pos_invoices=references)
+				self.assertEqual(frappe.db.count("POS Invoice Merge Log"), merge_logs + 1)
+
+			for d in [*invoices, pos_inv_cn]:
+				d.load_from_db()
+				self.assertEqual(d.status, "Consolidated")
+
+			# one merge log per batch
+			self.assertEqual(len({d.consolidated_invoice for d in invoices}), 3)
+			self.assertEqual(
+				frappe.db.get_value("Sales Invoice", pos_inv_cn.consolidated_invoice, "is_return"), 1
+			)
+
+		finally:
+			frappe.set_user("Administrator")
+			frappe.db.sql("delete from `tabPOS Profile`")
+			frappe.db.sql("delete from `tabPOS Invoice`")
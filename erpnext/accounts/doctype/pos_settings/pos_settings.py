@@ -2,6 +2,8 @@
 # For license information, please see license.txt
 
 
+import frappe
+from frappe import _
 from frappe.model.document import Document
 
 
@@ -23,3 +25,32 @@ class POSSettings(Document):
 
 	def validate(self):
 		pass
+
+	def on_update(self):
+		self.rebuild_item_search_index()
+
+	def rebuild_item_search_index(self):
+		"""The search fields are indexed with the items when the Link Search Index is used"""
+		from erpnext.setup.doctype.link_search_term.link_search_term import (
+			INDEX_FIELDS_KEY,
+			is_link_search_index_enabled,
+		)
+
+		doc_before_save = self.get_doc_before_save()
+		if not (
+			doc_before_save
+			and is_link_search_index_enabled()
+			and [d.fieldname for d in doc_before_save.pos_search_fields]
+			!= [d.fieldname for d in self.pos_search_fields]
+		):
+			return
+
+		frappe.db.set_default(INDEX_FIELDS_KEY.format("Item"), "")
+		frappe.enqueue(
+			"erpnext.setup.doctype.link_search_term.link_search_term.rebuild_link_search_index",
+			doctypes=["Item"],
+			queue="long",
+			timeout=3600,
+			enqueue_after_commit=True,
+		)
+		frappe.msgprint(_("The Link Search Index of Items will be built in the background."), alert=True)
@@ -12,6 +12,11 @@ from frappe import _, throw
 from frappe.model.document import Document
 from frappe.utils import cint, flt
 
+from erpnext.accounts.doctype.pricing_rule.pricing_rule_index import (
+	invalidate_pricing_rule_index,
+	prefetch_pricing_rule_index,
+)
+
 apply_on_dict = {"Item Code": "items", "Item Group": "item_groups", "Brand": "brands"}
 
 other_fields = ["other_item_code", "other_item_group", "other_brand"]
@@ -144,6 +149,14 @@ class PricingRule(Document):
 		if not self.margin_type:
 			self.margin_rate_or_amount = 0.0
 
+	def on_trash(self):
+		invalidate_pricing_rule_index()
+
+	def clear_cache(self):
+		# called on save and db_set
+		invalidate_pricing_rule_index()
+		return super().clear_cache()
+
 	def validate_duplicate_apply_on(self):
 		if self.apply_on != "Transaction":
 			apply_on_table = apply_on_dict.get(self.apply_on)
@@ -357,6 +370,8 @@ def apply_pricing_rule(args, doc=None):
 	for item_code, val in query_items:
 		serialized_items.setdefault(item_code, val)
 
+	prefetch_pricing_rule_index(args.transaction_type, item_list)
+
 	for item in item_list:
 		args_copy = copy.deepcopy(args)
 		args_copy.update(item)
@@ -0,0 +1,266 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: GNU General Public License v3. See license.txt
+
+"""In-memory index of enabled Pricing Rules.
+
+Rules are loaded once per apply on (Item Code, Item Group, Brand) and transaction type
+(selling, buying), kept in Redis and in the worker process, and looked up by the
+item code, item group or brand of the transaction instead of querying for every item.
+The index is dropped whenever a Pricing Rule or Promotional Scheme changes."""
+
+import frappe
+from frappe import _
+from frappe.utils import cstr, getdate
+
+INDEX_CACHE_KEY = "pricing_rule_index"
+INDEX_VERSION_CACHE_KEY = "pricing_rule_index_version"
+TREE_ANCESTORS_CACHE_KEY = "pricing_rule_tree_ancestors"
+
+# doctypes whose hierarchy is matched against the Pricing Rule by ancestors
+TREE_DOCTYPES = ("Item Group", "Customer Group", "Territory", "Supplier Group", "Warehouse")
+
+SELLING_DOCTYPES = (
+	"Quotation",
+	"Quotation Item",
+	"Sales Order",
+	"Sales Order Item",
+	"Delivery Note",
+	"Delivery Note Item",
+	"Sales Invoice",
+	"Sales Invoice Item",
+	"POS Invoice",
+	"POS Invoice Item",
+)
+
+# indexes loaded in this process, by site, apply on and transaction type
+_local_indexes = {}
+
+
+class PricingRuleIndex:
+	"""Pricing Rule rows (one per apply on row, like the SQL join) by apply on and
+	`other_*` value. Rows are kept in `priority desc, name desc` order."""
+
+	def __init__(self, apply_on, rows):
+		self.apply_on_field = frappe.scrub(apply_on)
+		self.other_field = "other_" + self.apply_on_field
+		self.rows = rows
+		self.by_value = {}
+		self.rows_by_rule = {}
+		self.by_other_value = {}
+
+		for position, row in enumerate(rows):
+			row._position = position
+			self.by_value.setdefault(row.get(self.apply_on_field), []).append(row)
+			self.rows_by_rule.setdefault(row.name, []).append(row)
+
+		for rule_rows in self.rows_by_rule.values():
+			rule = rule_rows[0]
+			if rule.apply_rule_on_other and rule.get(self.other_field):
+				self.by_other_value.setdefault(rule.get(self.other_field), []).extend(rule_rows)
+
+	def get_candidates(self, args):
+		value = args.get(self.apply_on_field)
+		uom = args.get("uom")
+
+		def uom_matches(row):
+			return not uom or cstr(row.uom) in (uom, "")
+
+		candidates = []
+		if self.apply_on_field == "item_code":
+			candidates.extend(row for row in self.by_value.get(value, []) if uom_matches(row))
+
+			if "variant_of" not in args:
+				args.variant_of = frappe.get_cached_value("Item", args.item_code, "variant_of")
+
+			if args.variant_of:
+				candidates.extend(self.by_value.get(args.variant_of, []))
+
+		elif self.apply_on_field == "item_group":
+			for item_group in get_tree_ancestors("Item Group", value):
+				candidates.extend(row for row in self.by_value.get(item_group, []) if uom_matches(row))
+
+		else:
+			candidates.extend(self.by_value.get(value, []))
+
+		candidates.extend(self.by_other_value.get(value, []))
+
+		# rows may match more than one condition, like they would match the OR in a query
+		return sorted(
+			{row._position: row for row in candidates}.values(), key=lambda row: row._position
+		)
+
+
+def get_pricing_rules_from_index(apply_on, args):
+	"""Pricing Rules applicable to the item in `args` for `apply_on`, as returned by a
+	query on Pricing Rule joined with its apply on table"""
+	apply_on_field = frappe.scrub(apply_on)
+	if not args.get(apply_on_field):
+		return []
+
+	if not args.price_list:
+		args.price_list = None
+
+	index = get_pricing_rule_index(apply_on, args.transaction_type)
+	matcher = get_rule_matcher(args)
+
+	matched_rules = {}
+	pricing_rules = []
+	for row in index.get_candidates(args):
+		if row.name not in matched_rules:
+			matched_rules[row.name] = matcher(row)
+
+		if matched_rules[row.name]:
+			pricing_rule = frappe._dict(row)
+			pricing_rule.pop("_position", None)
+			pricing_rules.append(pricing_rule)
+
+	return pricing_rules
+
+
+def get_rule_matcher(args):
+	"""Returns a function that checks the party, warehouse, date and price list of a rule"""
+	party_values = {}
+	for field in ("company", "customer", "supplier", "campaign", "sales_partner"):
+		party_values[field] = ("", args.get(field)) if args.get(field) else ("",)
+
+	tree_values = {}
+	for parenttype in ("Customer Group", "Territory", "Supplier Group", "Warehouse"):
+		field = frappe.scrub(parenttype)
+		if args.get(field):
+			tree_values[field] = set(get_tree_ancestors(parenttype, args.get(field))) | {""}
+
+	transaction_date = getdate(args.transaction_date) if args.get("transaction_date") else None
+	price_lists = ("", cstr(args.price_list))
+	for_selling = args.get("doctype") in SELLING_DOCTYPES
+
+	def matches(rule):
+		if not (rule.selling if for_selling else rule.buying):
+			return False
+
+		for field, values in party_values.items():
+			if cstr(rule.get(field)) not in values:
+				return False
+
+		for field, values in tree_values.items():
+			if cstr(rule.get(field)) not in values:
+				return False
+
+		if transaction_date:
+			if rule.valid_from and getdate(rule.valid_from) > transaction_date:
+				return False
+
+			if rule.valid_upto and getdate(rule.valid_upto) < transaction_date:
+				return False
+
+		return cstr(rule.for_price_list) in price_lists
+
+	return matches
+
+
+def get_pricing_rule_index(apply_on, transaction_type):
+	version = frappe.cache().get_value(
+		INDEX_VERSION_CACHE_KEY, generator=lambda: frappe.generate_hash(length=10)
+	)
+
+	key = (frappe.local.site, apply_on, transaction_type)
+	if key in _local_indexes and _local_indexes[key][0] == version:
+		return _local_indexes[key][1]
+
+	rows = frappe.cache().hget(
+		INDEX_CACHE_KEY,
+		"{0}::{1}".format(apply_on, transaction_type),
+		generator=lambda: get_pricing_rule_rows(apply_on, transaction_type),
+	)
+
+	index = PricingRuleIndex(apply_on, [frappe._dict(row) for row in rows])
+	_local_indexes[key] = (version, index)
+
+	return index
+
+
+def get_pricing_rule_rows(apply_on, transaction_type):
+	if transaction_type not in ("selling", "buying"):
+		frappe.throw(_("Invalid transaction type {0}").format(transaction_type))
+
+	apply_on_field = frappe.scrub(apply_on)
+	child_doc = "`tabPricing Rule {0}`".format(apply_on)
+
+	return frappe.db.sql(
+		"""select `tabPricing Rule`.*,
+			{child_doc}.{apply_on_field}, {child_doc}.uom
+		from `tabPricing Rule`, {child_doc}
+		where {child_doc}.parent = `tabPricing Rule`.name
+			and `tabPricing Rule`.disable = 0
+			and `tabPricing Rule`.{transaction_type} = 1
+		order by `tabPricing Rule`.priority desc,
+			`tabPricing Rule`.name desc""".format(
+			child_doc=child_doc, apply_on_field=apply_on_field, transaction_type=transaction_type
+		),
+		as_dict=1,
+	)
+
+
+def get_tree_ancestors(parenttype, name):
+	"""`name` and its ancestors, and the root for groups with a separate root"""
+
+	def _get_ancestors():
+		try:
+			lft, rgt = frappe.db.get_value(parenttype, name, ["lft", "rgt"])
+		except TypeError:
+			frappe.throw(_("Invalid {0}").format(name))
+
+		ancestors = frappe.db.sql_list(
+			"""select name from `tab%s`
+			where lft<=%s and rgt>=%s"""
+			% (parenttype, "%s", "%s"),
+			(lft, rgt),
+		)
+
+		if parenttype in ["Customer Group", "Item Group", "Territory"]:
+			parent_field = "parent_{0}".format(frappe.scrub(parenttype))
+			root_name = frappe.db.get_list(
+				parenttype,
+				{"is_group": 1, parent_field: ("is", "not set")},
+				"name",
+				as_list=1,
+				ignore_permissions=True,
+			)
+
+			if root_name and root_name[0][0]:
+				ancestors.append(root_name[0][0])
+
+		return ancestors
+
+	return frappe.cache().hget(
+		TREE_ANCESTORS_CACHE_KEY, "{0}::{1}".format(parenttype, name), generator=_get_ancestors
+	)
+
+
+def prefetch_pricing_rule_index(transaction_type, items):
+	"""Load the indexes and tree ancestors used by `items` in one go, for documents
+	with many items"""
+	if transaction_type not in ("selling", "buying"):
+		return
+
+	for apply_on in ("Item Code", "Item Group", "Brand"):
+		get_pricing_rule_index(apply_on, transaction_type)
+
+	for item_group in {item.get("item_group") for item in items if item.get("item_group")}:
+		get_tree_ancestors("Item Group", item_group)
+
+
+def clear_pricing_rule_index(doc=None, method=None):
+	frappe.cache().delete_value([INDEX_CACHE_KEY, INDEX_VERSION_CACHE_KEY])
+	_local_indexes.clear()
+
+
+def invalidate_pricing_rule_index():
+	"""Drop the index now, and once more after commit or rollback, so that an index
+	rebuilt from uncommitted data by another process is not kept"""
+	clear_pricing_rule_index()
+	frappe.db.after_commit.add(clear_pricing_rule_index)
+	frappe.db.after_rollback.add(clear_pricing_rule_index)
+
+
+def clear_tree_ancestors(doc=None, method=None):
+	frappe.cache().delete_value(TREE_ANCESTORS_CACHE_KEY)
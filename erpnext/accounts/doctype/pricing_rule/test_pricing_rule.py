@@ -6,6 +6,10 @@ import unittest
 
 import frappe
 
+from erpnext.accounts.doctype.pricing_rule.pricing_rule_index import (
+	clear_pricing_rule_index,
+	get_pricing_rules_from_index,
+)
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
 from erpnext.selling.doctype.sales_order.test_sales_order import make_sales_order
 from erpnext.stock.doctype.item.test_item import make_item
@@ -94,6 +98,7 @@ class TestPricingRule(unittest.TestCase):
 		self.assertEqual(details.get("discount_percentage"), 5)
 
 		frappe.db.sql("update `tabPricing Rule` set priority=NULL where campaign='_Test Campaign'")
+		clear_pricing_rule_index()
 		from erpnext.accounts.doctype.pricing_rule.utils import MultiplePricingRuleConflict
 
 		self.assertRaises(MultiplePricingRuleConflict, get_item_details, args)
@@ -1108,6 +1113,55 @@ class TestPricingRule(unittest.TestCase):
 		self.assertEqual(so.items[1].item_code, "_Test Item")
 		self.assertEqual(so.items[1].qty, 4)
 
+	def test_pricing_rule_index(self):
+		args = frappe._dict(
+			{
+				"item_code": "_Test Item",
+				"item_group": "_Test Item Group",
+				"company": "_Test Company",
+				"customer": "_Test Customer",
+				"price_list": "_Test Price List",
+				"doctype": "Sales Order",
+				"transaction_type": "selling",
+				"transaction_date": frappe.utils.today(),
+			}
+		)
+
+		rule = make_pricing_rule(
+			title="_Test Pricing Rule Index",
+			apply_on="Item Code",
+			item_code="_Test Item",
+			selling=1,
+			discount_percentage=10,
+		)
+		rule_for_group = make_pricing_rule(
+			title="_Test Pricing Rule Index for Group",
+			apply_on="Item Group",
+			item_group="_Test Item Group",
+			selling=1,
+			discount_percentage=5,
+		)
+
+		self.assertEqual(
+			[d.name for d in get_pricing_rules_from_index("Item Code", frappe._dict(args))], [rule.name]
+		)
+		self.assertEqual(
+			[d.name for d in get_pricing_rules_from_index("Item Group", frappe._dict(args))],
+			[rule_for_group.name],
+		)
+
+		# changes on the rule are picked up by the index
+		rule.db_set("customer", "_Test Customer 1")
+		self.assertFalse(get_pricing_rules_from_index("Item Code", frappe._dict(args)))
+
+		rule_for_group.db_set("disable", 1)
+		self.assertFalse(get_pricing_rules_from_index("Item Group", frappe._dict(args)))
+
+		args.transaction_date = "2000-01-01"
+		rule.db_set("customer", None)
+		rule.db_set("valid_from", "2020-01-01")
+		self.assertFalse(get_pricing_rules_from_index("Item Code", frappe._dict(args)))
+
 
 test_dependencies = ["Campaign"]
 
@@ -1184,6 +1238,8 @@ def delete_existing_pricing_rules():
 
 		frappe.db.sql("delete from `tab{0}`".format(doctype))
 
+	clear_pricing_rule_index()
+
 
 def make_item_price(item, price_list_name, item_price):
 	frappe.get_doc(
@@ -11,6 +11,10 @@ import frappe
 from frappe import _, bold
 from frappe.utils import cint, flt, fmt_money, get_link_to_form, getdate, today
 
+from erpnext.accounts.doctype.pricing_rule.pricing_rule_index import (
+	get_pricing_rules_from_index,
+	get_tree_ancestors,
+)
 from erpnext.setup.doctype.item_group.item_group import get_child_item_groups
 from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
 from erpnext.stock.get_item_details import get_conversion_factor
@@ -25,13 +29,12 @@ apply_on_table = {"Item Code": "items", "Item Group": "item_groups", "Brand": "b
 
 def get_pricing_rules(args, doc=None):
 	pricing_rules = []
-	values = {}
 
 	if not frappe.db.exists("Pricing Rule", {"disable": 0, args.transaction_type: 1}):
 		return
 
 	for apply_on in ["Item Code", "Item Group", "Brand"]:
-		pricing_rules.extend(_get_pricing_rules(apply_on, args, values))
+		pricing_rules.extend(get_pricing_rules_from_index(apply_on, args))
 		if pricing_rules and not apply_multiple_pricing_rules(pricing_rules):
 			break
 
@@ -95,86 +98,6 @@ def filter_pricing_rule_based_on_condition(pricing_rules, doc=None):
 	return filtered_pricing_rules
 
 
-def _get_pricing_rules(apply_on, args, values):
-	apply_on_field = frappe.scrub(apply_on)
-
-	if not args.get(apply_on_field):
-		return []
-
-	child_doc = "`tabPricing Rule {0}`".format(apply_on)
-
-	conditions = item_variant_condition = item_conditions = ""
-	values[apply_on_field] = args.get(apply_on_field)
-	if apply_on_field in ["item_code", "brand"]:
-		item_conditions = "{child_doc}.{apply_on_field}= %({apply_on_field})s".format(
-			child_doc=child_doc, apply_on_field=apply_on_field
-		)
-
-		if apply_on_field == "item_code":
-			if args.get("uom", None):
-				item_conditions += (
-					" and ({child_doc}.uom='{item_uom}' or IFNULL({child_doc}.uom, '')='')".format(
-						child_doc=child_doc, item_uom=args.get("uom")
-					)
-				)
-			if "variant_of" not in args:
-				args.variant_of = frappe.get_cached_value("Item", args.item_code, "variant_of")
-
-			if args.variant_of:
-				item_variant_condition = " or {child_doc}.item_code=%(variant_of)s ".format(
-					child_doc=child_doc
-				)
-				values["variant_of"] = args.variant_of
-	elif apply_on_field == "item_group":
-		item_conditions = _get_tree_conditions(args, "Item Group", child_doc, False)
-		if args.get("uom", None):
-			item_conditions += (
-				" and ({child_doc}.uom='{item_uom}' or IFNULL({child_doc}.uom, '')='')".format(
-					child_doc=child_doc, item_uom=args.get("uom")
-				)
-			)
-
-	conditions += get_other_conditions(conditions, values, args)
-	warehouse_conditions = _get_tree_conditions(args, "Warehouse", "`tabPricing Rule`")
-	if warehouse_conditions:
-		warehouse_conditions = " and {0}".format(warehouse_conditions)
-
-	if not args.price_list:
-		args.price_list = None
-
-	conditions += " and ifnull(`tabPricing Rule`.for_price_list, '') in (%(price_list)s, '')"
-	values["price_list"] = args.get("price_list")
-
-	pricing_rules = (
-		frappe.db.sql(
-			"""select `tabPricing Rule`.*,
-			{child_doc}.{apply_on_field}, {child_doc}.uom
-		from `tabPricing Rule`, {child_doc}
-		where ({item_conditions} or (`tabPricing Rule`.apply_rule_on_other is not null
-			and `tabPricing Rule`.{apply_on_other_field}=%({apply_on_field})s) {item_variant_condition})
-			and {child_doc}.parent = `tabPricing Rule`.name
-			and `tabPricing Rule`.disable = 0 and
-			`tabPricing Rule`.{transaction_type} = 1 {warehouse_cond} {conditions}
-		order by `tabPricing Rule`.priority desc,
-			`tabPricing Rule`.name desc""".format(
-				child_doc=child_doc,
-				apply_on_field=apply_on_field,
-				item_conditions=item_conditions,
-				item_variant_condition=item_variant_condition,
-				transaction_type=args.transaction_type,
-				warehouse_cond=warehouse_conditions,
-				apply_on_other_field="other_{0}".format(apply_on_field),
-				conditions=conditions,
-			),
-			values,
-			as_dict=1,
-		)
-		or []
-	)
-
-	return pricing_rules
-
-
 def apply_multiple_pricing_rules(pricing_rules):
 	apply_multiple_rule = [
 		d.apply_multiple_pricing_rules for d in pricing_rules if d.apply_multiple_pricing_rules
@@ -196,30 +119,7 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 		if key in frappe.flags.tree_conditions:
 			return frappe.flags.tree_conditions[key]
 
-		try:
-			lft, rgt = frappe.db.get_value(parenttype, args.get(field), ["lft", "rgt"])
-		except TypeError:
-			frappe.throw(_("Invalid {0}").format(args.get(field)))
-
-		parent_groups = frappe.db.sql_list(
-			"""select name from `tab%s`
-			where lft<=%s and rgt>=%s"""
-			% (parenttype, "%s", "%s"),
-			(lft, rgt),
-		)
-
-		if parenttype in ["Customer Group", "Item Group", "Territory"]:
-			parent_field = "parent_{0}".format(frappe.scrub(parenttype))
-			root_name = frappe.db.get_list(
-				parenttype,
-				{"is_group": 1, parent_field: ("is", "not set")},
-				"name",
-				as_list=1,
-				ignore_permissions=True,
-			)
-
-			if root_name and root_name[0][0]:
-				parent_groups.append(root_name[0][0])
+		parent_groups = list(get_tree_ancestors(parenttype, args.get(field)))
 
 		if parent_groups:
 			if allow_blank:
@@ -4,9 +4,24 @@
 import frappe
 from frappe import _, qb
 from frappe.model.document import Document
-from frappe.utils import get_link_to_form
+from frappe.query_builder.functions import Max
+from frappe.utils import get_datetime, get_link_to_form
 from frappe.utils.scheduler import is_scheduler_inactive
 
+from erpnext.accounts.utils import QueryPaymentLedger
+
+# references reconciled by each background job
+RECONCILE_BATCH_SIZE = 20
+# filters that limit a run to a part of the party's vouchers
+PARTIAL_SCOPE_FIELDS = (
+	"from_invoice_date",
+	"to_invoice_date",
+	"from_payment_date",
+	"to_payment_date",
+	"cost_center",
+	"bank_cash_account",
+)
+
 
 class ProcessPaymentReconciliation(Document):
 	# begin: auto-generated types
@@ -24,6 +39,7 @@ class ProcessPaymentReconciliation(Document):
 		error_log: DF.LongText | None
 		from_invoice_date: DF.Date | None
 		from_payment_date: DF.Date | None
+		ledger_watermark: DF.Datetime | None
 		party: DF.DynamicLink
 		party_type: DF.Link
 		receivable_payable_account: DF.Link
@@ -199,28 +215,20 @@ def trigger_reconciliation_for_queued_docs():
 
 	if not is_scheduler_inactive():
 		# Get all queued documents
+		fields = ["company", "party_type", "party", "receivable_payable_account"]
 		all_queued = frappe.db.get_all(
 			"Process Payment Reconciliation",
 			filters={"docstatus": 1, "status": "Queued"},
+			fields=["name", *fields],
 			order_by="creation desc",
-			as_list=1,
 		)
 
 		docs_to_trigger = []
 		unique_filters = set()
 		queue_size = 5
 
-		fields = ["company", "party_type", "party", "receivable_payable_account"]
-
-		def get_filters_as_tuple(fields, doc):
-			filters = ()
-			for x in fields:
-				filters += tuple(doc.get(x))
-			return filters
-
-		for x in all_queued:
-			doc = frappe.get_doc("Process Payment Reconciliation", x)
-			filters = get_filters_as_tuple(fields, doc)
+		for doc in skip_docs_with_nothing_to_reconcile(all_queued):
+			filters = tuple(doc.get(x) for x in fields)
 			if filters not in unique_filters:
 				unique_filters.add(filters)
 				docs_to_trigger.append(doc.name)
@@ -235,6 +243,94 @@ def trigger_reconciliation_for_queued_docs():
 		frappe.msgprint(_("Scheduler is Inactive. Can't trigger jobs now."))
 
 
+def skip_docs_with_nothing_to_reconcile(docs: list) -> list:
+	"""
+	Complete the queued docs of parties without both open invoices and open payments, and
+	return the others.
+
+	Parties are checked in one query per company, party type and account, and only if their
+	Payment Ledger changed since the last run found nothing to reconcile.
+	"""
+	groups = {}
+	for doc in docs:
+		groups.setdefault((doc.company, doc.party_type, doc.receivable_payable_account), []).append(doc)
+
+	completed = set()
+	for (company, party_type, account), group in groups.items():
+		parties = list({doc.party for doc in group})
+		ledger_modified = get_ledger_modified(company, party_type, parties)
+		watermarks = get_ledger_watermarks(company, party_type, parties, account)
+
+		# party -> time up to which it had nothing to reconcile
+		nothing_to_reconcile = {}
+		changed = []
+		for party in parties:
+			modified = ledger_modified.get(party)
+			if not modified:
+				nothing_to_reconcile[party] = None
+			elif watermarks.get(party) and get_datetime(watermarks[party]) >= get_datetime(modified):
+				nothing_to_reconcile[party] = watermarks[party]
+			else:
+				changed.append(party)
+
+		if changed:
+			ple = qb.DocType("Payment Ledger Entry")
+			summary = QueryPaymentLedger().get_party_outstanding_summary(
+				[ple.company == company, ple.party_type == party_type, ple.party.isin(changed)]
+			)
+			to_reconcile = {row.party for row in summary if row.invoices and row.payments}
+			for party in changed:
+				if party not in to_reconcile:
+					nothing_to_reconcile[party] = ledger_modified[party]
+
+		for doc in group:
+			if doc.party in nothing_to_reconcile:
+				frappe.db.set_value(
+					"Process Payment Reconciliation",
+					doc.name,
+					{"status": "Completed", "ledger_watermark": nothing_to_reconcile[doc.party]},
+				)
+				completed.add(doc.name)
+
+	return [doc for doc in docs if doc.name not in completed]
+
+
+def get_ledger_modified(company: str, party_type: str, parties: list) -> dict:
+	"""
+	Last time a Payment Ledger Entry of each party was posted or delinked
+	"""
+	ple = qb.DocType("Payment Ledger Entry")
+	return frappe._dict(
+		qb.from_(ple)
+		.select(ple.party, Max(ple.modified))
+		.where((ple.company == company) & (ple.party_type == party_type) & ple.party.isin(parties))
+		.groupby(ple.party)
+		.run()
+	)
+
+
+def get_ledger_watermarks(company: str, party_type: str, parties: list, account: str) -> dict:
+	"""
+	Time up to which each party had nothing to reconcile, as found by the last runs
+	"""
+	ppr = qb.DocType("Process Payment Reconciliation")
+	return frappe._dict(
+		qb.from_(ppr)
+		.select(ppr.party, Max(ppr.ledger_watermark))
+		.where(
+			(ppr.docstatus == 1)
+			& (ppr.status == "Completed")
+			& (ppr.company == company)
+			& (ppr.party_type == party_type)
+			& (ppr.receivable_payable_account == account)
+			& ppr.party.isin(parties)
+			& ppr.ledger_watermark.isnotnull()
+		)
+		.groupby(ppr.party)
+		.run()
+	)
+
+
 def reconcile_based_on_filters(doc: None | str = None) -> None:
 	"""
 	Identify current state of document and execute next tasks in background
@@ -341,8 +437,22 @@ def fetch_and_allocate(doc: str) -> None:
 				reconcile_log = frappe.get_doc("Process Payment Reconciliation Log", log)
 
 				pr = get_pr_instance(doc)
+				ledger_modified = get_ledger_modified(pr.company, pr.party_type, [pr.party])
 				pr.get_unreconciled_entries()
 
+				if not (pr.invoices and pr.payments):
+					process_pr = frappe.db.get_value(
+						"Process Payment Reconciliation", doc, PARTIAL_SCOPE_FIELDS, as_dict=True
+					)
+					if not any(process_pr.values()):
+						# later runs skip the party until its ledger changes
+						frappe.db.set_value(
+							"Process Payment Reconciliation",
+							doc,
+							"ledger_watermark",
+							ledger_modified.get(pr.party),
+						)
+
 				if len(pr.invoices) > 0 and len(pr.payments) > 0:
 					invoices = [x.as_dict() for x in pr.invoices]
 					payments = [x.as_dict() for x in pr.payments]
@@ -390,116 +500,132 @@ def reconcile(doc: None | str = None) -> None:
 	if doc:
 		log = frappe.db.get_value("Process Payment Reconciliation Log", filters={"process_pr": doc})
 		if log:
-			res = frappe.get_all(
-				"Process Payment Reconciliation Log",
-				filters={"name": log},
-				fields=["reconciled_entries", "total_allocations"],
-				as_list=1,
-				limit=1,
-			)
-
-			reconciled_entries, total_allocations = res[0]
-			if reconciled_entries != total_allocations:
-				try:
-					# Fetch next allocation
-					allocations = get_next_allocation(log)
-
-					pr = get_pr_instance(doc)
-
-					# pass allocation to PR instance
-					for x in allocations:
-						pr.append("allocation", x)
-
-					# reconcile
-					pr.reconcile_allocations(skip_ref_details_update_for_pe=True)
-
-					# If Payment Entry, update details only for newly linked references
-					# This is for performance
-					if allocations[0].reference_type == "Payment Entry":
-
-						references = [(x.invoice_type, x.invoice_number) for x in allocations]
-						pe = frappe.get_doc(allocations[0].reference_type, allocations[0].reference_name)
-						pe.flags.ignore_validate_update_after_submit = True
-						pe.set_missing_ref_details(update_ref_details_only_for=references)
-						pe.save()
-
-					# Update reconciled flag
-					allocation_names = [x.name for x in allocations]
-					ppa = qb.DocType("Process Payment Reconciliation Log Allocations")
-					qb.update(ppa).set(ppa.reconciled, True).where(ppa.name.isin(allocation_names)).run()
-
-					# Update reconciled count
-					reconciled_count = frappe.db.count(
-						"Process Payment Reconciliation Log Allocations", filters={"parent": log, "reconciled": True}
-					)
-					frappe.db.set_value(
-						"Process Payment Reconciliation Log", log, "reconciled_entries", reconciled_count
-					)
-
-				except Exception as err:
-					# Update the parent doc about the exception
-					frappe.db.rollback()
-
-					traceback = frappe.get_traceback()
-					if traceback:
-						message = "Traceback: <br>" + traceback
-						frappe.db.set_value("Process Payment Reconciliation Log", log, "error_log", message)
-						frappe.db.set_value(
-							"Process Payment Reconciliation",
-							doc,
-							"error_log",
-							message,
-						)
-					if reconciled_entries and total_allocations and reconciled_entries < total_allocations:
-						frappe.db.set_value(
-							"Process Payment Reconciliation Log", log, "status", "Partially Reconciled"
-						)
-						frappe.db.set_value(
-							"Process Payment Reconciliation",
-							doc,
-							"status",
-							"Partially Reconciled",
+			# reconcile a batch of references in this job
+			for _i in range(RECONCILE_BATCH_SIZE):
+				status = reconcile_next_allocation(doc, log)
+				if status != "Reconciled":
+					break
+
+			if status != "Completed":
+				if frappe.db.get_value("Process Payment Reconciliation", doc, "status") != "Paused":
+					# trigger next batch in job
+					# generate reconcile job name
+					allocation = get_next_allocation(log)
+					if allocation:
+						reconcile_job_name = (
+							f"process_{doc}_reconcile_allocation_{allocation[0].idx}_{allocation[-1].idx}"
 						)
 					else:
-						frappe.db.set_value("Process Payment Reconciliation Log", log, "status", "Failed")
-						frappe.db.set_value(
-							"Process Payment Reconciliation",
-							doc,
-							"status",
-							"Failed",
+						reconcile_job_name = f"process_{doc}_reconcile"
+
+					if not is_job_running(reconcile_job_name):
+						frappe.enqueue(
+							method="erpnext.accounts.doctype.process_payment_reconciliation.process_payment_reconciliation.reconcile",
+							queue="long",
+							timeout="3600",
+							is_async=True,
+							job_name=reconcile_job_name,
+							enqueue_after_commit=True,
+							doc=doc,
 						)
-				finally:
-					if reconciled_entries == total_allocations:
-						frappe.db.set_value("Process Payment Reconciliation Log", log, "status", "Reconciled")
-						frappe.db.set_value("Process Payment Reconciliation Log", log, "reconciled", True)
-						frappe.db.set_value("Process Payment Reconciliation", doc, "status", "Completed")
-					else:
 
-						if frappe.db.get_value("Process Payment Reconciliation", doc, "status") != "Paused":
-							# trigger next batch in job
-							# generate reconcile job name
-							allocation = get_next_allocation(log)
-							if allocation:
-								reconcile_job_name = (
-									f"process_{doc}_reconcile_allocation_{allocation[0].idx}_{allocation[-1].idx}"
-								)
-							else:
-								reconcile_job_name = f"process_{doc}_reconcile"
-
-							if not is_job_running(reconcile_job_name):
-								frappe.enqueue(
-									method="erpnext.accounts.doctype.process_payment_reconciliation.process_payment_reconciliation.reconcile",
-									queue="long",
-									timeout="3600",
-									is_async=True,
-									job_name=reconcile_job_name,
-									enqueue_after_commit=True,
-									doc=doc,
-								)
-			else:
-				frappe.db.set_value("Process Payment Reconciliation Log", log, "status", "Reconciled")
-				frappe.db.set_value("Process Payment Reconciliation Log", log, "reconciled", True)
-				frappe.db.set_value("Process Payment Reconciliation", doc, "status", "Completed")
+
+def reconcile_next_allocation(doc: str, log: str) -> str:
+	"""
+	Reconcile the allocations of the next reference and commit them.
+	Returns "Completed" once every allocation is reconciled, "Reconciled" or "Failed" otherwise.
+	"""
+	res = frappe.get_all(
+		"Process Payment Reconciliation Log",
+		filters={"name": log},
+		fields=["reconciled_entries", "total_allocations"],
+		as_list=1,
+		limit=1,
+	)
+
+	reconciled_entries, total_allocations = res[0]
+	if reconciled_entries == total_allocations:
+		frappe.db.set_value("Process Payment Reconciliation Log", log, "status", "Reconciled")
+		frappe.db.set_value("Process Payment Reconciliation Log", log, "reconciled", True)
+		frappe.db.set_value("Process Payment Reconciliation", doc, "status", "Completed")
+		return "Completed"
+
+	try:
+		# Fetch next allocation
+		allocations = get_next_allocation(log)
+
+		pr = get_pr_instance(doc)
+
+		# pass allocation to PR instance
+		for x in allocations:
+			pr.append("allocation", x)
+
+		# reconcile
+		pr.reconcile_allocations(skip_ref_details_update_for_pe=True)
+
+		# If Payment Entry, update details only for newly linked references
+		# This is for performance
+		if allocations[0].reference_type == "Payment Entry":
+
+			references = [(x.invoice_type, x.invoice_number) for x in allocations]
+			pe = frappe.get_doc(allocations[0].reference_type, allocations[0].reference_name)
+			pe.flags.ignore_validate_update_after_submit = True
+			pe.set_missing_ref_details(update_ref_details_only_for=references)
+			pe.save()
+
+		# Update reconciled flag
+		allocation_names = [x.name for x in allocations]
+		ppa = qb.DocType("Process Payment Reconciliation Log Allocations")
+		qb.update(ppa).set(ppa.reconciled, True).where(ppa.name.isin(allocation_names)).run()
+
+		# Update reconciled count
+		reconciled_count = frappe.db.count(
+			"Process Payment Reconciliation Log Allocations", filters={"parent": log, "reconciled": True}
+		)
+		frappe.db.set_value(
+			"Process Payment Reconciliation Log", log, "reconciled_entries", reconciled_count
+		)
+
+		# keep the references reconciled so far if a later one fails
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+		return "Reconciled"
+
+	except Exception as err:
+		# Update the parent doc about the exception
+		frappe.db.rollback()
+
+		traceback = frappe.get_traceback()
+		if traceback:
+			message = "Traceback: <br>" + traceback
+			frappe.db.set_value("Process Payment Reconciliation Log", log, "error_log", message)
+			frappe.db.set_value(
+				"Process Payment Reconciliation",
+				doc,
+				"error_log",
+				message,
+			)
+		if reconciled_entries and total_allocations and reconciled_entries < total_allocations:
+			frappe.db.set_value(
+				"Process Payment Reconciliation Log", log, "status", "Partially Reconciled"
+			)
+			frappe.db.set_value(
+				"Process Payment Reconciliation",
+				doc,
+				"status",
+				"Partially Reconciled",
+			)
+		else:
+			frappe.db.set_value("Process Payment Reconciliation Log", log, "status", "Failed")
+			frappe.db.set_value(
+				"Process Payment Reconciliation",
+				doc,
+				"status",
+				"Failed",
+			)
+
+		return "Failed"
 
 
 @frappe.whitelist()
@@ -6,6 +6,8 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 
+from erpnext.accounts.doctype.pricing_rule.pricing_rule_index import invalidate_pricing_rule_index
+
 pricing_rule_fields = [
 	"apply_on",
 	"mixed_conditions",
@@ -187,6 +189,7 @@ class PromotionalScheme(Document):
 			or {}
 		)
 		self.update_pricing_rules(pricing_rules)
+		invalidate_pricing_rule_index()
 
 	def update_pricing_rules(self, pricing_rules):
 		rules = {}
@@ -214,6 +217,8 @@ class PromotionalScheme(Document):
 		for rule in frappe.get_all("Pricing Rule", {"promotional_scheme": self.name}):
 			frappe.delete_doc("Pricing Rule", rule.name)
 
+		invalidate_pricing_rule_index()
+
 
 def raise_for_transaction_exists(name):
 	msg = f"""You can't change the {frappe.bold(_('Applicable For'))}
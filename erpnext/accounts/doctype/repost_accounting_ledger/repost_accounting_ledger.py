@@ -6,6 +6,10 @@ from frappe import _, qb
 from frappe.model.document import Document
 from frappe.utils.data import comma_and
 
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import (
+	remove_voucher_from_gl_balance_snapshot,
+)
+
 
 class RepostAccountingLedger(Document):
 	# begin: auto-generated types
@@ -152,6 +156,7 @@ def start_repost(account_repost_doc=str) -> None:
 				doc = frappe.get_doc(x.voucher_type, x.voucher_no)
 
 				if repost_doc.delete_cancelled_entries:
+					remove_voucher_from_gl_balance_snapshot(doc.doctype, doc.name)
 					frappe.db.delete("GL Entry", filters={"voucher_type": doc.doctype, "voucher_no": doc.name})
 					frappe.db.delete(
 						"Payment Ledger Entry", filters={"voucher_type": doc.doctype, "voucher_no": doc.name}
@@ -0,0 +1,60 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+
+from erpnext.accounts.doctype.payment_entry.payment_entry import get_payment_entry
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	rebuild_voucher_outstanding,
+	verify_voucher_outstanding,
+)
+
+
+class TestVoucherOutstanding(FrappeTestCase):
+	def get_outstanding(self, voucher_no):
+		return frappe.db.get_value(
+			"Voucher Outstanding",
+			{"voucher_type": "Sales Invoice", "voucher_no": voucher_no},
+			"outstanding",
+		)
+
+	@change_settings("Accounts Settings", {"use_voucher_outstanding": 1})
+	def test_outstanding_on_payment_and_cancel(self):
+		rebuild_voucher_outstanding(company="_Test Company")
+
+		si = create_sales_invoice(rate=100)
+		self.assertEqual(self.get_outstanding(si.name), 100)
+
+		pe = get_payment_entry(si.doctype, si.name, party_amount=40, bank_account="_Test Bank - _TC")
+		pe.reference_no = "1"
+		pe.reference_date = si.posting_date
+		pe.submit()
+		self.assertEqual(self.get_outstanding(si.name), 60)
+
+		pe.cancel()
+		self.assertEqual(self.get_outstanding(si.name), 100)
+		self.assertFalse(verify_voucher_outstanding(company="_Test Company"))
+
+		si.reload()
+		si.cancel()
+		self.assertFalse(self.get_outstanding(si.name))
+
+	@change_settings("Accounts Settings", {"use_voucher_outstanding": 1})
+	def test_verify_and_repair(self):
+		rebuild_voucher_outstanding(company="_Test Company")
+		si = create_sales_invoice(rate=100)
+
+		outstanding = frappe.qb.DocType("Voucher Outstanding")
+		(
+			frappe.qb.update(outstanding)
+			.set(outstanding.outstanding, 10)
+			.where(outstanding.voucher_no == si.name)
+		).run()
+
+		mismatches = verify_voucher_outstanding(company="_Test Company", repair=True)
+		self.assertEqual(len(mismatches), 1)
+		self.assertEqual(mismatches[0].voucher_no, si.name)
+		self.assertEqual(self.get_outstanding(si.name), 100)
+		self.assertFalse(verify_voucher_outstanding(company="_Test Company"))
@@ -0,0 +1,402 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _, qb
+from frappe.model.document import Document
+from frappe.query_builder import Criterion
+from frappe.utils import cint, flt
+
+OUTSTANDING_KEY_FIELDS = ("account", "voucher_type", "voucher_no", "party")
+OUTSTANDING_AMOUNT_FIELDS = (
+	"invoiced",
+	"paid",
+	"credit_note",
+	"outstanding",
+	"invoiced_in_account_currency",
+	"paid_in_account_currency",
+	"credit_note_in_account_currency",
+	"outstanding_in_account_currency",
+)
+
+# parties whose balances are recomputed together during a rebuild or a verification
+PARTY_BATCH_SIZE = 500
+
+
+class VoucherOutstanding(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link | None
+		account_currency: DF.Link | None
+		company: DF.Link | None
+		cost_center: DF.Link | None
+		credit_note: DF.Currency
+		credit_note_in_account_currency: DF.Currency
+		invoiced: DF.Currency
+		invoiced_in_account_currency: DF.Currency
+		outstanding: DF.Currency
+		outstanding_in_account_currency: DF.Currency
+		paid: DF.Currency
+		paid_in_account_currency: DF.Currency
+		party: DF.DynamicLink | None
+		party_type: DF.Link | None
+		posting_date: DF.Date | None
+		voucher_no: DF.DynamicLink | None
+		voucher_type: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def is_voucher_outstanding_maintained():
+	"""Rows are updated on every Payment Ledger change once enabled in Accounts Settings"""
+	return cint(frappe.db.get_single_value("Accounts Settings", "use_voucher_outstanding"))
+
+
+def is_voucher_outstanding_ready():
+	"""Rows can be read only after the initial build from existing Payment Ledger Entries is done"""
+	return is_voucher_outstanding_maintained() and cint(
+		frappe.db.get_default("voucher_outstanding_built")
+	)
+
+
+def get_voucher_balances(ple_entries, return_entries, other_vouchers=None):
+	"""Invoiced, paid, credit note and outstanding amounts per account, voucher and party,
+	computed from Payment Ledger Entries (ordered by posting date) the way the Accounts
+	Receivable / Payable reports do.
+
+	:param return_entries: return invoices mapped to the invoice they were made against
+	:param other_vouchers: keys of vouchers outside `ple_entries` which have entries of their
+	        own, entries against them are skipped"""
+	from erpnext.accounts.utils import get_currency_precision
+
+	other_vouchers = other_vouchers or set()
+	balances = {}
+	for ple in ple_entries:
+		key = (ple.account, ple.voucher_type, ple.voucher_no, ple.party)
+		if key not in balances:
+			balances[key] = frappe._dict(
+				dict.fromkeys(OUTSTANDING_AMOUNT_FIELDS, 0.0),
+				company=ple.company,
+				account=ple.account,
+				party_type=ple.party_type,
+				party=ple.party,
+				voucher_type=ple.voucher_type,
+				voucher_no=ple.voucher_no,
+				posting_date=ple.posting_date,
+				account_currency=ple.account_currency,
+				cost_center=None,
+			)
+
+	for ple in ple_entries:
+		against_voucher_no = ple.against_voucher_no
+		# payments against a credit note are considered against the original invoice
+		if ple.against_voucher_type in ("Sales Invoice", "Purchase Invoice"):
+			against_voucher_no = return_entries.get(against_voucher_no) or against_voucher_no
+
+		key = (ple.account, ple.against_voucher_type, against_voucher_no, ple.party)
+		if key in other_vouchers:
+			continue
+
+		row = balances.get(key) or balances[(ple.account, ple.voucher_type, ple.voucher_no, ple.party)]
+		row.party_type = ple.party_type
+		update_voucher_balance(row, ple)
+
+	precision = get_currency_precision() or 2
+	for row in balances.values():
+		for suffix in ("", "_in_account_currency"):
+			row["outstanding" + suffix] = flt(
+				row["invoiced" + suffix] - row["paid" + suffix] - row["credit_note" + suffix], precision
+			)
+
+	return balances
+
+
+def update_voucher_balance(row, ple):
+	"""Same split of the entry amount as `ReceivablePayableReport.update_voucher_balance`"""
+	if ple.amount > 0:
+		if (
+			ple.voucher_type in ["Journal Entry", "Payment Entry"]
+			and ple.voucher_no != ple.against_voucher_no
+		):
+			fieldname = "paid"
+		else:
+			fieldname = "invoiced"
+	else:
+		if ple.voucher_type in ("Sales Invoice", "Purchase Invoice"):
+			if row.voucher_no == ple.voucher_no == ple.against_voucher_no:
+				fieldname = "paid"
+			else:
+				fieldname = "credit_note"
+		else:
+			fieldname = "paid"
+
+	sign = 1 if fieldname == "invoiced" else -1
+	row[fieldname] += sign * flt(ple.amount)
+	row[fieldname + "_in_account_currency"] += sign * flt(ple.amount_in_account_currency)
+
+	if ple.cost_center:
+		row.cost_center = str(ple.cost_center)
+
+
+def get_payment_ledger_entries(filters):
+	ple = qb.DocType("Payment Ledger Entry")
+	return (
+		qb.from_(ple)
+		.select(
+			ple.company,
+			ple.account,
+			ple.party_type,
+			ple.party,
+			ple.voucher_type,
+			ple.voucher_no,
+			ple.against_voucher_type,
+			ple.against_voucher_no,
+			ple.posting_date,
+			ple.account_currency,
+			ple.cost_center,
+			ple.amount,
+			ple.amount_in_account_currency,
+		)
+		.where((ple.delinked == 0) & Criterion.all(filters))
+		.orderby(ple.posting_date)
+		.orderby(ple.creation)
+		.run(as_dict=True)
+	)
+
+
+def get_return_entries(filters=None, or_filters=None):
+	return_entries = frappe._dict()
+	for doctype in ("Sales Invoice", "Purchase Invoice"):
+		return_entries.update(
+			frappe.get_all(
+				doctype,
+				filters={"is_return": 1, "docstatus": 1, **(filters or {})},
+				or_filters=or_filters,
+				fields=["name", "return_against"],
+				as_list=1,
+			)
+		)
+
+	return return_entries
+
+
+def update_voucher_outstanding_for_entries(ple_entries):
+	"""Recompute the rows of the vouchers and the against vouchers of `ple_entries`"""
+	if not ple_entries or not is_voucher_outstanding_maintained():
+		return
+
+	vouchers_by_party = {}
+	for entry in ple_entries:
+		if not entry.get("party"):
+			continue
+
+		vouchers = vouchers_by_party.setdefault(
+			(entry.get("account"), entry.get("party_type"), entry.get("party")), set()
+		)
+		vouchers.add((entry.get("voucher_type"), entry.get("voucher_no")))
+		vouchers.add(
+			(
+				entry.get("against_voucher_type") or entry.get("voucher_type"),
+				entry.get("against_voucher_no") or entry.get("voucher_no"),
+			)
+		)
+
+	for (account, party_type, party), vouchers in vouchers_by_party.items():
+		refresh_voucher_outstanding(account, party_type, party, vouchers)
+
+
+def refresh_voucher_outstanding(account, party_type, party, vouchers):
+	"""Recompute the rows of `vouchers` for one account and party from their Payment Ledger
+	Entries, including entries against their returns"""
+	ple = qb.DocType("Payment Ledger Entry")
+	party_filters = [ple.account == account, ple.party_type == party_type, ple.party == party]
+
+	voucher_names = {voucher_no for voucher_type, voucher_no in vouchers}
+	return_entries = get_return_entries(
+		or_filters={"name": ("in", voucher_names), "return_against": ("in", voucher_names)}
+	)
+
+	# rows of original invoices change with their credit notes, and entries against credit
+	# notes count towards the original invoice
+	for return_voucher, return_against in return_entries.items():
+		if return_voucher in voucher_names and return_against:
+			for voucher_type, voucher_no in list(vouchers):
+				if voucher_no == return_voucher:
+					vouchers.add((voucher_type, return_against))
+
+	names_to_fetch = voucher_names | set(return_entries) | set(filter(None, return_entries.values()))
+	ple_entries = get_payment_ledger_entries(
+		party_filters
+		+ [ple.voucher_no.isin(list(names_to_fetch)) | ple.against_voucher_no.isin(list(names_to_fetch))]
+	)
+
+	# entries of these vouchers may also be against other vouchers, or their returns
+	other_names = {d.against_voucher_no for d in ple_entries} - set(return_entries)
+	if other_names:
+		return_entries.update(get_return_entries({"name": ("in", list(other_names))}))
+
+	own_vouchers = {(d.voucher_type, d.voucher_no) for d in ple_entries}
+	against_vouchers = set()
+	for d in ple_entries:
+		against_voucher_no = d.against_voucher_no
+		if d.against_voucher_type in ("Sales Invoice", "Purchase Invoice"):
+			against_voucher_no = return_entries.get(against_voucher_no) or against_voucher_no
+
+		if (d.against_voucher_type, against_voucher_no) not in own_vouchers:
+			against_vouchers.add((d.against_voucher_type, against_voucher_no))
+
+	other_vouchers = set()
+	if against_vouchers:
+		against_names = [voucher_no for voucher_type, voucher_no in against_vouchers]
+		for row in get_payment_ledger_entries(party_filters + [ple.voucher_no.isin(against_names)]):
+			if (row.voucher_type, row.voucher_no) in against_vouchers:
+				other_vouchers.add((account, row.voucher_type, row.voucher_no, party))
+
+	balances = get_voucher_balances(ple_entries, return_entries, other_vouchers)
+
+	outstanding = qb.DocType("Voucher Outstanding")
+	for voucher_type, voucher_no in vouchers:
+		(
+			qb.from_(outstanding)
+			.delete()
+			.where(outstanding.account == account)
+			.where(outstanding.party == party)
+			.where(outstanding.voucher_type == voucher_type)
+			.where(outstanding.voucher_no == voucher_no)
+		).run()
+
+	insert_voucher_outstanding(
+		row for row in balances.values() if (row.voucher_type, row.voucher_no) in vouchers
+	)
+
+
+def insert_voucher_outstanding(rows):
+	from erpnext.accounts.utils import bulk_insert_documents
+
+	docs = []
+	for row in rows:
+		doc = frappe.new_doc("Voucher Outstanding")
+		doc.update(row)
+		doc.set_new_name()
+		docs.append(doc)
+
+	bulk_insert_documents(docs)
+
+
+def get_parties_in_batches(company=None):
+	ple = qb.DocType("Payment Ledger Entry")
+	query = qb.from_(ple).select(ple.party_type, ple.party).where(ple.party.isnotnull()).distinct()
+	if company:
+		query = query.where(ple.company == company)
+
+	parties = [tuple(row) for row in query.run()]
+	for i in range(0, len(parties), PARTY_BATCH_SIZE):
+		yield parties[i : i + PARTY_BATCH_SIZE]
+
+
+def get_expected_voucher_outstanding(parties, return_entries, company=None):
+	"""Rows of `parties` computed from all their Payment Ledger Entries"""
+	ple = qb.DocType("Payment Ledger Entry")
+	filters = [ple.party.isin([party for party_type, party in parties])]
+	if company:
+		filters.append(ple.company == company)
+
+	party_set = set(parties)
+	ple_entries = [
+		row for row in get_payment_ledger_entries(filters) if (row.party_type, row.party) in party_set
+	]
+	return get_voucher_balances(ple_entries, return_entries)
+
+
+def get_stored_voucher_outstanding(parties, company=None):
+	filters = {"party": ("in", [party for party_type, party in parties])}
+	if company:
+		filters["company"] = company
+
+	party_set = set(parties)
+	return {
+		tuple(row[fieldname] for fieldname in OUTSTANDING_KEY_FIELDS): row
+		for row in frappe.get_all("Voucher Outstanding", filters=filters, fields=["*"])
+		if (row.party_type, row.party) in party_set
+	}
+
+
+def rebuild_voucher_outstanding(company=None):
+	"""Recreate all rows from Payment Ledger Entry, for one company or for all"""
+	frappe.db.delete("Voucher Outstanding", {"company": company} if company else {})
+
+	return_entries = get_return_entries({"company": company} if company else {})
+	for parties in get_parties_in_batches(company):
+		insert_voucher_outstanding(
+			get_expected_voucher_outstanding(parties, return_entries, company).values()
+		)
+
+	if not company:
+		frappe.db.set_default("voucher_outstanding_built", 1)
+
+
+def verify_voucher_outstanding(company=None, repair=False):
+	"""Compare the rows against balances recomputed from Payment Ledger Entry.
+
+	Returns the mismatching rows. With `repair`, the rows are corrected."""
+	from erpnext.accounts.utils import get_currency_precision
+
+	precision = get_currency_precision() or 2
+	return_entries = get_return_entries({"company": company} if company else {})
+
+	mismatches = []
+	for parties in get_parties_in_batches(company):
+		expected = get_expected_voucher_outstanding(parties, return_entries, company)
+		actual = get_stored_voucher_outstanding(parties, company)
+
+		to_replace = []
+		for key in set(expected) | set(actual):
+			expected_row = expected.get(key) or {}
+			actual_row = actual.get(key) or {}
+
+			if not any(
+				flt(flt(expected_row.get(fieldname)) - flt(actual_row.get(fieldname)), precision)
+				for fieldname in OUTSTANDING_AMOUNT_FIELDS
+			):
+				continue
+
+			mismatches.append(
+				frappe._dict(dict(zip(OUTSTANDING_KEY_FIELDS, key)), expected=expected_row, actual=actual_row)
+			)
+			to_replace.append((key, actual_row, expected_row))
+
+		if repair:
+			for key, actual_row, expected_row in to_replace:
+				if actual_row:
+					frappe.db.delete("Voucher Outstanding", {"name": actual_row.name})
+
+			insert_voucher_outstanding(
+				expected_row for key, actual_row, expected_row in to_replace if expected_row
+			)
+
+	return mismatches
+
+
+def verify_and_repair_voucher_outstanding():
+	"""Scheduled daily, logs and fixes rows which drifted from the Payment Ledger"""
+	if not is_voucher_outstanding_ready():
+		return
+
+	mismatches = verify_voucher_outstanding(repair=True)
+	if mismatches:
+		frappe.log_error(
+			title=_("Voucher Outstanding mismatch"),
+			message=frappe.as_json(mismatches[:100]),
+		)
+
+
+def on_doctype_update():
+	frappe.db.add_index("Voucher Outstanding", ["party_type", "party"])
+	frappe.db.add_index("Voucher Outstanding", ["voucher_type", "voucher_no"])
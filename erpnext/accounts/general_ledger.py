@@ -15,7 +15,18 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 )
 from erpnext.accounts.doctype.accounting_period.accounting_period import ClosedAccountingPeriod
 from erpnext.accounts.doctype.budget.budget import validate_expense_against_budget
-from erpnext.accounts.utils import create_payment_ledger_entry
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import (
+	update_gl_balance_snapshot,
+)
+from erpnext.accounts.doctype.gl_entry.gl_entry import (
+	update_outstanding_amt,
+	validate_balance_type,
+	validate_frozen_account,
+)
+from erpnext.accounts.utils import bulk_insert_documents, create_payment_ledger_entry
+
+# vouchers with at least these many ledger rows can be posted with multi-row inserts
+BULK_GL_ENTRY_THRESHOLD = 100
 
 
 def make_gl_entries(
@@ -25,6 +36,7 @@ def make_gl_entries(
 	merge_entries=True,
 	update_outstanding="Yes",
 	from_repost=False,
+	bulk=False,
 ):
 	if gl_map:
 		if not cancel:
@@ -39,8 +51,9 @@ def make_gl_entries(
 					adv_adj=adv_adj,
 					update_outstanding=update_outstanding,
 					from_repost=from_repost,
+					bulk=bulk,
 				)
-				save_entries(gl_map, adv_adj, update_outstanding, from_repost)
+				save_entries(gl_map, adv_adj, update_outstanding, from_repost, bulk=bulk)
 			# Post GL Map process there may no be any GL Entries
 			elif gl_map:
 				frappe.throw(
@@ -350,7 +363,7 @@ def update_net_values(entry):
 			entry.debit_in_account_currency = 0
 
 
-def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False):
+def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False, bulk=False):
 	if not from_repost:
 		validate_cwip_accounts(gl_map)
 
@@ -362,8 +375,13 @@ def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False):
 		if gl_map[0]["voucher_type"] != "Period Closing Voucher":
 			validate_against_pcv(is_opening, gl_map[0]["posting_date"], gl_map[0]["company"])
 
-	for entry in gl_map:
-		make_entry(entry, adv_adj, update_outstanding, from_repost)
+	if bulk:
+		make_entries_in_bulk(gl_map, adv_adj, update_outstanding, from_repost)
+	else:
+		for entry in gl_map:
+			make_entry(entry, adv_adj, update_outstanding, from_repost)
+
+	update_gl_balance_snapshot(gl_map)
 
 
 def make_entry(args, adv_adj, update_outstanding, from_repost=False):
@@ -380,6 +398,72 @@ def make_entry(args, adv_adj, update_outstanding, from_repost=False):
 		validate_expense_against_budget(args)
 
 
+def make_entries_in_bulk(gl_map, adv_adj, update_outstanding, from_repost=False):
+	"""Insert all GL Entries of the map with multi-row INSERTs.
+
+	Each entry is validated like in `make_entry`. Checks which read back the ledger
+	(balance type, outstanding and budget) run after the insert, once per distinct key."""
+	validate_ledger = not from_repost and gl_map[0].get("voucher_type") != "Period Closing Voucher"
+
+	gl_entries = []
+	for args in gl_map:
+		gle = frappe.new_doc("GL Entry")
+		gle.update(args)
+		gle.flags.ignore_permissions = 1
+		gle.flags.from_repost = from_repost
+		gle.flags.adv_adj = adv_adj
+		gle.flags.update_outstanding = update_outstanding or "Yes"
+		gle.flags.notify_update = False
+		gle.docstatus = 1
+		gle.set_new_name()
+		gle.run_method("validate")
+		gle.run_method("before_submit")
+
+		if validate_ledger:
+			gle.validate_account_details(adv_adj)
+			gle.validate_dimensions_for_pl_and_bs()
+			gle.validate_allowed_dimensions()
+			validate_frozen_account(gle.account, adv_adj)
+
+		gl_entries.append(gle)
+
+	bulk_insert_documents(gl_entries)
+
+	if not validate_ledger:
+		return
+
+	for account in {gle.account for gle in gl_entries}:
+		validate_balance_type(account, adv_adj)
+
+	outstanding_to_update = []
+	for gle in gl_entries:
+		args = gle.get_outstanding_update_args()
+		if args and args not in outstanding_to_update:
+			outstanding_to_update.append(args)
+
+	for args in outstanding_to_update:
+		update_outstanding_amt(*args)
+
+	validate_expense_against_budget_in_bulk(gl_map)
+
+
+def validate_expense_against_budget_in_bulk(gl_map):
+	"""Budget is validated against the booked ledger, so after a bulk insert it is enough
+	to check one entry per account, cost center and budget dimension combination"""
+	dimensions = ["project"] + get_accounting_dimensions()
+
+	budget_checked = set()
+	for args in gl_map:
+		key = (args.get("account"), args.get("cost_center")) + tuple(
+			args.get(dimension) for dimension in dimensions
+		)
+		if key in budget_checked:
+			continue
+
+		budget_checked.add(key)
+		validate_expense_against_budget(args)
+
+
 def validate_cwip_accounts(gl_map):
 	"""Validate that CWIP account are not used in Journal Entry"""
 	if gl_map and gl_map[0].voucher_type != "Journal Entry":
@@ -624,6 +708,8 @@ def make_reverse_gl_entries(
 		else:
 			set_as_cancel(gl_entries[0]["voucher_type"], gl_entries[0]["voucher_no"])
 
+		update_gl_balance_snapshot(gl_entries, cancel=True)
+
 		for entry in gl_entries:
 			new_gle = copy.deepcopy(entry)
 			new_gle["name"] = None
@@ -14,6 +14,10 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
 )
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	OUTSTANDING_AMOUNT_FIELDS,
+	is_voucher_outstanding_ready,
+)
 from erpnext.accounts.utils import get_currency_precision, get_party_types_from_account_type
 
 #  This report gives a summary of all Outstanding Invoices considering the following
@@ -29,7 +33,8 @@ from erpnext.accounts.utils import get_currency_precision, get_party_types_from_
 #  7. For overpayment against an invoice with payment terms, there will be an additional row
 #  8. Invoice details like Sales Persons, Delivery Notes are also fetched comma separated
 #  9. Report amounts are in party currency if in_party_currency is selected, otherwise company currency
-# 10. This report is based on Payment Ledger Entries
+# 10. This report is based on Payment Ledger Entries, or on Voucher Outstanding when it is enabled
+#     in Accounts Settings and the filters allow it
 
 
 def execute(filters=None):
@@ -86,10 +91,15 @@ class ReceivablePayableReport(object):
 			self.skip_total_row = 1
 
 	def get_data(self):
-		self.get_ple_entries()
-		self.get_sales_invoices_or_customers_based_on_sales_person()
 		self.voucher_balance = OrderedDict()
-		self.init_voucher_balance()  # invoiced, paid, credit_note, outstanding
+		if self.can_use_voucher_outstanding():
+			# balances are already accumulated per voucher
+			self.ple_entries = []
+			self.get_voucher_balance_from_outstanding()
+		else:
+			self.get_ple_entries()
+			self.get_sales_invoices_or_customers_based_on_sales_person()
+			self.init_voucher_balance()  # invoiced, paid, credit_note, outstanding
 
 		# Build delivery note map against all sales invoices
 		self.build_delivery_note_map()
@@ -149,6 +159,102 @@ class ReceivablePayableReport(object):
 		if self.filters.get("group_by_party") and not self.filters.get("in_party_currency"):
 			self.init_subtotal_row("Total")
 
+	def can_use_voucher_outstanding(self):
+		"""Voucher Outstanding holds current balances per account, voucher and party, so it
+		can replace the Payment Ledger only when nothing is posted after the report date and
+		no filter needs the individual entries"""
+		if not is_voucher_outstanding_ready():
+			return False
+
+		if any(
+			self.filters.get(key)
+			for key in (
+				"cost_center",
+				"finance_book",
+				"sales_person",
+				"show_future_payments",
+				"show_remarks",
+			)
+		):
+			return False
+
+		dimensions = get_accounting_dimensions(as_list=False)
+		if any(self.filters.get(dimension.fieldname) for dimension in dimensions):
+			return False
+
+		self.prepare_conditions()
+		ple = self.ple
+		return not (
+			qb.from_(ple)
+			.select(ple.name)
+			.where(ple.delinked == 0)
+			.where(ple.posting_date.gt(self.filters.report_date))
+			.where(Criterion.all(self.qb_selection_filter))
+			.where(Criterion.any(self.or_filters))
+			.limit(1)
+		).run()
+
+	def get_voucher_balance_from_outstanding(self):
+		outstanding = qb.DocType("Voucher Outstanding")
+
+		# build the same conditions against Voucher Outstanding
+		self.ple = outstanding
+		try:
+			self.prepare_conditions()
+		finally:
+			self.ple = qb.DocType("Payment Ledger Entry")
+
+		query = (
+			qb.from_(outstanding)
+			.select(
+				outstanding.account,
+				outstanding.voucher_type,
+				outstanding.voucher_no,
+				outstanding.party_type,
+				outstanding.party,
+				outstanding.posting_date,
+				outstanding.account_currency,
+				*(outstanding[field] for field in OUTSTANDING_AMOUNT_FIELDS),
+			)
+			.where((outstanding.outstanding != 0) | (outstanding.outstanding_in_account_currency != 0))
+			.where(Criterion.all(self.qb_selection_filter))
+			.where(Criterion.any(self.or_filters))
+		)
+
+		if self.filters.get("group_by_party"):
+			query = query.orderby(outstanding.party, outstanding.posting_date)
+		else:
+			query = query.orderby(outstanding.posting_date, outstanding.party)
+
+		for row in query.run(as_dict=True):
+			if self.filters.get("ignore_accounts"):
+				key = (row.voucher_type, row.voucher_no, row.party)
+			else:
+				key = (row.account, row.voucher_type, row.voucher_no, row.party)
+
+			if key not in self.voucher_balance:
+				self.voucher_balance[key] = frappe._dict(
+					dict.fromkeys(OUTSTANDING_AMOUNT_FIELDS, 0.0),
+					voucher_type=row.voucher_type,
+					voucher_no=row.voucher_no,
+					party=row.party,
+					party_account=row.account,
+					posting_date=row.posting_date,
+					account_currency=row.account_currency,
+				)
+
+			balance = self.voucher_balance[key]
+			for field in OUTSTANDING_AMOUNT_FIELDS:
+				balance[field] += flt(row[field])
+
+			self.get_invoices(row)
+
+			if self.filters.get("group_by_party"):
+				self.init_subtotal_row(row.party)
+
+		if self.filters.get("group_by_party") and not self.filters.get("in_party_currency"):
+			self.init_subtotal_row("Total")
+
 	def get_invoices(self, ple):
 		if ple.voucher_type in ("Sales Invoice", "Purchase Invoice"):
 			if self.filters.get("sales_person"):
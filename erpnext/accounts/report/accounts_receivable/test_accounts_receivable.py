@@ -772,3 +772,41 @@ class TestAccountsReceivable(AccountsTestMixin, FrappeTestCase):
 		# post sorting output should be [[Additional Debtors, ...], [Debtors, ...]]
 		report_output = sorted(report_output, key=lambda x: x[0])
 		self.assertEqual(expected_data, report_output)
+
+	@change_settings("Accounts Settings", {"use_voucher_outstanding": 1})
+	def test_report_from_voucher_outstanding(self):
+		from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+			rebuild_voucher_outstanding,
+		)
+
+		rebuild_voucher_outstanding(company=self.company)
+
+		si1 = self.create_sales_invoice(no_payment_schedule=True)
+		self.create_payment_entry(si1.name)
+		si2 = self.create_sales_invoice(no_payment_schedule=True)
+		self.create_credit_note(si2.name)
+		self.create_sales_invoice()
+
+		filters = {
+			"company": self.company,
+			"report_date": today(),
+			"range1": 30,
+			"range2": 60,
+			"range3": 90,
+			"range4": 120,
+		}
+
+		fields = ["voucher_no", "party", "invoiced", "paid", "credit_note", "outstanding"]
+		for extra_filters in ({}, {"group_by_party": 1}, {"based_on_payment_terms": 1}):
+			report_filters = {**filters, **extra_filters}
+			from_outstanding = execute(report_filters)[1]
+
+			frappe.db.set_default("voucher_outstanding_built", 0)
+			from_ledger = execute(report_filters)[1]
+			frappe.db.set_default("voucher_outstanding_built", 1)
+
+			self.assertTrue(from_ledger)
+			self.assertEqual(
+				[[row.get(field) for field in fields] for row in from_outstanding],
+				[[row.get(field) for field in fields] for row in from_ledger],
+			)
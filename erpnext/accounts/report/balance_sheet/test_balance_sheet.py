@@ -49,3 +49,51 @@ class TestBalanceSheet(FrappeTestCase):
 				self.assertEqual(account_dict.total, 1000)
 			if account_dict.get("account") == "Current Assets - _TC6":
 				self.assertEqual(account_dict.total, 550)
+
+	def test_gl_entries_summed_by_period(self):
+		from erpnext.accounts.report.financial_statements import (
+			calculate_values,
+			get_period_list,
+			set_gl_entries_by_account,
+		)
+		from erpnext.accounts.utils import get_fiscal_year
+
+		fiscal_year = get_fiscal_year(today(), company="_Test Company")
+		filters = frappe._dict(company="_Test Company")
+		period_list = get_period_list(
+			fiscal_year[0],
+			fiscal_year[0],
+			fiscal_year[1],
+			fiscal_year[2],
+			"Fiscal Year",
+			"Monthly",
+			company="_Test Company",
+		)
+		root = frappe.db.get_value(
+			"Account",
+			{"company": "_Test Company", "root_type": "Asset", "parent_account": ("is", "not set")},
+			["lft", "rgt"],
+		)
+
+		values = []
+		for periods in (None, period_list):
+			entries_by_account = {}
+			set_gl_entries_by_account(
+				"_Test Company",
+				period_list[0].year_start_date,
+				period_list[-1].to_date,
+				root[0],
+				root[1],
+				filters,
+				entries_by_account,
+				root_type="Asset",
+				period_list=periods,
+			)
+			accounts_by_name = {account: frappe._dict() for account in entries_by_account}
+			calculate_values(accounts_by_name, entries_by_account, period_list, True, False)
+			values.append(accounts_by_name)
+
+		self.assertEqual(values[0].keys(), values[1].keys())
+		for account, balances in values[0].items():
+			for key, value in balances.items():
+				self.assertAlmostEqual(value, values[1][account].get(key), places=2)
@@ -8,6 +8,8 @@ import re
 
 import frappe
 from frappe import _
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Sum
 from frappe.utils import (
 	add_days,
 	add_months,
@@ -201,6 +203,7 @@ def get_data(
 			gl_entries_by_account,
 			ignore_closing_entries=ignore_closing_entries,
 			root_type=root_type,
+			period_list=period_list,
 		)
 
 	calculate_values(
@@ -429,8 +432,12 @@ def set_gl_entries_by_account(
 	ignore_closing_entries=False,
 	ignore_opening_entries=False,
 	root_type=None,
+	period_list=None,
 ):
-	"""Returns a dict like { "account": [gl entries], ... }"""
+	"""Returns a dict like { "account": [gl entries], ... }
+
+	If `period_list` is passed, GL Entries are summed up in the query and one entry is
+	returned per account, fiscal year and span of dates between period boundaries."""
 	gl_entries = []
 
 	account_filters = {
@@ -491,6 +498,7 @@ def set_gl_entries_by_account(
 			filters,
 			ignore_closing_entries,
 			ignore_opening_entries=ignore_opening_entries,
+			period_list=period_list,
 		)
 
 		if filters and filters.get("presentation_currency"):
@@ -511,7 +519,13 @@ def get_accounting_entries(
 	ignore_closing_entries,
 	period_closing_voucher=None,
 	ignore_opening_entries=False,
+	period_list=None,
 ):
+	if doctype == "GL Entry" and period_list:
+		return get_accounting_entries_by_period(
+			from_date, to_date, accounts, filters, ignore_closing_entries, period_list, ignore_opening_entries
+		)
+
 	gl_entry = frappe.qb.DocType(doctype)
 	query = (
 		frappe.qb.from_(gl_entry)
@@ -545,6 +559,71 @@ def get_accounting_entries(
 	return entries
 
 
+def get_accounting_entries_by_period(
+	from_date,
+	to_date,
+	accounts,
+	filters,
+	ignore_closing_entries,
+	period_list,
+	ignore_opening_entries=False,
+):
+	"""GL Entries summed up per account, fiscal year and period bucket.
+
+	Buckets are the spans between the start and end of each period and the start of the
+	first fiscal year, so every entry in a bucket falls in the same periods. Each row gets
+	the first date of its bucket as `posting_date`, which `calculate_values` compares
+	with the periods like it would with the dates of the entries."""
+	boundaries = get_period_boundaries(period_list)
+
+	gl_entry = frappe.qb.DocType("GL Entry")
+	period_bucket = Case()
+	for idx, boundary in enumerate(boundaries):
+		period_bucket = period_bucket.when(gl_entry.posting_date < boundary, idx)
+	period_bucket = period_bucket.else_(len(boundaries))
+
+	query = (
+		frappe.qb.from_(gl_entry)
+		.select(
+			gl_entry.account,
+			gl_entry.account_currency,
+			gl_entry.fiscal_year,
+			period_bucket.as_("period_bucket"),
+			Sum(gl_entry.debit).as_("debit"),
+			Sum(gl_entry.credit).as_("credit"),
+			Sum(gl_entry.debit_in_account_currency).as_("debit_in_account_currency"),
+			Sum(gl_entry.credit_in_account_currency).as_("credit_in_account_currency"),
+		)
+		.where(gl_entry.company == filters.company)
+		.where(gl_entry.is_cancelled == 0)
+		.where(gl_entry.posting_date <= to_date)
+		.where(gl_entry.account.isin(accounts))
+		.groupby(gl_entry.account, gl_entry.account_currency, gl_entry.fiscal_year, period_bucket)
+	)
+
+	if ignore_opening_entries:
+		query = query.where(gl_entry.is_opening == "No")
+
+	query = apply_additional_conditions("GL Entry", query, from_date, ignore_closing_entries, filters)
+
+	bucket_dates = [add_days(boundaries[0], -1), *boundaries]
+	entries = query.run(as_dict=True)
+	for entry in entries:
+		entry.posting_date = bucket_dates[cint(entry.pop("period_bucket"))]
+
+	return entries
+
+
+def get_period_boundaries(period_list):
+	"""Sorted dates on which an entry moves into or out of a period"""
+	boundaries = {getdate(period_list[0].year_start_date)}
+	for period in period_list:
+		boundaries.add(getdate(period.from_date))
+		boundaries.add(getdate(add_days(period.to_date, 1)))
+
+	return sorted(boundaries)
+
+
 def apply_additional_conditions(doctype, query, from_date, ignore_closing_entries, filters):
 	gl_entry = frappe.qb.DocType(doctype)
 	accounting_dimensions = get_accounting_dimensions(as_list=False)
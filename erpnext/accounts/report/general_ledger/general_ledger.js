@@ -200,7 +200,35 @@ frappe.query_reports["General Ledger"] = {
 			"fieldtype": "Check"
 		}
 
-	]
+	],
+
+	onload: function(report) {
+		report.page.add_inner_button(__("Export in Background"), function() {
+			frappe.prompt({
+				fieldname: "file_format",
+				label: __("File Format"),
+				fieldtype: "Select",
+				options: ["CSV", "Excel"],
+				default: "CSV",
+				reqd: 1
+			}, (values) => {
+				frappe.call({
+					method: "erpnext.accounts.report.general_ledger.general_ledger.export_general_ledger",
+					args: {
+						filters: report.get_values(),
+						file_format: values.file_format
+					}
+				});
+			}, __("Export General Ledger"), __("Export"));
+		});
+
+		frappe.realtime.off("general_ledger_export_ready");
+		frappe.realtime.on("general_ledger_export_ready", (data) => {
+			frappe.msgprint(__("General Ledger export is ready: {0}", [
+				`<a href="${data.file_url}" target="_blank">${__("Download")}</a>`
+			]));
+		});
+	}
 }
 
 erpnext.utils.add_dimensions('General Ledger', 15)
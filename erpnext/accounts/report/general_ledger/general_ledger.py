@@ -6,7 +6,7 @@ from collections import OrderedDict
 
 import frappe
 from frappe import _, _dict
-from frappe.utils import cstr, getdate
+from frappe.utils import cint, cstr, getdate
 
 from erpnext import get_company_currency, get_default_company
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
@@ -25,6 +25,18 @@ def execute(filters=None):
 	if not filters:
 		return [], []
 
+	filters, account_details = prepare_filters(filters)
+
+	columns = get_columns(filters)
+
+	update_translations()
+
+	res = get_result(filters, account_details)
+
+	return columns, res
+
+
+def prepare_filters(filters):
 	account_details = {}
 
 	if filters and filters.get("print_in_account_currency") and not filters.get("account"):
@@ -42,13 +54,7 @@ def execute(filters=None):
 
 	filters = set_account_currency(filters)
 
-	columns = get_columns(filters)
-
-	update_translations()
-
-	res = get_result(filters, account_details)
-
-	return columns, res
+	return filters, account_details
 
 
 def update_translations():
@@ -160,16 +166,6 @@ def get_result(filters, account_details):
 
 def get_gl_entries(filters, accounting_dimensions):
 	currency_map = get_currency(filters)
-	select_fields = """, debit, credit, debit_in_account_currency,
-		credit_in_account_currency """
-
-	if filters.get("show_remarks"):
-		if remarks_length := frappe.db.get_single_value(
-			"Accounts Settings", "general_ledger_remarks_length"
-		):
-			select_fields += f",substr(remarks, 1, {remarks_length}) as 'remarks'"
-		else:
-			select_fields += """,remarks"""
 
 	order_by_statement = "order by posting_date, account, creation"
 
@@ -186,6 +182,30 @@ def get_gl_entries(filters, accounting_dimensions):
 			"Company", filters.get("company"), "default_finance_book"
 		)
 
+	gl_entries = frappe.db.sql(
+		get_gl_entries_query(filters, accounting_dimensions, get_conditions(filters), order_by_statement),
+		filters,
+		as_dict=1,
+	)
+
+	if filters.get("presentation_currency"):
+		return convert_to_presentation_currency(gl_entries, currency_map)
+	else:
+		return gl_entries
+
+
+def get_gl_entries_query(filters, accounting_dimensions, conditions, order_by_statement):
+	select_fields = """, debit, credit, debit_in_account_currency,
+		credit_in_account_currency """
+
+	if filters.get("show_remarks"):
+		if remarks_length := frappe.db.get_single_value(
+			"Accounts Settings", "general_ledger_remarks_length"
+		):
+			select_fields += f",substr(remarks, 1, {remarks_length}) as 'remarks'"
+		else:
+			select_fields += """,remarks"""
+
 	dimension_fields = ""
 	if accounting_dimensions:
 		dimension_fields = ", ".join(accounting_dimensions) + ","
@@ -196,8 +216,7 @@ def get_gl_entries(filters, accounting_dimensions):
 			"debit_in_transaction_currency, credit_in_transaction_currency, transaction_currency,"
 		)
 
-	gl_entries = frappe.db.sql(
-		"""
+	return """
 		select
 			name as gl_entry, posting_date, account, party_type, party,
 			voucher_type, voucher_no, {dimension_fields}
@@ -208,21 +227,13 @@ def get_gl_entries(filters, accounting_dimensions):
 		where company=%(company)s {conditions}
 		{order_by_statement}
 	""".format(
-			dimension_fields=dimension_fields,
-			transaction_currency_fields=transaction_currency_fields,
-			select_fields=select_fields,
-			conditions=get_conditions(filters),
-			order_by_statement=order_by_statement,
-		),
-		filters,
-		as_dict=1,
+		dimension_fields=dimension_fields,
+		transaction_currency_fields=transaction_currency_fields,
+		select_fields=select_fields,
+		conditions=conditions,
+		order_by_statement=order_by_statement,
 	)
 
-	if filters.get("presentation_currency"):
-		return convert_to_presentation_currency(gl_entries, currency_map)
-	else:
-		return gl_entries
-
 
 def get_conditions(filters):
 	conditions = []
@@ -400,13 +411,8 @@ def initialize_gle_map(gl_entries, filters):
 	return gle_map
 
 
-def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map):
-	totals = get_totals_dict()
-	entries = []
-	consolidated_gle = OrderedDict()
-	group_by = group_by_field(filters.get("group_by"))
-	group_by_voucher_consolidated = filters.get("group_by") == "Group by Voucher (Consolidated)"
-
+def get_value_updater(filters):
+	"""Returns a function that adds the amounts of a GL Entry to `data[key]`"""
 	if filters.get("show_net_values_in_party_account"):
 		account_type_map = get_account_type_map(filters.get("company"))
 
@@ -440,6 +446,17 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map):
 		if data[key].against_voucher and gle.against_voucher:
 			data[key].against_voucher += ", " + gle.against_voucher
 
+	return update_value_in_dict
+
+
+def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map):
+	totals = get_totals_dict()
+	entries = []
+	consolidated_gle = OrderedDict()
+	group_by = group_by_field(filters.get("group_by"))
+	group_by_voucher_consolidated = filters.get("group_by") == "Group by Voucher (Consolidated)"
+	update_value_in_dict = get_value_updater(filters)
+
 	from_date, to_date = getdate(filters.from_date), getdate(filters.to_date)
 	show_opening_entries = filters.get("show_opening_entries")
 
@@ -502,27 +519,45 @@ def get_account_type_map(company):
 
 
 def get_result_as_list(data, filters):
-	balance, balance_in_account_currency = 0, 0
-	inv_details = get_supplier_invoice_details()
+	return get_row_updater(filters)(data)
 
-	for d in data:
-		if not d.get("posting_date"):
-			balance, balance_in_account_currency = 0, 0
 
-		balance = get_balance(d, balance, "debit", "credit")
-		d["balance"] = balance
+def get_row_updater(filters):
+	"""Returns a function that sets running balance and bill no on rows of the report.
+	The balance is carried over between calls, so rows can be passed a few at a time."""
+	balance = 0
 
-		d["account_currency"] = filters.account_currency
-		d["bill_no"] = inv_details.get(d.get("against_voucher"), "")
+	def update_rows(data):
+		nonlocal balance
+		inv_details = get_supplier_invoice_details(
+			list({d.get("against_voucher") for d in data if d.get("against_voucher")})
+		)
 
-	return data
+		for d in data:
+			if not d.get("posting_date"):
+				balance = 0
 
+			balance = get_balance(d, balance, "debit", "credit")
+			d["balance"] = balance
+
+			d["account_currency"] = filters.account_currency
+			d["bill_no"] = inv_details.get(d.get("against_voucher"), "")
+
+		return data
+
+	return update_rows
+
+
+def get_supplier_invoice_details(invoices):
+	if not invoices:
+		return {}
 
-def get_supplier_invoice_details():
 	inv_details = {}
 	for d in frappe.db.sql(
 		""" select name, bill_no from `tabPurchase Invoice`
-		where docstatus = 1 and bill_no is not null and bill_no != '' """,
+		where docstatus = 1 and bill_no is not null and bill_no != ''
+		and name in %(invoices)s """,
+		{"invoices": invoices},
 		as_dict=1,
 	):
 		inv_details[d.name] = d.bill_no
@@ -649,3 +684,332 @@ def get_columns(filters):
 		columns.extend([{"label": _("Remarks"), "fieldname": "remarks", "width": 400}])
 
 	return columns
+
+
+def get_streaming_sort_fields(filters):
+	"""Columns by which GL Entries are paged, so that entries of a group come together"""
+	if filters.get("group_by") == "Group by Account":
+		return ["account", "posting_date", "creation", "name"]
+	elif filters.get("group_by") == "Group by Party":
+		return ["party", "posting_date", "creation", "name"]
+	else:
+		return ["posting_date", "voucher_type", "voucher_no", "creation", "name"]
+
+
+def get_opening_condition(filters):
+	if filters.get("show_opening_entries"):
+		return "posting_date < %(from_date)s"
+
+	return "(posting_date < %(from_date)s or is_opening = 'Yes')"
+
+
+def get_gl_entries_in_pages(filters, accounting_dimensions, conditions, page_length):
+	"""Yields GL Entries of the reporting period, `page_length` rows at a time.
+
+	Each page starts after the sort key of the last row of the previous one (keyset pagination),
+	so reading a page costs the same no matter how far into the ledger it is."""
+	sort_fields = get_streaming_sort_fields(filters)
+	conditions += " and not {0}".format(get_opening_condition(filters))
+	order_by_statement = "order by {0} limit {1}".format(", ".join(sort_fields), cint(page_length))
+	keyset_condition = " and ({0}) > ({1})".format(
+		", ".join(sort_fields), ", ".join("%(after_{0})s".format(field) for field in sort_fields)
+	)
+
+	values = frappe._dict(filters)
+	query = get_gl_entries_query(filters, accounting_dimensions, conditions, order_by_statement)
+	while True:
+		gl_entries = frappe.db.sql(query, values, as_dict=1)
+		if not gl_entries:
+			break
+
+		last_entry = gl_entries[-1]
+		for field in sort_fields:
+			values["after_" + field] = last_entry.gl_entry if field == "name" else last_entry.get(field)
+
+		yield gl_entries
+
+		if len(gl_entries) < page_length:
+			break
+
+		query = get_gl_entries_query(
+			filters, accounting_dimensions, conditions + keyset_condition, order_by_statement
+		)
+
+
+def get_opening_balances(filters, conditions, currency_map, account_currencies):
+	"""Opening debit and credit in total, and per account or party when grouped by them"""
+	group_field = None
+	if filters.get("group_by") in ("Group by Account", "Group by Party"):
+		group_field = group_by_field(filters.get("group_by"))
+
+	opening_entries = frappe.db.sql(
+		"""
+		select
+			{group_field} account_currency, sum(debit) as debit, sum(credit) as credit,
+			sum(debit_in_account_currency) as debit_in_account_currency,
+			sum(credit_in_account_currency) as credit_in_account_currency
+		from `tabGL Entry`
+		where company=%(company)s {conditions} and {opening_condition}
+		group by {group_field} account_currency
+	""".format(
+			group_field=group_field + "," if group_field else "",
+			conditions=conditions,
+			opening_condition=get_opening_condition(filters),
+		),
+		filters,
+		as_dict=1,
+	)
+
+	if filters.get("presentation_currency"):
+		convert_to_presentation_currency(opening_entries, currency_map, account_currencies)
+
+	update_value_in_dict = get_value_updater(filters)
+	opening = get_totals_dict()
+	group_openings = {}
+	for gle in opening_entries:
+		update_value_in_dict(opening, "opening", gle)
+		if group_field:
+			group_opening = group_openings.setdefault(gle.get(group_field), get_totals_dict())
+			update_value_in_dict(group_opening, "opening", gle)
+
+	return opening.opening, group_openings
+
+
+def get_result_in_chunks(filters, page_length=5000):
+	"""Yields the rows of the report like `get_result` does, a few at a time.
+
+	GL Entries are read page by page and group totals are computed as each group
+	ends, so memory use does not depend on the number of GL Entries."""
+	accounting_dimensions = []
+	if filters.get("include_dimensions"):
+		accounting_dimensions = get_accounting_dimensions()
+
+	if filters.get("include_default_book_entries"):
+		filters["company_fb"] = frappe.get_cached_value(
+			"Company", filters.get("company"), "default_finance_book"
+		)
+
+	conditions = get_conditions(filters)
+	currency_map = get_currency(filters)
+
+	account_currencies = None
+	if filters.get("presentation_currency"):
+		account_currencies = frappe.db.sql_list(
+			"""select distinct account_currency from `tabGL Entry`
+			where company=%(company)s {0}""".format(
+				conditions
+			),
+			filters,
+		)
+
+	group_by = group_by_field(filters.get("group_by"))
+	group_by_voucher_consolidated = filters.get("group_by") == "Group by Voucher (Consolidated)"
+	show_group_opening = filters.get("group_by") != "Group by Voucher"
+	update_value_in_dict = get_value_updater(filters)
+	update_rows = get_row_updater(filters)
+
+	totals = get_totals_dict()
+	opening, group_openings = get_opening_balances(
+		filters, conditions, currency_map, account_currencies
+	)
+	update_value_in_dict(totals, "opening", opening)
+	update_value_in_dict(totals, "closing", opening)
+
+	# Opening for filtered account
+	yield update_rows([totals.opening])
+
+	no_group = object()
+	current_group = no_group
+	group_totals = None
+	consolidated_gle = OrderedDict()
+
+	def close_group():
+		rows = []
+		if group_by_voucher_consolidated:
+			for value in consolidated_gle.values():
+				update_value_in_dict(totals, "total", value)
+				update_value_in_dict(totals, "closing", value)
+				rows.append(value)
+			consolidated_gle.clear()
+
+		elif group_totals:
+			rows.append(group_totals.total)
+			if show_group_opening:
+				rows.append(group_totals.closing)
+
+		return rows
+
+	for gl_entries in get_gl_entries_in_pages(
+		filters, accounting_dimensions, conditions, page_length
+	):
+		if filters.get("presentation_currency"):
+			convert_to_presentation_currency(gl_entries, currency_map, account_currencies)
+
+		rows = []
+		for gle in gl_entries:
+			gle.against = gle.get("against_link") or gle.get("against")
+			gle.voucher_type = _(gle.voucher_type)
+			group_by_value = gle.get(group_by)
+
+			if group_by_value != current_group:
+				rows += close_group()
+				current_group = group_by_value
+
+				if not group_by_voucher_consolidated:
+					group_totals = get_totals_dict()
+					if group_opening := group_openings.get(group_by_value):
+						update_value_in_dict(group_totals, "opening", group_opening.opening)
+						update_value_in_dict(group_totals, "closing", group_opening.opening)
+
+					rows.append({})
+					if show_group_opening:
+						rows.append(group_totals.opening)
+
+			if group_by_voucher_consolidated:
+				keylist = [
+					gle.get("voucher_type"),
+					gle.get("voucher_no"),
+					gle.get("account"),
+					gle.get("party_type"),
+					gle.get("party"),
+				]
+				if filters.get("include_dimensions"):
+					for dim in accounting_dimensions:
+						keylist.append(gle.get(dim))
+					keylist.append(gle.get("cost_center"))
+
+				key = tuple(keylist)
+				if key not in consolidated_gle:
+					consolidated_gle.setdefault(key, gle)
+				else:
+					update_value_in_dict(consolidated_gle, key, gle)
+			else:
+				update_value_in_dict(group_totals, "total", gle)
+				update_value_in_dict(group_totals, "closing", gle)
+				update_value_in_dict(totals, "total", gle)
+				update_value_in_dict(totals, "closing", gle)
+				rows.append(gle)
+
+		yield update_rows(rows)
+
+	rows = close_group()
+	if not group_by_voucher_consolidated:
+		rows.append({})
+
+	rows += [totals.total, totals.closing]
+	yield update_rows(rows)
+
+
+@frappe.whitelist()
+def export_general_ledger(filters, file_format="CSV"):
+	"""Exports the report to a private file in a background job"""
+	if not frappe.get_cached_doc("Report", "General Ledger").is_permitted():
+		frappe.throw(_("Not permitted to export General Ledger"), frappe.PermissionError)
+
+	if file_format not in ("CSV", "Excel"):
+		frappe.throw(_("File format should be CSV or Excel"))
+
+	filters = frappe._dict(frappe.parse_json(filters))
+	# validate in the request, so that errors are shown to the user
+	prepare_filters(frappe._dict(filters))
+
+	frappe.enqueue(
+		"erpnext.accounts.report.general_ledger.general_ledger.generate_general_ledger_export",
+		queue="long",
+		timeout=7200,
+		filters=filters,
+		file_format=file_format,
+	)
+	frappe.msgprint(
+		_("General Ledger is being exported in the background. You will be notified once it is ready."),
+		alert=True,
+	)
+
+
+def generate_general_ledger_export(filters, file_format="CSV"):
+	filters = prepare_filters(frappe._dict(filters))[0]
+	columns = get_columns(filters)
+	update_translations()
+
+	extension = "xlsx" if file_format == "Excel" else "csv"
+	file_name = "general-ledger-{0}.{1}".format(frappe.generate_hash(length=10), extension)
+	file_path = frappe.get_site_path("private", "files", file_name)
+
+	rows = get_result_in_chunks(filters)
+	if file_format == "Excel":
+		write_xlsx_in_chunks(columns, rows, file_path)
+	else:
+		write_csv_in_chunks(columns, rows, file_path)
+
+	file_doc = create_export_file(file_name, file_path)
+	frappe.publish_realtime(
+		"general_ledger_export_ready",
+		{"file_url": file_doc.file_url},
+		user=frappe.session.user,
+	)
+
+	return file_doc.file_url
+
+
+def get_export_row(row, fieldnames):
+	return [row.get(fieldname) for fieldname in fieldnames]
+
+
+def write_csv_in_chunks(columns, rows, file_path):
+	import csv
+
+	fieldnames = [column["fieldname"] for column in columns]
+	with open(file_path, "w", newline="", encoding="utf-8") as f:
+		writer = csv.writer(f)
+		writer.writerow([column["label"] for column in columns])
+		for chunk in rows:
+			writer.writerows(get_export_row(row, fieldnames) for row in chunk)
+
+
+def write_xlsx_in_chunks(columns, rows, file_path):
+	import openpyxl
+	from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+	fieldnames = [column["fieldname"] for column in columns]
+
+	# write only workbooks keep rows in a temporary file instead of memory
+	wb = openpyxl.Workbook(write_only=True)
+	ws = wb.create_sheet(_("General Ledger"))
+	ws.append([column["label"] for column in columns])
+	for chunk in rows:
+		for row in chunk:
+			ws.append(
+				[
+					ILLEGAL_CHARACTERS_RE.sub("", value) if isinstance(value, str) else value
+					for value in get_export_row(row, fieldnames)
+				]
+			)
+
+	wb.save(file_path)
+
+
+def create_export_file(file_name, file_path):
+	import hashlib
+	import os
+
+	content_hash = hashlib.md5()
+	with open(file_path, "rb") as f:
+		for block in iter(lambda: f.read(1024 * 1024), b""):
+			content_hash.update(block)
+
+	file_doc = frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": file_name,
+			"file_url": "/private/files/" + file_name,
+			"is_private": 1,
+			"folder": "Home",
+			"file_size": os.path.getsize(file_path),
+			"content_hash": content_hash.hexdigest(),
+		}
+	)
+	# File.insert reads the whole file to save it again, which is avoided for large exports
+	file_doc.set_new_name()
+	file_doc.db_insert()
+
+	return file_doc
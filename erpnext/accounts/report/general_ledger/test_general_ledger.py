@@ -3,9 +3,15 @@
 
 import frappe
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import today
+from frappe.utils import add_days, cstr, today
 
-from erpnext.accounts.report.general_ledger.general_ledger import execute
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.report.general_ledger.general_ledger import (
+	execute,
+	get_result_in_chunks,
+	prepare_filters,
+	update_translations,
+)
 
 
 class TestGeneralLedger(FrappeTestCase):
@@ -148,3 +154,43 @@ class TestGeneralLedger(FrappeTestCase):
 		self.assertEqual(data[2]["credit"], 900)
 		self.assertEqual(data[3]["debit"], 100)
 		self.assertEqual(data[3]["credit"], 100)
+
+	def test_rows_in_chunks_match_report(self):
+		for posting_date in (add_days(today(), -10), today(), today()):
+			make_journal_entry(
+				"_Test Bank - _TC",
+				"_Test Account Cost for Goods Sold - _TC",
+				100,
+				posting_date=posting_date,
+				submit=True,
+			)
+
+		for group_by in ("Group by Account", "Group by Voucher", "Group by Voucher (Consolidated)"):
+			filters = frappe._dict(
+				{
+					"company": "_Test Company",
+					"from_date": add_days(today(), -5),
+					"to_date": today(),
+					"account": ["_Test Bank - _TC"] if group_by != "Group by Account" else [],
+					"group_by": group_by,
+				}
+			)
+			data = execute(frappe._dict(filters))[1]
+
+			update_translations()
+			chunked_filters = prepare_filters(frappe._dict(filters))[0]
+			chunked_data = [row for rows in get_result_in_chunks(chunked_filters, page_length=1) for row in rows]
+
+			# entries on the same date may come in a different order, so only the rows are compared
+			def get_rows(rows):
+				return sorted(
+					(cstr(row.get("account")), cstr(row.get("voucher_no")), row.get("debit"), row.get("credit"))
+					for row in rows
+					if row
+				)
+
+			self.assertEqual(get_rows(data), get_rows(chunked_data))
+			for row, chunked_row in zip(data[-2:], chunked_data[-2:]):
+				self.assertEqual(row.get("debit"), chunked_row.get("debit"))
+				self.assertEqual(row.get("credit"), chunked_row.get("credit"))
+				self.assertEqual(row.get("balance"), chunked_row.get("balance"))
@@ -2,6 +2,7 @@
 # License: GNU General Public License v3. See license.txt
 
 
+from datetime import timedelta
 from json import loads
 from typing import TYPE_CHECKING, List, Optional, Tuple
 
@@ -9,7 +10,7 @@ import frappe
 import frappe.defaults
 from frappe import _, qb, throw
 from frappe.model.meta import get_field_precision
-from frappe.query_builder import AliasedQuery, Criterion, Table
+from frappe.query_builder import AliasedQuery, Case, Criterion, Table
 from frappe.query_builder.functions import Round, Sum
 from frappe.query_builder.utils import DocType
 from frappe.utils import (
@@ -18,9 +19,11 @@ from frappe.utils import (
 	cstr,
 	flt,
 	formatdate,
+	get_first_day,
 	get_number_format_info,
 	getdate,
 	now,
+	now_datetime,
 	nowdate,
 )
 from pypika import Order
@@ -31,6 +34,12 @@ import erpnext
 # imported to enable erpnext.accounts.utils.get_account_currency
 from erpnext.accounts.doctype.account.account import get_account_currency  # noqa
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import get_dimensions
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import (
+	is_gl_balance_snapshot_ready,
+)
+from erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding import (
+	update_voucher_outstanding_for_entries,
+)
 from erpnext.stock import get_warehouse_account_map
 from erpnext.stock.utils import get_stock_value_on
 
@@ -196,13 +205,17 @@ def get_balance_on(
 	if not cost_center and frappe.form_dict.get("cost_center"):
 		cost_center = frappe.form_dict.get("cost_center")
 
-	cond = ["is_cancelled=0"]
+	cond = []
+	date_cond = []
 	if start_date:
-		cond.append("posting_date >= %s" % frappe.db.escape(cstr(start_date)))
+		date_cond.append("posting_date >= %s" % frappe.db.escape(cstr(start_date)))
+
+	# without a date, the balance of all entries that exist is returned
+	use_snapshot = not start_date and is_gl_balance_snapshot_ready()
+	snapshot_date = date
 	if date:
-		cond.append("posting_date <= %s" % frappe.db.escape(cstr(date)))
+		date_cond.append("posting_date <= %s" % frappe.db.escape(cstr(date)))
 	else:
-		# get balance of all entries that exist
 		date = nowdate()
 
 	if account:
@@ -291,18 +304,60 @@ def get_balance_on(
 			select_field = "sum(debit_in_account_currency) - sum(credit_in_account_currency)"
 		else:
 			select_field = "sum(debit) - sum(credit)"
+
+		if use_snapshot:
+			return get_balance_from_gl_balance_snapshot(select_field, cond, snapshot_date)
+
 		bal = frappe.db.sql(
 			"""
 			SELECT {0}
 			FROM `tabGL Entry` gle
 			WHERE {1}""".format(
-				select_field, " and ".join(cond)
+				select_field, " and ".join(["is_cancelled=0", *date_cond, *cond])
 			)
 		)[0][0]
 		# if bal is None, return 0
 		return flt(bal)
 
 
+def get_balance_from_gl_balance_snapshot(select_field, cond, date=None):
+	"""Balance as on `date` from monthly snapshots of closed months and the
+	GL Entries posted in the month of `date`"""
+	snapshot_cond = list(cond)
+	if date:
+		month_start = frappe.db.escape(cstr(get_first_day(date)))
+		snapshot_cond.append("period_start_date < %s" % month_start)
+
+	bal = frappe.db.sql(
+		"""
+		SELECT {0}
+		FROM `tabGL Balance Snapshot` gle
+		{1}""".format(
+			select_field, "WHERE " + " and ".join(snapshot_cond) if snapshot_cond else ""
+		)
+	)[0][0]
+
+	if date:
+		gl_cond = [
+			"is_cancelled=0",
+			"posting_date >= %s" % month_start,
+			"posting_date <= %s" % frappe.db.escape(cstr(date)),
+			*cond,
+		]
+		bal = flt(bal) + flt(
+			frappe.db.sql(
+				"""
+				SELECT {0}
+				FROM `tabGL Entry` gle
+				WHERE {1}""".format(
+					select_field, " and ".join(gl_cond)
+				)
+			)[0][0]
+		)
+
+	return flt(bal)
+
+
 def get_count_on(account, fieldname, date):
 	cond = ["is_cancelled=0"]
 	if date:
@@ -772,6 +827,27 @@ def update_accounting_ledgers_after_reference_removal(
 
 	# Payment Ledger
 	ple = qb.DocType("Payment Ledger Entry")
+	unlinked_entries = (
+		qb.from_(ple)
+		.select(
+			ple.account,
+			ple.party_type,
+			ple.party,
+			ple.voucher_type,
+			ple.voucher_no,
+			ple.against_voucher_type,
+			ple.against_voucher_no,
+		)
+		.where(
+			(ple.against_voucher_type == ref_type)
+			& (ple.against_voucher_no == ref_no)
+			& (ple.delinked == 0)
+		)
+	)
+	if payment_name:
+		unlinked_entries = unlinked_entries.where(ple.voucher_no == payment_name)
+	unlinked_entries = unlinked_entries.run(as_dict=True)
+
 	ple_update_query = (
 		qb.update(ple)
 		.set(ple.against_voucher_type, ple.voucher_type)
@@ -789,6 +865,8 @@ def update_accounting_ledgers_after_reference_removal(
 		ple_update_query = ple_update_query.where(ple.voucher_no == payment_name)
 	ple_update_query.run()
 
+	update_voucher_outstanding_for_entries(unlinked_entries)
+
 
 def remove_ref_from_advance_section(ref_doc: object = None):
 	# TODO: this might need some testing
@@ -1371,6 +1449,12 @@ def _delete_pl_entries(voucher_type, voucher_no):
 
 
 def _delete_gl_entries(voucher_type, voucher_no):
+	from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import (
+		remove_voucher_from_gl_balance_snapshot,
+	)
+
+	remove_voucher_from_gl_balance_snapshot(voucher_type, voucher_no)
+
 	gle = qb.DocType("GL Entry")
 	qb.from_(gle).delete().where(
 		(gle.voucher_type == voucher_type) & (gle.voucher_no == voucher_no)
@@ -1697,11 +1781,21 @@ def get_payment_ledger_entries(gl_entries, cancel=0):
 
 
 def create_payment_ledger_entry(
-	gl_entries, cancel=0, adv_adj=0, update_outstanding="Yes", from_repost=0, partial_cancel=False
+	gl_entries,
+	cancel=0,
+	adv_adj=0,
+	update_outstanding="Yes",
+	from_repost=0,
+	partial_cancel=False,
+	bulk=False,
 ):
 	if gl_entries:
 		ple_map = get_payment_ledger_entries(gl_entries, cancel=cancel)
 
+		if bulk and not cancel:
+			create_payment_ledger_entries_in_bulk(ple_map, adv_adj, update_outstanding, from_repost)
+			return
+
 		for entry in ple_map:
 
 			ple = frappe.get_doc(entry)
@@ -1716,6 +1810,78 @@ def create_payment_ledger_entry(
 			ple.submit()
 
 
+def create_payment_ledger_entries_in_bulk(ple_map, adv_adj=0, update_outstanding="Yes", from_repost=0):
+	"""Insert Payment Ledger Entries with multi-row INSERTs.
+
+	Runs the same validations as `PaymentLedgerEntry.on_update`, but ledger dependent
+	checks and outstanding updates are done once per distinct account / against voucher
+	after all entries are written."""
+	from erpnext.accounts.doctype.gl_entry.gl_entry import (
+		validate_balance_type,
+		validate_frozen_account,
+	)
+
+	if not ple_map:
+		return
+
+	ple_entries = []
+	for entry in ple_map:
+		ple = frappe.get_doc(entry)
+		ple.flags.ignore_permissions = 1
+		ple.flags.adv_adj = adv_adj
+		ple.flags.from_repost = from_repost
+		ple.flags.update_outstanding = update_outstanding
+		ple.docstatus = 1
+		ple.set_new_name()
+		ple.run_method("validate")
+		ple.run_method("before_submit")
+
+		if not from_repost:
+			ple.validate_account_details()
+			ple.validate_dimensions_for_pl_and_bs()
+			ple.validate_allowed_dimensions()
+			validate_frozen_account(ple.account, adv_adj)
+
+		ple_entries.append(ple)
+
+	bulk_insert_documents(ple_entries)
+
+	if not from_repost:
+		for account in {ple.account for ple in ple_entries}:
+			validate_balance_type(account, adv_adj)
+
+	outstanding_to_update = []
+	for ple in ple_entries:
+		args = ple.get_outstanding_update_args()
+		if args and args not in outstanding_to_update:
+			outstanding_to_update.append(args)
+
+	for args in outstanding_to_update:
+		update_voucher_outstanding(*args)
+
+	# same as `PaymentLedgerEntry.on_update`, once for all entries
+	update_voucher_outstanding_for_entries(ple_entries)
+
+
+def bulk_insert_documents(docs):
+	"""Write new, already validated documents of a single doctype using multi-row INSERTs.
+
+	Creation timestamps are spaced a microsecond apart so that the rows keep the order
+	in which they would have been inserted one by one."""
+	if not docs:
+		return
+
+	timestamp = now_datetime()
+	values = []
+	for idx, doc in enumerate(docs):
+		doc.creation = doc.modified = timestamp + timedelta(microseconds=idx)
+		doc.owner = doc.modified_by = frappe.session.user
+		values.append(tuple(doc.get_valid_dict(convert_dates_to_str=True).values()))
+
+	fields = list(docs[0].get_valid_dict().keys())
+	frappe.db.bulk_insert(docs[0].doctype, fields=fields, values=values)
+
+
 def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, party):
 	ple = frappe.qb.DocType("Payment Ledger Entry")
 	vouchers = [frappe._dict({"voucher_type": voucher_type, "voucher_no": voucher_no})]
@@ -2021,6 +2187,45 @@ class QueryPaymentLedger(object):
 
 		return self.voucher_outstandings
 
+	def get_party_outstanding_summary(self, common_filter=None):
+		"""
+		Count the vouchers with outstanding of every party in one query
+
+		common_filter - array of criterions
+		invoices - vouchers with +ve outstanding
+		payments - vouchers with -ve outstanding
+		"""
+
+		ple = self.ple
+		outstanding = Table("outstanding")
+
+		query_voucher_outstanding = (
+			qb.from_(ple)
+			.select(
+				ple.party_type,
+				ple.party,
+				Sum(ple.amount_in_account_currency).as_("amount_in_account_currency"),
+			)
+			.where(ple.delinked == 0)
+			.where(Criterion.all(common_filter or []))
+			.groupby(
+				ple.against_voucher_type, ple.against_voucher_no, ple.party_type, ple.party, ple.account
+			)
+		)
+
+		return (
+			qb.with_(query_voucher_outstanding, "outstanding")
+			.from_(AliasedQuery("outstanding"))
+			.select(
+				outstanding.party_type,
+				outstanding.party,
+				Sum(Case().when(outstanding.amount_in_account_currency > 0, 1).else_(0)).as_("invoices"),
+				Sum(Case().when(outstanding.amount_in_account_currency < 0, 1).else_(0)).as_("payments"),
+			)
+			.groupby(outstanding.party_type, outstanding.party)
+			.run(as_dict=True)
+		)
+
 
 def create_gain_loss_journal(
 	company,
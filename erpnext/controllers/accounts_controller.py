@@ -28,6 +28,9 @@ import erpnext
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 )
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import (
+	remove_voucher_from_gl_balance_snapshot,
+)
 from erpnext.accounts.doctype.pricing_rule.utils import (
 	apply_pricing_rule_for_free_items,
 	apply_pricing_rule_on_transaction,
@@ -311,6 +314,7 @@ class AccountsController(TransactionBase):
 			frappe.qb.from_(ple).delete().where(
 				(ple.voucher_type == self.doctype) & (ple.voucher_no == self.name)
 			).run()
+			remove_voucher_from_gl_balance_snapshot(self.doctype, self.name)
 			frappe.db.sql(
 				"delete from `tabGL Entry` where voucher_type=%s and voucher_no=%s", (self.doctype, self.name)
 			)
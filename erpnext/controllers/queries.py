@@ -99,7 +99,9 @@ def customer_query(doctype, txt, searchfield, start, page_len, filters, as_dict=
 
 	fields = get_fields(doctype, fields)
 	searchfields = frappe.get_meta(doctype).get_search_fields()
-	searchfields = " or ".join(field + " like %(txt)s" for field in searchfields)
+	searchfields = get_link_search_condition(doctype, txt, searchfields) or " or ".join(
+		field + " like %(txt)s" for field in searchfields
+	)
 
 	return frappe.db.sql(
 		"""select {fields} from `tabCustomer`
@@ -136,12 +138,14 @@ def supplier_query(doctype, txt, searchfield, start, page_len, filters, as_dict=
 		fields.append("supplier_name")
 
 	fields = get_fields(doctype, fields)
+	search_condition = get_link_search_condition(
+		doctype, txt, [searchfield, "supplier_name"]
+	) or "{0} like %(txt)s or supplier_name like %(txt)s".format(searchfield)
 
 	return frappe.db.sql(
 		"""select {field} from `tabSupplier`
 		where docstatus < 2
-			and ({key} like %(txt)s
-			or supplier_name like %(txt)s) and disabled=0
+			and ({search_condition}) and disabled=0
 			and (on_hold = 0 or (on_hold = 1 and CURRENT_DATE > release_date))
 			{mcond}
 		order by
@@ -150,7 +154,11 @@ def supplier_query(doctype, txt, searchfield, start, page_len, filters, as_dict=
 			idx desc,
 			name, supplier_name
 		limit %(page_len)s offset %(start)s""".format(
-			**{"field": ", ".join(fields), "key": searchfield, "mcond": get_match_cond(doctype)}
+			**{
+				"field": ", ".join(fields),
+				"search_condition": search_condition,
+				"mcond": get_match_cond(doctype),
+			}
 		),
 		{"txt": "%%%s%%" % txt, "_txt": txt.replace("%", ""), "start": start, "page_len": page_len},
 		as_dict=as_dict,
@@ -241,6 +249,7 @@ def item_query(doctype, txt, searchfield, start, page_len, filters, as_dict=Fals
 		]
 		if field not in searchfields
 	]
+	search_condition = get_link_search_condition(doctype, txt, searchfields)
 	searchfields = " or ".join([field + " like %(txt)s" for field in searchfields])
 
 	if filters and isinstance(filters, dict):
@@ -275,6 +284,12 @@ def item_query(doctype, txt, searchfield, start, page_len, filters, as_dict=Fals
 		# scan description only if items are less than 50000
 		description_cond = "or tabItem.description LIKE %(txt)s"
 
+	if not search_condition:
+		search_condition = """{scond} or tabItem.item_code IN (select parent from `tabItem Barcode`
+			where barcode LIKE %(txt)s) {description_cond}""".format(
+			scond=searchfields, description_cond=description_cond
+		)
+
 	return frappe.db.sql(
 		"""select
 			tabItem.name {columns}
@@ -283,8 +298,7 @@ def item_query(doctype, txt, searchfield, start, page_len, filters, as_dict=Fals
 			and tabItem.disabled=0
 			and tabItem.has_variants=0
 			and (tabItem.end_of_life > %(today)s or ifnull(tabItem.end_of_life, '0000-00-00')='0000-00-00')
-			and ({scond} or tabItem.item_code IN (select parent from `tabItem Barcode` where barcode LIKE %(txt)s)
-				{description_cond})
+			and ({search_condition})
 			{fcond} {mcond}
 		order by
 			if(locate(%(_txt)s, name), locate(%(_txt)s, name), 99999),
@@ -293,10 +307,9 @@ def item_query(doctype, txt, searchfield, start, page_len, filters, as_dict=Fals
 			name, item_name
 		limit %(start)s, %(page_len)s """.format(
 			columns=columns,
-			scond=searchfields,
+			search_condition=search_condition,
 			fcond=get_filters_cond(doctype, filters, conditions).replace("%", "%%"),
 			mcond=get_match_cond(doctype).replace("%", "%%"),
-			description_cond=description_cond,
 		),
 		{
 			"today": nowdate(),
@@ -722,13 +735,16 @@ def warehouse_query(doctype, txt, searchfield, start, page_len, filters):
 	doctype = "Warehouse"
 	conditions, bin_conditions = [], []
 	filter_dict = get_doctype_wise_filters(filters)
+	search_condition = get_link_search_condition(
+		doctype, txt, [searchfield]
+	) or "`tabWarehouse`.`{0}` like {1}".format(searchfield, frappe.db.escape("%{0}%".format(txt)))
 
 	query = """select `tabWarehouse`.name,
 		CONCAT_WS(' : ', 'Actual Qty', ifnull(round(`tabBin`.actual_qty, 2), 0 )) actual_qty
 		from `tabWarehouse` left join `tabBin`
 		on `tabBin`.warehouse = `tabWarehouse`.name {bin_conditions}
 		where
-			`tabWarehouse`.`{key}` like {txt}
+			({search_condition})
 			{fcond} {mcond}
 		order by ifnull(`tabBin`.actual_qty, 0) desc
 		limit
@@ -737,12 +753,11 @@ def warehouse_query(doctype, txt, searchfield, start, page_len, filters):
 		bin_conditions=get_filters_cond(
 			doctype, filter_dict.get("Bin"), bin_conditions, ignore_permissions=True
 		),
-		key=searchfield,
+		search_condition=search_condition,
 		fcond=get_filters_cond(doctype, filter_dict.get("Warehouse"), conditions),
 		mcond=get_match_cond(doctype),
 		start=start,
 		page_len=page_len,
-		txt=frappe.db.escape("%{0}%".format(txt)),
 	)
 
 	return frappe.db.sql(query)
@@ -871,6 +886,18 @@ def get_tax_template(doctype, txt, searchfield, start, page_len, filters):
 		return [(d,) for d in set(taxes)]
 
 
+def get_link_search_condition(doctype, txt, searchfields):
+	"""Condition matching `txt` in `searchfields` from the search index of the last installed app
+	that provides one, None to search with LIKE"""
+	methods = frappe.get_hooks("get_link_search_condition")
+	if not methods:
+		return
+
+	condition = frappe.get_attr(methods[-1])(doctype, txt, searchfields)
+	# escaped for the queries run with parameters
+	return condition.replace("%", "%%") if condition else None
+
+
 def get_fields(doctype, fields=None):
 	if fields is None:
 		fields = []
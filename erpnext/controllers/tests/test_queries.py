@@ -62,6 +62,30 @@ class TestQueries(unittest.TestCase):
 		query(txt="", filters={"supplier": None})
 		query(txt="", filters={"supplier": ""})
 
+	def test_item_query_with_search_index(self):
+		from erpnext.setup.doctype.link_search_term.link_search_term import (
+			rebuild_link_search_index,
+		)
+
+		query = add_default_params(queries.item_query, "Item")
+
+		frappe.db.set_single_value("Global Defaults", "use_link_search_index", 1)
+		try:
+			rebuild_link_search_index(["Item", "Customer"])
+
+			# matched from the start of a word of the item code or name
+			self.assertGreaterEqual(len(query(txt="_Test Item")), 7)
+			self.assertEqual(len(query(txt="home desktop 100 3")), 1)
+			self.assertEqual(len(query(txt="est Item Home Desktop 100 3")), 0)
+
+			# "_" is searched with LIKE, words without it from the index
+			customer_query = add_default_params(queries.customer_query, "Customer")
+			self.assertGreaterEqual(len(customer_query(txt="customer usd")), 1)
+			self.assertEqual(len(customer_query(txt="ustomer usd")), 0)
+		finally:
+			frappe.db.set_single_value("Global Defaults", "use_link_search_index", 0)
+			rebuild_link_search_index()
+
 	def test_bom_qury(self):
 		query = add_default_params(queries.bom, "BOM")
 
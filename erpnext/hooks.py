@@ -44,6 +44,10 @@ before_install = [
 	"erpnext.setup.install.check_frappe_version",
 ]
 after_install = "erpnext.setup.install.after_install"
+after_migrate = [
+	"erpnext.accounts.doctype.pricing_rule.pricing_rule_index.clear_pricing_rule_index",
+	"erpnext.accounts.doctype.pricing_rule.pricing_rule_index.clear_tree_ancestors",
+]
 
 boot_session = "erpnext.startup.boot.boot_session"
 notification_config = "erpnext.startup.notifications.get_notification_config"
@@ -319,6 +323,16 @@ doc_events = {
 	tuple(period_closing_doctypes): {
 		"validate": "erpnext.accounts.doctype.accounting_period.accounting_period.validate_accounting_period_on_doc_save",
 	},
+	("Item Group", "Customer Group", "Territory", "Supplier Group", "Warehouse"): {
+		"on_update": "erpnext.accounts.doctype.pricing_rule.pricing_rule_index.clear_tree_ancestors",
+		"after_rename": "erpnext.accounts.doctype.pricing_rule.pricing_rule_index.clear_tree_ancestors",
+		"on_trash": "erpnext.accounts.doctype.pricing_rule.pricing_rule_index.clear_tree_ancestors",
+	},
+	("Item", "Customer", "Supplier", "Warehouse"): {
+		"on_update": "erpnext.setup.doctype.link_search_term.link_search_term.update_link_search_index",
+		"after_rename": "erpnext.setup.doctype.link_search_term.link_search_term.update_link_search_index",
+		"on_trash": "erpnext.setup.doctype.link_search_term.link_search_term.update_link_search_index",
+	},
 	"Stock Entry": {
 		"on_submit": "erpnext.stock.doctype.material_request.material_request.update_completed_and_requested_qty",
 		"on_cancel": "erpnext.stock.doctype.material_request.material_request.update_completed_and_requested_qty",
@@ -454,6 +468,13 @@ scheduler_events = {
 		"erpnext.manufacturing.doctype.bom_update_tool.bom_update_tool.auto_update_latest_price_in_all_boms",
 		"erpnext.crm.utils.open_leads_opportunities_based_on_todays_event",
 		"erpnext.assets.doctype.asset.depreciation.post_depreciation_entries",
+		"erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot.verify_and_repair_gl_balance_snapshot",
+		"erpnext.accounts.doctype.voucher_outstanding.voucher_outstanding.verify_and_repair_voucher_outstanding",
+		"erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint.update_stock_balance_checkpoints",
+		"erpnext.stock.doctype.batch_wise_balance.batch_wise_balance.verify_and_repair_batch_wise_balance",
+		"erpnext.stock.doctype.serial_no_state.serial_no_state.verify_and_repair_serial_no_state",
+		"erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry.reserve_stock_for_sales_orders",
+		"erpnext.setup.doctype.link_search_term.link_search_term.rebuild_outdated_link_search_indexes",
 	],
 	"monthly_long": [
 		"erpnext.accounts.deferred_revenue.process_deferred_accounting",
@@ -547,6 +568,12 @@ get_matching_queries = (
 	"erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool.get_matching_queries"
 )
 
+# returns a condition narrowing link query results down from a search index, or None to search
+# with LIKE
+get_link_search_condition = (
+	"erpnext.setup.doctype.link_search_term.link_search_term.get_link_search_condition"
+)
+
 get_amounts_not_reflected_in_system_for_bank_reconciliation_statement = "erpnext.accounts.report.bank_reconciliation_statement.bank_reconciliation_statement.get_amounts_not_reflected_in_system_for_bank_reconciliation_statement"
 
 get_payment_entries_for_bank_clearance = (
@@ -15,12 +15,30 @@ from frappe.utils import cint, cstr, flt, today
 from frappe.website.website_generator import WebsiteGenerator
 
 import erpnext
+from erpnext.manufacturing.doctype.bom.exploded_bom_cache import (
+	get_exploded_bom,
+	get_flat_bom_items,
+	invalidate_exploded_bom_cache,
+)
 from erpnext.setup.utils import get_exchange_rate
 from erpnext.stock.doctype.item.item import get_item_details
-from erpnext.stock.get_item_details import get_conversion_factor, get_price_list_rate
+from erpnext.stock.get_item_details import (
+	ItemDetailsPrefetch,
+	get_conversion_factor,
+	get_price_list_rate,
+)
 
 form_grid_templates = {"items": "templates/form_grid/item_grid.html"}
 
+OPERATION_COST_FIELDS = (
+	"hour_rate",
+	"base_hour_rate",
+	"operating_cost",
+	"base_operating_cost",
+	"cost_per_unit",
+	"base_cost_per_unit",
+)
+
 
 class BOMRecursionError(frappe.ValidationError):
 	pass
@@ -48,11 +66,14 @@ class BOMTree:
 			self.__create_tree()
 
 	def __create_tree(self):
-		bom = frappe.get_cached_doc("BOM", self.name)
+		bom = get_exploded_bom(self.name)
+		if not bom:
+			frappe.throw(_("BOM {0} does not exist").format(self.name), frappe.DoesNotExistError)
+
 		self.item_code = bom.item
 		self.bom_qty = bom.quantity
 
-		for item in bom.get("items", []):
+		for item in bom.bom_items:
 			qty = item.stock_qty / bom.quantity  # quantity per unit
 			exploded_qty = self.exploded_qty * qty
 			if item.bom_no:
@@ -267,13 +288,16 @@ class BOM(WebsiteGenerator):
 
 	def on_update(self):
 		frappe.cache().hdel("bom_children", self.name)
+		invalidate_exploded_bom_cache([self.name])
 		self.check_recursion()
 
 	def on_submit(self):
+		invalidate_exploded_bom_cache([self.name])
 		self.manage_default_bom()
 		self.update_bom_creator_status()
 
 	def on_cancel(self):
+		invalidate_exploded_bom_cache([self.name])
 		self.db_set("is_active", 0)
 		self.db_set("is_default", 0)
 
@@ -299,6 +323,7 @@ class BOM(WebsiteGenerator):
 		doc.set_status(save=True)
 
 	def on_update_after_submit(self):
+		invalidate_exploded_bom_cache([self.name])
 		self.validate_bom_links()
 		self.manage_default_bom()
 
@@ -444,9 +469,9 @@ class BOM(WebsiteGenerator):
 			rate = get_valuation_rate(arg)
 		elif arg:
 			# Customer Provided parts and Supplier sourced parts will have zero rate
-			if not frappe.db.get_value(
-				"Item", arg["item_code"], "is_customer_provided_item"
-			) and not arg.get("sourced_by_supplier"):
+			if not get_item_value(arg["item_code"], "is_customer_provided_item") and not arg.get(
+				"sourced_by_supplier"
+			):
 				if arg.get("bom_no") and self.set_rate_of_sub_assembly_item_based_on_bom:
 					rate = flt(self.get_bom_unitcost(arg["bom_no"])) * (arg.get("conversion_factor") or 1)
 				else:
@@ -509,8 +534,13 @@ class BOM(WebsiteGenerator):
 				where bom_no = %s and docstatus < 2 and parenttype='BOM'""",
 				(cost, cost, self.name),
 			)
+			invalidate_exploded_bom_cache()
 
 	def get_bom_unitcost(self, bom_no):
+		prefetch = get_bom_rate_prefetch()
+		if prefetch and bom_no in prefetch.bom_names:
+			return prefetch.bom_unit_costs.get(bom_no) or 0
+
 		bom = frappe.db.sql(
 			"""select name, base_total_cost/quantity as unit_cost from `tabBOM`
 			where is_active = 1 and name = %s""",
@@ -683,6 +713,7 @@ class BOM(WebsiteGenerator):
 		if save_updates:
 			# not via doc event, table is not regenerated and needs updation
 			self.calculate_exploded_cost()
+			invalidate_exploded_bom_cache([self.name])
 
 		old_cost = self.total_cost
 
@@ -720,6 +751,7 @@ class BOM(WebsiteGenerator):
 			self.base_operating_cost = flt(total_operating_cost * self.conversion_rate, 2)
 
 	def update_rate_and_time(self, row, update_hour_rate=False):
+		old_values = [row.get(field) for field in OPERATION_COST_FIELDS]
 		if not row.hour_rate or update_hour_rate:
 			hour_rate = flt(frappe.get_cached_value("Workstation", row.workstation, "hour_rate"))
 
@@ -735,7 +767,7 @@ class BOM(WebsiteGenerator):
 			row.cost_per_unit = row.operating_cost / (row.batch_size or 1.0)
 			row.base_cost_per_unit = row.base_operating_cost / (row.batch_size or 1.0)
 
-		if update_hour_rate:
+		if update_hour_rate and old_values != [row.get(field) for field in OPERATION_COST_FIELDS]:
 			row.db_update()
 
 	def calculate_rm_cost(self, save=False):
@@ -783,6 +815,7 @@ class BOM(WebsiteGenerator):
 		base_total_sm_cost = 0
 
 		for d in self.get("scrap_items"):
+			old_values = (d.base_rate, d.amount, d.base_amount)
 			d.base_rate = flt(d.rate, d.precision("rate")) * flt(
 				self.conversion_rate, self.precision("conversion_rate")
 			)
@@ -792,7 +825,7 @@ class BOM(WebsiteGenerator):
 			)
 			total_sm_cost += d.amount
 			base_total_sm_cost += d.base_amount
-			if save:
+			if save and old_values != (d.base_rate, d.amount, d.base_amount):
 				d.db_update()
 
 		self.scrap_material_cost = total_sm_cost
@@ -815,8 +848,11 @@ class BOM(WebsiteGenerator):
 		"Create Raw Material-Rate map for Exploded Items. Fetch rate from Items table or Subassembly BOM."
 		rm_rate_map = {}
 
+		prefetch = get_bom_rate_prefetch()
 		for item in self.get("items"):
-			if item.bom_no:
+			if item.bom_no and prefetch and item.bom_no in prefetch.bom_names:
+				rm_rate_map.update(prefetch.explosion_item_rates.get(item.bom_no, {}))
+			elif item.bom_no:
 				# Get Item-Rate from Subassembly BOM
 				explosion_items = frappe.get_all(
 					"BOM Explosion Item",
@@ -872,30 +908,15 @@ class BOM(WebsiteGenerator):
 
 	def get_child_exploded_items(self, bom_no, stock_qty):
 		"""Add all items from Flat BOM of child BOM"""
-		# Did not use qty_consumed_per_unit in the query, as it leads to rounding loss
-		child_fb_items = frappe.db.sql(
-			"""
-			SELECT
-				bom_item.item_code,
-				bom_item.item_name,
-				bom_item.description,
-				bom_item.source_warehouse,
-				bom_item.operation,
-				bom_item.stock_uom,
-				bom_item.stock_qty,
-				bom_item.rate,
-				bom_item.include_item_in_manufacturing,
-				bom_item.sourced_by_supplier,
-				bom_item.stock_qty / ifnull(bom.quantity, 1) AS qty_consumed_per_unit
-			FROM `tabBOM Explosion Item` bom_item, `tabBOM` bom
-			WHERE
-				bom_item.parent = bom.name
-				AND bom.name = %s
-				AND bom.docstatus = 1
-		""",
-			bom_no,
-			as_dict=1,
-		)
+		child_bom = get_exploded_bom(bom_no)
+		if not child_bom or child_bom.docstatus != 1:
+			return
+
+		# Did not use qty_consumed_per_unit of the rows, as it leads to rounding loss
+		child_fb_items = [
+			frappe._dict(row, qty_consumed_per_unit=flt(row.stock_qty) / flt(child_bom.quantity or 1))
+			for row in child_bom.exploded_items
+		]
 
 		for d in child_fb_items:
 			self.add_to_cur_exploded_items(
@@ -921,6 +942,7 @@ class BOM(WebsiteGenerator):
 
 		if save:
 			frappe.db.sql("""delete from `tabBOM Explosion Item` where parent=%s""", self.name)
+			invalidate_exploded_bom_cache([self.name])
 
 		for d in sorted(self.cur_exploded_items, key=itemgetter(0)):
 			ch = self.append("exploded_items", {})
@@ -995,7 +1017,7 @@ def get_bom_item_rate(args, bom_doc):
 	elif bom_doc.rm_cost_as_per == "Last Purchase Rate":
 		rate = (
 			flt(args.get("last_purchase_rate"))
-			or flt(frappe.db.get_value("Item", args["item_code"], "last_purchase_rate"))
+			or flt(get_item_value(args["item_code"], "last_purchase_rate"))
 		) * (args.get("conversion_factor") or 1)
 	elif bom_doc.rm_cost_as_per == "Price List":
 		if not bom_doc.buying_price_list:
@@ -1038,6 +1060,14 @@ def get_valuation_rate(data):
 	item_code, company = data.get("item_code"), data.get("company")
 	valuation_rate = 0.0
 
+	prefetch = get_bom_rate_prefetch()
+	if (
+		prefetch
+		and item_code in prefetch.items
+		and not (data.get("set_rate_based_on_warehouse") and data.get("warehouse"))
+	):
+		return prefetch.get_valuation_rate(item_code, company)
+
 	bin_table = frappe.qb.DocType("Bin")
 	wh_table = frappe.qb.DocType("Warehouse")
 	item_valuation = (
@@ -1064,18 +1094,7 @@ def get_valuation_rate(data):
 
 	if (valuation_rate is not None) and valuation_rate <= 0:
 		# Explicit null value check. If None, Bins don't exist, neither does SLE
-		sle = frappe.qb.DocType("Stock Ledger Entry")
-		last_val_rate = (
-			frappe.qb.from_(sle)
-			.select(sle.valuation_rate)
-			.where((sle.item_code == item_code) & (sle.valuation_rate > 0) & (sle.is_cancelled == 0))
-			.orderby(sle.posting_date, order=frappe.qb.desc)
-			.orderby(sle.posting_time, order=frappe.qb.desc)
-			.orderby(sle.creation, order=frappe.qb.desc)
-			.limit(1)
-		).run(as_dict=True)
-
-		valuation_rate = flt(last_val_rate[0].get("valuation_rate")) if last_val_rate else 0
+		valuation_rate = get_last_valuation_rate(item_code)
 
 	if not valuation_rate:
 		valuation_rate = frappe.db.get_value("Item", item_code, "valuation_rate")
@@ -1083,6 +1102,145 @@ def get_valuation_rate(data):
 	return flt(valuation_rate)
 
 
+def get_last_valuation_rate(item_code):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	last_val_rate = (
+		frappe.qb.from_(sle)
+		.select(sle.valuation_rate)
+		.where((sle.item_code == item_code) & (sle.valuation_rate > 0) & (sle.is_cancelled == 0))
+		.orderby(sle.posting_date, order=frappe.qb.desc)
+		.orderby(sle.posting_time, order=frappe.qb.desc)
+		.orderby(sle.creation, order=frappe.qb.desc)
+		.limit(1)
+	).run(as_dict=True)
+
+	return flt(last_val_rate[0].get("valuation_rate")) if last_val_rate else 0
+
+
+class BOMRatePrefetch:
+	"""Rates read while costing a set of BOMs, loaded in a few queries. Used by the
+	BOM Update Tool, which costs BOMs level by level, so the sub-assembly BOMs of a
+	set are already costed."""
+
+	def __init__(self, bom_docs):
+		self.items = {}
+		self.valuation_rates = {}
+		self.last_valuation_rates = {}
+		self.bom_names = set()
+		self.bom_unit_costs = {}
+		self.explosion_item_rates = {}
+
+		item_codes = set()
+		for bom_doc in bom_docs:
+			for row in bom_doc.get("items") + bom_doc.get("scrap_items"):
+				item_codes.add(row.item_code)
+				if row.get("bom_no"):
+					self.bom_names.add(row.bom_no)
+
+		if item_codes:
+			self.set_items(item_codes)
+			self.set_valuation_rates(item_codes, {bom_doc.company for bom_doc in bom_docs})
+
+		if self.bom_names:
+			self.set_bom_rates()
+
+	def set_items(self, item_codes):
+		for item in frappe.get_all(
+			"Item",
+			filters={"name": ("in", list(item_codes))},
+			fields=["name", "is_customer_provided_item", "last_purchase_rate", "valuation_rate"],
+		):
+			self.items[item.name] = item
+
+	def set_valuation_rates(self, item_codes, companies):
+		from frappe.query_builder.functions import Sum
+
+		bin_table = frappe.qb.DocType("Bin")
+		wh_table = frappe.qb.DocType("Warehouse")
+		bins = (
+			frappe.qb.from_(bin_table)
+			.join(wh_table)
+			.on(bin_table.warehouse == wh_table.name)
+			.select(
+				bin_table.item_code,
+				wh_table.company,
+				Sum(bin_table.stock_value).as_("stock_value"),
+				Sum(bin_table.actual_qty).as_("actual_qty"),
+			)
+			.where(bin_table.item_code.isin(list(item_codes)) & wh_table.company.isin(list(companies)))
+			.groupby(bin_table.item_code, wh_table.company)
+		).run(as_dict=True)
+
+		for row in bins:
+			valuation_rate = flt(row.stock_value) / flt(row.actual_qty) if flt(row.actual_qty) else 0.0
+			self.valuation_rates[(row.item_code, row.company)] = valuation_rate
+
+	def set_bom_rates(self):
+		bom_names = list(self.bom_names)
+		for bom in frappe.get_all(
+			"BOM",
+			filters={"name": ("in", bom_names), "is_active": 1},
+			fields=["name", "base_total_cost", "quantity"],
+		):
+			self.bom_unit_costs[bom.name] = flt(bom.base_total_cost) / flt(bom.quantity or 1)
+
+		for row in frappe.get_all(
+			"BOM Explosion Item",
+			filters={"parent": ("in", bom_names)},
+			fields=["parent", "item_code", "rate"],
+			order_by=None,
+		):
+			self.explosion_item_rates.setdefault(row.parent, {})[row.item_code] = flt(row.rate)
+
+	def get_valuation_rate(self, item_code, company):
+		"""Same as `get_valuation_rate`, with the last valuation rate read once per item"""
+		valuation_rate = self.valuation_rates.get((item_code, company))
+
+		if (valuation_rate is not None) and valuation_rate <= 0:
+			if item_code not in self.last_valuation_rates:
+				self.last_valuation_rates[item_code] = get_last_valuation_rate(item_code)
+
+			valuation_rate = self.last_valuation_rates[item_code]
+
+		if not valuation_rate:
+			valuation_rate = self.items[item_code].valuation_rate
+
+		return flt(valuation_rate)
+
+
+def get_bom_rate_prefetch():
+	return frappe.flags.get("bom_rate_prefetch")
+
+
+def set_bom_rate_prefetch(bom_docs):
+	"""Read the rates of the raw materials of `bom_docs` in bulk, until called with None.
+	Item Prices of BOMs costed as per Price List are read through `ItemDetailsPrefetch`."""
+	if not bom_docs:
+		frappe.flags.bom_rate_prefetch = None
+		frappe.flags.item_details_prefetch = None
+		return
+
+	frappe.flags.bom_rate_prefetch = BOMRatePrefetch(bom_docs)
+
+	args_list = [
+		frappe._dict(
+			item_code=row.item_code, price_list=bom_doc.buying_price_list, transaction_type="buying"
+		)
+		for bom_doc in bom_docs
+		if bom_doc.rm_cost_as_per == "Price List" and bom_doc.buying_price_list
+		for row in bom_doc.get("items")
+	]
+	frappe.flags.item_details_prefetch = ItemDetailsPrefetch(args_list) if args_list else None
+
+
+def get_item_value(item_code, fieldname):
+	prefetch = get_bom_rate_prefetch()
+	if prefetch and item_code in prefetch.items:
+		return prefetch.items[item_code].get(fieldname)
+
+	return frappe.db.get_value("Item", item_code, fieldname)
+
+
 def get_list_context(context):
 	context.title = _("Bill of Materials")
 	# context.introduction = _('Boms')
@@ -1099,72 +1257,48 @@ def get_bom_items_as_dict(
 ):
 	item_dict = {}
 
-	# Did not use qty_consumed_per_unit in the query, as it leads to rounding loss
-	query = """select
-				bom_item.item_code,
-				bom_item.idx,
-				item.item_name,
-				sum(bom_item.{qty_field}/ifnull(bom.quantity, 1)) * %(qty)s as qty,
-				item.image,
-				bom.project,
-				bom_item.rate,
-				sum(bom_item.{qty_field}/ifnull(bom.quantity, 1)) * bom_item.rate * %(qty)s as amount,
-				item.stock_uom,
-				item.item_group,
-				item.allow_alternative_item,
-				item_default.default_warehouse,
-				item_default.expense_account as expense_account,
-				item_default.buying_cost_center as cost_center
-				{select_columns}
-			from
-				`tab{table}` bom_item
-				JOIN `tabBOM` bom ON bom_item.parent = bom.name
-				JOIN `tabItem` item ON item.name = bom_item.item_code
-				LEFT JOIN `tabItem Default` item_default
-					ON item_default.parent = item.name and item_default.company = %(company)s
-			where
-				bom_item.docstatus < 2
-				and bom.name = %(bom)s
-				and item.is_stock_item in (1, {is_stock_item})
-				{where_conditions}
-				group by item_code, stock_uom
-				order by idx"""
-
-	is_stock_item = 0 if include_non_stock_items else 1
-	if cint(fetch_exploded):
-		query = query.format(
-			table="BOM Explosion Item",
-			where_conditions="",
-			is_stock_item=is_stock_item,
-			qty_field="stock_qty",
-			select_columns=""", bom_item.source_warehouse, bom_item.operation,
-				bom_item.include_item_in_manufacturing, bom_item.description, bom_item.rate, bom_item.sourced_by_supplier,
-				(Select idx from `tabBOM Item` where item_code = bom_item.item_code and parent = %(parent)s limit 1) as idx""",
-		)
-
-		items = frappe.db.sql(
-			query, {"parent": bom, "qty": qty, "bom": bom, "company": company}, as_dict=True
+	if cint(fetch_exploded) or not fetch_scrap_items:
+		items = get_flat_bom_items_with_details(
+			bom,
+			company,
+			qty=qty,
+			fetch_exploded=cint(fetch_exploded),
+			include_non_stock_items=include_non_stock_items,
+			fetch_qty_in_stock_uom=fetch_qty_in_stock_uom,
 		)
-	elif fetch_scrap_items:
-		query = query.format(
-			table="BOM Scrap Item",
-			where_conditions="",
-			select_columns=", item.description",
-			is_stock_item=is_stock_item,
-			qty_field="stock_qty",
-		)
-
-		items = frappe.db.sql(query, {"qty": qty, "bom": bom, "company": company}, as_dict=True)
 	else:
-		query = query.format(
-			table="BOM Item",
-			where_conditions="",
-			is_stock_item=is_stock_item,
-			qty_field="stock_qty" if fetch_qty_in_stock_uom else "qty",
-			select_columns=""", bom_item.uom, bom_item.conversion_factor, bom_item.source_warehouse,
-				bom_item.operation, bom_item.include_item_in_manufacturing, bom_item.sourced_by_supplier,
-				bom_item.description, bom_item.base_rate as rate """,
+		# Did not use qty_consumed_per_unit in the query, as it leads to rounding loss
+		query = """select
+					bom_item.item_code,
+					bom_item.idx,
+					item.item_name,
+					sum(bom_item.stock_qty/ifnull(bom.quantity, 1)) * %(qty)s as qty,
+					item.image,
+					bom.project,
+					bom_item.rate,
+					sum(bom_item.stock_qty/ifnull(bom.quantity, 1)) * bom_item.rate * %(qty)s as amount,
+					item.stock_uom,
+					item.item_group,
+					item.allow_alternative_item,
+					item_default.default_warehouse,
+					item_default.expense_account as expense_account,
+					item_default.buying_cost_center as cost_center,
+					item.description
+				from
+					`tabBOM Scrap Item` bom_item
+					JOIN `tabBOM` bom ON bom_item.parent = bom.name
+					JOIN `tabItem` item ON item.name = bom_item.item_code
+					LEFT JOIN `tabItem Default` item_default
+						ON item_default.parent = item.name and item_default.company = %(company)s
+				where
+					bom_item.docstatus < 2
+					and bom.name = %(bom)s
+					and item.is_stock_item in (1, {is_stock_item})
+					group by item_code, stock_uom
+					order by idx""".format(
+			is_stock_item=0 if include_non_stock_items else 1
 		)
+
 		items = frappe.db.sql(query, {"qty": qty, "bom": bom, "company": company}, as_dict=True)
 
 	for item in items:
@@ -1186,6 +1320,98 @@ def get_bom_items_as_dict(
 	return item_dict
 
 
+def get_flat_bom_items_with_details(
+	bom,
+	company,
+	qty=1,
+	fetch_exploded=1,
+	include_non_stock_items=False,
+	fetch_qty_in_stock_uom=True,
+):
+	"""Items of the cached BOM Item (or BOM Explosion Item) rows of `bom`, with their
+	Item and Item Default fields, ordered by idx"""
+	bom_doc = get_exploded_bom(bom)
+	if not bom_doc or bom_doc.docstatus == 2:
+		return []
+
+	rows = get_flat_bom_items(
+		bom_doc,
+		qty,
+		fetch_exploded=fetch_exploded,
+		qty_field="stock_qty" if (fetch_exploded or fetch_qty_in_stock_uom) else "qty",
+		group_by_uom=False,
+	)
+
+	item = frappe.qb.DocType("Item")
+	item_default = frappe.qb.DocType("Item Default")
+	item_details = {}
+	if rows:
+		item_details = {
+			d.item_code: d
+			for d in (
+				frappe.qb.from_(item)
+				.left_join(item_default)
+				.on((item_default.parent == item.name) & (item_default.company == company))
+				.select(
+					item.name.as_("item_code"),
+					item.item_name,
+					item.image,
+					item.stock_uom,
+					item.item_group,
+					item.allow_alternative_item,
+					item.is_stock_item,
+					item_default.default_warehouse,
+					item_default.expense_account,
+					item_default.buying_cost_center.as_("cost_center"),
+				)
+				.where(item.name.isin([row.item_code for row in rows]))
+			).run(as_dict=True)
+		}
+
+	# exploded items are ordered as the BOM Item they come from
+	bom_item_idx = {}
+	for row in bom_doc.bom_items:
+		bom_item_idx.setdefault(row.item_code, row.idx)
+
+	items = []
+	for row in rows:
+		details = item_details.get(row.item_code)
+		if not details or not (details.is_stock_item or include_non_stock_items):
+			continue
+
+		item = frappe._dict(
+			{
+				"item_code": row.item_code,
+				"idx": bom_item_idx.get(row.item_code) if fetch_exploded else row.idx,
+				"item_name": details.item_name,
+				"qty": row.qty,
+				"image": details.image,
+				"project": bom_doc.project,
+				# for BOM Items, rate is in company currency but amount in BOM currency
+				"rate": row.rate if fetch_exploded else row.base_rate,
+				"amount": flt(row.qty) * flt(row.rate),
+				"stock_uom": details.stock_uom,
+				"item_group": details.item_group,
+				"allow_alternative_item": details.allow_alternative_item,
+				"default_warehouse": details.default_warehouse,
+				"expense_account": details.expense_account,
+				"cost_center": details.cost_center,
+				"source_warehouse": row.source_warehouse,
+				"operation": row.operation,
+				"include_item_in_manufacturing": row.include_item_in_manufacturing,
+				"sourced_by_supplier": row.sourced_by_supplier,
+				"description": row.description,
+			}
+		)
+
+		if not fetch_exploded:
+			item.update({"uom": row.uom, "conversion_factor": row.conversion_factor})
+
+		items.append(item)
+
+	return sorted(items, key=lambda d: (d.idx is not None, d.idx or 0))
+
+
 @frappe.whitelist()
 def get_bom_items(bom, company, qty=1, fetch_exploded=1):
 	items = get_bom_items_as_dict(
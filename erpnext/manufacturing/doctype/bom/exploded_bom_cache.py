@@ -0,0 +1,158 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: GNU General Public License v3. See license.txt
+
+"""Cache of the BOM Item and BOM Explosion Item rows of BOMs.
+
+Rows are read once per BOM, kept in Redis and in the worker process, and flattened into
+quantities per stock UOM by Production Plan, Work Order and the BOM Stock Report instead
+of querying the BOM tables for every BOM of every request. A BOM is dropped whenever it is
+saved, submitted, cancelled or costed, and the whole cache when BOMs are replaced."""
+
+import functools
+
+import frappe
+from frappe.utils import flt
+
+CACHE_KEY = "exploded_bom"
+VERSION_CACHE_KEY = "exploded_bom_version"
+
+BOM_FIELDS = ("name", "item", "quantity", "docstatus", "is_active", "project")
+ROW_FIELDS = {
+	"bom_items": (
+		"BOM Item",
+		(
+			"item_code",
+			"item_name",
+			"description",
+			"idx",
+			"bom_no",
+			"qty",
+			"stock_qty",
+			"uom",
+			"stock_uom",
+			"conversion_factor",
+			"rate",
+			"base_rate",
+			"source_warehouse",
+			"operation",
+			"include_item_in_manufacturing",
+			"sourced_by_supplier",
+		),
+	),
+	"exploded_items": (
+		"BOM Explosion Item",
+		(
+			"item_code",
+			"item_name",
+			"description",
+			"idx",
+			"stock_qty",
+			"stock_uom",
+			"rate",
+			"source_warehouse",
+			"operation",
+			"include_item_in_manufacturing",
+			"sourced_by_supplier",
+		),
+	),
+}
+
+# BOMs loaded in this process, by site, with the cache version they were loaded at
+_local_boms = {}
+
+
+def get_exploded_bom(bom_no):
+	"""BOM fields with its `bom_items` and `exploded_items` rows, None if there is no such BOM.
+	The returned rows are shared, and must not be changed."""
+	return get_exploded_boms([bom_no]).get(bom_no)
+
+
+def get_exploded_boms(bom_nos):
+	version = frappe.cache().get_value(
+		VERSION_CACHE_KEY, generator=lambda: frappe.generate_hash(length=10)
+	)
+
+	local_cache = _local_boms.get(frappe.local.site)
+	if not local_cache or local_cache[0] != version:
+		local_cache = _local_boms[frappe.local.site] = (version, {})
+
+	boms = local_cache[1]
+	missing = []
+	for bom_no in set(bom_nos):
+		if not bom_no or bom_no in boms:
+			continue
+
+		bom = frappe.cache().hget(CACHE_KEY, bom_no)
+		if bom is None:
+			missing.append(bom_no)
+		else:
+			boms[bom_no] = bom
+
+	if missing:
+		for bom_no, bom in load_boms(missing).items():
+			frappe.cache().hset(CACHE_KEY, bom_no, bom)
+			boms[bom_no] = bom
+
+	return {bom_no: boms[bom_no] for bom_no in bom_nos if boms.get(bom_no)}
+
+
+def load_boms(bom_nos):
+	boms = {}
+	for bom in frappe.get_all("BOM", filters={"name": ("in", bom_nos)}, fields=list(BOM_FIELDS)):
+		boms[bom.name] = frappe._dict(bom, bom_items=[], exploded_items=[])
+
+	if not boms:
+		return boms
+
+	for parentfield, (doctype, fields) in ROW_FIELDS.items():
+		for row in frappe.get_all(
+			doctype,
+			filters={"parent": ("in", list(boms)), "parenttype": "BOM"},
+			fields=["parent", *fields],
+			order_by="idx",
+		):
+			boms[row.pop("parent")][parentfield].append(row)
+
+	return boms
+
+
+def get_flat_bom_items(bom, qty=1, fetch_exploded=True, qty_field="stock_qty", group_by_uom=True):
+	"""Copies of the rows of `bom` grouped by item code (and stock UOM), in the order of their
+	first row, with `qty` set to the quantity required to make `qty` units of the BOM.
+
+	:param bom: BOM as returned by `get_exploded_bom`
+	:param fetch_exploded: use the BOM Explosion Item rows instead of the BOM Item rows"""
+	rows = {}
+	for row in bom.exploded_items if fetch_exploded else bom.bom_items:
+		key = (row.item_code, row.stock_uom) if group_by_uom else row.item_code
+		required_qty = flt(row.get(qty_field)) / flt(bom.quantity or 1) * flt(qty)
+
+		if key in rows:
+			rows[key].qty += required_qty
+		else:
+			rows[key] = frappe._dict(row, qty=required_qty)
+
+	return list(rows.values())
+
+
+def clear_exploded_bom_cache(bom_nos=None):
+	"""Drop `bom_nos`, or every BOM if not given"""
+	if bom_nos:
+		for bom_no in bom_nos:
+			frappe.cache().hdel(CACHE_KEY, bom_no)
+		frappe.cache().delete_value(VERSION_CACHE_KEY)
+	else:
+		frappe.cache().delete_value([CACHE_KEY, VERSION_CACHE_KEY])
+
+	_local_boms.pop(frappe.local.site, None)
+
+
+def invalidate_exploded_bom_cache(bom_nos=None):
+	"""Drop the BOMs now, and once more after commit or rollback, so that rows read from
+	uncommitted data by another process are not kept"""
+	bom_nos = list(bom_nos) if bom_nos else None
+	callback = functools.partial(clear_exploded_bom_cache, bom_nos)
+
+	clear_exploded_bom_cache(bom_nos)
+	frappe.db.after_commit.add(callback)
+	frappe.db.after_rollback.add(callback)
@@ -189,6 +189,16 @@ class TestBOM(FrappeTestCase):
 		self.assertEqual(bom.base_raw_material_cost, 27000)
 		self.assertEqual(bom.base_total_cost, 33000)
 
+		from erpnext.manufacturing.doctype.bom.bom import get_bom_items_as_dict
+
+		# rate in company currency, amount in BOM currency
+		items_dict = get_bom_items_as_dict(
+			bom=bom.name, company="_Test Company", qty=1, fetch_exploded=0
+		)
+		item = items_dict["_Test Item Home Desktop Manufactured"]
+		self.assertEqual(item.rate, 3000)
+		self.assertEqual(item.amount, 150)
+
 	@timeout
 	def test_bom_cost_multi_uom_based_on_valuation_rate(self):
 		bom = frappe.copy_doc(test_records[2])
@@ -766,6 +776,27 @@ class TestBOM(FrappeTestCase):
 		self.assertTrue("_Test RM Item 2 Fixed Asset Item" not in items)
 		self.assertTrue("_Test RM Item 3 Manufacture Item" in items)
 
+	def test_exploded_bom_cache(self):
+		from erpnext.manufacturing.doctype.bom.exploded_bom_cache import (
+			get_exploded_bom,
+			get_flat_bom_items,
+		)
+
+		bom_tree = {"Assembly": {"SubAssembly1": {"ChildPart1": {}, "ChildPart2": {}}, "ChildPart3": {}}}
+		parent_bom = create_nested_bom(bom_tree, prefix="_Test Cached BOM ")
+
+		cached_bom = get_exploded_bom(parent_bom.name)
+		self.assertEqual(cached_bom.docstatus, 1)
+		self.assertEqual(len(cached_bom.bom_items), 2)
+		self.assertEqual(
+			{row.item_code: row.qty for row in get_flat_bom_items(cached_bom, qty=2)},
+			{row.item_code: flt(row.stock_qty) * 2 for row in parent_bom.exploded_items},
+		)
+
+		# dropped from the cache on cancel
+		parent_bom.cancel()
+		self.assertEqual(get_exploded_bom(parent_bom.name).docstatus, 2)
+
 
 def get_default_bom(item_code="_Test FG Item 2"):
 	return frappe.db.get_value("BOM", {"item": item_code, "is_active": 1, "is_default": 1})
@@ -19,6 +19,10 @@ from erpnext.manufacturing.doctype.bom_update_log.bom_updation_utils import (
 )
 
 
+# BOMs of a level costed by one background job, so that a level is shared by several workers
+BOM_COST_BATCH_SIZE = 1_000
+
+
 class BOMMissingError(frappe.ValidationError):
 	pass
 
@@ -183,15 +187,15 @@ def process_boms_cost_level_wise(
 def queue_bom_cost_jobs(
 	current_boms_list: List[str], update_doc: "BOMUpdateLog", current_level: int
 ) -> None:
-	"Queue batches of 20k BOMs of the same level to process parallelly"
+	"Queue batches of BOMs of the same level to process parallelly"
 	batch_no = 0
 
 	while current_boms_list:
 		batch_no += 1
-		batch_size = 7_000
-		boms_to_process = current_boms_list[:batch_size]  # slice out batch of 20k BOMs
+		batch_size = BOM_COST_BATCH_SIZE
+		boms_to_process = current_boms_list[:batch_size]  # slice out a batch of BOMs
 
-		# update list to exclude 20K (queued) BOMs
+		# update list to exclude queued BOMs
 		current_boms_list = current_boms_list[batch_size:] if len(current_boms_list) > batch_size else []
 
 		batch_row = update_doc.append(
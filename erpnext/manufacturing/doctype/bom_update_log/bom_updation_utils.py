@@ -12,6 +12,19 @@ if TYPE_CHECKING:
 import frappe
 from frappe import _
 
+from erpnext.manufacturing.doctype.bom.exploded_bom_cache import invalidate_exploded_bom_cache
+
+BOM_COST_FIELDS = (
+	"operating_cost",
+	"base_operating_cost",
+	"raw_material_cost",
+	"base_raw_material_cost",
+	"scrap_material_cost",
+	"base_scrap_material_cost",
+	"total_cost",
+	"base_total_cost",
+)
+
 
 def replace_bom(boms: Dict, log_name: str) -> None:
 	"Replace current BOM with new BOM in parent BOMs."
@@ -23,6 +36,7 @@ def replace_bom(boms: Dict, log_name: str) -> None:
 	update_new_bom_in_bom_items(unit_cost, current_bom, new_bom)
 
 	frappe.cache().delete_key("bom_children")
+	invalidate_exploded_bom_cache()
 	parent_boms = get_ancestor_boms(new_bom)
 
 	for bom in parent_boms:
@@ -115,14 +129,28 @@ def get_bom_unit_cost(bom_name: str) -> float:
 
 
 def update_cost_in_boms(bom_list: List[str]) -> None:
-	"Updates cost in given BOMs. Returns current and total updated BOMs."
+	"""Updates cost in given BOMs. Rates are read in bulk for every 50 BOMs, and only
+	BOMs whose cost changed are written back."""
+	from erpnext.manufacturing.doctype.bom.bom import set_bom_rate_prefetch
+
+	batch_size = 50
+	for index in range(0, len(bom_list), batch_size):
+		bom_docs = [
+			frappe.get_doc("BOM", bom, for_update=True) for bom in bom_list[index : index + batch_size]
+		]
+
+		set_bom_rate_prefetch(bom_docs)
+		try:
+			for bom_doc in bom_docs:
+				existing_cost = [bom_doc.get(field) for field in BOM_COST_FIELDS]
+				bom_doc.calculate_cost(save_updates=True, update_hour_rate=True)
+
+				if existing_cost != [bom_doc.get(field) for field in BOM_COST_FIELDS]:
+					bom_doc.db_update()
+		finally:
+			set_bom_rate_prefetch(None)
 
-	for index, bom in enumerate(bom_list):
-		bom_doc = frappe.get_doc("BOM", bom, for_update=True)
-		bom_doc.calculate_cost(save_updates=True, update_hour_rate=True)
-		bom_doc.db_update()
-
-		if (index % 50 == 0) and not frappe.flags.in_test:
+		if not frappe.flags.in_test:
 			frappe.db.commit()  # nosemgrep
 
 
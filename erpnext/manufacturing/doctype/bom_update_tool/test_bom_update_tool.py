@@ -3,6 +3,7 @@
 
 import frappe
 from frappe.tests.utils import FrappeTestCase, timeout
+from frappe.utils import flt
 
 from erpnext.manufacturing.doctype.bom_update_log.test_bom_update_log import (
 	update_cost_in_all_boms_in_test,
@@ -64,3 +65,29 @@ class TestBOMUpdateTool(FrappeTestCase):
 
 		doc.load_from_db()
 		self.assertEqual(doc.total_cost, 200)
+
+	def test_bom_cost_with_rate_prefetch(self):
+		"Rates read in bulk while costing BOMs are the same as rates read per item."
+		from erpnext.manufacturing.doctype.bom.bom import set_bom_rate_prefetch
+
+		bom_names = frappe.get_all("BOM", {"docstatus": 1}, pluck="name", order_by="name")
+		expected = {}
+		for bom_name in bom_names:
+			bom_doc = frappe.get_doc("BOM", bom_name)
+			bom_doc.calculate_cost()
+			expected[bom_name] = get_rounded_cost(bom_doc)
+
+		bom_docs = [frappe.get_doc("BOM", bom_name) for bom_name in bom_names]
+		set_bom_rate_prefetch(bom_docs)
+		try:
+			for bom_doc in bom_docs:
+				bom_doc.calculate_cost()
+				self.assertEqual(get_rounded_cost(bom_doc), expected[bom_doc.name])
+		finally:
+			set_bom_rate_prefetch(None)
+
+		self.assertIsNone(frappe.flags.bom_rate_prefetch)
+
+
+def get_rounded_cost(bom_doc):
+	return flt(bom_doc.total_cost, 6), [flt(row.rate, 6) for row in bom_doc.items]
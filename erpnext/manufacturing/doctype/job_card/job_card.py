@@ -1,8 +1,9 @@
 # Copyright (c) 2021, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
+import bisect
 import datetime
 import json
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 
 import frappe
 from frappe import _, bold
@@ -27,6 +28,9 @@ from frappe.utils import (
 from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings import (
 	get_mins_between_operations,
 )
+from erpnext.manufacturing.doctype.workstation.workstation_calendar import (
+	get_workstation_calendar,
+)
 from erpnext.manufacturing.doctype.workstation_type.workstation_type import get_workstations
 
 
@@ -242,9 +246,23 @@ class JobCard(Document):
 	def get_overlap_for(self, args, check_next_available_slot=False):
 		time_logs = []
 
-		time_logs.extend(self.get_time_logs(args, "Job Card Time Log", check_next_available_slot))
+		calendar = None
+		if args.from_time and args.to_time and not (args.get("employee") or args.name or args.parent):
+			# while scheduling a Work Order, from the busy time loaded once for all its operations
+			calendar = get_workstation_calendar(
+				self.workstation_type,
+				self.workstation,
+				min(get_datetime(args.from_time), get_datetime(args.to_time)),
+			)
+
+		if calendar:
+			time_logs = calendar.get_time_logs(args.from_time, args.to_time, check_next_available_slot)
+		else:
+			time_logs.extend(self.get_time_logs(args, "Job Card Time Log", check_next_available_slot))
 
-		time_logs.extend(self.get_time_logs(args, "Job Card Scheduled Time", check_next_available_slot))
+			time_logs.extend(
+				self.get_time_logs(args, "Job Card Scheduled Time", check_next_available_slot)
+			)
 
 		if not time_logs:
 			return {}
@@ -272,37 +290,37 @@ class JobCard(Document):
 		return time_logs[-1]
 
 	def has_overlap(self, production_capacity, time_logs):
-		overlap = False
 		if production_capacity == 1 and len(time_logs) > 0:
 			return True
 
 		# Check overlap exists or not between the overlapping time logs with the current Job Card
-		for row in time_logs:
-			count = 1
-			for next_row in time_logs:
-				if row.name == next_row.name:
-					continue
-
-				if (
-					(
-						get_datetime(next_row.from_time) >= get_datetime(row.from_time)
-						and get_datetime(next_row.from_time) <= get_datetime(row.to_time)
-					)
-					or (
-						get_datetime(next_row.to_time) >= get_datetime(row.from_time)
-						and get_datetime(next_row.to_time) <= get_datetime(row.to_time)
-					)
-					or (
-						get_datetime(next_row.from_time) <= get_datetime(row.from_time)
-						and get_datetime(next_row.to_time) >= get_datetime(row.to_time)
-					)
-				):
-					count += 1
+		# by counting the time logs of other Job Cards overlapping each one, from the sorted start
+		# and end times instead of comparing every pair
+		intervals = [
+			(get_datetime(row.from_time), get_datetime(row.to_time), row.name) for row in time_logs
+		]
+
+		def get_sorted_times(intervals):
+			return sorted(x[0] for x in intervals), sorted(x[1] for x in intervals)
+
+		intervals_by_job_card = defaultdict(list)
+		for interval in intervals:
+			intervals_by_job_card[interval[2]].append(interval)
+
+		all_times = get_sorted_times(intervals)
+		job_card_times = {name: get_sorted_times(x) for name, x in intervals_by_job_card.items()}
+
+		for from_time, to_time, name in intervals:
+			count = (
+				1
+				+ get_overlapping_count(*all_times, from_time, to_time)
+				- get_overlapping_count(*job_card_times[name], from_time, to_time)
+			)
 
 			if count > production_capacity:
 				return True
 
-		return overlap
+		return False
 
 	def get_time_logs(self, args, doctype, check_next_available_slot=False):
 		jc = frappe.qb.DocType("Job Card")
@@ -1032,6 +1050,12 @@ class JobCard(Document):
 		return False
 
 
+def get_overlapping_count(from_times, to_times, from_time, to_time):
+	"""Number of intervals, by their sorted start and end times, overlapping `from_time` to
+	`to_time`: the ones not starting after it ends, less the ones ending before it starts"""
+	return bisect.bisect_right(from_times, to_time) - bisect.bisect_left(to_times, from_time)
+
+
 @frappe.whitelist()
 def make_time_log(args):
 	if isinstance(args, str):
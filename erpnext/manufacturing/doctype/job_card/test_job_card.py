@@ -177,6 +177,148 @@ class TestJobCard(FrappeTestCase):
 		jc2.save()
 		self.assertTrue(jc2.name)
 
+	def test_job_card_overlap_count_with_capacity(self):
+		def time_log(job_card, from_time, to_time):
+			return frappe._dict(
+				{"name": job_card, "from_time": f"2021-01-01 {from_time}", "to_time": f"2021-01-01 {to_time}"}
+			)
+
+		jc = frappe.new_doc("Job Card")
+
+		# time logs touching at their ends overlap
+		time_logs = [
+			time_log("JC-1", "04:00:00", "08:00:00"),
+			time_log("JC-2", "08:00:00", "09:00:00"),
+			time_log("JC-3", "02:00:00", "04:00:00"),
+		]
+		self.assertTrue(jc.has_overlap(2, time_logs))
+		self.assertFalse(jc.has_overlap(3, time_logs))
+
+		# time logs of the same job card are not counted
+		time_logs = [
+			time_log("JC-1", "00:00:00", "04:00:00"),
+			time_log("JC-1", "04:00:00", "08:00:00"),
+			time_log("JC-2", "02:00:00", "03:00:00"),
+		]
+		self.assertFalse(jc.has_overlap(2, time_logs))
+		self.assertTrue(jc.has_overlap(1, time_logs))
+
+	@change_settings(
+		"Manufacturing Settings",
+		{"disable_capacity_planning": 0, "capacity_planning_for_days": 30, "mins_between_operations": 0},
+	)
+	def test_schedule_job_cards_from_workstation_calendars(self):
+		from unittest.mock import patch
+
+		from erpnext.manufacturing.doctype.operation.test_operation import make_operation
+
+		row = {"operation": "Test Operation A", "workstation": "_Test Workstation A"}
+		make_workstation(row)
+		make_operation(row)
+
+		# two operations of two batches each, on their own workstations
+		bom = frappe.copy_doc(frappe.get_test_records("BOM")[2])
+		bom.append(
+			"operations",
+			{
+				"operation": "Test Operation A",
+				"workstation": "_Test Workstation A",
+				"hour_rate": 100,
+				"time_in_mins": 60,
+			},
+		)
+		for operation in bom.operations:
+			operation.batch_size = 2
+		bom.insert()
+		bom.submit()
+
+		planned_start_date = f"{add_to_date(today(), days=1)} 10:00:00"
+
+		def get_planned_times():
+			"""Scheduled time of the Job Cards of two overlapping Work Orders"""
+			planned_times = []
+			for _i in range(2):
+				work_order = make_wo_order_test_record(
+					item="_Test FG Item 2", bom_no=bom.name, qty=4, planned_start_date=planned_start_date
+				)
+
+				job_cards = frappe.get_all(
+					"Job Card", filters={"work_order": work_order.name}, order_by="creation", pluck="name"
+				)
+				self.assertEqual(len(job_cards), 4)
+				for job_card in job_cards:
+					planned_times.extend(
+						(str(row.from_time), str(row.to_time))
+						for row in frappe.get_doc("Job Card", job_card).scheduled_time_logs
+					)
+
+			return planned_times
+
+		frappe.db.savepoint("workstation_calendars")
+		planned_times = get_planned_times()
+		frappe.db.rollback(save_point="workstation_calendars")
+
+		# time logs queried for every slot tried, as without the calendars
+		with patch(
+			"erpnext.manufacturing.doctype.job_card.job_card.get_workstation_calendar",
+			return_value=None,
+		):
+			self.assertEqual(get_planned_times(), planned_times)
+
+	@change_settings(
+		"Manufacturing Settings", {"disable_capacity_planning": 0, "capacity_planning_for_days": 30}
+	)
+	def test_workstation_calendar_time_logs(self):
+		from erpnext.manufacturing.doctype.workstation.workstation_calendar import (
+			add_to_workstation_calendars,
+			get_workstation_calendar,
+		)
+
+		work_order = make_wo_order_test_record(item="_Test FG Item 2", qty=2)
+		job_card = frappe.get_doc("Job Card", {"work_order": work_order.name})
+		scheduled_time = job_card.scheduled_time_logs[0]
+		from_time = add_to_date(scheduled_time.from_time, hours=-1)
+
+		frappe.flags.workstation_calendars = {}
+		try:
+			calendar = get_workstation_calendar(None, job_card.workstation, from_time)
+
+			# same time logs as queried for the slot
+			jc = frappe.new_doc("Job Card")
+			jc.workstation = job_card.workstation
+			for check_next_available_slot in (False, True):
+				args = frappe._dict(from_time=from_time, to_time=scheduled_time.to_time)
+				expected = jc.get_time_logs(
+					args, "Job Card Time Log", check_next_available_slot
+				) + jc.get_time_logs(args, "Job Card Scheduled Time", check_next_available_slot)
+
+				time_logs = calendar.get_time_logs(
+					from_time, scheduled_time.to_time, check_next_available_slot
+				)
+				self.assertEqual(
+					sorted(row.row_name for row in time_logs), sorted(row.row_name for row in expected)
+				)
+				self.assertIn(scheduled_time.name, [row.row_name for row in time_logs])
+
+			# loaded again only for a slot before the time logs loaded
+			self.assertIs(
+				get_workstation_calendar(None, job_card.workstation, add_to_date(from_time, hours=1)),
+				calendar,
+			)
+			earlier_calendar = get_workstation_calendar(
+				None, job_card.workstation, add_to_date(from_time, days=-1)
+			)
+			self.assertIsNot(earlier_calendar, calendar)
+
+			# Job Cards inserted meanwhile are added to the calendars of their workstation
+			new_job_card = frappe.copy_doc(job_card)
+			new_job_card.name = "_Test Calendar Job Card"
+			add_to_workstation_calendars(new_job_card)
+			time_logs = earlier_calendar.get_time_logs(from_time, scheduled_time.to_time)
+			self.assertIn(new_job_card.name, [row.name for row in time_logs])
+		finally:
+			frappe.flags.workstation_calendars = None
+
 	def test_job_card_multiple_materials_transfer(self):
 		"Test transferring RMs separately against Job Card with multiple RMs."
 		self.transfer_material_against = "Job Card"
@@ -13,6 +13,13 @@ frappe.ui.form.on('Production Plan', {
 	setup(frm) {
 		frm.trigger("setup_queries");
 
+		frappe.realtime.on("production_plan_mr_items_updated", (data) => {
+			if (data.production_plan === frm.doc.name) {
+				frappe.hide_progress();
+				frm.reload_doc();
+			}
+		});
+
 		frm.custom_make_buttons = {
 			'Work Order': 'Work Order / Subcontract PO',
 			'Material Request': 'Material Request',
@@ -346,6 +353,19 @@ frappe.ui.form.on('Production Plan', {
 	},
 
 	get_items_for_material_requests(frm, warehouses) {
+		// large draft plans are exploded in a background job, saved plans only
+		if (frm.doc.docstatus === 0 && !frm.is_new() && !frm.is_dirty()
+			&& frm.doc.po_items.length >= 50) {
+			frappe.call({
+				method: "erpnext.manufacturing.doctype.production_plan.production_plan.enqueue_get_items_for_material_requests",
+				args: {
+					production_plan: frm.doc.name,
+					warehouses: warehouses || []
+				}
+			});
+			return;
+		}
+
 		frappe.call({
 			method: "erpnext.manufacturing.doctype.production_plan.production_plan.get_items_for_material_requests",
 			freeze: true,
@@ -25,13 +25,21 @@ from pypika.terms import ExistsCriterion
 
 from erpnext.manufacturing.doctype.bom.bom import get_children as get_bom_children
 from erpnext.manufacturing.doctype.bom.bom import validate_bom_no
+from erpnext.manufacturing.doctype.bom.exploded_bom_cache import (
+	get_exploded_bom,
+	get_flat_bom_items,
+)
 from erpnext.manufacturing.doctype.work_order.work_order import get_item_details
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
-from erpnext.stock.get_item_details import get_conversion_factor
+from erpnext.stock.get_item_details import ItemDetailsPrefetch, get_conversion_factor
 from erpnext.stock.utils import get_or_make_bin
 from erpnext.utilities.transaction_base import validate_uom_is_integer
 
 
+# items for material requests are exploded with progress published every these many rows
+PROGRESS_INTERVAL = 20
+
+
 class ProductionPlan(Document):
 	# begin: auto-generated types
 	# This code is auto-generated. Do not modify anything in this block.
@@ -1076,53 +1084,88 @@ def download_raw_materials(doc, warehouses=None):
 def get_exploded_items(
 	item_details, company, bom_no, include_non_stock_items, planned_qty=1, doc=None
 ):
-	bei = frappe.qb.DocType("BOM Explosion Item")
-	bom = frappe.qb.DocType("BOM")
-	item = frappe.qb.DocType("Item")
-	item_default = frappe.qb.DocType("Item Default")
-	item_uom = frappe.qb.DocType("UOM Conversion Detail")
-
-	data = (
-		frappe.qb.from_(bei)
-		.join(bom)
-		.on(bom.name == bei.parent)
-		.join(item)
-		.on(item.name == bei.item_code)
-		.left_join(item_default)
-		.on((item_default.parent == item.name) & (item_default.company == company))
-		.left_join(item_uom)
-		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
-		.select(
-			(IfNull(Sum(bei.stock_qty / IfNull(bom.quantity, 1)), 0) * planned_qty).as_("qty"),
-			item.item_name,
-			item.name.as_("item_code"),
-			bei.description,
-			bei.stock_uom,
-			item.min_order_qty,
-			bei.source_warehouse,
-			item.default_material_request_type,
-			item.min_order_qty,
-			item_default.default_warehouse,
-			item.purchase_uom,
-			item_uom.conversion_factor,
-			item.safety_stock,
-		)
-		.where(
-			(bei.docstatus < 2)
-			& (bom.name == bom_no)
-			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
-		)
-		.groupby(bei.item_code, bei.stock_uom)
-	).run(as_dict=True)
+	bom = get_exploded_bom(bom_no)
+	if not bom or bom.docstatus == 2:
+		return item_details
 
-	for d in data:
-		if not d.conversion_factor and d.purchase_uom:
-			d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
-		item_details.setdefault(d.get("item_code"), d)
+	rows = get_flat_bom_items(bom, planned_qty)
+	items = get_item_details_for_planning({row.item_code for row in rows}, company)
+
+	for row in rows:
+		item = items.get(row.item_code)
+		if not item or not (include_non_stock_items or item.is_stock_item):
+			continue
+
+		item_details.setdefault(
+			row.item_code,
+			frappe._dict(
+				{
+					"qty": row.qty,
+					"item_name": item.item_name,
+					"item_code": row.item_code,
+					"description": row.description,
+					"stock_uom": row.stock_uom,
+					"min_order_qty": item.min_order_qty,
+					"source_warehouse": row.source_warehouse,
+					"default_material_request_type": item.default_material_request_type,
+					"default_warehouse": item.default_warehouse,
+					"purchase_uom": item.purchase_uom,
+					"conversion_factor": item.conversion_factor,
+					"safety_stock": item.safety_stock,
+				}
+			),
+		)
 
 	return item_details
 
 
+def get_item_details_for_planning(item_codes, company):
+	"""Item, Item Default and purchase UOM conversion factor of `item_codes`, read once
+	per item while getting the items for material requests"""
+	cache = frappe.flags.planning_item_details
+	if cache is None:
+		cache = {}
+
+	missing = [item_code for item_code in item_codes if (item_code, company) not in cache]
+	if missing:
+		item = frappe.qb.DocType("Item")
+		item_default = frappe.qb.DocType("Item Default")
+		item_uom = frappe.qb.DocType("UOM Conversion Detail")
+
+		data = (
+			frappe.qb.from_(item)
+			.left_join(item_default)
+			.on((item_default.parent == item.name) & (item_default.company == company))
+			.left_join(item_uom)
+			.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
+			.select(
+				item.name.as_("item_code"),
+				item.item_name,
+				item.is_stock_item,
+				item.is_sub_contracted_item.as_("is_sub_contracted"),
+				item.default_bom,
+				item.default_material_request_type,
+				item.min_order_qty,
+				item.safety_stock,
+				item.purchase_uom,
+				item_default.default_warehouse,
+				item_uom.conversion_factor,
+			)
+			.where(item.name.isin(missing))
+		).run(as_dict=True)
+
+		for d in data:
+			if not d.conversion_factor and d.purchase_uom:
+				d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
+			cache.setdefault((d.item_code, company), d)
+
+	return {
+		item_code: cache[(item_code, company)]
+		for item_code in item_codes
+		if (item_code, company) in cache
+	}
+
+
 def get_uom_conversion_factor(item_code, uom):
 	return frappe.db.get_value(
 		"UOM Conversion Detail", {"parent": item_code, "uom": uom}, "conversion_factor"
@@ -1140,56 +1183,47 @@ def get_subitems(
 	parent_qty,
 	planned_qty=1,
 ):
-	bom_item = frappe.qb.DocType("BOM Item")
-	bom = frappe.qb.DocType("BOM")
-	item = frappe.qb.DocType("Item")
-	item_default = frappe.qb.DocType("Item Default")
-	item_uom = frappe.qb.DocType("UOM Conversion Detail")
-
-	items = (
-		frappe.qb.from_(bom_item)
-		.join(bom)
-		.on(bom.name == bom_item.parent)
-		.join(item)
-		.on(bom_item.item_code == item.name)
-		.left_join(item_default)
-		.on((item.name == item_default.parent) & (item_default.company == company))
-		.left_join(item_uom)
-		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
-		.select(
-			bom_item.item_code,
-			item.default_material_request_type,
-			item.item_name,
-			IfNull(parent_qty * Sum(bom_item.stock_qty / IfNull(bom.quantity, 1)) * planned_qty, 0).as_(
-				"qty"
-			),
-			item.is_sub_contracted_item.as_("is_sub_contracted"),
-			bom_item.source_warehouse,
-			item.default_bom.as_("default_bom"),
-			bom_item.description.as_("description"),
-			bom_item.stock_uom.as_("stock_uom"),
-			item.min_order_qty.as_("min_order_qty"),
-			item.safety_stock.as_("safety_stock"),
-			item_default.default_warehouse,
-			item.purchase_uom,
-			item_uom.conversion_factor,
-		)
-		.where(
-			(bom.name == bom_no)
-			& (bom_item.docstatus < 2)
-			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
+	bom = get_exploded_bom(bom_no)
+	if not bom or bom.docstatus == 2:
+		return item_details
+
+	rows = get_flat_bom_items(
+		bom, flt(parent_qty) * flt(planned_qty), fetch_exploded=False, group_by_uom=False
+	)
+	item_data = get_item_details_for_planning({row.item_code for row in rows}, company)
+
+	items = []
+	for row in rows:
+		item = item_data.get(row.item_code)
+		if not item or not (include_non_stock_items or item.is_stock_item):
+			continue
+
+		items.append(
+			frappe._dict(
+				{
+					"item_code": row.item_code,
+					"default_material_request_type": item.default_material_request_type,
+					"item_name": item.item_name,
+					"qty": row.qty,
+					"is_sub_contracted": item.is_sub_contracted,
+					"source_warehouse": row.source_warehouse,
+					"default_bom": item.default_bom,
+					"description": row.description,
+					"stock_uom": row.stock_uom,
+					"min_order_qty": item.min_order_qty,
+					"safety_stock": item.safety_stock,
+					"default_warehouse": item.default_warehouse,
+					"purchase_uom": item.purchase_uom,
+					"conversion_factor": item.conversion_factor,
+				}
+			)
 		)
-		.groupby(bom_item.item_code)
-	).run(as_dict=True)
 
 	for d in items:
 		if not data.get("include_exploded_items") or not d.default_bom:
 			if d.item_code in item_details:
 				item_details[d.item_code].qty = item_details[d.item_code].qty + d.qty
 			else:
-				if not d.conversion_factor and d.purchase_uom:
-					d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
-
 				item_details[d.item_code] = d
 
 		if data.get("include_exploded_items") and d.default_bom:
@@ -1237,7 +1271,7 @@ def get_material_request_items(
 
 			required_qty = required_qty / row["conversion_factor"]
 
-	if frappe.db.get_value("UOM", row["purchase_uom"], "must_be_whole_number"):
+	if frappe.get_cached_value("UOM", row["purchase_uom"], "must_be_whole_number"):
 		required_qty = ceil(required_qty)
 
 	if include_safety_stock:
@@ -1384,6 +1418,163 @@ def get_bin_details(row, company, for_warehouse=None, all_warehouse=False):
 	return query.run(as_dict=True)
 
 
+def get_bin_details_for_items(rows, company, for_warehouse=None):
+	"""Same as `get_bin_details` for many rows, read in one query. Returns, for each row,
+	the first Bin of its item code in the warehouse of the row (or its descendants), as
+	used while getting the items for material requests."""
+	item_codes = {row.item_code for row in rows}
+	if not item_codes:
+		return []
+
+	bin = frappe.qb.DocType("Bin")
+	wh = frappe.qb.DocType("Warehouse")
+
+	bins_by_item = {}
+	for d in (
+		frappe.qb.from_(bin)
+		.join(wh)
+		.on(wh.name == bin.warehouse)
+		.select(
+			bin.item_code,
+			bin.warehouse,
+			wh.lft,
+			wh.rgt,
+			bin.projected_qty,
+			bin.actual_qty,
+			bin.ordered_qty,
+			bin.reserved_qty_for_production,
+			bin.planned_qty,
+		)
+		.where(bin.item_code.isin(list(item_codes)) & (wh.company == company))
+		.orderby(bin.item_code)
+		.orderby(bin.warehouse)
+	).run(as_dict=True):
+		bins_by_item.setdefault(d.item_code, []).append(d)
+
+	warehouse_bounds = {}
+	bins = []
+	for row in rows:
+		warehouse = for_warehouse or row.get("source_warehouse") or row.get("default_warehouse")
+		if warehouse and warehouse not in warehouse_bounds:
+			warehouse_bounds[warehouse] = frappe.db.get_value("Warehouse", warehouse, ["lft", "rgt"])
+
+		bin_dict = {}
+		for d in bins_by_item.get(row.item_code, []):
+			if not warehouse or (
+				warehouse_bounds[warehouse][0] <= d.lft and d.rgt <= warehouse_bounds[warehouse][1]
+			):
+				bin_dict = d
+				break
+
+		bins.append(bin_dict)
+
+	return bins
+
+
+def get_item_uoms_and_locations(item_codes, warehouses):
+	"""Purchase UOM of `item_codes`, and the Bins with stock in `warehouses` of those without
+	serial or batch numbers, ordered as picked by `get_available_item_locations`. Locations
+	of other items are None, and are picked per item."""
+	if not item_codes:
+		return {}
+
+	items = frappe.get_all(
+		"Item",
+		filters={"name": ("in", list(item_codes))},
+		fields=["name", "purchase_uom", "has_serial_no", "has_batch_no"],
+	)
+
+	item_uoms = {}
+	for item in items:
+		locations = None if (item.has_serial_no or item.has_batch_no) else []
+		item_uoms[item.name] = (item.purchase_uom, locations)
+
+	other_items = [item_code for item_code, d in item_uoms.items() if d[1] is not None]
+	if other_items:
+		bin = frappe.qb.DocType("Bin")
+		for d in (
+			frappe.qb.from_(bin)
+			.select(bin.item_code, bin.warehouse, bin.actual_qty.as_("qty"))
+			.where(
+				(bin.item_code.isin(other_items)) & (bin.actual_qty > 0) & (bin.warehouse.isin(warehouses))
+			)
+			.orderby(bin.creation)
+		).run(as_dict=True):
+			item_uoms[d.pop("item_code")][1].append(d)
+
+	return item_uoms
+
+
+@frappe.whitelist()
+def enqueue_get_items_for_material_requests(production_plan, warehouses=None):
+	"""Get the items for material requests of a saved Production Plan in a background job,
+	for plans with many items. Progress is published to the form, which is reloaded once
+	the Material Request Plan Items are saved."""
+	from frappe.utils.background_jobs import is_job_enqueued
+
+	doc = frappe.get_doc("Production Plan", production_plan)
+	doc.check_permission("write")
+
+	if doc.docstatus != 0:
+		frappe.throw(_("Raw materials can be fetched in the background only for draft plans"))
+
+	job_id = f"production_plan_mr_items::{doc.name}"
+	if is_job_enqueued(job_id):
+		frappe.msgprint(_("Raw materials are already being fetched for {0}").format(doc.name))
+		return
+
+	frappe.enqueue(
+		set_items_for_material_requests,
+		queue="long",
+		timeout=3600,
+		job_id=job_id,
+		production_plan=doc.name,
+		warehouses=warehouses,
+		now=frappe.flags.in_test,
+	)
+
+	frappe.msgprint(
+		_("Raw materials are being fetched in the background. The plan will refresh once done."),
+		alert=True,
+	)
+
+
+def set_items_for_material_requests(production_plan, warehouses=None):
+	doc = frappe.get_doc("Production Plan", production_plan)
+
+	frappe.flags.planning_item_details = {}
+	try:
+		mr_items = get_mr_items_for_plan(doc.as_dict(), warehouses, publish_progress=True)
+	finally:
+		frappe.flags.planning_item_details = None
+
+	doc.set("mr_items", [])
+	for row in mr_items:
+		row.pop("name", None)
+		doc.append("mr_items", row)
+
+	doc.save()
+
+	frappe.publish_realtime(
+		"production_plan_mr_items_updated",
+		{"production_plan": doc.name},
+		user=frappe.session.user,
+	)
+
+
+def publish_mr_items_progress(production_plan, count, total):
+	if not production_plan:
+		return
+
+	frappe.publish_progress(
+		count * 100 / (total or 1),
+		title=_("Getting Raw Materials..."),
+		doctype="Production Plan",
+		docname=production_plan,
+		description=_("Exploded {0} of {1} items").format(count, total),
+	)
+
+
 @frappe.whitelist()
 def get_so_details(sales_order):
 	return frappe.db.get_value(
@@ -1409,6 +1600,16 @@ def get_warehouse_list(warehouses):
 
 @frappe.whitelist()
 def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_data=None):
+	frappe.flags.planning_item_details = {}
+	try:
+		return get_mr_items_for_plan(doc, warehouses, get_parent_warehouse_data)
+	finally:
+		frappe.flags.planning_item_details = None
+
+
+def get_mr_items_for_plan(
+	doc, warehouses=None, get_parent_warehouse_data=None, publish_progress=False
+):
 	if isinstance(doc, str):
 		doc = frappe._dict(json.loads(doc))
 
@@ -1458,7 +1659,10 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 		for d in doc.get("sub_assembly_items"):
 			sub_assembly_items.setdefault((d.get("production_item"), d.get("bom_no")), d.get("qty"))
 
-	for data in po_items:
+	for index, data in enumerate(po_items):
+		if publish_progress and index % PROGRESS_INTERVAL == 0:
+			publish_mr_items_progress(doc.get("name"), index, len(po_items))
+
 		if not data.get("include_exploded_items") and doc.get("sub_assembly_items"):
 			data["include_exploded_items"] = 1
 
@@ -1550,30 +1754,61 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 			else:
 				so_item_details[sales_order][item_code] = details
 
+	if publish_progress:
+		publish_mr_items_progress(doc.get("name"), len(po_items), len(po_items))
+
+	all_item_details = [
+		details for item_dict in so_item_details.values() for details in item_dict.values()
+	]
+	bins = get_bin_details_for_items(all_item_details, doc.company, warehouse)
+
+	# conversion factors of all items are read at once by `get_conversion_factor`
+	frappe.flags.item_details_prefetch = ItemDetailsPrefetch(
+		[frappe._dict(item_code=details.item_code) for details in all_item_details]
+	)
+
 	mr_items = []
-	for sales_order, item_code in so_item_details.items():
-		item_dict = so_item_details[sales_order]
-		for details in item_dict.values():
-			bin_dict = get_bin_details(details, doc.company, warehouse)
-			bin_dict = bin_dict[0] if bin_dict else {}
-
-			if details.qty > 0:
-				items = get_material_request_items(
-					details,
-					sales_order,
-					company,
-					ignore_existing_ordered_qty,
-					include_safety_stock,
-					warehouse,
-					bin_dict,
-				)
-				if items:
-					mr_items.append(items)
+	try:
+		bins = iter(bins)
+		for sales_order, item_code in so_item_details.items():
+			item_dict = so_item_details[sales_order]
+			for details in item_dict.values():
+				bin_dict = next(bins)
+
+				if details.qty > 0:
+					items = get_material_request_items(
+						details,
+						sales_order,
+						company,
+						ignore_existing_ordered_qty,
+						include_safety_stock,
+						warehouse,
+						bin_dict,
+					)
+					if items:
+						mr_items.append(items)
+	finally:
+		frappe.flags.item_details_prefetch = None
 
 	if (not ignore_existing_ordered_qty or get_parent_warehouse_data) and warehouses:
+		item_codes = {item["item_code"] for item in mr_items}
+		item_uoms = get_item_uoms_and_locations(item_codes, warehouses)
+
 		new_mr_items = []
 		for item in mr_items:
-			get_materials_from_other_locations(item, warehouses, new_mr_items, company)
+			purchase_uom, locations = item_uoms.get(item["item_code"], (None, None))
+			if locations is not None:
+				# rows are limited like `get_available_item_locations_for_other_item`
+				locations = locations[: cint(item.get("quantity") * item.get("conversion_factor"))]
+
+			get_materials_from_other_locations(
+				item,
+				warehouses,
+				new_mr_items,
+				company,
+				locations=locations,
+				purchase_uom=purchase_uom,
+			)
 
 		mr_items = new_mr_items
 
@@ -1593,20 +1828,22 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 	return mr_items
 
 
-def get_materials_from_other_locations(item, warehouses, new_mr_items, company):
+def get_materials_from_other_locations(
+	item, warehouses, new_mr_items, company, locations=None, purchase_uom=None
+):
 	from erpnext.stock.doctype.pick_list.pick_list import get_available_item_locations
 
-	stock_uom, purchase_uom = frappe.db.get_value(
-		"Item", item.get("item_code"), ["stock_uom", "purchase_uom"]
-	)
+	if not purchase_uom:
+		purchase_uom = frappe.db.get_value("Item", item.get("item_code"), "purchase_uom")
 
-	locations = get_available_item_locations(
-		item.get("item_code"),
-		warehouses,
-		item.get("quantity") * item.get("conversion_factor"),
-		company,
-		ignore_validation=True,
-	)
+	if locations is None:
+		locations = get_available_item_locations(
+			item.get("item_code"),
+			warehouses,
+			item.get("quantity") * item.get("conversion_factor"),
+			company,
+			ignore_validation=True,
+		)
 
 	required_qty = item.get("quantity")
 	if item.get("conversion_factor") and item.get("purchase_uom") != item.get("stock_uom"):
@@ -1640,7 +1877,7 @@ def get_materials_from_other_locations(item, warehouses, new_mr_items, company):
 	if flt(required_qty, precision) > 0:
 		required_qty = required_qty
 
-		if frappe.db.get_value("UOM", purchase_uom, "must_be_whole_number"):
+		if purchase_uom and frappe.get_cached_value("UOM", purchase_uom, "must_be_whole_number"):
 			required_qty = ceil(required_qty)
 
 		item["quantity"] = required_qty / item.get("conversion_factor")
@@ -1768,45 +2005,38 @@ def get_non_completed_production_plans():
 def get_raw_materials_of_sub_assembly_items(
 	item_details, company, bom_no, include_non_stock_items, sub_assembly_items, planned_qty=1
 ):
-	bei = frappe.qb.DocType("BOM Item")
-	bom = frappe.qb.DocType("BOM")
-	item = frappe.qb.DocType("Item")
-	item_default = frappe.qb.DocType("Item Default")
-	item_uom = frappe.qb.DocType("UOM Conversion Detail")
-
-	items = (
-		frappe.qb.from_(bei)
-		.join(bom)
-		.on(bom.name == bei.parent)
-		.join(item)
-		.on(item.name == bei.item_code)
-		.left_join(item_default)
-		.on((item_default.parent == item.name) & (item_default.company == company))
-		.left_join(item_uom)
-		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
-		.select(
-			(IfNull(Sum(bei.stock_qty / IfNull(bom.quantity, 1)), 0) * planned_qty).as_("qty"),
-			item.item_name,
-			item.name.as_("item_code"),
-			bei.description,
-			bei.stock_uom,
-			bei.bom_no,
-			item.min_order_qty,
-			bei.source_warehouse,
-			item.default_material_request_type,
-			item.min_order_qty,
-			item_default.default_warehouse,
-			item.purchase_uom,
-			item_uom.conversion_factor,
-			item.safety_stock,
-		)
-		.where(
-			(bei.docstatus == 1)
-			& (bom.name == bom_no)
-			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
+	bom = get_exploded_bom(bom_no)
+	if not bom or bom.docstatus != 1:
+		return item_details
+
+	rows = get_flat_bom_items(bom, planned_qty, fetch_exploded=False)
+	item_data = get_item_details_for_planning({row.item_code for row in rows}, company)
+
+	items = []
+	for row in rows:
+		item = item_data.get(row.item_code)
+		if not item or not (include_non_stock_items or item.is_stock_item):
+			continue
+
+		items.append(
+			frappe._dict(
+				{
+					"qty": row.qty,
+					"item_name": item.item_name,
+					"item_code": row.item_code,
+					"description": row.description,
+					"stock_uom": row.stock_uom,
+					"bom_no": row.bom_no,
+					"min_order_qty": item.min_order_qty,
+					"source_warehouse": row.source_warehouse,
+					"default_material_request_type": item.default_material_request_type,
+					"default_warehouse": item.default_warehouse,
+					"purchase_uom": item.purchase_uom,
+					"conversion_factor": item.conversion_factor,
+					"safety_stock": item.safety_stock,
+				}
+			)
 		)
-		.groupby(bei.item_code, bei.stock_uom)
-	).run(as_dict=True)
 
 	for item in items:
 		key = (item.item_code, item.bom_no)
@@ -1824,9 +2054,6 @@ def get_raw_materials_of_sub_assembly_items(
 				planned_qty=planned_qty,
 			)
 		else:
-			if not item.conversion_factor and item.purchase_uom:
-				item.conversion_factor = get_uom_conversion_factor(item.item_code, item.purchase_uom)
-
 			if details := item_details.get(item.get("item_code")):
 				details.qty += item.get("qty")
 			else:
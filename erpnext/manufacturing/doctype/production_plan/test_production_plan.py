@@ -1458,6 +1458,29 @@ class TestProductionPlan(FrappeTestCase):
 			self.assertEqual(row.get("uom"), "Nos")
 			self.assertEqual(row.get("conversion_factor"), 10.0)
 
+	def test_mr_items_in_background(self):
+		"Items for material requests fetched in a background job are saved in the plan."
+		from erpnext.manufacturing.doctype.production_plan.production_plan import (
+			enqueue_get_items_for_material_requests,
+		)
+
+		pln = create_production_plan(
+			item_code="Test Production Item 1", skip_getting_mr_items=True, do_not_submit=1
+		)
+		expected_items = get_items_for_material_requests(pln.as_dict())
+		self.assertTrue(expected_items)
+
+		enqueue_get_items_for_material_requests(pln.name)
+		pln.reload()
+
+		self.assertEqual(
+			sorted((row.item_code, flt(row.quantity), row.material_request_type) for row in pln.mr_items),
+			sorted(
+				(row["item_code"], flt(row["quantity"]), row["material_request_type"])
+				for row in expected_items
+			),
+		)
+
 	def test_unreserve_qty_on_closing_of_pp(self):
 		from erpnext.stock.doctype.warehouse.test_warehouse import create_warehouse
 		from erpnext.stock.utils import get_or_make_bin
@@ -31,6 +31,9 @@ from erpnext.manufacturing.doctype.bom.bom import (
 from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings import (
 	get_mins_between_operations,
 )
+from erpnext.manufacturing.doctype.workstation.workstation_calendar import (
+	add_to_workstation_calendars,
+)
 from erpnext.stock.doctype.batch.batch import make_batch
 from erpnext.stock.doctype.item.item import get_item_defaults, validate_end_of_life
 from erpnext.stock.doctype.serial_no.serial_no import get_available_serial_nos, get_serial_nos
@@ -574,12 +577,19 @@ class WorkOrder(Document):
 		enable_capacity_planning = not cint(manufacturing_settings_doc.disable_capacity_planning)
 		plan_days = cint(manufacturing_settings_doc.capacity_planning_for_days) or 30
 
-		for index, row in enumerate(self.operations):
-			qty = self.qty
-			while qty > 0:
-				qty = split_qty_based_on_batch_size(self, row, qty)
-				if row.job_card_qty > 0:
-					self.prepare_data_for_job_card(row, index, plan_days, enable_capacity_planning)
+		if enable_capacity_planning:
+			# busy time of workstations, loaded once for scheduling all the operations
+			frappe.flags.workstation_calendars = {}
+
+		try:
+			for index, row in enumerate(self.operations):
+				qty = self.qty
+				while qty > 0:
+					qty = split_qty_based_on_batch_size(self, row, qty)
+					if row.job_card_qty > 0:
+						self.prepare_data_for_job_card(row, index, plan_days, enable_capacity_planning)
+		finally:
+			frappe.flags.workstation_calendars = None
 
 		planned_end_date = self.operations and self.operations[-1].planned_end_time
 		if planned_end_date:
@@ -1558,6 +1568,9 @@ def create_job_card(work_order, row, enable_capacity_planning=False, auto_create
 			doc.schedule_time_logs(row)
 
 		doc.insert()
+		if enable_capacity_planning:
+			add_to_workstation_calendars(doc)
+
 		frappe.msgprint(
 			_("Job card {0} created").format(get_link_to_form("Job Card", doc.name)), alert=True
 		)
@@ -0,0 +1,128 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: GNU General Public License v3. See license.txt
+
+"""Busy time of workstations, for capacity planning of the Job Cards of a Work Order.
+
+The time logs and scheduled time of Job Cards are loaded once per workstation (type) and kept
+sorted by end time, instead of being queried for every slot tried while scheduling every
+operation. Job Cards created meanwhile are added as they are inserted."""
+
+import bisect
+
+import frappe
+from frappe.utils import get_datetime
+
+
+def get_workstation_calendar(workstation_type, workstation, from_time):
+	"""Calendar of the Job Cards of `workstation_type` and `workstation` ending from `from_time`
+	on, while `frappe.flags.workstation_calendars` is set. None otherwise."""
+	calendars = frappe.flags.workstation_calendars
+	if calendars is None:
+		return
+
+	key = (workstation_type or None, workstation or None)
+	calendar = calendars.get(key)
+	if not calendar or calendar.loaded_from > from_time:
+		calendar = calendars[key] = WorkstationCalendar(workstation_type, workstation, from_time)
+
+	return calendar
+
+
+def add_to_workstation_calendars(job_card):
+	"""Add the scheduled time of a Job Card inserted while scheduling"""
+	calendars = frappe.flags.workstation_calendars or {}
+	for (workstation_type, workstation), calendar in calendars.items():
+		if workstation_type and job_card.workstation_type != workstation_type:
+			continue
+
+		if workstation and job_card.workstation != workstation:
+			continue
+
+		for row in job_card.scheduled_time_logs:
+			calendar.add(
+				frappe._dict(
+					{
+						"name": job_card.name,
+						"row_name": row.name,
+						"from_time": get_datetime(row.from_time),
+						"to_time": get_datetime(row.to_time),
+						"workstation": job_card.workstation,
+						"workstation_type": job_card.workstation_type,
+					}
+				)
+			)
+
+
+class WorkstationCalendar:
+	def __init__(self, workstation_type, workstation, from_time) -> None:
+		self.workstation_type = workstation_type
+		self.workstation = workstation
+		self.loaded_from = from_time
+
+		self.end_times = []
+		self.time_logs = []
+
+		# time logs first, so that they come first among the ones ending at the same time
+		for doctype in ("Job Card Time Log", "Job Card Scheduled Time"):
+			for row in self.load_time_logs(doctype):
+				self.add(row)
+
+	def load_time_logs(self, doctype):
+		jc = frappe.qb.DocType("Job Card")
+		jctl = frappe.qb.DocType(doctype)
+
+		query = (
+			frappe.qb.from_(jctl)
+			.from_(jc)
+			.select(
+				jc.name.as_("name"),
+				jctl.name.as_("row_name"),
+				jctl.from_time,
+				jctl.to_time,
+				jc.workstation,
+				jc.workstation_type,
+			)
+			.where(
+				(jctl.parent == jc.name)
+				& (jc.docstatus < 2)
+				& (jctl.from_time.isnotnull())
+				& (jctl.to_time >= self.loaded_from)
+			)
+			.orderby(jctl.to_time)
+		)
+
+		if self.workstation_type:
+			query = query.where(jc.workstation_type == self.workstation_type)
+
+		if self.workstation:
+			query = query.where(jc.workstation == self.workstation)
+
+		if doctype != "Job Card Time Log":
+			query = query.where(jc.total_time_in_mins == 0)
+
+		return query.run(as_dict=True)
+
+	def add(self, time_log):
+		index = bisect.bisect_right(self.end_times, time_log.to_time)
+		self.end_times.insert(index, time_log.to_time)
+		self.time_logs.insert(index, time_log)
+
+	def get_time_logs(self, from_time, to_time, check_next_available_slot=False):
+		"""Time logs overlapping `from_time` to `to_time`, and the ones after it if
+		`check_next_available_slot`, sorted by end time. Same as `JobCard.get_time_logs`."""
+		from_time, to_time = get_datetime(from_time), get_datetime(to_time)
+
+		# every matching time log ends after the start or the end of the window
+		start = bisect.bisect_left(self.end_times, min(from_time, to_time))
+
+		time_logs = []
+		for row in self.time_logs[start:]:
+			if (
+				(row.from_time < from_time and row.to_time > from_time)
+				or (row.from_time < to_time and row.to_time > to_time)
+				or (row.from_time >= from_time and row.to_time <= to_time)
+				or (check_next_available_slot and row.from_time >= from_time and row.to_time >= to_time)
+			):
+				time_logs.append(row)
+
+		return time_logs
@@ -4,10 +4,14 @@
 
 import frappe
 from frappe import _
-from frappe.query_builder.functions import Floor, Sum
-from frappe.utils import cint
+from frappe.utils import cint, flt, floor
 from pypika.terms import ExistsCriterion
 
+from erpnext.manufacturing.doctype.bom.exploded_bom_cache import (
+	get_exploded_bom,
+	get_flat_bom_items,
+)
+
 
 def execute(filters=None):
 	if not filters:
@@ -39,20 +43,26 @@ def get_bom_stock(filters):
 	if cint(qty_to_produce) <= 0:
 		frappe.throw(_("Quantity to Produce should be greater than zero."))
 
-	if filters.get("show_exploded_view"):
-		bom_item_table = "BOM Explosion Item"
-	else:
-		bom_item_table = "BOM Item"
+	bom = get_exploded_bom(filters.get("bom"))
+	if not bom:
+		return []
+
+	rows = get_flat_bom_items(
+		bom, qty_to_produce, fetch_exploded=filters.get("show_exploded_view"), group_by_uom=False
+	)
+	if not rows:
+		return []
+
+	bom_qty = {}
+	for row in bom.exploded_items if filters.get("show_exploded_view") else bom.bom_items:
+		bom_qty[row.item_code] = bom_qty.get(row.item_code, 0.0) + flt(row.stock_qty)
 
 	warehouse_details = frappe.db.get_value(
 		"Warehouse", filters.get("warehouse"), ["lft", "rgt"], as_dict=1
 	)
 
-	BOM = frappe.qb.DocType("BOM")
-	BOM_ITEM = frappe.qb.DocType(bom_item_table)
 	BIN = frappe.qb.DocType("Bin")
 	WH = frappe.qb.DocType("Warehouse")
-	CONDITIONS = ()
 
 	if warehouse_details:
 		CONDITIONS = ExistsCriterion(
@@ -67,23 +77,34 @@ def get_bom_stock(filters):
 	else:
 		CONDITIONS = BIN.warehouse == filters.get("warehouse")
 
-	QUERY = (
-		frappe.qb.from_(BOM)
-		.inner_join(BOM_ITEM)
-		.on(BOM.name == BOM_ITEM.parent)
-		.left_join(BIN)
-		.on((BOM_ITEM.item_code == BIN.item_code) & (CONDITIONS))
-		.select(
-			BOM_ITEM.item_code,
-			BOM_ITEM.description,
-			BOM_ITEM.stock_qty,
-			BOM_ITEM.stock_uom,
-			BOM_ITEM.stock_qty * qty_to_produce / BOM.quantity,
-			Sum(BIN.actual_qty).as_("actual_qty"),
-			Sum(Floor(BIN.actual_qty / (BOM_ITEM.stock_qty * qty_to_produce / BOM.quantity))),
+	bins = {}
+	for d in (
+		frappe.qb.from_(BIN)
+		.select(BIN.item_code, BIN.actual_qty)
+		.where(BIN.item_code.isin([row.item_code for row in rows]) & CONDITIONS)
+	).run(as_dict=True):
+		bins.setdefault(d.item_code, []).append(flt(d.actual_qty))
+
+	data = []
+	for row in rows:
+		required_qty = row.qty
+		actual_qty = enough_parts_to_build = None
+		if row.item_code in bins:
+			actual_qty = sum(bins[row.item_code])
+			enough_parts_to_build = (
+				sum(floor(qty / required_qty) for qty in bins[row.item_code]) if required_qty else None
+			)
+
+		data.append(
+			(
+				row.item_code,
+				row.description,
+				bom_qty[row.item_code],
+				row.stock_uom,
+				required_qty,
+				actual_qty,
+				enough_parts_to_build,
+			)
 		)
-		.where((BOM_ITEM.parent == filters.get("bom")) & (BOM_ITEM.parenttype == "BOM"))
-		.groupby(BOM_ITEM.item_code)
-	)
 
-	return QUERY.run()
+	return data
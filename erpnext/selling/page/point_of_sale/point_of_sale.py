@@ -9,8 +9,15 @@ import frappe
 from frappe.utils import cint
 from frappe.utils.nestedset import get_root_of
 
-from erpnext.accounts.doctype.pos_invoice.pos_invoice import get_stock_availability
+from erpnext.accounts.doctype.pos_invoice.pos_invoice import (
+	get_stock_availability,
+	get_stock_availability_for_items,
+)
 from erpnext.accounts.doctype.pos_profile.pos_profile import get_child_nodes, get_item_groups
+from erpnext.setup.doctype.link_search_term.link_search_term import (
+	get_link_search_condition,
+	get_pos_search_fields,
+)
 from erpnext.stock.utils import scan_barcode
 
 
@@ -160,30 +167,25 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 	if not items_data:
 		return result
 
-	for item in items_data:
-		uoms = frappe.get_doc("Item", item.item_code).get("uoms", [])
+	item_codes = [item.item_code for item in items_data]
+	stock_availability = get_stock_availability_for_items(item_codes, warehouse)
+	conversion_factors = get_conversion_factors(item_codes)
+	prices = get_item_prices(item_codes, price_list)
 
-		item.actual_qty, _ = get_stock_availability(item.item_code, warehouse)
+	for item in items_data:
+		item.actual_qty, _ = stock_availability[item.item_code]
 		item.uom = item.stock_uom
 
-		item_price = frappe.get_all(
-			"Item Price",
-			fields=["price_list_rate", "currency", "uom", "batch_no"],
-			filters={
-				"price_list": price_list,
-				"item_code": item.item_code,
-				"selling": True,
-			},
-		)
+		item_price = prices.get(item.item_code, [])
 
 		if not item_price:
 			result.append(item)
 
 		for price in item_price:
-			uom = next(filter(lambda x: x.uom == price.uom, uoms), {})
+			conversion_factor = conversion_factors.get((item.item_code, price.uom))
 
-			if price.uom != item.stock_uom and uom and uom.conversion_factor:
-				item.actual_qty = item.actual_qty // uom.conversion_factor
+			if price.uom != item.stock_uom and conversion_factor:
+				item.actual_qty = item.actual_qty // conversion_factor
 
 			result.append(
 				{
@@ -197,12 +199,46 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 	return {"items": result}
 
 
+def get_conversion_factors(item_codes):
+	conversion_factors = {}
+	for row in frappe.get_all(
+		"UOM Conversion Detail",
+		filters={"parent": ("in", item_codes), "parenttype": "Item"},
+		fields=["parent", "uom", "conversion_factor"],
+	):
+		conversion_factors.setdefault((row.parent, row.uom), row.conversion_factor)
+
+	return conversion_factors
+
+
+def get_item_prices(item_codes, price_list):
+	prices = {}
+	for price in frappe.get_all(
+		"Item Price",
+		fields=["item_code", "price_list_rate", "currency", "uom", "batch_no"],
+		filters={
+			"price_list": price_list,
+			"item_code": ("in", item_codes),
+			"selling": True,
+		},
+	):
+		prices.setdefault(price.pop("item_code"), []).append(price)
+
+	return prices
+
+
 @frappe.whitelist()
 def search_for_serial_or_batch_or_barcode_number(search_value: str) -> Dict[str, Optional[str]]:
 	return scan_barcode(search_value)
 
 
 def get_conditions(search_term):
+	search_condition = search_term and get_link_search_condition(
+		"Item", search_term, ["name", "item_name", *get_pos_search_fields()], table="item"
+	)
+	if search_condition:
+		return "({0})".format(search_condition)
+
 	condition = "("
 	condition += """item.name like {search_term}
 		or item.item_name like {search_term}""".format(
@@ -5,6 +5,7 @@
 """Global Defaults"""
 import frappe
 import frappe.defaults
+from frappe import _
 from frappe.custom.doctype.property_setter.property_setter import make_property_setter
 from frappe.utils import cint
 
@@ -39,6 +40,7 @@ class GlobalDefaults(Document):
 		disable_in_words: DF.Check
 		disable_rounded_total: DF.Check
 		hide_currency_symbol: DF.Literal["", "No", "Yes"]
+		use_link_search_index: DF.Check
 	# end: auto-generated types
 
 	def on_update(self):
@@ -52,9 +54,33 @@ class GlobalDefaults(Document):
 
 		self.toggle_rounded_total()
 		self.toggle_in_words()
+		self.rebuild_link_search_index()
 
 		frappe.clear_cache()
 
+	def rebuild_link_search_index(self):
+		if not self.has_value_changed("use_link_search_index"):
+			return
+
+		from erpnext.setup.doctype.link_search_term.link_search_term import (
+			INDEX_FIELDS_KEY,
+			INDEXED_DOCTYPES,
+		)
+
+		# link queries search with LIKE until the index is built again, or dropped if disabled
+		for doctype in INDEXED_DOCTYPES:
+			frappe.db.set_default(INDEX_FIELDS_KEY.format(doctype), "")
+
+		frappe.enqueue(
+			"erpnext.setup.doctype.link_search_term.link_search_term.rebuild_link_search_index",
+			queue="long",
+			timeout=3600,
+			enqueue_after_commit=True,
+		)
+
+		if self.use_link_search_index:
+			frappe.msgprint(_("The Link Search Index will be built in the background."), alert=True)
+
 	@frappe.whitelist()
 	def get_defaults(self):
 		return frappe.defaults.get_defaults()
@@ -0,0 +1,188 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import cint, cstr, strip_html
+
+# fields searched by the link queries of `controllers.queries` besides the search fields, items
+# are also searched by the POS Search Fields
+INDEXED_DOCTYPES = {
+	"Item": ["name", "item_code", "item_group", "item_name"],
+	"Customer": ["name", "customer_name"],
+	"Supplier": ["name", "supplier_name"],
+	"Warehouse": ["name", "warehouse_name"],
+}
+# fields indexed for a doctype when its index was built, unset while it is being rebuilt
+INDEX_FIELDS_KEY = "link_search_index_fields::{0}"
+BATCH_SIZE = 1000
+SEARCH_TERM_LENGTH = 140
+
+
+class LinkSearchTerm(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		reference_doctype: DF.Link | None
+		reference_name: DF.DynamicLink | None
+		search_term: DF.Data | None
+	# end: auto-generated types
+
+	pass
+
+
+def is_link_search_index_enabled():
+	return cint(frappe.db.get_single_value("Global Defaults", "use_link_search_index"))
+
+
+def get_indexed_fields(doctype):
+	meta = frappe.get_meta(doctype, cached=True)
+	search_fields = meta.get_search_fields()
+	if doctype == "Item":
+		search_fields = search_fields + get_pos_search_fields()
+
+	fields = []
+	for field in INDEXED_DOCTYPES[doctype] + search_fields:
+		if field not in fields and (field == "name" or meta.get_field(field)):
+			fields.append(field)
+
+	return fields
+
+
+def get_pos_search_fields():
+	pos_settings = frappe.get_cached_doc("POS Settings")
+	return [d.fieldname for d in pos_settings.pos_search_fields if d.fieldname]
+
+
+def get_link_search_condition(doctype, txt, searchfields, table=None):
+	"""SQL condition on `table` (`tab{doctype}` by default) matching documents with a value of
+	`searchfields` starting with `txt`, or starting with it from a word on. None if the index
+	cannot be used, and the caller should search with LIKE instead."""
+	if doctype not in INDEXED_DOCTYPES or not is_link_search_index_enabled():
+		return
+
+	# wildcards typed by the user are left to LIKE
+	search_term = " ".join(cstr(txt).lower().split())[:SEARCH_TERM_LENGTH]
+	if not search_term or "%" in search_term or "_" in search_term:
+		return
+
+	indexed_fields = get_indexed_fields(doctype)
+	if frappe.db.get_default(INDEX_FIELDS_KEY.format(doctype)) != ",".join(indexed_fields):
+		return
+
+	if any(field not in indexed_fields for field in searchfields):
+		return
+
+	return """{0}.name in (select reference_name from `tabLink Search Term`
+		where reference_doctype = {1} and search_term like {2})""".format(
+		table or f"`tab{doctype}`",
+		frappe.db.escape(doctype),
+		frappe.db.escape(search_term.replace("\\", "\\\\") + "%"),
+	)
+
+
+def get_search_terms(values):
+	"""Lower-cased values, and every part of them starting at a word"""
+	terms = set()
+	for value in values:
+		# long texts are matched on their first words
+		words = strip_html(cstr(value))[: SEARCH_TERM_LENGTH * 2].lower().split()
+		for i in range(len(words)):
+			terms.add(" ".join(words[i:])[:SEARCH_TERM_LENGTH])
+
+	return terms
+
+
+def update_link_search_index(doc, method=None, *args):
+	"""Replace the search terms of a document on save, rename and delete"""
+	if doc.doctype not in INDEXED_DOCTYPES or not is_link_search_index_enabled():
+		return
+
+	names = [doc.name]
+	if method == "after_rename" and args:
+		names.append(args[0])
+
+	delete_search_terms(doc.doctype, names)
+	if method != "on_trash":
+		index_documents(doc.doctype, [doc.name], get_indexed_fields(doc.doctype))
+
+
+def delete_search_terms(doctype, names=None):
+	filters = {"reference_doctype": doctype}
+	if names is not None:
+		filters["reference_name"] = ("in", list(names))
+
+	frappe.db.delete("Link Search Term", filters)
+
+
+def index_documents(doctype, names, fields):
+	values_by_name = {}
+	for doc in frappe.get_all(doctype, filters={"name": ("in", list(names))}, fields=fields):
+		values_by_name[doc.name] = [doc.get(field) for field in fields]
+
+	if not values_by_name:
+		return
+
+	if doctype == "Item":
+		for barcode in frappe.get_all(
+			"Item Barcode",
+			filters={"parent": ("in", list(values_by_name)), "parenttype": "Item"},
+			fields=["parent", "barcode"],
+		):
+			values_by_name[barcode.parent].append(barcode.barcode)
+
+	values = []
+	for name, doc_values in values_by_name.items():
+		for search_term in get_search_terms(doc_values):
+			values.append((frappe.generate_hash(length=10), doctype, name, search_term))
+
+	frappe.db.bulk_insert(
+		"Link Search Term",
+		fields=["name", "reference_doctype", "reference_name", "search_term"],
+		values=values,
+	)
+
+
+def rebuild_link_search_index(doctypes=None):
+	"""Index every document of `doctypes`, link queries search them with LIKE until done"""
+	for doctype in doctypes or INDEXED_DOCTYPES:
+		frappe.db.set_default(INDEX_FIELDS_KEY.format(doctype), "")
+		delete_search_terms(doctype)
+
+		if not is_link_search_index_enabled():
+			continue
+
+		fields = get_indexed_fields(doctype)
+		names = frappe.get_all(doctype, pluck="name", order_by="name")
+		for i in range(0, len(names), BATCH_SIZE):
+			index_documents(doctype, names[i : i + BATCH_SIZE], fields)
+			if not frappe.flags.in_test:
+				frappe.db.commit()
+
+		frappe.db.set_default(INDEX_FIELDS_KEY.format(doctype), ",".join(fields))
+
+
+def rebuild_outdated_link_search_indexes():
+	"""Scheduled daily, rebuilds the index of doctypes whose search fields were customized"""
+	if not is_link_search_index_enabled():
+		return
+
+	outdated = []
+	for doctype in INDEXED_DOCTYPES:
+		# indexes not built yet are being built by the job enqueued when enabled
+		indexed_fields = frappe.db.get_default(INDEX_FIELDS_KEY.format(doctype))
+		if indexed_fields and indexed_fields != ",".join(get_indexed_fields(doctype)):
+			outdated.append(doctype)
+
+	if outdated:
+		rebuild_link_search_index(outdated)
+
+
+def on_doctype_update():
+	frappe.db.add_index("Link Search Term", ["reference_doctype", "search_term"])
+	frappe.db.add_index("Link Search Term", ["reference_doctype", "reference_name"])
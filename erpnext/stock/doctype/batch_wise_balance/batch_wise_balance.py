@@ -0,0 +1,342 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.query_builder import Criterion
+from frappe.query_builder.custom import ConstantColumn
+from frappe.query_builder.functions import CombineDatetime, Sum
+from frappe.utils import cint, flt, now, nowtime, today
+
+BALANCE_KEY_FIELDS = ("item_code", "warehouse", "batch_no", "entry_type")
+
+# batch items whose balances are recomputed together during a rebuild or a verification
+ITEM_BATCH_SIZE = 500
+
+
+class BatchWiseBalance(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		batch_no: DF.Link | None
+		entry_type: DF.Literal["Serial and Batch Entry", "Stock Ledger Entry"]
+		item_code: DF.Link | None
+		qty: DF.Float
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def is_batch_wise_balance_maintained():
+	"""Rows are updated on every Stock Ledger Entry of a batch item once enabled in Stock Settings"""
+	return cint(frappe.db.get_single_value("Stock Settings", "maintain_batch_wise_balance"))
+
+
+def is_batch_wise_balance_ready():
+	"""Rows can be read only after the initial build from existing Stock Ledger Entries is done"""
+	return is_batch_wise_balance_maintained() and cint(
+		frappe.db.get_default("batch_wise_balance_built")
+	)
+
+
+def apply_filters(query, kwargs, fields):
+	"""Filter `query` on item code, warehouse and batch no, each a value or a list of values"""
+	for key, field in fields.items():
+		value = kwargs.get(key)
+		if not value:
+			continue
+
+		if isinstance(value, list):
+			query = query.where(field.isin(value))
+		else:
+			query = query.where(field == value)
+
+	return query
+
+
+def get_ledger_balances(kwargs, condition=None):
+	"""Qty per item, warehouse, batch and entry type, summed from the Serial and Batch Entries
+	and the Batch No of Stock Ledger Entries that are not cancelled"""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	batch_ledger = frappe.qb.DocType("Serial and Batch Entry")
+
+	bundle_query = (
+		frappe.qb.from_(sle)
+		.inner_join(batch_ledger)
+		.on(sle.serial_and_batch_bundle == batch_ledger.parent)
+		.select(
+			sle.item_code,
+			sle.warehouse,
+			batch_ledger.batch_no,
+			ConstantColumn("Serial and Batch Entry").as_("entry_type"),
+			Sum(batch_ledger.qty).as_("qty"),
+		)
+		.where((sle.is_cancelled == 0) & (batch_ledger.batch_no.isnotnull()))
+		.groupby(sle.item_code, sle.warehouse, batch_ledger.batch_no)
+	)
+	bundle_query = apply_filters(
+		bundle_query,
+		kwargs,
+		{"item_code": sle.item_code, "warehouse": sle.warehouse, "batch_no": batch_ledger.batch_no},
+	)
+
+	ledger_query = (
+		frappe.qb.from_(sle)
+		.select(
+			sle.item_code,
+			sle.warehouse,
+			sle.batch_no,
+			ConstantColumn("Stock Ledger Entry").as_("entry_type"),
+			Sum(sle.actual_qty).as_("qty"),
+		)
+		.where((sle.is_cancelled == 0) & (sle.batch_no.isnotnull()))
+		.groupby(sle.item_code, sle.warehouse, sle.batch_no)
+	)
+	ledger_query = apply_filters(
+		ledger_query,
+		kwargs,
+		{"item_code": sle.item_code, "warehouse": sle.warehouse, "batch_no": sle.batch_no},
+	)
+
+	if condition is not None:
+		bundle_query = bundle_query.where(condition)
+		ledger_query = ledger_query.where(condition)
+
+	balances = {}
+	for query in (bundle_query, ledger_query):
+		for row in query.run(as_dict=True):
+			balances[tuple(row[field] for field in BALANCE_KEY_FIELDS)] = row
+
+	return balances
+
+
+def get_available_batches_from_balance(kwargs):
+	"""Same as `get_available_batches`, from the balances less the entries posted after the
+	posting date or by the vouchers to ignore"""
+	balance = frappe.qb.DocType("Batch Wise Balance")
+	batch_table = frappe.qb.DocType("Batch")
+
+	query = (
+		frappe.qb.from_(balance)
+		.inner_join(batch_table)
+		.on(balance.batch_no == batch_table.name)
+		.select(balance.batch_no, balance.warehouse, balance.qty, balance.item_code)
+		.where(balance.entry_type == "Serial and Batch Entry")
+		.where(
+			(batch_table.disabled == 0)
+			& ((batch_table.expiry_date >= today()) | (batch_table.expiry_date.isnull()))
+		)
+	)
+	query = apply_filters(
+		query,
+		kwargs,
+		{"item_code": balance.item_code, "warehouse": balance.warehouse, "batch_no": balance.batch_no},
+	)
+	query = order_by_batch(query, batch_table, kwargs.based_on)
+
+	data = query.run(as_dict=True)
+	if not data:
+		return data
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	conditions = []
+	if kwargs.get("posting_date"):
+		if kwargs.get("posting_time") is None:
+			kwargs.posting_time = nowtime()
+
+		conditions.append(
+			CombineDatetime(sle.posting_date, sle.posting_time)
+			> CombineDatetime(kwargs.posting_date, kwargs.posting_time)
+		)
+
+	if kwargs.get("ignore_voucher_nos"):
+		conditions.append(sle.voucher_no.isin(kwargs.get("ignore_voucher_nos")))
+
+	if conditions:
+		excluded = get_ledger_balances(kwargs, Criterion.any(conditions))
+		for row in data:
+			key = (row.item_code, row.warehouse, row.batch_no, "Serial and Batch Entry")
+			if key in excluded:
+				row.qty -= flt(excluded[key].qty)
+
+	for row in data:
+		del row["item_code"]
+
+	return data
+
+
+def get_stock_ledgers_batches_from_balance(kwargs):
+	"""Same as `get_stock_ledgers_batches`, from the balances"""
+	balance = frappe.qb.DocType("Batch Wise Balance")
+	batch_table = frappe.qb.DocType("Batch")
+
+	query = (
+		frappe.qb.from_(balance)
+		.inner_join(batch_table)
+		.on(balance.batch_no == batch_table.name)
+		.select(balance.warehouse, balance.item_code, balance.qty, balance.batch_no)
+		.where(balance.entry_type == "Stock Ledger Entry")
+	)
+	query = apply_filters(
+		query,
+		kwargs,
+		{"item_code": balance.item_code, "warehouse": balance.warehouse, "batch_no": balance.batch_no},
+	)
+	query = order_by_batch(query, batch_table, kwargs.based_on)
+
+	return {(d.batch_no, d.warehouse): d for d in query.run(as_dict=True)}
+
+
+def order_by_batch(query, batch_table, based_on):
+	if based_on == "LIFO":
+		return query.orderby(batch_table.creation, order=frappe.qb.desc)
+	elif based_on == "Expiry":
+		return query.orderby(batch_table.expiry_date)
+
+	return query.orderby(batch_table.creation)
+
+
+def update_batch_wise_balance(item_code, warehouse, batch_nos):
+	"""Recompute the rows of `batch_nos` of an item in a warehouse from the Stock Ledger"""
+	if not batch_nos or not is_batch_wise_balance_maintained():
+		return
+
+	kwargs = frappe._dict(item_code=item_code, warehouse=warehouse, batch_no=list(batch_nos))
+	frappe.db.delete(
+		"Batch Wise Balance",
+		{"item_code": item_code, "warehouse": warehouse, "batch_no": ("in", kwargs.batch_no)},
+	)
+	insert_batch_wise_balance(get_ledger_balances(kwargs).values())
+
+
+def insert_batch_wise_balance(rows):
+	user = frappe.session.user
+	timestamp = now()
+
+	values = [
+		(
+			frappe.generate_hash(length=10),
+			timestamp,
+			timestamp,
+			user,
+			user,
+			*(row[field] for field in BALANCE_KEY_FIELDS),
+			flt(row.qty),
+		)
+		for row in rows
+	]
+
+	fields = ["name", "creation", "modified", "owner", "modified_by", *BALANCE_KEY_FIELDS, "qty"]
+	frappe.db.bulk_insert("Batch Wise Balance", fields=fields, values=values)
+
+
+def get_batch_items_in_batches():
+	item_codes = frappe.get_all("Item", filters={"has_batch_no": 1}, pluck="name", order_by="name")
+	for i in range(0, len(item_codes), ITEM_BATCH_SIZE):
+		yield item_codes[i : i + ITEM_BATCH_SIZE]
+
+
+def get_stored_batch_wise_balance(item_codes):
+	"""Rows of `item_codes` per balance key, more than one if duplicated"""
+	rows_by_key = {}
+	for row in frappe.get_all(
+		"Batch Wise Balance",
+		filters={"item_code": ("in", item_codes)},
+		fields=["name", "qty", *BALANCE_KEY_FIELDS],
+	):
+		rows_by_key.setdefault(tuple(row[field] for field in BALANCE_KEY_FIELDS), []).append(row)
+
+	return rows_by_key
+
+
+def rebuild_batch_wise_balance():
+	"""Recreate all rows from the Stock Ledger.
+
+	Rows are updated by postings while the rebuild runs, so the rows of each batch of items
+	are deleted and inserted again in the same transaction."""
+	balance = frappe.qb.DocType("Batch Wise Balance")
+	item = frappe.qb.DocType("Item")
+	frappe.qb.from_(balance).delete().where(
+		balance.item_code.notin(frappe.qb.from_(item).select(item.name).where(item.has_batch_no == 1))
+	).run()
+
+	for item_codes in get_batch_items_in_batches():
+		frappe.db.delete("Batch Wise Balance", {"item_code": ("in", item_codes)})
+		insert_batch_wise_balance(get_ledger_balances(frappe._dict(item_code=item_codes)).values())
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+	frappe.db.set_default("batch_wise_balance_built", 1)
+
+
+def verify_batch_wise_balance(repair=False):
+	"""Compare the rows against balances recomputed from the Stock Ledger.
+
+	Returns the mismatching and duplicated rows. With `repair`, the rows are corrected."""
+	precision = cint(frappe.db.get_default("float_precision")) or 2
+
+	mismatches = []
+	for item_codes in get_batch_items_in_batches():
+		expected = get_ledger_balances(frappe._dict(item_code=item_codes))
+		actual = get_stored_batch_wise_balance(item_codes)
+
+		to_replace = []
+		for key in set(expected) | set(actual):
+			expected_row = expected.get(key)
+			actual_rows = actual.get(key) or []
+			actual_qty = sum(flt(row.qty) for row in actual_rows)
+
+			# rows are kept at zero qty, a batch with entries is available even if empty
+			if (
+				expected_row
+				and len(actual_rows) == 1
+				and not flt(flt(expected_row.qty) - actual_qty, precision)
+			):
+				continue
+
+			mismatches.append(
+				frappe._dict(
+					dict(zip(BALANCE_KEY_FIELDS, key)),
+					expected=expected_row and flt(expected_row.qty),
+					actual=actual_qty if actual_rows else None,
+					rows=len(actual_rows),
+				)
+			)
+			to_replace.append((actual_rows, expected_row))
+
+		if repair and to_replace:
+			names = [row.name for actual_rows, expected_row in to_replace for row in actual_rows]
+			if names:
+				frappe.db.delete("Batch Wise Balance", {"name": ("in", names)})
+
+			insert_batch_wise_balance(
+				expected_row for actual_rows, expected_row in to_replace if expected_row
+			)
+
+	return mismatches
+
+
+def verify_and_repair_batch_wise_balance():
+	"""Scheduled daily, logs and fixes rows which drifted from the Stock Ledger"""
+	if not is_batch_wise_balance_ready():
+		return
+
+	mismatches = verify_batch_wise_balance(repair=True)
+	if mismatches:
+		frappe.log_error(
+			title=_("Batch Wise Balance mismatch"),
+			message=frappe.as_json(mismatches[:100]),
+		)
+
+
+def on_doctype_update():
+	frappe.db.add_unique(
+		"Batch Wise Balance", list(BALANCE_KEY_FIELDS), constraint_name="unique_batch_wise_balance"
+	)
@@ -0,0 +1,102 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+
+from erpnext.stock.doctype.batch_wise_balance.batch_wise_balance import (
+	rebuild_batch_wise_balance,
+	verify_batch_wise_balance,
+)
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
+	get_auto_batch_nos,
+)
+from erpnext.stock.doctype.serial_and_batch_bundle.test_serial_and_batch_bundle import (
+	get_batch_from_bundle,
+)
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+WAREHOUSE = "_Test Warehouse - _TC"
+
+
+class TestBatchWiseBalance(FrappeTestCase):
+	def setUp(self):
+		self.item_code = make_item(
+			"_Test Batch Wise Balance Item",
+			{
+				"has_batch_no": 1,
+				"create_new_batch": 1,
+				"is_stock_item": 1,
+				"batch_number_series": "BWB-.#####",
+			},
+		).name
+
+	def get_balance(self, batch_no):
+		return frappe.db.get_value(
+			"Batch Wise Balance",
+			{"batch_no": batch_no, "warehouse": WAREHOUSE, "entry_type": "Serial and Batch Entry"},
+			"qty",
+		)
+
+	@change_settings("Stock Settings", {"maintain_batch_wise_balance": 1})
+	def test_balance_on_submit_and_cancel(self):
+		rebuild_batch_wise_balance()
+
+		receipt = make_stock_entry(item_code=self.item_code, qty=10, rate=100, target=WAREHOUSE)
+		batch_no = get_batch_from_bundle(receipt.items[0].serial_and_batch_bundle)
+		self.assertEqual(self.get_balance(batch_no), 10)
+
+		issue = make_stock_entry(item_code=self.item_code, qty=4, source=WAREHOUSE, batch_no=batch_no)
+		self.assertEqual(self.get_balance(batch_no), 6)
+
+		batches = get_auto_batch_nos(
+			frappe._dict(item_code=self.item_code, warehouse=WAREHOUSE, batch_no=batch_no)
+		)
+		self.assertEqual([(d.batch_no, d.qty) for d in batches], [(batch_no, 6)])
+
+		# entries of the vouchers to ignore are left out, like when read from the ledger
+		batches = get_auto_batch_nos(
+			frappe._dict(
+				item_code=self.item_code,
+				warehouse=WAREHOUSE,
+				batch_no=batch_no,
+				ignore_voucher_nos=[issue.name],
+			)
+		)
+		self.assertEqual([(d.batch_no, d.qty) for d in batches], [(batch_no, 10)])
+
+		issue.cancel()
+		self.assertEqual(self.get_balance(batch_no), 10)
+		self.assertFalse(verify_batch_wise_balance())
+
+	@change_settings("Stock Settings", {"maintain_batch_wise_balance": 1})
+	def test_verify_and_repair(self):
+		rebuild_batch_wise_balance()
+		receipt = make_stock_entry(item_code=self.item_code, qty=10, rate=100, target=WAREHOUSE)
+		batch_no = get_batch_from_bundle(receipt.items[0].serial_and_batch_bundle)
+
+		balance = frappe.qb.DocType("Batch Wise Balance")
+		frappe.qb.update(balance).set(balance.qty, 3).where(balance.batch_no == batch_no).run()
+
+		mismatches = verify_batch_wise_balance(repair=True)
+		self.assertEqual(len(mismatches), 1)
+		self.assertEqual(mismatches[0].batch_no, batch_no)
+		self.assertEqual(self.get_balance(batch_no), 10)
+		self.assertFalse(verify_batch_wise_balance())
+
+	@change_settings("Stock Settings", {"maintain_batch_wise_balance": 1})
+	def test_rebuild_with_rows_of_postings(self):
+		# rows inserted by a posting made while the rebuild runs are replaced, not duplicated
+		receipt = make_stock_entry(item_code=self.item_code, qty=10, rate=100, target=WAREHOUSE)
+		batch_no = get_batch_from_bundle(receipt.items[0].serial_and_batch_bundle)
+
+		rebuild_batch_wise_balance()
+		self.assertEqual(
+			frappe.db.count(
+				"Batch Wise Balance", {"batch_no": batch_no, "entry_type": "Serial and Batch Entry"}
+			),
+			1,
+		)
+		self.assertEqual(self.get_balance(batch_no), 10)
+		self.assertFalse(verify_batch_wise_balance())
@@ -1,6 +1,9 @@
 # Copyright (c) 2020, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
+import json
+from itertools import product
+
 import frappe
 from frappe import _
 from frappe.desk.form.load import get_attachments
@@ -9,19 +12,28 @@ from frappe.model.document import Document
 from frappe.query_builder import DocType, Interval
 from frappe.query_builder.functions import Max, Now
 from frappe.utils import cint, get_link_to_form, get_weekday, getdate, now, nowtime
+from frappe.utils.background_jobs import is_job_enqueued
 from frappe.utils.user import get_users_with_role
 from rq.timeouts import JobTimeoutException
 
 import erpnext
 from erpnext.accounts.general_ledger import validate_accounting_period
 from erpnext.accounts.utils import get_future_stock_vouchers, repost_gle_for_stock_vouchers
+from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+	invalidate_stock_balance_checkpoints,
+)
 from erpnext.stock.stock_ledger import (
 	get_affected_transactions,
+	get_distinct_item_warehouse,
+	get_item_warehouse_chains,
 	get_items_to_be_repost,
+	get_shared_voucher_item_warehouses,
 	repost_future_sle,
 )
 
 RecoverableErrors = (JobTimeoutException, QueryDeadlockError, QueryTimeoutError)
+PARALLEL_REPOST_JOBS_KEY = "repost_item_valuation_parallel_jobs"
+REPOST_SHARD_TIMEOUT = 6 * 60 * 60
 
 
 class RepostItemValuation(Document):
@@ -33,6 +45,10 @@ class RepostItemValuation(Document):
 	if TYPE_CHECKING:
 		from frappe.types import DF
 
+		from erpnext.stock.doctype.repost_item_valuation_shard.repost_item_valuation_shard import (
+			RepostItemValuationShard,
+		)
+
 		affected_transactions: DF.Code | None
 		allow_negative_stock: DF.Check
 		allow_zero_rate: DF.Check
@@ -48,6 +64,7 @@ class RepostItemValuation(Document):
 		posting_date: DF.Date
 		posting_time: DF.Time | None
 		reposting_data_file: DF.Attach | None
+		shards: DF.Table[RepostItemValuationShard]
 		status: DF.Literal["Queued", "In Progress", "Completed", "Skipped", "Failed"]
 		total_reposting_count: DF.Int
 		via_landed_cost_voucher: DF.Check
@@ -60,13 +77,15 @@ class RepostItemValuation(Document):
 	def clear_old_logs(days=None):
 		days = days or 90
 		table = DocType("Repost Item Valuation")
+		filters = (table.modified < (Now() - Interval(days=days))) & (
+			table.status.isin(["Completed", "Skipped"])
+		)
+
+		shard = DocType("Repost Item Valuation Shard")
 		frappe.db.delete(
-			table,
-			filters=(
-				(table.modified < (Now() - Interval(days=days)))
-				& (table.status.isin(["Completed", "Skipped"]))
-			),
+			shard, filters=shard.parent.isin(frappe.qb.from_(table).select(table.name).where(filters))
 		)
+		frappe.db.delete(table, filters=filters)
 
 	def validate(self):
 		self.validate_period_closing_voucher()
@@ -236,6 +255,7 @@ class RepostItemValuation(Document):
 		self.items_to_be_repost = None
 		self.gl_reposting_index = 0
 		self.db_update()
+		frappe.db.delete("Repost Item Valuation Shard", {"parent": self.name})
 
 	def deduplicate_similar_repost(self):
 		"""Deduplicate similar reposts based on item-warehouse-posting combination."""
@@ -282,7 +302,11 @@ def repost(doc):
 		if not frappe.flags.in_test:
 			frappe.db.commit()
 
+		if repost_in_shards(doc):
+			return
+
 		repost_sl_entries(doc)
+		invalidate_stock_balance_checkpoints(doc.posting_date)
 		repost_gl_entries(doc)
 
 		doc.set_status("Completed")
@@ -293,27 +317,161 @@ def repost(doc):
 			# there is no reason for reposts to fail in CI
 			raise
 
-		frappe.db.rollback()
-		traceback = frappe.get_traceback()
-		doc.log_error("Unable to repost item valuation")
+		log_repost_error(doc, e)
+	finally:
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+
+def log_repost_error(doc, e):
+	frappe.db.rollback()
+	traceback = frappe.get_traceback()
+	doc.log_error("Unable to repost item valuation")
+
+	message = frappe.message_log.pop() if frappe.message_log else ""
+	if traceback:
+		message += "<br>" + "Traceback: <br>" + traceback
+	frappe.db.set_value(doc.doctype, doc.name, "error_log", message)
+
+	outgoing_email_account = frappe.get_cached_value(
+		"Email Account", {"default_outgoing": 1, "enable_outgoing": 1}, "name"
+	)
+
+	if outgoing_email_account and not isinstance(e, RecoverableErrors):
+		notify_error_to_stock_managers(doc, message)
+		doc.set_status("Failed")
+
+
+def repost_in_shards(doc):
+	"""Reposts the SLEs of a transaction in parallel jobs, one per shard of independent
+	item-warehouses, if Parallel Reposting Jobs is set.
+
+	Each shard keeps its own progress, and the last one to finish reposts the GL Entries and
+	completes the repost. Returns True if the repost is left to the jobs."""
+	if not doc.shards and not make_repost_shards(doc):
+		return False
+
+	pending_shards = [shard for shard in doc.shards if shard.status != "Completed"]
+	if not pending_shards:
+		# the last shard failed after it was completed
+		complete_sharded_repost(doc)
+		return True
+
+	for shard in pending_shards:
+		job_id = f"repost_item_valuation::{doc.name}::shard::{shard.idx}"
+		if not is_job_enqueued(job_id):
+			frappe.enqueue(
+				repost_shard,
+				repost_item_valuation=doc.name,
+				shard=shard.name,
+				queue="long",
+				timeout=REPOST_SHARD_TIMEOUT,
+				job_id=job_id,
+				enqueue_after_commit=True,
+			)
+
+	return True
+
 
-		message = frappe.message_log.pop() if frappe.message_log else ""
-		if traceback:
-			message += "<br>" + "Traceback: <br>" + traceback
-		frappe.db.set_value(doc.doctype, doc.name, "error_log", message)
+def make_repost_shards(doc):
+	"""Splits the SLEs to repost of a transaction in shards, returns True if there is more than one"""
+	if doc.based_on != "Transaction" or doc.current_index or doc.reposting_data_file:
+		return False
 
-		outgoing_email_account = frappe.get_cached_value(
-			"Email Account", {"default_outgoing": 1, "enable_outgoing": 1}, "name"
+	parallel_jobs = cint(
+		frappe.db.get_single_value("Stock Reposting Settings", "parallel_reposting_jobs")
+	)
+	if parallel_jobs <= 1:
+		return False
+
+	args = get_items_to_be_repost(doc.voucher_type, doc.voucher_no, doc=doc)
+	shards = get_item_warehouse_shards(args, doc.posting_date, parallel_jobs)
+	if len(shards) <= 1:
+		return False
+
+	for shard_args in shards:
+		distinct_item_warehouses = get_distinct_item_warehouse(shard_args)
+		shard = doc.append(
+			"shards",
+			{
+				"status": "Queued",
+				"items_to_be_repost": json.dumps(shard_args, default=str),
+				"distinct_item_and_warehouse": json.dumps(
+					{str(k): v for k, v in distinct_item_warehouses.items()}, default=str
+				),
+			},
 		)
+		shard.docstatus = 1
+		shard.db_insert()
+
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+	return True
+
 
-		if outgoing_email_account and not isinstance(e, RecoverableErrors):
-			notify_error_to_stock_managers(doc, message)
-			doc.set_status("Failed")
+def repost_shard(repost_item_valuation, shard):
+	"""Reposts the SLEs of one shard, and completes the repost if it is the last one to finish"""
+	doc = frappe.get_doc("Repost Item Valuation", repost_item_valuation)
+	shard = next((row for row in doc.shards if row.name == shard), None)
+	if not shard or shard.status == "Completed" or doc.status != "In Progress":
+		return
+
+	try:
+		frappe.db.MAX_WRITES_PER_TRANSACTION *= 4
+
+		shard.db_set("status", "In Progress")
+		repost_future_sle(
+			allow_negative_stock=doc.allow_negative_stock,
+			via_landed_cost_voucher=doc.via_landed_cost_voucher,
+			doc=shard,
+		)
+
+		if complete_repost_shard(doc, shard):
+			complete_sharded_repost(doc)
+
+	except Exception as e:
+		if frappe.flags.in_test:
+			raise
+
+		log_repost_error(doc, e)
 	finally:
 		if not frappe.flags.in_test:
 			frappe.db.commit()
 
 
+def complete_repost_shard(doc, shard):
+	"""Marks the shard completed, returns True if no other shard of the repost is pending"""
+	# shards are completed one at a time under a lock on the repost, so only the last one to
+	# finish finds no pending shard
+	frappe.db.get_value(doc.doctype, doc.name, "status", for_update=True)
+	shard.db_set("status", "Completed")
+	pending_shards = frappe.db.count(
+		"Repost Item Valuation Shard", {"parent": doc.name, "status": ("!=", "Completed")}
+	)
+
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+	return not pending_shards
+
+
+def complete_sharded_repost(doc):
+	affected_transactions = set()
+	for shard in frappe.get_all(
+		"Repost Item Valuation Shard",
+		filters={"parent": doc.name},
+		fields=["affected_transactions"],
+	):
+		affected_transactions.update(get_affected_transactions(shard))
+
+	doc.db_set("affected_transactions", frappe.as_json(affected_transactions))
+	invalidate_stock_balance_checkpoints(doc.posting_date)
+	repost_gl_entries(doc)
+
+	doc.set_status("Completed")
+
+
 def repost_sl_entries(doc):
 	if doc.based_on == "Transaction":
 		repost_future_sle(
@@ -427,20 +585,159 @@ def repost_entries():
 
 	riv_entries = get_repost_item_valuation_entries()
 
-	for row in riv_entries:
-		doc = frappe.get_doc("Repost Item Valuation", row.name)
+	parallel_jobs = cint(
+		frappe.db.get_single_value("Stock Reposting Settings", "parallel_reposting_jobs")
+	)
+	if parallel_jobs > 1 and len(riv_entries) > 1:
+		enqueue_parallel_reposts(riv_entries, parallel_jobs)
+		return
+
+	repost_entries_in_order([row.name for row in riv_entries])
+
+	riv_entries = get_repost_item_valuation_entries()
+	if riv_entries:
+		return
+
+
+def repost_entries_in_order(riv_entries):
+	for name in riv_entries:
+		doc = frappe.get_doc("Repost Item Valuation", name)
 		if doc.status in ("Queued", "In Progress"):
 			repost(doc)
+			if doc.status == "In Progress" and doc.shards:
+				# later entries may depend on the valuation reposted by the shards
+				break
+
 			doc.deduplicate_similar_repost()
 
-	riv_entries = get_repost_item_valuation_entries()
-	if riv_entries:
+
+def enqueue_parallel_reposts(riv_entries, parallel_jobs):
+	"""Split queued reposts into independent item-warehouse chains and repost them in
+	`parallel_jobs` background jobs.
+
+	Entries of a chain stay in one job in their original order. Each entry keeps its own
+	progress (status, current index), so an interrupted job resumes in the next run."""
+	running_jobs = frappe.cache().get_value(PARALLEL_REPOST_JOBS_KEY) or []
+	if any(is_job_enqueued(job_id) for job_id in running_jobs):
 		return
 
+	job_ids = []
+	for idx, shard in enumerate(get_repost_shards(riv_entries, parallel_jobs)):
+		job_id = f"repost_item_valuation::shard::{idx}"
+		frappe.enqueue(
+			repost_entries_in_order,
+			riv_entries=shard,
+			queue="long",
+			timeout=REPOST_SHARD_TIMEOUT,
+			job_id=job_id,
+		)
+		job_ids.append(job_id)
+
+	frappe.cache().set_value(PARALLEL_REPOST_JOBS_KEY, job_ids)
+
+
+def get_repost_shards(riv_entries, no_of_shards):
+	"""Returns `no_of_shards` or fewer lists of Repost Item Valuation names. Entries whose
+	item-warehouses depend on each other, or have SLEs in the same voucher whose GL Entries
+	would be reposted by both, always end up in the same list."""
+	item_warehouses_by_entry = {}
+	for row in riv_entries:
+		if row.based_on == "Transaction":
+			# GL of future vouchers is reposted for every item in every warehouse of the transaction
+			sles = get_items_to_be_repost(row.voucher_type, row.voucher_no)
+			item_warehouses_by_entry[row.name] = set(
+				product({sle.item_code for sle in sles}, {sle.warehouse for sle in sles})
+			)
+		else:
+			item_warehouses_by_entry[row.name] = {(row.item_code, row.warehouse)}
+
+	posting_date = min(getdate(row.posting_date) for row in riv_entries)
+	chain_map = get_item_warehouse_chains(
+		[key for keys in item_warehouses_by_entry.values() for key in keys], posting_date
+	)
+
+	# a transaction can touch more than one chain, which then have to be reposted together
+	groups = {}
+	for item_warehouses in get_shared_voucher_item_warehouses(list(chain_map), posting_date):
+		merge_chains(groups, [chain_map[key] for key in item_warehouses])
+
+	entry_chains = {}
+	for name, item_warehouses in item_warehouses_by_entry.items():
+		chains = [chain_map[key] for key in item_warehouses] or [(name,)]
+		merge_chains(groups, chains)
+
+		entry_chains[name] = chains[0]
+
+	entries_by_group = {}
+	for row in riv_entries:
+		entries_by_group.setdefault(find_chain_group(groups, entry_chains[row.name]), []).append(
+			row.name
+		)
+
+	order = {row.name: idx for idx, row in enumerate(riv_entries)}
+	return [
+		sorted(shard, key=order.get)
+		for shard in spread_over_shards(entries_by_group.values(), no_of_shards)
+	]
+
+
+def get_item_warehouse_shards(args, posting_date, no_of_shards):
+	"""Returns `no_of_shards` or fewer lists of the SLEs to repost of a transaction, one per
+	item-warehouse. Item-warehouses whose valuations depend on each other always end up in the
+	same list, and so do the ones with outgoing rows in the same Stock Entry or rows in the same
+	Stock Reconciliation, since reposting one row recalculates all the rows of those."""
+	chain_map = get_item_warehouse_chains([(d.item_code, d.warehouse) for d in args], posting_date)
+
+	sle = DocType("Stock Ledger Entry")
+	recalculated_vouchers = ((sle.voucher_type == "Stock Entry") & (sle.actual_qty < 0)) | (
+		sle.voucher_type == "Stock Reconciliation"
+	)
+
+	groups = {}
+	for item_warehouses in get_shared_voucher_item_warehouses(
+		list(chain_map), posting_date, condition=recalculated_vouchers
+	):
+		merge_chains(groups, [chain_map[key] for key in item_warehouses])
+
+	args_by_group = {}
+	for row in args:
+		group = find_chain_group(groups, chain_map[(row.item_code, row.warehouse)])
+		args_by_group.setdefault(group, []).append(row)
+
+	order = {id(row): idx for idx, row in enumerate(args)}
+	return [
+		sorted(shard, key=lambda row: order[id(row)])
+		for shard in spread_over_shards(args_by_group.values(), no_of_shards)
+	]
+
+
+def find_chain_group(groups, chain):
+	groups.setdefault(chain, chain)
+	while groups[chain] != chain:
+		groups[chain] = groups[groups[chain]]
+		chain = groups[chain]
+
+	return chain
+
+
+def merge_chains(groups, chains):
+	for chain in chains[1:]:
+		groups[find_chain_group(groups, chain)] = find_chain_group(groups, chains[0])
+
+
+def spread_over_shards(lists, no_of_shards):
+	"""Spreads `lists` over `no_of_shards` or fewer shards, the longest first to the shortest shard"""
+	shards = [[] for _i in range(min(no_of_shards, len(lists)))]
+	for entries in sorted(lists, key=len, reverse=True):
+		min(shards, key=len).extend(entries)
+
+	return shards
+
 
 def get_repost_item_valuation_entries():
 	return frappe.db.sql(
-		""" SELECT name from `tabRepost Item Valuation`
+		""" SELECT name, based_on, item_code, warehouse, voucher_type, voucher_no, posting_date
+		from `tabRepost Item Valuation`
 		WHERE status in ('Queued', 'In Progress') and creation <= %s and docstatus = 1
 		ORDER BY timestamp(posting_date, posting_time) asc, creation asc, status asc
 	""",
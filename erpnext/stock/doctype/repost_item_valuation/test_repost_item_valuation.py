@@ -14,9 +14,12 @@ from erpnext.controllers.stock_controller import create_item_wise_repost_entries
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
 from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import (
+	get_item_warehouse_shards,
+	get_repost_shards,
 	in_configured_timeslot,
 )
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.stock_ledger import get_items_to_be_repost
 from erpnext.stock.tests.test_utils import StockTestMixin
 from erpnext.stock.utils import PendingRepostingError
 
@@ -420,3 +423,98 @@ class TestRepostItemValuation(FrappeTestCase, StockTestMixin):
 
 		self.assertRaises(frappe.ValidationError, riv.save)
 		doc.cancel()
+
+	def test_repost_shards_keep_dependent_item_warehouses_together(self):
+		transferred_item = make_item(properties={"is_stock_item": 1}).name
+		other_item = make_item(properties={"is_stock_item": 1}).name
+
+		make_stock_entry(
+			item_code=transferred_item, to_warehouse="_Test Warehouse - _TC", qty=10, rate=100
+		)
+		make_stock_entry(
+			item_code=transferred_item,
+			from_warehouse="_Test Warehouse - _TC",
+			to_warehouse="Stores - _TC",
+			qty=5,
+		)
+		make_stock_entry(item_code=other_item, to_warehouse="_Test Warehouse - _TC", qty=10, rate=100)
+
+		def riv(name, item_code, warehouse):
+			return frappe._dict(
+				name=name,
+				based_on="Item and Warehouse",
+				item_code=item_code,
+				warehouse=warehouse,
+				posting_date=today(),
+			)
+
+		riv_entries = [
+			riv("riv-1", transferred_item, "_Test Warehouse - _TC"),
+			riv("riv-2", other_item, "_Test Warehouse - _TC"),
+			riv("riv-3", transferred_item, "Stores - _TC"),
+		]
+
+		shards = get_repost_shards(riv_entries, 4)
+		self.assertEqual(len(shards), 2)
+		self.assertIn(["riv-1", "riv-3"], shards)
+		self.assertIn(["riv-2"], shards)
+
+		self.assertEqual(get_repost_shards(riv_entries, 1), [["riv-1", "riv-2", "riv-3"]])
+
+	def test_repost_shards_keep_item_warehouses_of_a_voucher_together(self):
+		from erpnext.stock.doctype.stock_reservation_entry.test_stock_reservation_entry import (
+			create_material_receipt,
+		)
+
+		items = {}
+		for _i in range(3):
+			item = make_item(properties={"is_stock_item": 1, "valuation_rate": 100})
+			items[item.name] = item
+
+		item_codes = list(items)
+		# GL of the receipt is reposted as a whole while reposting either of its items
+		create_material_receipt({code: items[code] for code in item_codes[:2]}, qty=10)
+		create_material_receipt({item_codes[2]: items[item_codes[2]]}, qty=10)
+
+		riv_entries = [
+			frappe._dict(
+				name=f"riv-{idx}",
+				based_on="Item and Warehouse",
+				item_code=item_code,
+				warehouse="_Test Warehouse - _TC",
+				posting_date=today(),
+			)
+			for idx, item_code in enumerate(item_codes)
+		]
+
+		shards = get_repost_shards(riv_entries, 4)
+		self.assertEqual(len(shards), 2)
+		self.assertIn(["riv-0", "riv-1"], shards)
+		self.assertIn(["riv-2"], shards)
+
+	def test_item_warehouse_shards_of_a_transaction(self):
+		from erpnext.stock.doctype.stock_reservation_entry.test_stock_reservation_entry import (
+			create_material_receipt,
+		)
+
+		items = {}
+		for _i in range(3):
+			item = make_item(properties={"is_stock_item": 1, "valuation_rate": 100})
+			items[item.name] = item
+
+		transferred_item = list(items)[0]
+		receipt = create_material_receipt(items, qty=10)
+		make_stock_entry(
+			item_code=transferred_item,
+			from_warehouse="_Test Warehouse - _TC",
+			to_warehouse="Stores - _TC",
+			qty=5,
+		)
+
+		args = get_items_to_be_repost("Stock Entry", receipt.name)
+		shards = get_item_warehouse_shards(args, receipt.posting_date, 4)
+		self.assertEqual(len(shards), 3)
+		self.assertEqual(sorted(row.item_code for shard in shards for row in shard), sorted(items))
+
+		self.assertEqual(len(get_item_warehouse_shards(args, receipt.posting_date, 2)), 2)
+		self.assertEqual(len(get_item_warehouse_shards(args, receipt.posting_date, 1)), 1)
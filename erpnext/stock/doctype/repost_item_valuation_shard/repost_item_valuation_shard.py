@@ -0,0 +1,27 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+
+from frappe.model.document import Document
+
+
+class RepostItemValuationShard(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		affected_transactions: DF.Code | None
+		current_index: DF.Int
+		distinct_item_and_warehouse: DF.Code | None
+		items_to_be_repost: DF.Code | None
+		parent: DF.Data
+		parentfield: DF.Data
+		parenttype: DF.Data
+		status: DF.Literal["Queued", "In Progress", "Completed"]
+	# end: auto-generated types
+
+	pass
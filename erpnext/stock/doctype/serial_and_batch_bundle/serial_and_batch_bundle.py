@@ -9,6 +9,7 @@ from typing import Dict, List
 import frappe
 from frappe import _, _dict, bold
 from frappe.model.document import Document
+from frappe.model.naming import set_new_name
 from frappe.query_builder.functions import CombineDatetime, Sum
 from frappe.utils import (
 	add_days,
@@ -23,6 +24,15 @@ from frappe.utils import (
 )
 from frappe.utils.csvutils import build_csv_response
 
+from erpnext.stock.doctype.batch_wise_balance.batch_wise_balance import (
+	get_available_batches_from_balance,
+	get_stock_ledgers_batches_from_balance,
+	is_batch_wise_balance_ready,
+)
+from erpnext.stock.doctype.serial_no_state.serial_no_state import (
+	get_serial_nos_at_posting_date,
+	is_serial_no_state_ready,
+)
 from erpnext.stock.serial_batch_bundle import (
 	BatchNoValuation,
 	SerialNoValuation,
@@ -30,6 +40,11 @@ from erpnext.stock.serial_batch_bundle import (
 )
 from erpnext.stock.serial_batch_bundle import get_serial_nos as get_serial_nos_from_bundle
 
+# bundles with at least as many entries insert and update them with multi-row queries
+BULK_ENTRIES_THRESHOLD = 1000
+# names looked up per query when checking which Serial / Batch Nos exist
+NAMES_CHUNK_SIZE = 10000
+
 
 class SerialNoExistsInFutureTransactionError(frappe.ValidationError):
 	pass
@@ -85,6 +100,9 @@ class SerialandBatchBundle(Document):
 	# end: auto-generated types
 
 	def validate(self):
+		if self.has_bulk_entries():
+			self.validate_entry_links()
+
 		self.validate_serial_and_batch_no()
 		self.validate_duplicate_serial_and_batch_no()
 		self.validate_voucher_no()
@@ -104,7 +122,10 @@ class SerialandBatchBundle(Document):
 			return
 
 		serial_nos = [d.serial_no for d in self.entries if d.serial_no]
-		kwargs = {"item_code": self.item_code, "warehouse": self.warehouse}
+		if not serial_nos:
+			return
+
+		kwargs = {"item_code": self.item_code, "warehouse": self.warehouse, "serial_nos": serial_nos}
 		if self.voucher_type == "POS Invoice":
 			kwargs["ignore_voucher_nos"] = [self.voucher_no]
 
@@ -162,6 +183,74 @@ class SerialandBatchBundle(Document):
 					SerialNoDuplicateError,
 				)
 
+	def has_bulk_entries(self):
+		return len(self.entries) >= BULK_ENTRIES_THRESHOLD
+
+	def validate_entry_links(self):
+		"""Links of the entries are checked here with a query per link field, instead of a query
+		per entry and link while validating the links of the document"""
+		for df in frappe.get_meta("Serial and Batch Entry").get_link_fields():
+			fieldname, doctype = df.fieldname, df.options
+			names = list({d.get(fieldname) for d in self.entries if d.get(fieldname)})
+			missing_names = set(names) - get_existing_names(doctype, names)
+			if missing_names:
+				self.throw_error_message(
+					f"Could not find {doctype} {bold(', '.join(sorted(missing_names)[:20]))}",
+					frappe.LinkValidationError,
+				)
+
+	def db_insert(self, *args, **kwargs):
+		super().db_insert(*args, **kwargs)
+
+		if self.has_bulk_entries():
+			self.bulk_insert_entries()
+
+	def update_child_table(self, fieldname, df=None):
+		if fieldname != "entries" or not self.has_bulk_entries():
+			return super().update_child_table(fieldname, df)
+
+		# entries are replaced at once instead of being updated one by one
+		frappe.db.delete(
+			"Serial and Batch Entry",
+			{"parent": self.name, "parenttype": self.doctype, "parentfield": fieldname},
+		)
+		self.bulk_insert_entries()
+
+	def bulk_insert_entries(self):
+		values = []
+		for row in self.entries:
+			if not row.name:
+				set_new_name(row)
+
+			values.append(row.get_valid_dict(convert_dates_to_str=True))
+			row.flags.bulk_inserted = True
+			row.set("__islocal", False)
+
+		frappe.db.bulk_insert(
+			"Serial and Batch Entry",
+			fields=list(values[0]),
+			values=[tuple(d.values()) for d in values],
+		)
+
+	def update_entries_rate(self, rows):
+		"""Save the incoming rate and stock value difference of `rows`, with a query per
+		distinct rate rather than per row"""
+		names_by_rate = defaultdict(list)
+		for d in rows:
+			names_by_rate[(d.incoming_rate, d.stock_value_difference)].append(d.name)
+
+		table = frappe.qb.DocType("Serial and Batch Entry")
+		timestamp = now()
+		for (incoming_rate, stock_value_difference), names in names_by_rate.items():
+			(
+				frappe.qb.update(table)
+				.set(table.incoming_rate, incoming_rate)
+				.set(table.stock_value_difference, stock_value_difference)
+				.set(table.modified, timestamp)
+				.set(table.modified_by, frappe.session.user)
+				.where(table.name.isin(names))
+			).run()
+
 	def throw_error_message(self, message, exception=frappe.ValidationError):
 		frappe.throw(_(message), exception, title=_("Error"))
 
@@ -234,10 +323,8 @@ class SerialandBatchBundle(Document):
 
 			d.stock_value_difference = flt(d.qty) * flt(d.incoming_rate)
 
-			if save:
-				d.db_set(
-					{"incoming_rate": d.incoming_rate, "stock_value_difference": d.stock_value_difference}
-				)
+		if save:
+			self.update_entries_rate(self.entries)
 
 	def validate_negative_batch(self, batch_no, available_qty):
 		if available_qty < 0:
@@ -299,6 +386,7 @@ class SerialandBatchBundle(Document):
 		if not rate and self.voucher_detail_no and self.voucher_no:
 			rate = frappe.db.get_value(child_table, self.voucher_detail_no, valuation_field)
 
+		updated_rows = []
 		for d in self.entries:
 			if not rate or (
 				flt(rate, precision) == flt(d.incoming_rate, precision) and d.stock_value_difference
@@ -309,10 +397,10 @@ class SerialandBatchBundle(Document):
 			if self.has_batch_no:
 				d.stock_value_difference = flt(d.qty) * flt(d.incoming_rate)
 
-			if save:
-				d.db_set(
-					{"incoming_rate": d.incoming_rate, "stock_value_difference": d.stock_value_difference}
-				)
+			updated_rows.append(d)
+
+		if save and updated_rows:
+			self.update_entries_rate(updated_rows)
 
 	def set_serial_and_batch_values(self, parent, row, qty_field=None):
 		values_to_set = {}
@@ -969,22 +1057,26 @@ def get_serial_batch_from_data(item_code, kwargs):
 
 
 def make_serial_nos(item_code, serial_nos):
-	item = frappe.get_cached_value("Item", item_code, ["description", "item_code"], as_dict=1)
+	item = frappe.get_cached_value(
+		"Item", item_code, ["description", "item_code", "item_name"], as_dict=1
+	)
 
-	serial_nos = [d.get("serial_no") for d in serial_nos if d.get("serial_no")]
+	serial_nos = list({d.get("serial_no") for d in serial_nos if d.get("serial_no")})
+	existing_serial_nos = get_existing_names("Serial No", serial_nos)
 
 	serial_nos_details = []
+	timestamp = now()
 	user = frappe.session.user
 	for serial_no in serial_nos:
-		if frappe.db.exists("Serial No", serial_no):
+		if serial_no in existing_serial_nos:
 			continue
 
 		serial_nos_details.append(
 			(
 				serial_no,
 				serial_no,
-				now(),
-				now(),
+				timestamp,
+				timestamp,
 				user,
 				user,
 				item.item_code,
@@ -1007,24 +1099,38 @@ def make_serial_nos(item_code, serial_nos):
 		"status",
 	]
 
-	frappe.db.bulk_insert("Serial No", fields=fields, values=set(serial_nos_details))
+	frappe.db.bulk_insert("Serial No", fields=fields, values=serial_nos_details)
 
 	frappe.msgprint(_("Serial Nos are created successfully"), alert=True)
 
 
 def make_batch_nos(item_code, batch_nos):
-	item = frappe.get_cached_value("Item", item_code, ["description", "item_code"], as_dict=1)
+	item = frappe.get_cached_value(
+		"Item", item_code, ["description", "item_code", "item_name"], as_dict=1
+	)
 
-	batch_nos = [d.get("batch_no") for d in batch_nos if d.get("batch_no")]
+	batch_nos = list({d.get("batch_no") for d in batch_nos if d.get("batch_no")})
+	existing_batch_nos = get_existing_names("Batch", batch_nos)
 
 	batch_nos_details = []
+	timestamp = now()
 	user = frappe.session.user
 	for batch_no in batch_nos:
-		if frappe.db.exists("Batch", batch_no):
+		if batch_no in existing_batch_nos:
 			continue
 
 		batch_nos_details.append(
-			(batch_no, batch_no, now(), now(), user, user, item.item_code, item.item_name, item.description)
+			(
+				batch_no,
+				batch_no,
+				timestamp,
+				timestamp,
+				user,
+				user,
+				item.item_code,
+				item.item_name,
+				item.description,
+			)
 		)
 
 	fields = [
@@ -1039,11 +1145,21 @@ def make_batch_nos(item_code, batch_nos):
 		"description",
 	]
 
-	frappe.db.bulk_insert("Batch", fields=fields, values=set(batch_nos_details))
+	frappe.db.bulk_insert("Batch", fields=fields, values=batch_nos_details)
 
 	frappe.msgprint(_("Batch Nos are created successfully"), alert=True)
 
 
+def get_existing_names(doctype, names):
+	existing_names = set()
+	for i in range(0, len(names), NAMES_CHUNK_SIZE):
+		existing_names.update(
+			frappe.get_all(doctype, filters={"name": ("in", names[i : i + NAMES_CHUNK_SIZE])}, pluck="name")
+		)
+
+	return existing_names
+
+
 def parse_serial_nos(data):
 	if isinstance(data, list):
 		return data
@@ -1294,6 +1410,12 @@ def get_available_serial_nos(kwargs):
 			return []
 
 		filters["name"] = ("in", time_based_serial_nos)
+	elif kwargs.get("serial_nos"):
+		serial_nos = set(kwargs.serial_nos) - set(ignore_serial_nos)
+		if not serial_nos:
+			return []
+
+		filters["name"] = ("in", list(serial_nos))
 	elif ignore_serial_nos:
 		filters["name"] = ("not in", ignore_serial_nos)
 
@@ -1333,23 +1455,26 @@ def get_non_expired_batches(batches):
 def get_serial_nos_based_on_posting_date(kwargs, ignore_serial_nos):
 	from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
-	serial_nos = set()
-	data = get_stock_ledgers_for_serial_nos(kwargs)
+	if is_serial_no_state_ready() and not kwargs.get("serial_no"):
+		serial_nos = get_serial_nos_at_posting_date(kwargs)
+	else:
+		serial_nos = set()
+		data = get_stock_ledgers_for_serial_nos(kwargs)
 
-	for d in data:
-		if d.serial_and_batch_bundle:
-			sns = get_serial_nos_from_bundle(d.serial_and_batch_bundle, kwargs.get("serial_nos", []))
-			if d.actual_qty > 0:
-				serial_nos.update(sns)
-			else:
-				serial_nos.difference_update(sns)
+		for d in data:
+			if d.serial_and_batch_bundle:
+				sns = get_serial_nos_from_bundle(d.serial_and_batch_bundle, kwargs.get("serial_nos", []))
+				if d.actual_qty > 0:
+					serial_nos.update(sns)
+				else:
+					serial_nos.difference_update(sns)
 
-		elif d.serial_no:
-			sns = get_serial_nos(d.serial_no)
-			if d.actual_qty > 0:
-				serial_nos.update(sns)
-			else:
-				serial_nos.difference_update(sns)
+			elif d.serial_no:
+				sns = get_serial_nos(d.serial_no)
+				if d.actual_qty > 0:
+					serial_nos.update(sns)
+				else:
+					serial_nos.difference_update(sns)
 
 	serial_nos = list(serial_nos)
 	for serial_no in ignore_serial_nos:
@@ -1654,6 +1779,9 @@ def update_available_batches(available_batches, *reserved_batches) -> None:
 
 
 def get_available_batches(kwargs):
+	if is_batch_wise_balance_ready():
+		return get_available_batches_from_balance(kwargs)
+
 	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
 	batch_ledger = frappe.qb.DocType("Serial and Batch Entry")
 	batch_table = frappe.qb.DocType("Batch")
@@ -1840,6 +1968,9 @@ def get_stock_ledgers_for_serial_nos(kwargs):
 
 
 def get_stock_ledgers_batches(kwargs):
+	if is_batch_wise_balance_ready():
+		return get_stock_ledgers_batches_from_balance(kwargs)
+
 	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
 	batch_table = frappe.qb.DocType("Batch")
 
@@ -2,6 +2,7 @@
 # See license.txt
 
 import json
+from unittest.mock import patch
 
 import frappe
 from frappe.tests.utils import FrappeTestCase
@@ -420,6 +421,73 @@ class TestSerialandBatchBundle(FrappeTestCase):
 		ste.delete()
 		self.assertFalse(frappe.db.exists("Serial and Batch Bundle", bundle_doc.name))
 
+	def test_make_autonames(self):
+		from erpnext.utilities.naming import InvalidNamingSeriesError, make_autonames
+
+		names = make_autonames("TEST-AUTONAMES-.###", "Serial No", 3)
+		numbers = [int(name.rsplit("-", 1)[1]) for name in names]
+		self.assertEqual(numbers, list(range(numbers[0], numbers[0] + 3)))
+
+		# number part not separated with a dot
+		self.assertRaises(
+			InvalidNamingSeriesError, make_autonames, "TEST-AUTONAMES#####", "Serial No", 2
+		)
+
+	@patch(
+		"erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle.BULK_ENTRIES_THRESHOLD", 2
+	)
+	def test_bulk_serial_and_batch_entries(self):
+		item_code = make_item(
+			"_Test Bulk Serial Item",
+			{"has_serial_no": 1, "serial_no_series": "TEST-BULK-SN-.#####", "is_stock_item": 1},
+		).name
+
+		ste = make_stock_entry(item_code=item_code, target="_Test Warehouse - _TC", qty=5, rate=100)
+		bundle = ste.items[0].serial_and_batch_bundle
+
+		# serial nos are numbered consecutively from one reservation of the series
+		serial_nos = get_serial_nos_from_bundle(bundle)
+		self.assertEqual(len(serial_nos), 5)
+		numbers = [int(serial_no.rsplit("-", 1)[1]) for serial_no in serial_nos]
+		self.assertEqual(numbers, list(range(numbers[0], numbers[0] + 5)))
+
+		entries = frappe.get_all(
+			"Serial and Batch Entry",
+			filters={"parent": bundle},
+			fields=["docstatus", "warehouse", "incoming_rate"],
+		)
+		self.assertEqual(len(entries), 5)
+		for entry in entries:
+			self.assertEqual(entry.docstatus, 1)
+			self.assertEqual(entry.warehouse, "_Test Warehouse - _TC")
+			self.assertEqual(entry.incoming_rate, 100)
+
+		ste.cancel()
+		self.assertFalse(frappe.db.get_value("Serial No", serial_nos[0], "warehouse"))
+
+		bundle_doc = frappe.new_doc("Serial and Batch Bundle")
+		bundle_doc.update(
+			{
+				"item_code": item_code,
+				"warehouse": "_Test Warehouse - _TC",
+				"voucher_type": "Stock Entry",
+				"type_of_transaction": "Inward",
+				"company": "_Test Company",
+			}
+		)
+		for serial_no in ("TEST-BULK-SN-MISSING-1", "TEST-BULK-SN-MISSING-2"):
+			bundle_doc.append("entries", {"serial_no": serial_no, "qty": 1})
+
+		self.assertRaises(frappe.LinkValidationError, bundle_doc.save)
+
+		bundle_doc.set("entries", [])
+		for serial_no in serial_nos[:2]:
+			bundle_doc.append(
+				"entries", {"serial_no": serial_no, "qty": 1, "warehouse": "_Test Missing Warehouse - _TC"}
+			)
+
+		self.assertRaises(frappe.LinkValidationError, bundle_doc.save)
+
 
 def get_batch_from_bundle(bundle):
 	from erpnext.stock.serial_batch_bundle import get_batch_nos
@@ -29,4 +29,18 @@ class SerialandBatchEntry(Document):
 		warehouse: DF.Link | None
 	# end: auto-generated types
 
-	pass
+	def get_invalid_links(self, is_submittable=False):
+		parent_doc = getattr(self, "parent_doc", None)
+
+		# links of bundles with many entries are checked together, see `validate_entry_links`
+		if parent_doc and parent_doc.has_bulk_entries():
+			return [], []
+
+		return super().get_invalid_links(is_submittable=is_submittable)
+
+	def db_insert(self, *args, **kwargs):
+		# inserted with the other entries of the bundle, see `bulk_insert_entries`
+		if self.flags.bulk_inserted:
+			return
+
+		return super().db_insert(*args, **kwargs)
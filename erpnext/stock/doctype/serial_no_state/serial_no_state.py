@@ -0,0 +1,416 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import datetime
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.query_builder.functions import CombineDatetime, Coalesce
+from frappe.utils import cint, get_datetime, get_time, getdate, now
+
+STATE_FIELDS = (
+	"item_code",
+	"warehouse",
+	"batch_no",
+	"voucher_type",
+	"voucher_no",
+	"posting_datetime",
+)
+
+# serial no items, and Serial Nos of them, whose states are recomputed together during a
+# rebuild or a verification
+ITEM_BATCH_SIZE = 100
+SERIAL_NO_PAGE_SIZE = 10000
+
+
+class SerialNoState(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		batch_no: DF.Link | None
+		item_code: DF.Link | None
+		posting_datetime: DF.Datetime | None
+		serial_no: DF.Link | None
+		voucher_no: DF.DynamicLink | None
+		voucher_type: DF.Link | None
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def is_serial_no_state_maintained():
+	"""Rows are updated on every Stock Ledger Entry of a serial no item once enabled in Stock
+	Settings"""
+	return cint(frappe.db.get_single_value("Stock Settings", "maintain_serial_no_state"))
+
+
+def is_serial_no_state_ready():
+	"""Rows can be read only after the initial build from existing Stock Ledger Entries is done"""
+	return is_serial_no_state_maintained() and cint(frappe.db.get_default("serial_no_state_built"))
+
+
+def get_posting_datetime(posting_date, posting_time):
+	return datetime.datetime.combine(getdate(posting_date), get_time(posting_time))
+
+
+def apply_filters(query, kwargs, fields):
+	"""Filter `query` on item code and warehouse, each a value or a list of values"""
+	for key, field in fields.items():
+		value = kwargs.get(key)
+		if not value:
+			continue
+
+		if isinstance(value, list):
+			query = query.where(field.isin(value))
+		else:
+			query = query.where(field == value)
+
+	return query
+
+
+def get_serial_no_entries(kwargs, serial_nos=None, posting_datetime=None):
+	"""Entries moving Serial Nos of the item and warehouse of `kwargs`, in posting order, up to
+	`posting_datetime` and leaving out the entries of `kwargs.voucher_no`.
+
+	Stock Ledger Entries with Serial Nos instead of a Serial and Batch Bundle predate bundles,
+	they are read only for the Serial Nos without entries in bundles."""
+	entries = get_bundle_entries(kwargs, serial_nos, posting_datetime)
+
+	if serial_nos is None:
+		entries.extend(get_entries_without_bundle(kwargs, None, posting_datetime))
+	elif missing_serial_nos := set(serial_nos) - {d.serial_no for d in entries}:
+		entries.extend(get_entries_without_bundle(kwargs, missing_serial_nos, posting_datetime))
+
+	# outward before inward within a transfer posted at the same time
+	return sorted(entries, key=lambda d: (d.posting_datetime, d.creation, d.actual_qty > 0))
+
+
+def get_stock_ledger_query(kwargs, posting_datetime=None):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+
+	query = (
+		frappe.qb.from_(sle)
+		.select(
+			sle.item_code,
+			sle.warehouse,
+			sle.actual_qty,
+			sle.voucher_type,
+			sle.voucher_no,
+			sle.posting_date,
+			sle.posting_time,
+			sle.creation,
+		)
+		.where(sle.is_cancelled == 0)
+	)
+	query = apply_filters(query, kwargs, {"item_code": sle.item_code, "warehouse": sle.warehouse})
+
+	if posting_datetime:
+		query = query.where(CombineDatetime(sle.posting_date, sle.posting_time) <= posting_datetime)
+
+	if kwargs.get("voucher_no"):
+		query = query.where(sle.voucher_no != kwargs.voucher_no)
+
+	return query, sle
+
+
+def get_bundle_entries(kwargs, serial_nos=None, posting_datetime=None):
+	query, sle = get_stock_ledger_query(kwargs, posting_datetime)
+	batch_ledger = frappe.qb.DocType("Serial and Batch Entry")
+
+	query = (
+		query.inner_join(batch_ledger)
+		.on(sle.serial_and_batch_bundle == batch_ledger.parent)
+		.select(batch_ledger.serial_no, batch_ledger.batch_no)
+		.where(batch_ledger.serial_no.isnotnull())
+	)
+
+	if serial_nos is not None:
+		query = query.where(batch_ledger.serial_no.isin(list(serial_nos)))
+
+	entries = query.run(as_dict=True)
+	for d in entries:
+		d.posting_datetime = get_posting_datetime(d.posting_date, d.posting_time)
+
+	return entries
+
+
+def get_entries_without_bundle(kwargs, serial_nos=None, posting_datetime=None):
+	from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
+
+	query, sle = get_stock_ledger_query(kwargs, posting_datetime)
+	query = query.select(sle.serial_no, sle.batch_no).where(
+		(sle.serial_no.isnotnull()) & (Coalesce(sle.serial_and_batch_bundle, "") == "")
+	)
+
+	entries = []
+	for d in query.run(as_dict=True):
+		d.posting_datetime = get_posting_datetime(d.posting_date, d.posting_time)
+		for serial_no in get_serial_nos(d.serial_no):
+			if serial_nos is None or serial_no in serial_nos:
+				entries.append(frappe._dict(d, serial_no=serial_no))
+
+	return entries
+
+
+def get_serial_no_states(entries):
+	"""State of each Serial No after its last entry, `entries` being in posting order"""
+	states = {}
+	for d in entries:
+		states[d.serial_no] = frappe._dict(
+			serial_no=d.serial_no,
+			item_code=d.item_code,
+			warehouse=d.warehouse if d.actual_qty > 0 else None,
+			batch_no=d.batch_no,
+			voucher_type=d.voucher_type,
+			voucher_no=d.voucher_no,
+			posting_datetime=d.posting_datetime,
+		)
+
+	return states
+
+
+def get_serial_nos_at_posting_date(kwargs):
+	"""Serial Nos in stock now which were also in stock at the posting date and time of `kwargs`,
+	as replaying the Stock Ledger up to it would find them.
+
+	Serial Nos last moved before it are in the same state. The others, and the ones last moved
+	by `kwargs.voucher_no`, are looked up in the Stock Ledger."""
+	state = frappe.qb.DocType("Serial No State")
+	query = (
+		frappe.qb.from_(state)
+		.select(state.serial_no, state.voucher_no, state.posting_datetime)
+		.where(state.warehouse.isnotnull())
+	)
+	query = apply_filters(query, kwargs, {"item_code": state.item_code, "warehouse": state.warehouse})
+
+	if kwargs.get("serial_nos"):
+		query = query.where(state.serial_no.isin(kwargs.serial_nos))
+
+	posting_datetime = get_posting_datetime(kwargs.posting_date, kwargs.posting_time)
+
+	serial_nos, moved_serial_nos = set(), []
+	for row in query.run(as_dict=True):
+		if get_datetime(row.posting_datetime) > posting_datetime or (
+			kwargs.get("voucher_no") and row.voucher_no == kwargs.voucher_no
+		):
+			moved_serial_nos.append(row.serial_no)
+		else:
+			serial_nos.add(row.serial_no)
+
+	if moved_serial_nos:
+		in_stock = {}
+		for d in get_serial_no_entries(kwargs, moved_serial_nos, posting_datetime):
+			in_stock[d.serial_no] = d.actual_qty > 0
+
+		serial_nos.update(serial_no for serial_no, is_in_stock in in_stock.items() if is_in_stock)
+
+	return serial_nos
+
+
+def update_serial_no_state(sle, entries):
+	"""Keep the state of the Serial Nos moved by a Stock Ledger Entry, `entries` being their
+	Serial No and Batch No"""
+	if not entries or not is_serial_no_state_maintained():
+		return
+
+	serial_nos = [d.serial_no for d in entries]
+	states = {
+		row.name: row
+		for row in frappe.get_all(
+			"Serial No State",
+			filters={"name": ("in", serial_nos)},
+			fields=["name", "voucher_type", "voucher_no", "posting_datetime"],
+		)
+	}
+
+	if sle.is_cancelled:
+		# the state of Serial Nos last moved by the cancelled voucher goes back to the entry before
+		refresh_serial_no_state(
+			sle.item_code,
+			[
+				serial_no
+				for serial_no in serial_nos
+				if serial_no in states
+				and states[serial_no].voucher_type == sle.voucher_type
+				and states[serial_no].voucher_no == sle.voucher_no
+			],
+		)
+		return
+
+	posting_datetime = get_posting_datetime(sle.posting_date, sle.posting_time)
+
+	rows = []
+	for d in entries:
+		state = states.get(d.serial_no)
+		# a back-dated entry does not change the state after later entries
+		if state and get_datetime(state.posting_datetime) > posting_datetime:
+			continue
+
+		rows.append(
+			frappe._dict(
+				serial_no=d.serial_no,
+				item_code=sle.item_code,
+				warehouse=sle.warehouse if sle.actual_qty > 0 else None,
+				batch_no=d.batch_no,
+				voucher_type=sle.voucher_type,
+				voucher_no=sle.voucher_no,
+				posting_datetime=posting_datetime,
+			)
+		)
+
+	replace_serial_no_states([row.serial_no for row in rows], rows)
+
+
+def refresh_serial_no_state(item_code, serial_nos):
+	"""Recompute the state of `serial_nos` from the Stock Ledger"""
+	if not serial_nos:
+		return
+
+	states = get_serial_no_states(get_serial_no_entries(frappe._dict(item_code=item_code), serial_nos))
+	replace_serial_no_states(serial_nos, states.values())
+
+
+def replace_serial_no_states(serial_nos, rows):
+	if serial_nos:
+		frappe.db.delete("Serial No State", {"name": ("in", list(serial_nos))})
+
+	insert_serial_no_states(rows)
+
+
+def insert_serial_no_states(rows):
+	user = frappe.session.user
+	timestamp = now()
+
+	values = [
+		(row.serial_no, timestamp, timestamp, user, user, row.serial_no, *(row[f] for f in STATE_FIELDS))
+		for row in rows
+	]
+
+	fields = ["name", "creation", "modified", "owner", "modified_by", "serial_no", *STATE_FIELDS]
+	frappe.db.bulk_insert("Serial No State", fields=fields, values=values)
+
+
+def get_serial_no_items_in_batches():
+	item_codes = frappe.get_all("Item", filters={"has_serial_no": 1}, pluck="name", order_by="name")
+	for i in range(0, len(item_codes), ITEM_BATCH_SIZE):
+		yield item_codes[i : i + ITEM_BATCH_SIZE]
+
+
+def get_serial_nos_in_pages():
+	"""Serial Nos of the serial no items, a page of Serial Nos of a batch of items at a time.
+	Rows of Serial Nos which no longer exist come last in a page of their own."""
+	state = frappe.qb.DocType("Serial No State")
+	serial_no_table = frappe.qb.DocType("Serial No")
+
+	for item_codes in get_serial_no_items_in_batches():
+		last_serial_no = ""
+		while serial_nos := frappe.get_all(
+			"Serial No",
+			filters={"item_code": ("in", item_codes), "name": (">", last_serial_no)},
+			pluck="name",
+			order_by="name",
+			limit=SERIAL_NO_PAGE_SIZE,
+		):
+			yield item_codes, serial_nos
+			last_serial_no = serial_nos[-1]
+
+		if deleted_serial_nos := (
+			frappe.qb.from_(state)
+			.left_join(serial_no_table)
+			.on(serial_no_table.name == state.serial_no)
+			.select(state.serial_no)
+			.where(state.item_code.isin(item_codes) & serial_no_table.name.isnull())
+		).run(pluck=True):
+			yield item_codes, deleted_serial_nos
+
+
+def get_expected_serial_no_states(item_codes, serial_nos):
+	entries = get_serial_no_entries(frappe._dict(item_code=item_codes), serial_nos)
+	return get_serial_no_states(entries)
+
+
+def rebuild_serial_no_state():
+	"""Recreate all rows from the Stock Ledger.
+
+	Rows are updated by postings while the rebuild runs, so the rows of each page of Serial Nos
+	are deleted and inserted again in the same transaction."""
+	state = frappe.qb.DocType("Serial No State")
+	item = frappe.qb.DocType("Item")
+	frappe.qb.from_(state).delete().where(
+		state.item_code.notin(frappe.qb.from_(item).select(item.name).where(item.has_serial_no == 1))
+	).run()
+
+	for item_codes, serial_nos in get_serial_nos_in_pages():
+		replace_serial_no_states(
+			serial_nos, get_expected_serial_no_states(item_codes, serial_nos).values()
+		)
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+	frappe.db.set_default("serial_no_state_built", 1)
+
+
+def verify_serial_no_state(repair=False):
+	"""Compare the rows against states recomputed from the Stock Ledger.
+
+	Returns the mismatching rows. With `repair`, the rows are corrected."""
+	mismatches = []
+	for item_codes, serial_nos in get_serial_nos_in_pages():
+		expected = get_expected_serial_no_states(item_codes, serial_nos)
+		actual = {
+			row.serial_no: row
+			for row in frappe.get_all(
+				"Serial No State",
+				filters={"name": ("in", serial_nos)},
+				fields=["serial_no", *STATE_FIELDS],
+			)
+		}
+
+		to_replace = []
+		for serial_no in set(expected) | set(actual):
+			expected_row = expected.get(serial_no)
+			actual_row = actual.get(serial_no)
+
+			if (
+				expected_row
+				and actual_row
+				and all(
+					(get_datetime(expected_row[f]) == get_datetime(actual_row[f]))
+					if f == "posting_datetime"
+					else (expected_row[f] or None) == (actual_row[f] or None)
+					for f in STATE_FIELDS
+				)
+			):
+				continue
+
+			mismatches.append(frappe._dict(serial_no=serial_no, expected=expected_row, actual=actual_row))
+			to_replace.append(serial_no)
+
+		if repair and to_replace:
+			replace_serial_no_states(to_replace, [expected[d] for d in to_replace if d in expected])
+
+	return mismatches
+
+
+def verify_and_repair_serial_no_state():
+	"""Scheduled daily, logs and fixes rows which drifted from the Stock Ledger"""
+	if not is_serial_no_state_ready():
+		return
+
+	mismatches = verify_serial_no_state(repair=True)
+	if mismatches:
+		frappe.log_error(
+			title=_("Serial No State mismatch"),
+			message=frappe.as_json(mismatches[:100]),
+		)
+
+
+def on_doctype_update():
+	frappe.db.add_index("Serial No State", ["item_code", "warehouse"])
@@ -0,0 +1,100 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import add_days, today
+
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
+	get_available_serial_nos,
+)
+from erpnext.stock.doctype.serial_and_batch_bundle.test_serial_and_batch_bundle import (
+	get_serial_nos_from_bundle,
+)
+from erpnext.stock.doctype.serial_no_state.serial_no_state import (
+	rebuild_serial_no_state,
+	verify_serial_no_state,
+)
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+WAREHOUSE = "_Test Warehouse - _TC"
+
+
+class TestSerialNoState(FrappeTestCase):
+	def setUp(self):
+		self.item_code = make_item(
+			"_Test Serial No State Item",
+			{"has_serial_no": 1, "serial_no_series": "SNS-.#####", "is_stock_item": 1},
+		).name
+
+	def get_state_warehouse(self, serial_no):
+		return frappe.db.get_value("Serial No State", serial_no, "warehouse")
+
+	@change_settings("Stock Settings", {"maintain_serial_no_state": 1})
+	def test_state_on_submit_and_cancel(self):
+		rebuild_serial_no_state()
+
+		old_receipt = make_stock_entry(
+			item_code=self.item_code,
+			qty=2,
+			rate=100,
+			target=WAREHOUSE,
+			posting_date=add_days(today(), -5),
+		)
+		old_serial_nos = get_serial_nos_from_bundle(old_receipt.items[0].serial_and_batch_bundle)
+
+		receipt = make_stock_entry(item_code=self.item_code, qty=2, rate=100, target=WAREHOUSE)
+		serial_nos = get_serial_nos_from_bundle(receipt.items[0].serial_and_batch_bundle)
+
+		for serial_no in old_serial_nos + serial_nos:
+			self.assertEqual(self.get_state_warehouse(serial_no), WAREHOUSE)
+
+		# serials received after the posting date are not available at it
+		available = get_available_serial_nos(
+			frappe._dict(
+				item_code=self.item_code, warehouse=WAREHOUSE, posting_date=add_days(today(), -2)
+			)
+		)
+		self.assertEqual(sorted(d.serial_no for d in available), sorted(old_serial_nos))
+
+		issue = make_stock_entry(
+			item_code=self.item_code, qty=1, source=WAREHOUSE, serial_no=[old_serial_nos[0]]
+		)
+		self.assertIsNone(self.get_state_warehouse(old_serial_nos[0]))
+
+		available = get_available_serial_nos(frappe._dict(item_code=self.item_code, warehouse=WAREHOUSE))
+		self.assertNotIn(old_serial_nos[0], [d.serial_no for d in available])
+
+		issue.cancel()
+		self.assertEqual(self.get_state_warehouse(old_serial_nos[0]), WAREHOUSE)
+		self.assertFalse(verify_serial_no_state())
+
+	@change_settings("Stock Settings", {"maintain_serial_no_state": 1})
+	def test_verify_and_repair(self):
+		rebuild_serial_no_state()
+		receipt = make_stock_entry(item_code=self.item_code, qty=1, rate=100, target=WAREHOUSE)
+		serial_no = get_serial_nos_from_bundle(receipt.items[0].serial_and_batch_bundle)[0]
+
+		frappe.db.set_value("Serial No State", serial_no, "warehouse", None)
+
+		mismatches = verify_serial_no_state(repair=True)
+		self.assertEqual(len(mismatches), 1)
+		self.assertEqual(mismatches[0].serial_no, serial_no)
+		self.assertEqual(self.get_state_warehouse(serial_no), WAREHOUSE)
+		self.assertFalse(verify_serial_no_state())
+
+	@change_settings("Stock Settings", {"maintain_serial_no_state": 1})
+	def test_rebuild_in_pages_with_rows_of_postings(self):
+		# rows inserted by a posting made while the rebuild runs are replaced
+		receipt = make_stock_entry(item_code=self.item_code, qty=3, rate=100, target=WAREHOUSE)
+		serial_nos = get_serial_nos_from_bundle(receipt.items[0].serial_and_batch_bundle)
+
+		with patch("erpnext.stock.doctype.serial_no_state.serial_no_state.SERIAL_NO_PAGE_SIZE", 1):
+			rebuild_serial_no_state()
+			self.assertFalse(verify_serial_no_state())
+
+		for serial_no in serial_nos:
+			self.assertEqual(self.get_state_warehouse(serial_no), WAREHOUSE)
@@ -0,0 +1,153 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import json
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, cint, flt, get_first_day, getdate
+
+# item codes looked up together while saving or invalidating checkpoints
+ITEM_BATCH_SIZE = 1000
+
+
+class StockAgeingCheckpoint(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		company: DF.Link | None
+		fifo_queue: DF.LongText | None
+		item_code: DF.Link | None
+		posting_date: DF.Date | None
+		qty_after_transaction: DF.Float
+		total_qty: DF.Float
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def is_stock_ageing_checkpoint_enabled():
+	"""Checkpoints are saved by the Stock Ageing report and dropped by back-dated postings
+	once enabled in Stock Settings"""
+	return cint(frappe.db.get_single_value("Stock Settings", "persist_stock_ageing_slots"))
+
+
+def get_checkpoint_date(to_date):
+	"""Checkpoints are taken at the end of the month before `to_date` (or today, if
+	earlier), so that entries of the running month are always replayed"""
+	return getdate(add_days(get_first_day(min(getdate(to_date), getdate())), -1))
+
+
+def dump_fifo_queue(fifo_queue):
+	return json.dumps([[flt(qty), str(posting_date)] for qty, posting_date in fifo_queue])
+
+
+def load_fifo_queue(fifo_queue):
+	return [[flt(qty), getdate(posting_date)] for qty, posting_date in json.loads(fifo_queue or "[]")]
+
+
+def get_checkpoints_by_key(item_codes, posting_date=None):
+	checkpoint = frappe.qb.DocType("Stock Ageing Checkpoint")
+
+	checkpoints = {}
+	item_codes = list(item_codes)
+	for i in range(0, len(item_codes), ITEM_BATCH_SIZE):
+		query = (
+			frappe.qb.from_(checkpoint)
+			.select(checkpoint.name, checkpoint.item_code, checkpoint.warehouse, checkpoint.posting_date)
+			.where(checkpoint.item_code.isin(item_codes[i : i + ITEM_BATCH_SIZE]))
+		)
+
+		if posting_date:
+			query = query.where(checkpoint.posting_date >= posting_date)
+
+		for row in query.run(as_dict=True):
+			checkpoints.setdefault((row.item_code, row.warehouse), []).append(row)
+
+	return checkpoints
+
+
+def save_stock_ageing_checkpoints(slots, posting_date, company):
+	"""Save the FIFO slots of item-warehouses as on `posting_date`, replacing older checkpoints.
+
+	:param slots: dict of (item_code, warehouse) -> dict with `fifo_queue`,
+	        `qty_after_transaction` and `total_qty`"""
+	from erpnext.accounts.utils import bulk_insert_documents
+
+	if not slots:
+		return
+
+	to_delete = []
+	existing = get_checkpoints_by_key({item_code for item_code, warehouse in slots})
+	for key, rows in existing.items():
+		if key not in slots:
+			continue
+
+		if any(getdate(row.posting_date) >= posting_date for row in rows):
+			# a later checkpoint is already saved
+			slots.pop(key)
+		else:
+			to_delete.extend(row.name for row in rows)
+
+	if to_delete:
+		frappe.db.delete("Stock Ageing Checkpoint", {"name": ("in", to_delete)})
+
+	docs = []
+	for (item_code, warehouse), row in slots.items():
+		doc = frappe.new_doc("Stock Ageing Checkpoint")
+		doc.update(
+			{
+				"item_code": item_code,
+				"warehouse": warehouse,
+				"company": company,
+				"posting_date": posting_date,
+				"qty_after_transaction": flt(row["qty_after_transaction"]),
+				"total_qty": flt(row["total_qty"]),
+				"fifo_queue": dump_fifo_queue(row["fifo_queue"]),
+			}
+		)
+		doc.set_new_name()
+		docs.append(doc)
+
+	bulk_insert_documents(docs)
+
+
+def invalidate_stock_ageing_checkpoints(sl_entries):
+	"""Drop checkpoints that include the posting date of new or cancelled entries"""
+	if not sl_entries or not is_stock_ageing_checkpoint_enabled():
+		return
+
+	posting_dates = {}
+	for sle in sl_entries:
+		key = (sle.get("item_code"), sle.get("warehouse"))
+		posting_date = getdate(sle.get("posting_date"))
+		if key not in posting_dates or posting_date < posting_dates[key]:
+			posting_dates[key] = posting_date
+
+	existing = get_checkpoints_by_key(
+		{item_code for item_code, warehouse in posting_dates}, min(posting_dates.values())
+	)
+
+	to_delete = []
+	for key, rows in existing.items():
+		if key in posting_dates:
+			to_delete.extend(
+				row.name for row in rows if getdate(row.posting_date) >= posting_dates[key]
+			)
+
+	if to_delete:
+		frappe.db.delete("Stock Ageing Checkpoint", {"name": ("in", to_delete)})
+
+
+def clear_stock_ageing_checkpoints():
+	frappe.db.delete("Stock Ageing Checkpoint")
+
+
+def on_doctype_update():
+	frappe.db.add_index("Stock Ageing Checkpoint", ["item_code", "warehouse"])
@@ -0,0 +1,278 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import CombineDatetime, Min
+from frappe.utils import add_days, cint, flt, get_first_day, get_last_day, getdate, now, nowdate
+
+# month end up to which checkpoints are complete and match the Stock Ledger
+VALID_UPTO_KEY = "stock_balance_checkpoint_valid_upto"
+BALANCE_FIELDS = ("qty_after_transaction", "valuation_rate", "stock_value")
+
+
+class StockBalanceCheckpoint(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		company: DF.Link | None
+		item_code: DF.Link | None
+		period_end_date: DF.Date | None
+		qty_after_transaction: DF.Float
+		stock_value: DF.Currency
+		valuation_rate: DF.Currency
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def is_stock_balance_checkpoint_enabled():
+	"""Checkpoints are built by a scheduled job once enabled in Stock Settings"""
+	return cint(frappe.db.get_single_value("Stock Settings", "maintain_stock_balance_checkpoints"))
+
+
+def get_checkpoints_valid_upto(for_update=False):
+	"""`for_update` reads the latest committed value and locks it until the end of the
+	transaction, for changing it based on the value read"""
+	if for_update:
+		valid_upto = frappe.db.get_value(
+			"DefaultValue",
+			{"parent": "__default", "defkey": VALID_UPTO_KEY},
+			"defvalue",
+			for_update=True,
+		)
+	else:
+		valid_upto = frappe.db.get_default(VALID_UPTO_KEY)
+
+	return getdate(valid_upto) if valid_upto else None
+
+
+def get_checkpoint_period_end(posting_date):
+	"""Month end of the latest checkpoint that can be used for balances before `posting_date`"""
+	if not is_stock_balance_checkpoint_enabled():
+		return
+
+	if valid_upto := get_checkpoints_valid_upto():
+		return min(getdate(add_days(get_first_day(posting_date), -1)), valid_upto)
+
+
+def invalidate_stock_balance_checkpoints(posting_date):
+	"""Checkpoints from the month of a back-dated posting or repost onwards are regenerated
+	by the next run of the scheduled job, and not read until then"""
+	if not posting_date or not is_stock_balance_checkpoint_enabled():
+		return
+
+	# checkpoints are only built for past months
+	if getdate(posting_date) >= get_first_day(nowdate()):
+		return
+
+	# waits for a month being built by the scheduled job, see `update_stock_balance_checkpoints`
+	valid_upto = get_checkpoints_valid_upto(for_update=True)
+	if valid_upto and getdate(posting_date) <= valid_upto:
+		frappe.db.set_default(VALID_UPTO_KEY, add_days(get_first_day(posting_date), -1))
+
+
+def reset_stock_balance_checkpoints():
+	frappe.db.delete("Stock Balance Checkpoint")
+	frappe.db.set_default(VALID_UPTO_KEY, "")
+
+
+def update_stock_balance_checkpoints():
+	"""Scheduled daily, builds the checkpoints of every month end after the last valid one
+	from the previous checkpoint and the entries posted during the month.
+
+	The valid period is locked while a month is built, so entries back-dated into it are
+	either read by the job or, once it commits, invalidate the month they are posted in."""
+	if not is_stock_balance_checkpoint_enabled():
+		return
+
+	last_period_end = getdate(add_days(get_first_day(nowdate()), -1))
+	valid_upto = get_checkpoints_valid_upto()
+	if valid_upto and valid_upto >= last_period_end:
+		return
+
+	if not frappe.db.exists("DefaultValue", {"parent": "__default", "defkey": VALID_UPTO_KEY}):
+		# a row to lock
+		frappe.db.set_default(VALID_UPTO_KEY, "")
+
+	if not frappe.flags.in_test:
+		# entries are read from a snapshot taken after the lock
+		frappe.db.commit()
+
+	valid_upto = expected_valid_upto = get_checkpoints_valid_upto(for_update=True)
+	if not valid_upto:
+		sle = frappe.qb.DocType("Stock Ledger Entry")
+		first_posting_date = (
+			frappe.qb.from_(sle).select(Min(sle.posting_date)).where(sle.is_cancelled == 0)
+		).run()[0][0]
+		valid_upto = getdate(add_days(get_first_day(first_posting_date or last_period_end), -1))
+
+	checkpoint = frappe.qb.DocType("Stock Balance Checkpoint")
+	frappe.qb.from_(checkpoint).delete().where(checkpoint.period_end_date > valid_upto).run()
+
+	balances = {(row.item_code, row.warehouse): row for row in get_checkpoint_rows(valid_upto)}
+
+	period_end = valid_upto
+	while period_end < last_period_end:
+		if get_checkpoints_valid_upto(for_update=True) != expected_valid_upto:
+			# entries were posted in an earlier month meanwhile, picked up by the next run
+			frappe.db.rollback()
+			return
+
+		period_start = add_days(period_end, 1)
+		period_end = getdate(get_last_day(period_start))
+
+		for sle in get_stock_ledger_entries(period_start, period_end):
+			balances[(sle.item_code, sle.warehouse)] = sle
+
+		insert_checkpoints(period_end, balances.values())
+
+		frappe.db.set_default(VALID_UPTO_KEY, period_end)
+		expected_valid_upto = period_end
+		if not frappe.flags.in_test:
+			frappe.db.commit()
+
+
+def get_stock_ledger_entries(from_date, to_date):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+
+	return (
+		frappe.qb.from_(sle)
+		.select(sle.company, sle.item_code, sle.warehouse, *(sle[field] for field in BALANCE_FIELDS))
+		.where(
+			(sle.is_cancelled == 0) & (sle.posting_date >= from_date) & (sle.posting_date <= to_date)
+		)
+		.orderby(CombineDatetime(sle.posting_date, sle.posting_time))
+		.orderby(sle.creation)
+	).run(as_dict=True)
+
+
+def get_checkpoint_rows(period_end, item_code=None, warehouses=None):
+	checkpoint = frappe.qb.DocType("Stock Balance Checkpoint")
+
+	query = (
+		frappe.qb.from_(checkpoint)
+		.select(
+			checkpoint.company,
+			checkpoint.item_code,
+			checkpoint.warehouse,
+			*(checkpoint[field] for field in BALANCE_FIELDS),
+		)
+		.where(checkpoint.period_end_date == period_end)
+	)
+
+	if item_code:
+		query = query.where(checkpoint.item_code == item_code)
+
+	if warehouses:
+		query = query.where(checkpoint.warehouse.isin(warehouses))
+
+	return query.run(as_dict=True)
+
+
+def insert_checkpoints(period_end, balances):
+	user = frappe.session.user
+	timestamp = now()
+
+	values = []
+	for row in balances:
+		# a missing row stands for no stock
+		if not (flt(row.qty_after_transaction) or flt(row.stock_value)):
+			continue
+
+		values.append(
+			(
+				frappe.generate_hash(length=10),
+				timestamp,
+				timestamp,
+				user,
+				user,
+				period_end,
+				row.company,
+				row.item_code,
+				row.warehouse,
+				*(flt(row[field]) for field in BALANCE_FIELDS),
+			)
+		)
+
+	fields = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		"period_end_date",
+		"company",
+		"item_code",
+		"warehouse",
+		*BALANCE_FIELDS,
+	]
+
+	frappe.db.bulk_insert("Stock Balance Checkpoint", fields=fields, values=values)
+
+
+def get_stock_balance_from_checkpoints(item_code, warehouse, posting_date):
+	"""Qty, value and valuation rate of `item_code` in `warehouse` (and the warehouses under it)
+	before `posting_date`, from the last usable checkpoint and the entries posted after it.
+	None if there is no checkpoint."""
+	period_end = get_checkpoint_period_end(posting_date)
+	if not period_end:
+		return
+
+	lft, rgt = frappe.db.get_value("Warehouse", warehouse, ["lft", "rgt"]) or (None, None)
+	if lft is None:
+		return
+
+	warehouses = frappe.get_all(
+		"Warehouse", filters={"lft": (">=", lft), "rgt": ("<=", rgt)}, pluck="name"
+	)
+
+	balances = {
+		row.warehouse: row
+		for row in get_checkpoint_rows(period_end, item_code=item_code, warehouses=warehouses)
+	}
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	entries = (
+		frappe.qb.from_(sle)
+		.select(sle.warehouse, *(sle[field] for field in BALANCE_FIELDS))
+		.where(
+			(sle.item_code == item_code)
+			& (sle.warehouse.isin(warehouses))
+			& (sle.is_cancelled == 0)
+			& (sle.posting_date > period_end)
+			& (sle.posting_date < posting_date)
+		)
+		.orderby(CombineDatetime(sle.posting_date, sle.posting_time))
+		.orderby(sle.creation)
+	).run(as_dict=True)
+
+	last_entry = None
+	for entry in entries:
+		balances[entry.warehouse] = last_entry = entry
+
+	qty_after_transaction = sum(flt(row.qty_after_transaction) for row in balances.values())
+	stock_value = sum(flt(row.stock_value) for row in balances.values())
+
+	if len(balances) == 1:
+		valuation_rate = flt(list(balances.values())[0].valuation_rate)
+	elif qty_after_transaction:
+		valuation_rate = stock_value / qty_after_transaction
+	else:
+		valuation_rate = flt(last_entry.valuation_rate) if last_entry else 0.0
+
+	return frappe._dict(
+		qty_after_transaction=qty_after_transaction,
+		valuation_rate=valuation_rate,
+		stock_value=stock_value,
+	)
+
+
+def on_doctype_update():
+	frappe.db.add_index("Stock Balance Checkpoint", ["item_code", "warehouse"])
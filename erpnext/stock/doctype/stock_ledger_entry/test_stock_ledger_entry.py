@@ -2,6 +2,7 @@
 # See license.txt
 
 import json
+from unittest.mock import patch
 from uuid import uuid4
 
 import frappe
@@ -980,6 +981,49 @@ class TestStockLedgerEntry(FrappeTestCase, StockTestMixin):
 			repack, [{"incoming_rate": sum(rates) * 10}], sle_filters={"item_code": packed.name}
 		)
 
+	def test_sl_entries_in_bulk(self):
+		warehouse = "_Test Warehouse - _TC"
+		rates = [10 * i for i in range(1, 6)]
+
+		def make_receipt(item_code):
+			receipt = make_stock_entry(
+				item_code=item_code, target=warehouse, qty=10, do_not_save=True, rate=rates[0]
+			)
+			for rate in rates[1:]:
+				row = frappe.copy_doc(receipt.items[0], ignore_no_copy=False)
+				row.basic_rate = rate
+				receipt.append("items", row)
+
+			receipt.save()
+			receipt.submit()
+			return receipt
+
+		def get_ledger(receipt):
+			return frappe.get_all(
+				"Stock Ledger Entry",
+				fields=["qty_after_transaction", "valuation_rate", "stock_value", "stock_value_difference"],
+				filters={"voucher_no": receipt.name, "is_cancelled": 0},
+				order_by="creation",
+			)
+
+		receipt = make_receipt(make_item("_TestSLEsOneByOne").name)
+		with patch("erpnext.stock.stock_ledger.BULK_SL_ENTRY_THRESHOLD", 1):
+			bulk_item = make_item("_TestSLEsInBulk").name
+			bulk_receipt = make_receipt(bulk_item)
+
+		self.assertEqual(get_ledger(receipt), get_ledger(bulk_receipt))
+		self.assertEqual(
+			frappe.db.get_value("Bin", {"item_code": bulk_item, "warehouse": warehouse}, "actual_qty"), 50
+		)
+
+		with patch("erpnext.stock.stock_ledger.BULK_SL_ENTRY_THRESHOLD", 1):
+			bulk_receipt.cancel()
+
+		self.assertFalse(get_ledger(bulk_receipt))
+		self.assertEqual(
+			frappe.db.get_value("Bin", {"item_code": bulk_item, "warehouse": warehouse}, "actual_qty"), 0
+		)
+
 	def test_negative_fifo_valuation(self):
 		"""
 		When stock goes negative discard FIFO queue.
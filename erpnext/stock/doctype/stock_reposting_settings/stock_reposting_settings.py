@@ -23,6 +23,7 @@ class StockRepostingSettings(Document):
 			"", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
 		]
 		notify_reposting_error_to_role: DF.Link | None
+		parallel_reposting_jobs: DF.Int
 		start_time: DF.Time | None
 	# end: auto-generated types
 
@@ -1,15 +1,19 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
+from collections import defaultdict
+from datetime import timedelta
 from typing import Literal
 
 import frappe
 from frappe import _
 from frappe.model.document import Document
+from frappe.model.naming import set_new_name
 from frappe.query_builder.functions import Sum
-from frappe.utils import cint, flt
+from frappe.utils import cint, flt, getdate, now, now_datetime
 
 from erpnext.stock.utils import get_or_make_bin
+from erpnext.utilities.naming import make_autonames
 
 
 class StockReservationEntry(Document):
@@ -884,8 +888,6 @@ def create_stock_reservation_entries_for_so_items(
 ) -> None:
 	"""Creates Stock Reservation Entries for Sales Order Items."""
 
-	from erpnext.selling.doctype.sales_order.sales_order import get_unreserved_qty
-
 	if not from_voucher_type and (
 		sales_order.get("_action") == "submit"
 		and sales_order.set_warehouse
@@ -922,21 +924,183 @@ def create_stock_reservation_entries_for_so_items(
 
 			items.append(so_item)
 
-	sre_count = 0
+	items_to_reserve = get_sales_order_items_to_reserve(
+		sales_order, items if items_details else sales_order.get("items"), from_voucher_type
+	)
+
+	if not from_voucher_type and not any(
+		d.item.get("serial_and_batch_bundle") for d in items_to_reserve
+	):
+		sre_count = StockReservation(items_to_reserve).reserve()
+	else:
+		sre_count = 0
+
+		for d in items_to_reserve:
+			item = d.item
+			available_qty_to_reserve = get_available_qty_to_reserve(item.item_code, item.warehouse)
+			qty_to_be_reserved = get_qty_to_be_reserved(
+				item, d.unreserved_qty, available_qty_to_reserve, allow_partial_reservation, from_voucher_type
+			)
+
+			if not qty_to_be_reserved:
+				continue
+
+			sre = get_stock_reservation_entry(d, available_qty_to_reserve, qty_to_be_reserved)
+
+			if from_voucher_type:
+				sre.from_voucher_type = from_voucher_type
+				sre.from_voucher_no = item.from_voucher_no
+				sre.from_voucher_detail_no = item.from_voucher_detail_no
+
+			if item.get("serial_and_batch_bundle"):
+				sbb = frappe.get_doc("Serial and Batch Bundle", item.serial_and_batch_bundle)
+				sre.reservation_based_on = "Serial and Batch"
+
+				index, picked_qty = 0, 0
+				while index < len(sbb.entries) and picked_qty < qty_to_be_reserved:
+					entry = sbb.entries[index]
+					qty = 1 if d.has_serial_no else min(abs(entry.qty), qty_to_be_reserved - picked_qty)
+
+					sre.append(
+						"sb_entries",
+						{
+							"serial_no": entry.serial_no,
+							"batch_no": entry.batch_no,
+							"qty": qty,
+							"warehouse": entry.warehouse,
+						},
+					)
+
+					index += 1
+					picked_qty += qty
+
+			sre.save()
+			sre.submit()
+
+			sre_count += 1
+
+	if sre_count and notify:
+		frappe.msgprint(_("Stock Reservation Entries Created"), alert=True, indicator="green")
+
+
+def reserve_stock_for_sales_orders() -> None:
+	"""Reserves stock for the open Sales Orders, runs daily if `Stock Reservation` is enabled."""
+
+	if not frappe.db.get_single_value("Stock Settings", "enable_stock_reservation"):
+		return
+
+	so = frappe.qb.DocType("Sales Order")
+	so_item = frappe.qb.DocType("Sales Order Item")
+	sales_orders = (
+		frappe.qb.from_(so)
+		.join(so_item)
+		.on(so_item.parent == so.name)
+		.select(so.name)
+		.distinct()
+		.where(
+			(so.docstatus == 1)
+			& (so.status.notin(["Closed", "On Hold", "Completed"]))
+			& (so_item.reserve_stock == 1)
+			& (
+				so_item.stock_reserved_qty + so_item.delivered_qty * so_item.conversion_factor
+				< so_item.stock_qty
+			)
+		)
+	).run(pluck=True)
+
+	if sales_orders:
+		create_stock_reservation_entries_for_sales_orders(sales_orders)
+
+
+def create_stock_reservation_entries_for_sales_orders(sales_orders: list, notify=False) -> int:
+	"""Reserves stock for the items of the submitted Sales Orders, the ones to be delivered first
+	getting the stock first. Returns the number of Stock Reservation Entries created.
+
+	The items which could not be reserved are shown together if `notify`, else logged once."""
+
+	sales_orders = [
+		frappe.get_doc("Sales Order", sales_order) if isinstance(sales_order, str) else sales_order
+		for sales_order in sales_orders
+	]
+	sales_orders.sort(
+		key=lambda so: (
+			getdate(so.delivery_date or so.transaction_date),
+			getdate(so.transaction_date),
+			so.name,
+		)
+	)
+
+	items_to_reserve, skipped_items = [], []
+	for sales_order in sales_orders:
+		if sales_order.docstatus != 1:
+			continue
+
+		validate_stock_reservation_settings(sales_order)
+		items_to_reserve.extend(
+			get_sales_order_items_to_reserve(
+				sales_order, sales_order.get("items"), skipped_items=skipped_items
+			)
+		)
+
+	sre_count = StockReservation(items_to_reserve, skipped_items).reserve()
+
+	if skipped_items:
+		if notify:
+			frappe.msgprint(
+				skipped_items, title=_("Stock Reservation"), indicator="orange", as_list=True
+			)
+		else:
+			frappe.log_error(
+				title=_("Stock Reservation: Items Skipped"), message="\n".join(skipped_items)
+			)
+
+	if sre_count and notify:
+		frappe.msgprint(_("Stock Reservation Entries Created"), alert=True, indicator="green")
+
+	return sre_count
+
+
+def notify_skipped_item(
+	item: object, msg: str, skipped_items: list = None, indicator: str = "yellow", title: str = None
+) -> None:
+	"""Shows why the Sales Order Item is skipped, or adds it to `skipped_items` in bulk."""
+
+	if skipped_items is None:
+		frappe.msgprint(msg, title=title or _("Stock Reservation"), indicator=indicator)
+	else:
+		skipped_items.append(_("{0}: {1}").format(item.parent, msg))
+
+
+def get_sales_order_items_to_reserve(
+	sales_order: object,
+	items: list,
+	from_voucher_type: Literal["Pick List", "Purchase Receipt"] = None,
+	skipped_items: list = None,
+) -> list[dict]:
+	"""Returns the Sales Order Items for which stock can be reserved, with their Unreserved Qty.
+
+	If `skipped_items` is passed, the skipped items are added to it instead of being shown."""
+
+	from erpnext.selling.doctype.sales_order.sales_order import get_unreserved_qty
+
+	items_to_reserve = []
 	reserved_qty_details = get_sre_reserved_qty_details_for_voucher("Sales Order", sales_order.name)
 
-	for item in items if items_details else sales_order.get("items"):
+	for item in items:
 		# Skip if `Reserved Stock` is not checked for the item.
 		if not item.get("reserve_stock"):
 			continue
 
 		# Stock should be reserved from the Pick List if has Picked Qty.
 		if from_voucher_type != "Pick List" and flt(item.picked_qty) > 0:
-			frappe.throw(
-				_("Row #{0}: Item {1} has been picked, please reserve stock from the Pick List.").format(
-					item.idx, frappe.bold(item.item_code)
-				)
+			msg = _("Row #{0}: Item {1} has been picked, please reserve stock from the Pick List.").format(
+				item.idx, frappe.bold(item.item_code)
 			)
+			if skipped_items is None:
+				frappe.throw(msg)
+
+			skipped_items.append(_("{0}: {1}").format(item.parent, msg))
+			continue
 
 		is_stock_item, has_serial_no, has_batch_no = frappe.get_cached_value(
 			"Item", item.item_code, ["is_stock_item", "has_serial_no", "has_batch_no"]
@@ -945,12 +1109,12 @@ def create_stock_reservation_entries_for_so_items(
 		# Skip if Non-Stock Item.
 		if not is_stock_item:
 			if not from_voucher_type:
-				frappe.msgprint(
+				notify_skipped_item(
+					item,
 					_("Row #{0}: Stock cannot be reserved for a non-stock Item {1}").format(
 						item.idx, frappe.bold(item.item_code)
 					),
-					title=_("Stock Reservation"),
-					indicator="yellow",
+					skipped_items,
 				)
 
 			item.db_set("reserve_stock", 0)
@@ -958,12 +1122,12 @@ def create_stock_reservation_entries_for_so_items(
 
 		# Skip if Group Warehouse.
 		if frappe.get_cached_value("Warehouse", item.warehouse, "is_group"):
-			frappe.msgprint(
+			notify_skipped_item(
+				item,
 				_("Row #{0}: Stock cannot be reserved in group warehouse {1}.").format(
 					item.idx, frappe.bold(item.warehouse)
 				),
-				title=_("Stock Reservation"),
-				indicator="yellow",
+				skipped_items,
 			)
 			continue
 
@@ -971,7 +1135,7 @@ def create_stock_reservation_entries_for_so_items(
 
 		# Stock is already reserved for the item, notify the user and skip the item.
 		if unreserved_qty <= 0:
-			if not from_voucher_type:
+			if not from_voucher_type and skipped_items is None:
 				frappe.msgprint(
 					_("Row #{0}: Stock is already reserved for the Item {1}.").format(
 						item.idx, frappe.bold(item.item_code)
@@ -982,105 +1146,363 @@ def create_stock_reservation_entries_for_so_items(
 
 			continue
 
-		available_qty_to_reserve = get_available_qty_to_reserve(item.item_code, item.warehouse)
+		items_to_reserve.append(
+			frappe._dict(
+				{
+					"sales_order": sales_order,
+					"item": item,
+					"has_serial_no": has_serial_no,
+					"has_batch_no": has_batch_no,
+					"unreserved_qty": unreserved_qty,
+				}
+			)
+		)
+
+	return items_to_reserve
 
-		# No stock available to reserve, notify the user and skip the item.
-		if available_qty_to_reserve <= 0:
-			frappe.msgprint(
-				_("Row #{0}: Stock not available to reserve for the Item {1} in Warehouse {2}.").format(
-					item.idx, frappe.bold(item.item_code), frappe.bold(item.warehouse)
+
+def get_qty_to_be_reserved(
+	item: object,
+	unreserved_qty: float,
+	available_qty_to_reserve: float,
+	allow_partial_reservation: bool,
+	from_voucher_type: Literal["Pick List", "Purchase Receipt"] = None,
+	skipped_items: list = None,
+) -> float:
+	"""Returns the qty which can be reserved for the Sales Order Item, 0 if it should be skipped."""
+
+	# No stock available to reserve, notify the user and skip the item.
+	if available_qty_to_reserve <= 0:
+		notify_skipped_item(
+			item,
+			_("Row #{0}: Stock not available to reserve for the Item {1} in Warehouse {2}.").format(
+				item.idx, frappe.bold(item.item_code), frappe.bold(item.warehouse)
+			),
+			skipped_items,
+			indicator="orange",
+		)
+		return 0
+
+	# The quantity which can be reserved.
+	qty_to_be_reserved = min(unreserved_qty, available_qty_to_reserve)
+
+	if hasattr(item, "qty_to_reserve"):
+		if item.qty_to_reserve <= 0:
+			notify_skipped_item(
+				item,
+				_("Row #{0}: Quantity to reserve for the Item {1} should be greater than 0.").format(
+					item.idx, frappe.bold(item.item_code)
 				),
-				title=_("Stock Reservation"),
+				skipped_items,
 				indicator="orange",
 			)
-			continue
+			return 0
+		else:
+			qty_to_be_reserved = min(qty_to_be_reserved, item.qty_to_reserve)
+
+	# Partial Reservation
+	if qty_to_be_reserved < unreserved_qty:
+		if not from_voucher_type and (
+			not item.get("qty_to_reserve") or qty_to_be_reserved < flt(item.get("qty_to_reserve"))
+		):
+			msg = _("Row #{0}: Only {1} available to reserve for the Item {2}").format(
+				item.idx,
+				frappe.bold(str(qty_to_be_reserved / item.conversion_factor) + " " + item.uom),
+				frappe.bold(item.item_code),
+			)
+			notify_skipped_item(item, msg, skipped_items, indicator="orange")
 
-		# The quantity which can be reserved.
-		qty_to_be_reserved = min(unreserved_qty, available_qty_to_reserve)
+		# Skip the item if `Partial Reservation` is disabled in the Stock Settings.
+		if not allow_partial_reservation:
+			if qty_to_be_reserved == flt(item.get("qty_to_reserve")):
+				msg = _("Enable Allow Partial Reservation in the Stock Settings to reserve partial stock.")
+				notify_skipped_item(item, msg, skipped_items, title=_("Partial Stock Reservation"))
 
-		if hasattr(item, "qty_to_reserve"):
-			if item.qty_to_reserve <= 0:
-				frappe.msgprint(
-					_("Row #{0}: Quantity to reserve for the Item {1} should be greater than 0.").format(
-						item.idx, frappe.bold(item.item_code)
+			return 0
+
+	return qty_to_be_reserved
+
+
+def get_stock_reservation_entry(
+	item_to_reserve: dict, available_qty_to_reserve: float, qty_to_be_reserved: float
+) -> object:
+	"""Returns a new Stock Reservation Entry for the Sales Order Item."""
+
+	sales_order, item = item_to_reserve.sales_order, item_to_reserve.item
+
+	sre = frappe.new_doc("Stock Reservation Entry")
+
+	sre.item_code = item.item_code
+	sre.warehouse = item.warehouse
+	sre.has_serial_no = item_to_reserve.has_serial_no
+	sre.has_batch_no = item_to_reserve.has_batch_no
+	sre.voucher_type = sales_order.doctype
+	sre.voucher_no = sales_order.name
+	sre.voucher_detail_no = item.name
+	sre.available_qty = available_qty_to_reserve
+	sre.voucher_qty = item.stock_qty
+	sre.reserved_qty = qty_to_be_reserved
+	sre.company = sales_order.company
+	sre.stock_uom = item.stock_uom
+	sre.project = sales_order.project
+
+	return sre
+
+
+class StockReservation:
+	"""Reserves stock for Sales Order Items in bulk.
+
+	The stock of all their items and warehouses, and the Serial and Batch Nos to reserve if
+	picked automatically, are read at once and allocated in memory in the order of the items.
+	The Stock Reservation Entries are then inserted together, and the Reserved Qty of the
+	Sales Order Items and the Reserved Stock of the Bins updated once."""
+
+	def __init__(self, items_to_reserve: list[dict], skipped_items: list = None) -> None:
+		self.items_to_reserve = items_to_reserve
+		self.skipped_items = skipped_items
+		self.allow_partial_reservation = frappe.db.get_single_value(
+			"Stock Settings", "allow_partial_reservation"
+		)
+		self.auto_reserve_serial_and_batch = cint(
+			frappe.db.get_single_value("Stock Settings", "auto_reserve_serial_and_batch")
+		)
+		self.based_on = frappe.db.get_single_value("Stock Settings", "pick_serial_and_batch_based_on")
+
+		self.available_qty = {}
+		self.available_serial_and_batch_nos = {}
+		self.entries = []
+
+	def reserve(self) -> int:
+		"""Creates the Stock Reservation Entries and returns their count."""
+
+		if not self.items_to_reserve:
+			return 0
+
+		self.set_available_qty()
+		for item_to_reserve in self.items_to_reserve:
+			self.allocate(item_to_reserve)
+
+		if self.entries:
+			self.insert_entries()
+			self.update_reserved_qty_in_vouchers()
+			self.update_reserved_stock_in_bins()
+
+		return len(self.entries)
+
+	def set_available_qty(self) -> None:
+		"""Sets `Available Qty to Reserve (Actual Qty - Reserved Qty)` for every Item and Warehouse."""
+
+		item_codes = list({d.item.item_code for d in self.items_to_reserve})
+		warehouses = list({d.item.warehouse for d in self.items_to_reserve})
+
+		bin = frappe.qb.DocType("Bin")
+		bins = (
+			frappe.qb.from_(bin)
+			.select(bin.item_code, bin.warehouse, bin.actual_qty)
+			.where(bin.item_code.isin(item_codes) & bin.warehouse.isin(warehouses))
+		).run(as_dict=True)
+
+		reserved_qty = get_sre_reserved_qty_for_items_and_warehouses(item_codes, warehouses)
+		for d in bins:
+			key = (d.item_code, d.warehouse)
+			self.available_qty[key] = flt(d.actual_qty) - flt(reserved_qty.get(key))
+
+	def allocate(self, item_to_reserve: dict) -> None:
+		item = item_to_reserve.item
+		key = (item.item_code, item.warehouse)
+
+		available_qty_to_reserve = self.available_qty.get(key, 0)
+		qty_to_be_reserved = get_qty_to_be_reserved(
+			item,
+			item_to_reserve.unreserved_qty,
+			available_qty_to_reserve,
+			self.allow_partial_reservation,
+			skipped_items=self.skipped_items,
+		)
+
+		if not qty_to_be_reserved:
+			return
+
+		sre = get_stock_reservation_entry(item_to_reserve, available_qty_to_reserve, qty_to_be_reserved)
+
+		if self.auto_reserve_serial_and_batch and (
+			item_to_reserve.has_serial_no or item_to_reserve.has_batch_no
+		):
+			sre.reservation_based_on = "Serial and Batch"
+			for entry in self.pick_serial_and_batch_nos(item_to_reserve, qty_to_be_reserved):
+				sre.append("sb_entries", entry)
+
+			sre.reserved_qty = sum(flt(entry.qty) for entry in sre.sb_entries)
+			if not sre.reserved_qty:
+				notify_skipped_item(
+					item,
+					_("Row #{0}: Stock not available to reserve for the Item {1} in Warehouse {2}.").format(
+						item.idx, frappe.bold(item.item_code), frappe.bold(item.warehouse)
 					),
-					title=_("Stock Reservation"),
+					self.skipped_items,
 					indicator="orange",
 				)
-				continue
-			else:
-				qty_to_be_reserved = min(qty_to_be_reserved, item.qty_to_reserve)
-
-		# Partial Reservation
-		if qty_to_be_reserved < unreserved_qty:
-			if not from_voucher_type and (
-				not item.get("qty_to_reserve") or qty_to_be_reserved < flt(item.get("qty_to_reserve"))
-			):
-				msg = _("Row #{0}: Only {1} available to reserve for the Item {2}").format(
-					item.idx,
-					frappe.bold(str(qty_to_be_reserved / item.conversion_factor) + " " + item.uom),
-					frappe.bold(item.item_code),
-				)
-				frappe.msgprint(msg, title=_("Stock Reservation"), indicator="orange")
+				return
 
-			# Skip the item if `Partial Reservation` is disabled in the Stock Settings.
-			if not allow_partial_reservation:
-				if qty_to_be_reserved == flt(item.get("qty_to_reserve")):
-					msg = _("Enable Allow Partial Reservation in the Stock Settings to reserve partial stock.")
-					frappe.msgprint(msg, title=_("Partial Stock Reservation"), indicator="yellow")
+		sre.validate()
+		sre.status = "Reserved" if sre.reserved_qty == sre.voucher_qty else "Partially Reserved"
 
-				continue
+		self.available_qty[key] -= sre.reserved_qty
+		self.entries.append(sre)
 
-		sre = frappe.new_doc("Stock Reservation Entry")
-
-		sre.item_code = item.item_code
-		sre.warehouse = item.warehouse
-		sre.has_serial_no = has_serial_no
-		sre.has_batch_no = has_batch_no
-		sre.voucher_type = sales_order.doctype
-		sre.voucher_no = sales_order.name
-		sre.voucher_detail_no = item.name
-		sre.available_qty = available_qty_to_reserve
-		sre.voucher_qty = item.stock_qty
-		sre.reserved_qty = qty_to_be_reserved
-		sre.company = sales_order.company
-		sre.stock_uom = item.stock_uom
-		sre.project = sales_order.project
-
-		if from_voucher_type:
-			sre.from_voucher_type = from_voucher_type
-			sre.from_voucher_no = item.from_voucher_no
-			sre.from_voucher_detail_no = item.from_voucher_detail_no
-
-		if item.get("serial_and_batch_bundle"):
-			sbb = frappe.get_doc("Serial and Batch Bundle", item.serial_and_batch_bundle)
-			sre.reservation_based_on = "Serial and Batch"
+	def pick_serial_and_batch_nos(self, item_to_reserve: dict, qty: float) -> list[dict]:
+		"""Picks Serial and Batch Nos to reserve, in order, from the ones still available."""
 
-			index, picked_qty = 0, 0
-			while index < len(sbb.entries) and picked_qty < qty_to_be_reserved:
-				entry = sbb.entries[index]
-				qty = 1 if has_serial_no else min(abs(entry.qty), qty_to_be_reserved - picked_qty)
+		item = item_to_reserve.item
+		available = self.get_available_serial_and_batch_nos(item_to_reserve)
 
-				sre.append(
-					"sb_entries",
+		entries = []
+		if item_to_reserve.has_serial_no:
+			for d in available[: cint(qty)]:
+				entries.append(
 					{
-						"serial_no": entry.serial_no,
-						"batch_no": entry.batch_no,
-						"qty": qty,
-						"warehouse": entry.warehouse,
-					},
+						"serial_no": d.serial_no,
+						"batch_no": d.get("batch_no"),
+						"qty": 1,
+						"warehouse": item.warehouse,
+					}
 				)
 
-				index += 1
-				picked_qty += qty
+			del available[: cint(qty)]
+		else:
+			for d in available:
+				if qty <= 0:
+					break
 
-		sre.save()
-		sre.submit()
+				batch_qty = min(flt(d.qty), qty)
+				if batch_qty <= 0:
+					continue
 
-		sre_count += 1
+				entries.append({"batch_no": d.batch_no, "qty": batch_qty, "warehouse": item.warehouse})
+				d.qty -= batch_qty
+				qty -= batch_qty
 
-	if sre_count and notify:
-		frappe.msgprint(_("Stock Reservation Entries Created"), alert=True, indicator="green")
+		return entries
+
+	def get_available_serial_and_batch_nos(self, item_to_reserve: dict) -> list[dict]:
+		"""Returns the Serial Nos or Batches available to reserve for the Item and Warehouse, as
+		`get_serial_nos_for_outward` and `get_available_batches` would pick them."""
+
+		from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
+			get_auto_batch_nos,
+			get_available_serial_nos,
+		)
+
+		item = item_to_reserve.item
+		key = (item.item_code, item.warehouse)
+
+		if key not in self.available_serial_and_batch_nos:
+			kwargs = frappe._dict(
+				{"item_code": item.item_code, "warehouse": item.warehouse, "based_on": self.based_on}
+			)
+
+			if item_to_reserve.has_serial_no:
+				# enough Serial Nos for all the items of the Item and Warehouse
+				kwargs.has_batch_no = item_to_reserve.has_batch_no
+				kwargs.qty = sum(
+					cint(d.unreserved_qty)
+					for d in self.items_to_reserve
+					if (d.item.item_code, d.item.warehouse) == key
+				)
+				self.available_serial_and_batch_nos[key] = get_available_serial_nos(kwargs)
+			else:
+				self.available_serial_and_batch_nos[key] = get_auto_batch_nos(kwargs)
+
+		return self.available_serial_and_batch_nos[key]
+
+	def insert_entries(self) -> None:
+		"""Inserts the submitted Stock Reservation Entries and their Serial and Batch Entries."""
+
+		doctype = "Stock Reservation Entry"
+		autoname = frappe.get_meta(doctype).autoname or ""
+		names = []
+		if "#" in autoname and ":" not in autoname:
+			names = make_autonames(autoname, doctype, len(self.entries))
+
+		# increasing creation times, entries are read in the order they were created
+		timestamp = now_datetime()
+		user = frappe.session.user
+		step = 0
+
+		sre_values, sb_entry_values = [], []
+		for i, sre in enumerate(self.entries):
+			if names:
+				sre.name = names[i]
+			else:
+				set_new_name(sre)
+
+			for row in [sre, *sre.sb_entries]:
+				if row is not sre:
+					row.parent = sre.name
+					set_new_name(row)
+
+				step += 1
+				row.creation = row.modified = timestamp + timedelta(microseconds=step)
+				row.owner = row.modified_by = user
+				row.docstatus = 1
+
+			sre_values.append(sre.get_valid_dict(convert_dates_to_str=True))
+			sb_entry_values.extend(row.get_valid_dict(convert_dates_to_str=True) for row in sre.sb_entries)
+
+		for doctype, values in ((doctype, sre_values), ("Serial and Batch Entry", sb_entry_values)):
+			if values:
+				frappe.db.bulk_insert(
+					doctype, fields=list(values[0]), values=[tuple(d.values()) for d in values]
+				)
+
+	def update_reserved_qty_in_vouchers(self) -> None:
+		"""Updates total reserved qty in the Sales Order Items, with a query per distinct qty."""
+
+		sre = frappe.qb.DocType("Stock Reservation Entry")
+		reserved_qty = (
+			frappe.qb.from_(sre)
+			.select(sre.voucher_detail_no, Sum(sre.reserved_qty))
+			.where(
+				(sre.docstatus == 1)
+				& (sre.voucher_type == "Sales Order")
+				& (sre.voucher_detail_no.isin([d.voucher_detail_no for d in self.entries]))
+			)
+			.groupby(sre.voucher_detail_no)
+		).run(as_list=True)
+
+		names_by_qty = defaultdict(list)
+		for voucher_detail_no, qty in reserved_qty:
+			names_by_qty[flt(qty)].append(voucher_detail_no)
+
+		so_item = frappe.qb.DocType("Sales Order Item")
+		timestamp = now()
+		for qty, names in names_by_qty.items():
+			(
+				frappe.qb.update(so_item)
+				.set(so_item.stock_reserved_qty, qty)
+				.set(so_item.modified, timestamp)
+				.set(so_item.modified_by, frappe.session.user)
+				.where(so_item.name.isin(names))
+			).run()
+
+	def update_reserved_stock_in_bins(self) -> None:
+		"""Updates `Reserved Stock` in the Bins of the Items and Warehouses reserved."""
+
+		keys = {(d.item_code, d.warehouse) for d in self.entries}
+		reserved_qty = get_sre_reserved_qty_for_items_and_warehouses(
+			list({key[0] for key in keys}), list({key[1] for key in keys})
+		)
+
+		bin = frappe.qb.DocType("Bin")
+		timestamp = now()
+		for item_code, warehouse in keys:
+			(
+				frappe.qb.update(bin)
+				.set(bin.reserved_stock, flt(reserved_qty.get((item_code, warehouse))))
+				.set(bin.modified, timestamp)
+				.set(bin.modified_by, frappe.session.user)
+				.where((bin.item_code == item_code) & (bin.warehouse == warehouse))
+			).run()
 
 
 def cancel_stock_reservation_entries(
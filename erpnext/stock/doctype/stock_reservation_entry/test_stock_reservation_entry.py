@@ -5,7 +5,7 @@ from random import randint
 
 import frappe
 from frappe.tests.utils import FrappeTestCase, change_settings
-from frappe.utils import today
+from frappe.utils import add_days, today
 
 from erpnext.selling.doctype.sales_order.sales_order import create_pick_list, make_delivery_note
 from erpnext.selling.doctype.sales_order.test_sales_order import make_sales_order
@@ -646,6 +646,81 @@ class TestStockReservationEntry(FrappeTestCase):
 				# Test - 3: Reserved Serial/Batch Nos should be equal to PR Item Serial/Batch Nos.
 				self.assertEqual(set(sb_details), set(reserved_sb_details))
 
+	@change_settings(
+		"Stock Settings",
+		{
+			"allow_negative_stock": 0,
+			"enable_stock_reservation": 1,
+			"allow_partial_reservation": 1,
+			"auto_reserve_serial_and_batch": 1,
+			"pick_serial_and_batch_based_on": "FIFO",
+		},
+	)
+	def test_stock_reservation_for_sales_orders(self) -> None:
+		from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import (
+			create_stock_reservation_entries_for_sales_orders,
+		)
+
+		items_details = create_items()
+		create_material_receipt(items_details, self.warehouse, qty=10)
+
+		item_list = [
+			{
+				"item_code": item_code,
+				"warehouse": self.warehouse,
+				"qty": 8,
+				"uom": properties.stock_uom,
+				"rate": 100,
+			}
+			for item_code, properties in items_details.items()
+		]
+
+		so1 = make_sales_order(item_list=item_list, warehouse=self.warehouse)
+		so2 = make_sales_order(
+			item_list=item_list, warehouse=self.warehouse, transaction_date=add_days(today(), -1)
+		)
+
+		# Test - 1: Sales Order to be delivered first should be fully reserved, the other one with the rest.
+		sre_count = create_stock_reservation_entries_for_sales_orders([so1.name, so2.name])
+		self.assertEqual(sre_count, 8)
+
+		reserved_sb_entries = []
+		for so, status in ((so2, "Reserved"), (so1, "Partially Reserved")):
+			so.load_from_db()
+			for item in so.items:
+				sre_details = get_stock_reservation_entries_for_voucher(
+					"Sales Order", so.name, item.name, fields=["name", "reserved_qty", "status"]
+				)[0]
+				self.assertEqual(item.stock_reserved_qty, sre_details.reserved_qty)
+				self.assertEqual(item.stock_reserved_qty, 8 if so == so2 else 2)
+				self.assertEqual(sre_details.status, status)
+
+				reserved_sb_entries.extend(
+					frappe.get_all(
+						"Serial and Batch Entry",
+						filters={"parent": sre_details.name},
+						fields=["serial_no", "batch_no", "qty"],
+						as_list=True,
+					)
+				)
+
+		# Test - 2: Serial Nos should be reserved only once.
+		serial_nos = [serial_no for serial_no, batch_no, qty in reserved_sb_entries if serial_no]
+		self.assertEqual(len(serial_nos), 20)
+		self.assertEqual(len(set(serial_nos)), 20)
+
+		# Test - 3: Reserved Stock should be updated in the Bins.
+		for item_code in items_details:
+			self.assertEqual(
+				frappe.db.get_value(
+					"Bin", {"item_code": item_code, "warehouse": self.warehouse}, "reserved_stock"
+				),
+				10,
+			)
+
+		# Test - 4: Nothing left to reserve.
+		self.assertEqual(create_stock_reservation_entries_for_sales_orders([so1, so2]), 0)
+
 	@change_settings(
 		"Stock Settings",
 		{
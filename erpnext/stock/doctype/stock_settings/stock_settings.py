@@ -42,9 +42,13 @@ class StockSettings(Document):
 		enable_stock_reservation: DF.Check
 		item_group: DF.Link | None
 		item_naming_by: DF.Literal["Item Code", "Naming Series"]
+		maintain_batch_wise_balance: DF.Check
+		maintain_serial_no_state: DF.Check
+		maintain_stock_balance_checkpoints: DF.Check
 		mr_qty_allowance: DF.Float
 		naming_series_prefix: DF.Data | None
 		over_delivery_receipt_allowance: DF.Float
+		persist_stock_ageing_slots: DF.Check
 		pick_serial_and_batch_based_on: DF.Literal["FIFO", "LIFO", "Expiry"]
 		reorder_email_notify: DF.Check
 		role_allowed_to_create_edit_back_dated_transactions: DF.Link | None
@@ -213,6 +217,68 @@ class StockSettings(Document):
 
 	def on_update(self):
 		self.toggle_warehouse_field_for_inter_warehouse_transfer()
+		self.clear_stock_ageing_checkpoints()
+		self.rebuild_stock_balance_checkpoints()
+		self.rebuild_batch_wise_balance()
+		self.rebuild_serial_no_state()
+
+	def clear_stock_ageing_checkpoints(self):
+		# checkpoints are not invalidated by postings made while disabled
+		if self.has_value_changed("persist_stock_ageing_slots"):
+			from erpnext.stock.doctype.stock_ageing_checkpoint.stock_ageing_checkpoint import (
+				clear_stock_ageing_checkpoints,
+			)
+
+			clear_stock_ageing_checkpoints()
+
+	def rebuild_stock_balance_checkpoints(self):
+		if not self.has_value_changed("maintain_stock_balance_checkpoints"):
+			return
+
+		from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+			reset_stock_balance_checkpoints,
+		)
+
+		# reports read the Stock Ledger until the checkpoints are built again
+		reset_stock_balance_checkpoints()
+		if self.maintain_stock_balance_checkpoints:
+			frappe.enqueue(
+				"erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint.update_stock_balance_checkpoints",
+				queue="long",
+				timeout=3600,
+				enqueue_after_commit=True,
+			)
+			frappe.msgprint(_("Stock Balance Checkpoints will be built in the background."), alert=True)
+
+	def rebuild_batch_wise_balance(self):
+		if not self.has_value_changed("maintain_batch_wise_balance"):
+			return
+
+		# batches are read from the Stock Ledger until the rebuild is complete
+		frappe.db.set_default("batch_wise_balance_built", 0)
+		if self.maintain_batch_wise_balance:
+			frappe.enqueue(
+				"erpnext.stock.doctype.batch_wise_balance.batch_wise_balance.rebuild_batch_wise_balance",
+				queue="long",
+				timeout=3600,
+				enqueue_after_commit=True,
+			)
+			frappe.msgprint(_("Batch-wise Balance will be built in the background."), alert=True)
+
+	def rebuild_serial_no_state(self):
+		if not self.has_value_changed("maintain_serial_no_state"):
+			return
+
+		# serial nos are read from the Stock Ledger until the rebuild is complete
+		frappe.db.set_default("serial_no_state_built", 0)
+		if self.maintain_serial_no_state:
+			frappe.enqueue(
+				"erpnext.stock.doctype.serial_no_state.serial_no_state.rebuild_serial_no_state",
+				queue="long",
+				timeout=3600,
+				enqueue_after_commit=True,
+			)
+			frappe.msgprint(_("Serial No State will be built in the background."), alert=True)
 
 	def change_precision_for_for_sales(self):
 		doc_before_save = self.get_doc_before_save()
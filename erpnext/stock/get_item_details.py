@@ -17,6 +17,7 @@ from erpnext.accounts.doctype.pricing_rule.pricing_rule import (
 	get_pricing_rule_for_item,
 	set_transaction_type,
 )
+from erpnext.accounts.doctype.pricing_rule.pricing_rule_index import prefetch_pricing_rule_index
 from erpnext.setup.doctype.brand.brand import get_brand_defaults
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
 from erpnext.setup.utils import get_exchange_rate
@@ -149,6 +150,204 @@ def remove_standard_fields(details):
 	return details
 
 
+@frappe.whitelist()
+def get_items_details_batch(args_list, doc=None, for_validate=False, overwrite_warehouse=True):
+	"""
+	Returns `get_item_details` for each of `args_list`, in the same order.
+
+	Item, Item Price, UOM Conversion Detail and Bin rows of all the items are loaded
+	upfront, instead of being queried again for every row.
+	"""
+	if isinstance(args_list, str):
+		args_list = json.loads(args_list)
+
+	if isinstance(doc, str):
+		doc = json.loads(doc)
+
+	args_list = [process_args(args) for args in args_list]
+	frappe.flags.item_details_prefetch = ItemDetailsPrefetch(args_list)
+
+	try:
+		return [
+			get_item_details(args, doc=doc, for_validate=for_validate, overwrite_warehouse=overwrite_warehouse)
+			for args in args_list
+		]
+	finally:
+		frappe.flags.item_details_prefetch = None
+
+
+def get_item_details_prefetch():
+	return frappe.flags.get("item_details_prefetch")
+
+
+def clear_prefetched_item_prices():
+	"""Read Item Prices from the database again, once one has been added or changed"""
+	if prefetch := get_item_details_prefetch():
+		prefetch.price_lists = set()
+
+
+class ItemDetailsPrefetch:
+	"""Rows read by `get_item_details` for a set of items, loaded in a few queries"""
+
+	def __init__(self, args_list):
+		item_codes = {args.item_code for args in args_list if args.item_code}
+		items = [frappe.get_cached_doc("Item", item_code) for item_code in item_codes]
+
+		self.item_codes = item_codes | {item.variant_of for item in items if item.variant_of}
+		self.price_lists = {args.price_list for args in args_list if args.price_list}
+		self.child_warehouses = {}
+
+		if not self.item_codes:
+			self.item_prices, self.packing_units, self.conversion_factors, self.bins = {}, {}, {}, {}
+			return
+
+		self.set_item_prices()
+		self.set_conversion_factors()
+		self.set_bins()
+
+		transaction_types = {args.transaction_type for args in args_list}
+		for transaction_type in transaction_types:
+			prefetch_pricing_rule_index(transaction_type, items)
+
+	def set_item_prices(self):
+		self.item_prices, self.packing_units = {}, {}
+		if not self.price_lists:
+			return
+
+		ip = frappe.qb.DocType("Item Price")
+		item_prices = (
+			frappe.qb.from_(ip)
+			.select(
+				ip.name,
+				ip.item_code,
+				ip.price_list,
+				ip.price_list_rate,
+				ip.uom,
+				ip.batch_no,
+				ip.customer,
+				ip.supplier,
+				ip.valid_from,
+				ip.valid_upto,
+				ip.packing_unit,
+			)
+			.where(ip.item_code.isin(list(self.item_codes)) & ip.price_list.isin(list(self.price_lists)))
+		).run(as_dict=True)
+
+		for row in item_prices:
+			self.item_prices.setdefault((row.item_code, row.price_list), []).append(row)
+			self.packing_units[row.name] = row.packing_unit
+
+	def set_conversion_factors(self):
+		self.conversion_factors = {}
+		for row in frappe.get_all(
+			"UOM Conversion Detail",
+			filters={"parent": ("in", list(self.item_codes)), "parenttype": "Item"},
+			fields=["parent", "uom", "conversion_factor"],
+		):
+			self.conversion_factors.setdefault((row.parent, row.uom), row.conversion_factor)
+
+	def set_bins(self):
+		self.bins = {}
+
+		bin = frappe.qb.DocType("Bin")
+		wh = frappe.qb.DocType("Warehouse")
+		bins = (
+			frappe.qb.from_(bin)
+			.left_join(wh)
+			.on(bin.warehouse == wh.name)
+			.select(
+				bin.item_code,
+				bin.warehouse,
+				bin.projected_qty,
+				bin.actual_qty,
+				bin.reserved_qty,
+				bin.valuation_rate,
+				wh.company,
+			)
+			.where(bin.item_code.isin(list(self.item_codes)))
+		).run(as_dict=True)
+
+		for row in bins:
+			self.bins.setdefault(row.item_code, {})[row.warehouse] = row
+
+	def has_item_prices(self, item_code, price_list):
+		return item_code in self.item_codes and price_list in self.price_lists
+
+	def get_item_price(self, args, item_code, ignore_party=False):
+		"""Same rows, in the same order, as the query in `get_item_price`"""
+		transaction_date = getdate(args["transaction_date"]) if args.get("transaction_date") else None
+
+		item_prices = []
+		for row in self.item_prices.get((item_code, args.get("price_list")), []):
+			if cstr(row.uom) not in ("", args.get("uom")):
+				continue
+
+			if cstr(row.batch_no) not in ("", args.get("batch_no")):
+				continue
+
+			if not ignore_party:
+				if args.get("customer"):
+					if row.customer != args.get("customer"):
+						continue
+				elif args.get("supplier"):
+					if row.supplier != args.get("supplier"):
+						continue
+				elif row.customer or row.supplier:
+					continue
+
+			if transaction_date and not (
+				getdate(row.valid_from or "2000-01-01")
+				<= transaction_date
+				<= getdate(row.valid_upto or "2500-12-31")
+			):
+				continue
+
+			item_prices.append(row)
+
+		# nulls sort last in descending order, as in the query
+		item_prices.sort(
+			key=lambda row: (
+				row.valid_from is not None,
+				getdate(row.valid_from or "2000-01-01"),
+				cstr(row.batch_no),
+				row.uom is not None,
+				cstr(row.uom),
+			),
+			reverse=True,
+		)
+
+		return tuple((row.name, row.price_list_rate, row.uom) for row in item_prices)
+
+	def get_conversion_factor(self, item_code, variant_of, uom):
+		return self.conversion_factors.get((item_code, uom)) or self.conversion_factors.get(
+			(variant_of, uom)
+		)
+
+	def get_bin_details(self, item_code, warehouse, include_child_warehouses=False):
+		if include_child_warehouses:
+			if warehouse not in self.child_warehouses:
+				from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
+
+				self.child_warehouses[warehouse] = get_child_warehouses(warehouse)
+
+			warehouses = self.child_warehouses[warehouse]
+		else:
+			warehouses = [warehouse]
+
+		bins = self.bins.get(item_code, {})
+		bin_details = {"projected_qty": 0, "actual_qty": 0, "reserved_qty": 0}
+		for warehouse in set(warehouses):
+			if warehouse in bins:
+				for field in bin_details:
+					bin_details[field] += flt(bins[warehouse][field])
+
+		return bin_details
+
+	def get_company_total_stock(self, item_code, company):
+		bins = [row for row in self.bins.get(item_code, {}).values() if row.company == company]
+		return sum(flt(row.actual_qty) for row in bins) if bins else None
+
+
 def set_valuation_rate(out, args):
 	if frappe.db.exists("Product Bundle", {"name": args.item_code, "disabled": 0}, cache=True):
 		valuation_rate = 0.0
@@ -858,6 +1057,7 @@ def insert_item_price(args):
 					"Stock Settings", "update_existing_price_list_rate"
 				):
 					frappe.db.set_value("Item Price", item_price.name, "price_list_rate", price_list_rate)
+					clear_prefetched_item_prices()
 					frappe.msgprint(
 						_("Item Price updated for {0} in Price List {1}").format(args.item_code, args.price_list),
 						alert=True,
@@ -874,6 +1074,7 @@ def insert_item_price(args):
 					}
 				)
 				item_price.insert()
+				clear_prefetched_item_prices()
 				frappe.msgprint(
 					_("Item Price added for {0} in Price List {1}").format(args.item_code, args.price_list),
 					alert=True,
@@ -889,6 +1090,10 @@ def get_item_price(args, item_code, ignore_party=False):
 	:param item_code: str, Item Doctype field item_code
 	"""
 
+	prefetch = get_item_details_prefetch()
+	if prefetch and prefetch.has_item_prices(item_code, args.get("price_list")):
+		return prefetch.get_item_price(args, item_code, ignore_party=ignore_party)
+
 	ip = frappe.qb.DocType("Item Price")
 	query = (
 		frappe.qb.from_(ip)
@@ -982,9 +1187,14 @@ def check_packing_list(price_list_rate_name, desired_qty, item_code):
 	"""
 
 	flag = True
-	item_price = frappe.get_doc("Item Price", price_list_rate_name)
-	if item_price.packing_unit:
-		packing_increment = desired_qty % item_price.packing_unit
+	prefetch = get_item_details_prefetch()
+	if prefetch and price_list_rate_name in prefetch.packing_units:
+		packing_unit = prefetch.packing_units[price_list_rate_name]
+	else:
+		packing_unit = frappe.get_doc("Item Price", price_list_rate_name).packing_unit
+
+	if packing_unit:
+		packing_increment = desired_qty % packing_unit
 
 		if packing_increment != 0:
 			flag = False
@@ -1122,11 +1332,17 @@ def get_pos_profile(company, pos_profile=None, user=None):
 @frappe.whitelist()
 def get_conversion_factor(item_code, uom):
 	variant_of = frappe.db.get_value("Item", item_code, "variant_of", cache=True)
-	filters = {"parent": item_code, "uom": uom}
+	prefetch = get_item_details_prefetch()
+
+	if prefetch and item_code in prefetch.item_codes:
+		conversion_factor = prefetch.get_conversion_factor(item_code, variant_of, uom)
+	else:
+		filters = {"parent": item_code, "uom": uom}
+
+		if variant_of:
+			filters["parent"] = ("in", (item_code, variant_of))
+		conversion_factor = frappe.db.get_value("UOM Conversion Detail", filters, "conversion_factor")
 
-	if variant_of:
-		filters["parent"] = ("in", (item_code, variant_of))
-	conversion_factor = frappe.db.get_value("UOM Conversion Detail", filters, "conversion_factor")
 	if not conversion_factor:
 		stock_uom = frappe.db.get_value("Item", item_code, "stock_uom")
 		conversion_factor = get_uom_conv_factor(uom, stock_uom)
@@ -1146,8 +1362,12 @@ def get_projected_qty(item_code, warehouse):
 @frappe.whitelist()
 def get_bin_details(item_code, warehouse, company=None, include_child_warehouses=False):
 	bin_details = {"projected_qty": 0, "actual_qty": 0, "reserved_qty": 0}
+	prefetch = get_item_details_prefetch()
 
-	if warehouse:
+	if warehouse and prefetch and item_code in prefetch.item_codes:
+		bin_details = prefetch.get_bin_details(item_code, warehouse, include_child_warehouses)
+
+	elif warehouse:
 		from frappe.query_builder.functions import Coalesce, Sum
 
 		from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
@@ -1172,6 +1392,10 @@ def get_bin_details(item_code, warehouse, company=None, include_child_warehouses
 
 
 def get_company_total_stock(item_code, company):
+	prefetch = get_item_details_prefetch()
+	if prefetch and item_code in prefetch.item_codes:
+		return prefetch.get_company_total_stock(item_code, company)
+
 	bin = frappe.qb.DocType("Bin")
 	wh = frappe.qb.DocType("Warehouse")
 
@@ -1334,6 +1558,11 @@ def get_valuation_rate(item_code, company, warehouse=None):
 				or brand.get("default_warehouse")
 			)
 
+		prefetch = get_item_details_prefetch()
+		if warehouse and prefetch and item_code in prefetch.item_codes:
+			bin = prefetch.bins.get(item_code, {}).get(warehouse)
+			return frappe._dict(valuation_rate=bin.valuation_rate) if bin else {"valuation_rate": 0}
+
 		return frappe.db.get_value(
 			"Bin", {"item_code": item_code, "warehouse": warehouse}, ["valuation_rate"], as_dict=True
 		) or {"valuation_rate": 0}
@@ -8,8 +8,15 @@ from typing import Dict, List, Tuple, Union
 import frappe
 from frappe import _
 from frappe.utils import cint, date_diff, flt
+from pypika.terms import ExistsCriterion
 
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
+from erpnext.stock.doctype.stock_ageing_checkpoint.stock_ageing_checkpoint import (
+	get_checkpoint_date,
+	is_stock_ageing_checkpoint_enabled,
+	load_fifo_queue,
+	save_stock_ageing_checkpoints,
+)
 
 Filters = frappe._dict
 
@@ -231,12 +238,22 @@ class FIFOSlots:
 		                consumed/updated and maintained via FIFO. **
 		}
 		"""
+		checkpoint_date = None
 		if self.sle is None:
-			self.sle = self.__get_stock_ledger_entries()
+			if is_stock_ageing_checkpoint_enabled():
+				# replay only the entries after the saved slots of each item-warehouse
+				checkpoint_date = get_checkpoint_date(self.filters.get("to_date"))
+				self.__load_checkpoints()
 
+			self.sle = self.__get_stock_ledger_entries(with_checkpoints=bool(checkpoint_date))
+
+		slots_at_checkpoint = {}
 		for d in self.sle:
 			key, fifo_queue, transferred_item_key = self.__init_key_stores(d)
 
+			if checkpoint_date and key not in slots_at_checkpoint and d.posting_date > checkpoint_date:
+				slots_at_checkpoint[key] = self.__get_slots_to_save(key)
+
 			if d.voucher_type == "Stock Reconciliation":
 				# get difference in qty shift as actual qty
 				prev_balance_qty = self.item_details[key].get("qty_after_transaction", 0)
@@ -251,12 +268,80 @@ class FIFOSlots:
 
 			self.__update_balances(d, key)
 
+		if checkpoint_date:
+			self.__save_checkpoints(checkpoint_date, slots_at_checkpoint)
+
 		if not self.filters.get("show_warehouse_wise_stock"):
 			# (Item 1, WH 1), (Item 1, WH 2) => (Item 1)
 			self.item_details = self.__aggregate_details_by_item(self.item_details)
 
 		return self.item_details
 
+	def __load_checkpoints(self):
+		"Initialise item-warehouses from their last checkpoint on or before the report date."
+		checkpoint = frappe.qb.DocType("Stock Ageing Checkpoint")
+		item = self.__get_item_query()
+
+		query = (
+			frappe.qb.from_(checkpoint)
+			.from_(item)
+			.select(
+				item.name,
+				item.item_name,
+				item.item_group,
+				item.brand,
+				item.description,
+				item.stock_uom,
+				item.has_serial_no,
+				checkpoint.warehouse,
+				checkpoint.qty_after_transaction,
+				checkpoint.total_qty,
+				checkpoint.fifo_queue,
+			)
+			.where(
+				(checkpoint.item_code == item.name)
+				& (checkpoint.company == self.filters.get("company"))
+				& (checkpoint.posting_date <= self.filters.get("to_date"))
+			)
+		)
+
+		if self.filters.get("warehouse"):
+			query = self.__get_warehouse_conditions(checkpoint, query)
+
+		for row in query.orderby(checkpoint.item_code, checkpoint.warehouse).run(as_dict=True):
+			self.item_details[(row.name, row.warehouse)] = {
+				"details": row,
+				"fifo_queue": load_fifo_queue(row.pop("fifo_queue")),
+				"qty_after_transaction": row.pop("qty_after_transaction"),
+				"total_qty": row.pop("total_qty"),
+				"has_serial_no": row.has_serial_no,
+			}
+
+	def __get_slots_to_save(self, key: Tuple) -> Dict:
+		"Copy of the slots of an item-warehouse, as they are before the entry being replayed."
+		row = self.item_details[key]
+		if row["details"].get("has_serial_no") or "total_qty" not in row:
+			# serial no slots depend on entries of other warehouses, always replayed
+			return None
+
+		return {
+			"fifo_queue": [list(slot) for slot in row["fifo_queue"]],
+			"qty_after_transaction": row["qty_after_transaction"],
+			"total_qty": row["total_qty"],
+		}
+
+	def __save_checkpoints(self, checkpoint_date, slots_at_checkpoint: Dict):
+		for key, row in self.item_details.items():
+			if key not in slots_at_checkpoint:
+				# no entries after the checkpoint date
+				slots_at_checkpoint[key] = self.__get_slots_to_save(key)
+
+		save_stock_ageing_checkpoints(
+			{key: slots for key, slots in slots_at_checkpoint.items() if slots},
+			checkpoint_date,
+			self.filters.get("company"),
+		)
+
 	def __init_key_stores(self, row: Dict) -> Tuple:
 		"Initialise keys and FIFO Queue."
 
@@ -381,7 +466,7 @@ class FIFOSlots:
 
 		return item_aggregated_data
 
-	def __get_stock_ledger_entries(self) -> List[Dict]:
+	def __get_stock_ledger_entries(self, with_checkpoints: bool = False) -> List[Dict]:
 		sle = frappe.qb.DocType("Stock Ledger Entry")
 		item = self.__get_item_query()  # used as derived table in sle query
 
@@ -416,6 +501,22 @@ class FIFOSlots:
 		if self.filters.get("warehouse"):
 			sle_query = self.__get_warehouse_conditions(sle, sle_query)
 
+		if with_checkpoints:
+			# skip entries already included in a checkpoint
+			checkpoint = frappe.qb.DocType("Stock Ageing Checkpoint")
+			sle_query = sle_query.where(
+				ExistsCriterion(
+					frappe.qb.from_(checkpoint)
+					.select(checkpoint.name)
+					.where(
+						(checkpoint.item_code == sle.item_code)
+						& (checkpoint.warehouse == sle.warehouse)
+						& (checkpoint.posting_date >= sle.posting_date)
+						& (checkpoint.posting_date <= self.filters.get("to_date"))
+					)
+				).negate()
+			)
+
 		sle_query = sle_query.orderby(sle.posting_date, sle.posting_time, sle.creation, sle.actual_qty)
 
 		return sle_query.run(as_dict=True)
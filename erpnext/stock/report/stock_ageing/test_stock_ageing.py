@@ -2,7 +2,8 @@
 # See license.txt
 
 import frappe
-from frappe.tests.utils import FrappeTestCase
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import add_months, nowdate
 
 from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots, format_report_data
 
@@ -724,6 +725,64 @@ class TestStockAgeing(FrappeTestCase):
 		self.assertEqual(bal_qty, 0.9)
 		self.assertEqual(bal_qty, range_qty_sum)
 
+	@change_settings("Stock Settings", {"persist_stock_ageing_slots": 1})
+	def test_slots_from_checkpoint(self):
+		from erpnext.stock.doctype.item.test_item import make_item
+		from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+		item_code = make_item("_Test Stock Ageing Checkpoint Item", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		filters = frappe._dict(
+			company="_Test Company",
+			to_date=nowdate(),
+			item_code=item_code,
+			show_warehouse_wise_stock=True,
+		)
+
+		def get_slots():
+			return FIFOSlots(filters).generate()[(item_code, warehouse)]["fifo_queue"]
+
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=10,
+			rate=100,
+			posting_date=add_months(nowdate(), -3),
+		)
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=5,
+			rate=100,
+			posting_date=add_months(nowdate(), -2),
+		)
+		make_stock_entry(
+			item_code=item_code,
+			from_warehouse=warehouse,
+			qty=4,
+			posting_date=add_months(nowdate(), -1),
+		)
+
+		slots = get_slots()
+		self.assertTrue(
+			frappe.db.exists("Stock Ageing Checkpoint", {"item_code": item_code, "warehouse": warehouse})
+		)
+		self.assertEqual(get_slots(), slots)
+
+		# back-dated entry drops the checkpoint
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=2,
+			rate=100,
+			posting_date=add_months(nowdate(), -4),
+		)
+		self.assertFalse(
+			frappe.db.exists("Stock Ageing Checkpoint", {"item_code": item_code, "warehouse": warehouse})
+		)
+		self.assertEqual(sum(slot[0] for slot in get_slots()), 13)
+		self.assertEqual(get_slots(), get_slots())
+
 
 def generate_item_and_item_wh_wise_slots(filters, sle):
 	"Return results with and without 'show_warehouse_wise_stock'"
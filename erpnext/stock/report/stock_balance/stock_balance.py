@@ -14,6 +14,9 @@ from frappe.utils.nestedset import get_descendants_of
 
 import erpnext
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
+from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+	get_checkpoint_period_end,
+)
 from erpnext.stock.doctype.warehouse.warehouse import apply_warehouse_filter
 from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots, get_average_age
 from erpnext.stock.utils import add_additional_uom_columns
@@ -76,6 +79,12 @@ class StockBalanceReport(object):
 		self.opening_data = frappe._dict({})
 
 		closing_balance = self.get_closing_balance()
+
+		period_end = self.get_checkpoint_period_end()
+		if period_end and (not closing_balance or getdate(closing_balance[0].to_date) < period_end):
+			self.prepare_opening_data_from_checkpoint(period_end)
+			return
+
 		if not closing_balance:
 			return
 
@@ -89,6 +98,51 @@ class StockBalanceReport(object):
 			if group_by_key not in self.opening_data:
 				self.opening_data.setdefault(group_by_key, entry)
 
+	def get_checkpoint_period_end(self):
+		"""Month end of the Stock Balance Checkpoint to start from, if it can replace the
+		entries before it"""
+		if self.filters.get("ignore_closing_balance") or self.filters.get("show_stock_ageing_data"):
+			# ageing needs the FIFO queue of the opening stock
+			return
+
+		# checkpoints are kept per item and warehouse
+		if any(self.filters.get(fieldname) for fieldname in self.inventory_dimensions):
+			return
+
+		return get_checkpoint_period_end(self.from_date)
+
+	def prepare_opening_data_from_checkpoint(self, period_end) -> None:
+		self.start_from = add_days(period_end, 1)
+
+		checkpoint = frappe.qb.DocType("Stock Balance Checkpoint")
+		item_table = frappe.qb.DocType("Item")
+
+		query = (
+			frappe.qb.from_(checkpoint)
+			.inner_join(item_table)
+			.on(checkpoint.item_code == item_table.name)
+			.select(
+				checkpoint.company,
+				checkpoint.item_code,
+				checkpoint.warehouse,
+				checkpoint.qty_after_transaction.as_("bal_qty"),
+				checkpoint.stock_value.as_("bal_val"),
+				item_table.item_group,
+				item_table.stock_uom,
+				item_table.item_name,
+			)
+			.where(checkpoint.period_end_date == period_end)
+		)
+
+		query = self.apply_warehouse_filters(query, checkpoint)
+		query = self.apply_items_filters(query, item_table)
+
+		if self.filters.get("company"):
+			query = query.where(checkpoint.company == self.filters.get("company"))
+
+		for entry in query.run(as_dict=True):
+			self.opening_data.setdefault(self.get_group_by_key(entry), entry)
+
 	def prepare_new_data(self):
 		if not self.sle_entries:
 			return
@@ -2,8 +2,8 @@ from typing import Any, Dict
 
 import frappe
 from frappe import _dict
-from frappe.tests.utils import FrappeTestCase
-from frappe.utils import today
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import add_days, add_months, get_first_day, getdate, today
 
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
@@ -172,3 +172,59 @@ class TestStockBalance(FrappeTestCase):
 		)
 		self.assertPartialDictEq(attributes, rows[0])
 		self.assertInvariants(rows)
+
+	@change_settings("Stock Settings", {"maintain_stock_balance_checkpoints": 1})
+	def test_opening_from_checkpoint(self):
+		from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+			get_checkpoints_valid_upto,
+			get_stock_balance_from_checkpoints,
+			update_stock_balance_checkpoints,
+		)
+		from erpnext.stock.stock_ledger import get_previous_sle
+
+		self.generate_stock_ledger(
+			self.item.name,
+			[
+				_dict(qty=5, rate=10, posting_date=add_months(today(), -3)),
+				_dict(qty=3, rate=20, posting_date=add_months(today(), -2)),
+				_dict(
+					qty=2,
+					from_warehouse="_Test Warehouse - _TC",
+					to_warehouse=None,
+					posting_date=add_days(get_first_day(add_months(today(), -1)), 1),
+				),
+			],
+		)
+
+		update_stock_balance_checkpoints()
+		self.assertEqual(get_checkpoints_valid_upto(), getdate(add_days(get_first_day(today()), -1)))
+
+		self.filters.from_date = add_days(get_first_day(add_months(today(), -1)), 5)
+		rows = stock_balance(self.filters)
+		self.assertEqual(rows, stock_balance(self.filters.copy().update({"ignore_closing_balance": 1})))
+		self.assertInvariants(rows)
+
+		balance = get_stock_balance_from_checkpoints(
+			self.item.name, "_Test Warehouse - _TC", self.filters.from_date
+		)
+		previous_sle = get_previous_sle(
+			{
+				"item_code": self.item.name,
+				"warehouse": "_Test Warehouse - _TC",
+				"posting_date": self.filters.from_date,
+				"posting_time": "00:00:00",
+			}
+		)
+		self.assertEqual(balance.qty_after_transaction, previous_sle.qty_after_transaction)
+		self.assertAlmostEqual(balance.stock_value, previous_sle.stock_value, 3)
+
+		# back-dated entry marks later checkpoints for regeneration
+		self.generate_stock_ledger(
+			self.item.name, [_dict(qty=1, rate=10, posting_date=add_months(today(), -4))]
+		)
+		self.assertLess(get_checkpoints_valid_upto(), getdate(add_months(today(), -4)))
+
+		update_stock_balance_checkpoints()
+		rows = stock_balance(self.filters)
+		self.assertEqual(rows, stock_balance(self.filters.copy().update({"ignore_closing_balance": 1})))
+		self.assertEqual(rows[0].opening_qty, 7)
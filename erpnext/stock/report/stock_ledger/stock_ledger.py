@@ -9,6 +9,9 @@ from frappe.utils import cint, flt
 
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
+from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+	get_stock_balance_from_checkpoints,
+)
 from erpnext.stock.doctype.stock_reconciliation.stock_reconciliation import get_stock_balance_for
 from erpnext.stock.doctype.warehouse.warehouse import apply_warehouse_filter
 from erpnext.stock.utils import (
@@ -413,15 +416,20 @@ def get_opening_balance(filters, columns, sl_entries):
 
 	from erpnext.stock.stock_ledger import get_previous_sle
 
-	last_entry = get_previous_sle(
-		{
-			"item_code": filters.item_code,
-			"warehouse_condition": get_warehouse_condition(filters.warehouse),
-			"posting_date": filters.from_date,
-			"posting_time": "00:00:00",
-		}
+	last_entry = get_stock_balance_from_checkpoints(
+		filters.item_code, filters.warehouse, filters.from_date
 	)
 
+	if last_entry is None:
+		last_entry = get_previous_sle(
+			{
+				"item_code": filters.item_code,
+				"warehouse_condition": get_warehouse_condition(filters.warehouse),
+				"posting_date": filters.from_date,
+				"posting_time": "00:00:00",
+			}
+		)
+
 	# check if any SLEs are actually Opening Stock Reconciliation
 	for sle in list(sl_entries):
 		if (
@@ -3,7 +3,6 @@ from typing import List
 
 import frappe
 from frappe import _, bold
-from frappe.model.naming import make_autoname
 from frappe.query_builder.functions import CombineDatetime, Sum
 from frappe.utils import cint, flt, get_link_to_form, now, nowtime, today
 
@@ -11,7 +10,10 @@ from erpnext.stock.deprecated_serial_batch import (
 	DeprecatedBatchNoValuation,
 	DeprecatedSerialNoValuation,
 )
+from erpnext.stock.doctype.batch_wise_balance.batch_wise_balance import update_batch_wise_balance
+from erpnext.stock.doctype.serial_no_state.serial_no_state import update_serial_no_state
 from erpnext.stock.valuation import round_off_if_near_zero
+from erpnext.utilities.naming import make_autonames
 
 
 class SerialBatchBundle:
@@ -21,6 +23,7 @@ class SerialBatchBundle:
 
 		self.set_item_details()
 		self.process_serial_and_batch_bundle()
+		self.update_batch_wise_balance()
 		if self.sle.is_cancelled:
 			self.delink_serial_and_batch_bundle()
 
@@ -231,6 +234,7 @@ class SerialBatchBundle:
 
 		if self.item_details.has_serial_no == 1:
 			self.set_warehouse_and_status_in_serial_nos()
+			self.update_serial_no_state()
 
 		if (
 			self.sle.actual_qty > 0
@@ -280,6 +284,24 @@ class SerialBatchBundle:
 			.where(sn_table.name.isin(serial_nos))
 		).run()
 
+	def update_serial_no_state(self):
+		from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos as get_parsed_serial_nos
+
+		entries = []
+		if self.sle.serial_and_batch_bundle:
+			entries = frappe.get_all(
+				"Serial and Batch Entry",
+				fields=["serial_no", "batch_no"],
+				filters={"parent": self.sle.serial_and_batch_bundle, "serial_no": ("is", "set")},
+			)
+		elif self.sle.serial_no:
+			entries = [
+				frappe._dict(serial_no=serial_no, batch_no=self.sle.batch_no)
+				for serial_no in get_parsed_serial_nos(self.sle.serial_no)
+			]
+
+		update_serial_no_state(self.sle, entries)
+
 	def set_batch_no_in_serial_nos(self):
 		entries = frappe.get_all(
 			"Serial and Batch Entry",
@@ -299,6 +321,17 @@ class SerialBatchBundle:
 				.where(sn_table.name.isin(serial_nos))
 			).run()
 
+	def update_batch_wise_balance(self):
+		if not self.item_details.has_batch_no:
+			return
+
+		# before the validations of a cancellation and the update of batch qty, which read it
+		batch_nos = set(get_batch_nos(self.sle.serial_and_batch_bundle))
+		if self.sle.batch_no:
+			batch_nos.add(self.sle.batch_no)
+
+		update_batch_wise_balance(self.item_code, self.warehouse, batch_nos)
+
 	def update_batch_qty(self):
 		from erpnext.stock.doctype.batch.batch import get_available_batches
 
@@ -952,24 +985,26 @@ class SerialBatchCreation:
 		)
 
 	def get_auto_created_serial_nos(self):
-		sr_nos = []
 		serial_nos_details = []
 
 		if not self.serial_no_series:
 			msg = f"Please set Serial No Series in the item {self.item_code} or create Serial and Batch Bundle manually."
 			frappe.throw(_(msg))
 
-		for i in range(abs(cint(self.actual_qty))):
-			serial_no = make_autoname(self.serial_no_series, "Serial No")
-			sr_nos.append(serial_no)
+		# names are reserved from the series at once, not a counter update per Serial No
+		sr_nos = make_autonames(self.serial_no_series, "Serial No", abs(cint(self.actual_qty)))
+
+		timestamp = now()
+		user = frappe.session.user
+		for serial_no in sr_nos:
 			serial_nos_details.append(
 				(
 					serial_no,
 					serial_no,
-					now(),
-					now(),
-					frappe.session.user,
-					frappe.session.user,
+					timestamp,
+					timestamp,
+					user,
+					user,
 					self.warehouse,
 					self.company,
 					self.item_code,
@@ -997,7 +1032,7 @@ class SerialBatchCreation:
 				"batch_no",
 			]
 
-			frappe.db.bulk_insert("Serial No", fields=fields, values=set(serial_nos_details))
+			frappe.db.bulk_insert("Serial No", fields=fields, values=serial_nos_details)
 
 		return sr_nos
 
@@ -19,6 +19,12 @@ from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_in
 from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
 	get_available_batches,
 )
+from erpnext.stock.doctype.stock_ageing_checkpoint.stock_ageing_checkpoint import (
+	invalidate_stock_ageing_checkpoints,
+)
+from erpnext.stock.doctype.stock_balance_checkpoint.stock_balance_checkpoint import (
+	invalidate_stock_balance_checkpoints,
+)
 from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import (
 	get_sre_reserved_batch_nos_details,
 	get_sre_reserved_serial_nos_details,
@@ -32,6 +38,9 @@ from erpnext.stock.utils import (
 from erpnext.stock.valuation import FIFOValuation, LIFOValuation, round_off_if_near_zero
 
 
+BULK_SL_ENTRY_THRESHOLD = 100
+
+
 class NegativeStockError(frappe.ValidationError):
 	pass
 
@@ -61,25 +70,17 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 
 		args = get_args_for_future_sle(sl_entries[0])
 		future_sle_exists(args, sl_entries)
+		invalidate_stock_ageing_checkpoints(sl_entries)
+		invalidate_stock_balance_checkpoints(
+			min(getdate(sle.get("posting_date")) for sle in sl_entries)
+		)
 
-		for sle in sl_entries:
-			if sle.serial_no and not via_landed_cost_voucher:
-				validate_serial_no(sle)
-
-			if cancel:
-				sle["actual_qty"] = -flt(sle.get("actual_qty"))
-
-				if sle["actual_qty"] < 0 and not sle.get("outgoing_rate"):
-					sle["outgoing_rate"] = get_incoming_outgoing_rate_for_cancel(
-						sle.item_code, sle.voucher_type, sle.voucher_no, sle.voucher_detail_no
-					)
-					sle["incoming_rate"] = 0.0
+		if len(sl_entries) >= BULK_SL_ENTRY_THRESHOLD and can_make_sl_entries_in_bulk():
+			make_sl_entries_in_bulk(sl_entries, cancel, allow_negative_stock, via_landed_cost_voucher)
+			return
 
-				if sle["actual_qty"] > 0 and not sle.get("incoming_rate"):
-					sle["incoming_rate"] = get_incoming_outgoing_rate_for_cancel(
-						sle.item_code, sle.voucher_type, sle.voucher_no, sle.voucher_detail_no
-					)
-					sle["outgoing_rate"] = 0.0
+		for sle in sl_entries:
+			prepare_sl_entry(sle, cancel, via_landed_cost_voucher)
 
 			if sle.get("actual_qty") or sle.get("voucher_type") == "Stock Reconciliation":
 				sle_doc = make_entry(sle, allow_negative_stock, via_landed_cost_voucher)
@@ -102,35 +103,176 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 				)
 
 
+def prepare_sl_entry(sle, cancel=False, via_landed_cost_voucher=False):
+	if sle.serial_no and not via_landed_cost_voucher:
+		validate_serial_no(sle)
+
+	if cancel:
+		sle["actual_qty"] = -flt(sle.get("actual_qty"))
+
+		if sle["actual_qty"] < 0 and not sle.get("outgoing_rate"):
+			sle["outgoing_rate"] = get_incoming_outgoing_rate_for_cancel(
+				sle.item_code, sle.voucher_type, sle.voucher_no, sle.voucher_detail_no
+			)
+			sle["incoming_rate"] = 0.0
+
+		if sle["actual_qty"] > 0 and not sle.get("incoming_rate"):
+			sle["incoming_rate"] = get_incoming_outgoing_rate_for_cancel(
+				sle.item_code, sle.voucher_type, sle.voucher_no, sle.voucher_detail_no
+			)
+			sle["outgoing_rate"] = 0.0
+
+
+def can_make_sl_entries_in_bulk():
+	# negative stock per inventory dimension is validated against the entries already
+	# inserted for the voucher, so those have to be inserted one by one
+	return not any(dimension.get("validate_negative_stock") for dimension in get_inventory_dimensions())
+
+
+def make_sl_entries_in_bulk(
+	sl_entries, cancel=False, allow_negative_stock=False, via_landed_cost_voucher=False
+):
+	"""Insert the SL entries of a voucher with multi-row INSERTs.
+
+	Entries at the same item, warehouse and posting time are reposted together, in the
+	order of creation, and each Bin is read, created and updated once for the voucher."""
+	from erpnext.accounts.utils import bulk_insert_documents
+	from erpnext.controllers.stock_controller import future_sle_exists
+
+	entries = []
+	for sle in sl_entries:
+		prepare_sl_entry(sle, cancel, via_landed_cost_voucher)
+
+		if sle.get("actual_qty") or sle.get("voucher_type") == "Stock Reconciliation":
+			entries.append((sle, get_validated_sle_doc(sle, allow_negative_stock, via_landed_cost_voucher)))
+
+	bulk_insert_documents([sle_doc for sle, sle_doc in entries])
+
+	entries_by_timestamp = {}
+	for sle, sle_doc in entries:
+		sle_doc.run_method("on_submit")
+
+		# Added to handle the case when the stock ledger entry is created from the repostig
+		if sle.get("creation_time") and sle.get("voucher_type") == "Stock Reconciliation":
+			sle_doc.db_set("creation", sle.get("creation_time"))
+
+		args = sle_doc.as_dict()
+		if sle.get("voucher_type") == "Stock Reconciliation":
+			# preserve previous_qty_after_transaction for qty reposting
+			args.previous_qty_after_transaction = sle.get("previous_qty_after_transaction")
+
+		if not frappe.get_cached_value("Item", args.get("item_code"), "is_stock_item"):
+			frappe.msgprint(_("Item {0} ignored since it is not a stock item").format(args.get("item_code")))
+			continue
+
+		if not args.get("posting_date"):
+			args["posting_date"] = nowdate()
+
+		key = (args.item_code, args.warehouse, args.posting_date, args.posting_time)
+		entries_by_timestamp.setdefault(key, []).append(args)
+
+	bins = get_bins_for_item_warehouses({key[:2] for key in entries_by_timestamp})
+
+	last_args_by_bin = {}
+	for (item_code, warehouse, posting_date, posting_time), sle_args in entries_by_timestamp.items():
+		bin_details = bins[(item_code, warehouse)]
+		for args in sle_args:
+			args.reserved_stock = flt(bin_details.reserved_stock)
+
+		args = sle_args[-1]
+		if not (args.get("is_cancelled") and via_landed_cost_voucher):
+			# the last entry reposts all the entries of the voucher at this posting time
+			repost_sle_against_current_timestamp(args, allow_negative_stock, via_landed_cost_voucher)
+
+		for args in sle_args:
+			if future_sle_exists(args):
+				update_qty_in_future_sle(args, allow_negative_stock)
+			else:
+				validate_negative_qty_in_future_sle(args, allow_negative_stock)
+
+		last_args_by_bin[bin_details.name] = sle_args[-1]
+
+	for bin_name, args in last_args_by_bin.items():
+		update_bin_qty(bin_name, args)
+
+
+def get_validated_sle_doc(args, allow_negative_stock=False, via_landed_cost_voucher=False):
+	args["doctype"] = "Stock Ledger Entry"
+	sle = frappe.get_doc(args)
+	sle.flags.ignore_permissions = 1
+	sle.allow_negative_stock = allow_negative_stock
+	sle.via_landed_cost_voucher = via_landed_cost_voucher
+	sle.docstatus = 1
+	sle.set_new_name()
+	sle.run_method("validate")
+	sle.run_method("before_submit")
+
+	return sle
+
+
+def get_bins_for_item_warehouses(item_warehouses):
+	"""Bins of the (item code, warehouse) pairs, by pair. Missing Bins are created."""
+	bins = {}
+	if not item_warehouses:
+		return bins
+
+	bin = frappe.qb.DocType("Bin")
+	bin_details = (
+		frappe.qb.from_(bin)
+		.select(bin.name, bin.item_code, bin.warehouse, bin.reserved_stock)
+		.where(
+			bin.item_code.isin(list({item_code for item_code, warehouse in item_warehouses}))
+			& bin.warehouse.isin(list({warehouse for item_code, warehouse in item_warehouses}))
+		)
+	).run(as_dict=True)
+
+	for row in bin_details:
+		bins[(row.item_code, row.warehouse)] = row
+
+	for item_code, warehouse in item_warehouses:
+		if (item_code, warehouse) not in bins:
+			bins[(item_code, warehouse)] = frappe._dict(
+				name=get_or_make_bin(item_code, warehouse), reserved_stock=0.0
+			)
+
+	return bins
+
+
 def repost_current_voucher(args, allow_negative_stock=False, via_landed_cost_voucher=False):
 	if args.get("actual_qty") or args.get("voucher_type") == "Stock Reconciliation":
 		if not args.get("posting_date"):
 			args["posting_date"] = nowdate()
 
 		if not (args.get("is_cancelled") and via_landed_cost_voucher):
-			# Reposts only current voucher SL Entries
-			# Updates valuation rate, stock value, stock queue for current transaction
-			update_entries_after(
-				{
-					"item_code": args.get("item_code"),
-					"warehouse": args.get("warehouse"),
-					"posting_date": args.get("posting_date"),
-					"posting_time": args.get("posting_time"),
-					"voucher_type": args.get("voucher_type"),
-					"voucher_no": args.get("voucher_no"),
-					"sle_id": args.get("name"),
-					"creation": args.get("creation"),
-					"reserved_stock": args.get("reserved_stock"),
-				},
-				allow_negative_stock=allow_negative_stock,
-				via_landed_cost_voucher=via_landed_cost_voucher,
-			)
+			repost_sle_against_current_timestamp(args, allow_negative_stock, via_landed_cost_voucher)
 
 		# update qty in future sle and Validate negative qty
 		# For LCV: update future balances with -ve LCV SLE, which will be balanced by +ve LCV SLE
 		update_qty_in_future_sle(args, allow_negative_stock)
 
 
+def repost_sle_against_current_timestamp(
+	args, allow_negative_stock=False, via_landed_cost_voucher=False
+):
+	# Reposts only current voucher SL Entries
+	# Updates valuation rate, stock value, stock queue for current transaction
+	update_entries_after(
+		{
+			"item_code": args.get("item_code"),
+			"warehouse": args.get("warehouse"),
+			"posting_date": args.get("posting_date"),
+			"posting_time": args.get("posting_time"),
+			"voucher_type": args.get("voucher_type"),
+			"voucher_no": args.get("voucher_no"),
+			"sle_id": args.get("name"),
+			"creation": args.get("creation"),
+			"reserved_stock": args.get("reserved_stock"),
+		},
+		allow_negative_stock=allow_negative_stock,
+		via_landed_cost_voucher=via_landed_cost_voucher,
+	)
+
+
 def get_args_for_future_sle(row):
 	return frappe._dict(
 		{
@@ -230,7 +372,7 @@ def repost_future_sle(
 		args = []  # set args to empty list if None to avoid enumerate error
 
 	reposting_data = {}
-	if doc and doc.reposting_data_file:
+	if doc and doc.get("reposting_data_file"):
 		reposting_data = get_reposting_data(doc.reposting_data_file)
 
 	items_to_be_repost = get_items_to_be_repost(
@@ -410,7 +552,7 @@ def create_json_gz_file(data, doc, file_name=None) -> str:
 
 
 def get_items_to_be_repost(voucher_type=None, voucher_no=None, doc=None, reposting_data=None):
-	if not reposting_data and doc and doc.reposting_data_file:
+	if not reposting_data and doc and doc.get("reposting_data_file"):
 		reposting_data = get_reposting_data(doc.reposting_data_file)
 
 	if reposting_data and reposting_data.items_to_be_repost:
@@ -434,7 +576,7 @@ def get_items_to_be_repost(voucher_type=None, voucher_no=None, doc=None, reposti
 
 
 def get_distinct_item_warehouse(args=None, doc=None, reposting_data=None):
-	if not reposting_data and doc and doc.reposting_data_file:
+	if not reposting_data and doc and doc.get("reposting_data_file"):
 		reposting_data = get_reposting_data(doc.reposting_data_file)
 
 	if reposting_data and reposting_data.distinct_item_and_warehouse:
@@ -457,7 +599,7 @@ def get_distinct_item_warehouse(args=None, doc=None, reposting_data=None):
 
 
 def get_affected_transactions(doc, reposting_data=None) -> Set[Tuple[str, str]]:
-	if not reposting_data and doc and doc.reposting_data_file:
+	if not reposting_data and doc and doc.get("reposting_data_file"):
 		reposting_data = get_reposting_data(doc.reposting_data_file)
 
 	if reposting_data and reposting_data.affected_transactions:
@@ -470,6 +612,105 @@ def get_affected_transactions(doc, reposting_data=None) -> Set[Tuple[str, str]]:
 	return {tuple(transaction) for transaction in transactions}
 
 
+def get_item_warehouse_chains(item_warehouses, posting_date) -> dict:
+	"""Group item-warehouses into chains which can be reposted independently of each other.
+
+	Two item-warehouses belong to the same chain if an SLE of one of them posted on or
+	after `posting_date` has `dependant_sle_voucher_detail_no` pointing to an SLE of the
+	other (transfers, manufacture, repack etc.), since then reposting one changes the
+	valuation of the other. Dependent item-warehouses are followed transitively.
+
+	Returns {(item_code, warehouse): chain} where chain is one of the item-warehouses."""
+	chains = {}
+
+	def find(key):
+		chains.setdefault(key, key)
+		while chains[key] != key:
+			chains[key] = chains[chains[key]]
+			key = chains[key]
+
+		return key
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	dependant_sle = frappe.qb.DocType("Stock Ledger Entry").as_("dependant_sle")
+
+	checked = set()
+	to_check = list(set(item_warehouses))
+	while to_check:
+		checked.update(to_check)
+
+		links = (
+			frappe.qb.from_(sle)
+			.inner_join(dependant_sle)
+			.on(dependant_sle.voucher_detail_no == sle.dependant_sle_voucher_detail_no)
+			.select(
+				sle.item_code,
+				sle.warehouse,
+				dependant_sle.item_code.as_("dependant_item_code"),
+				dependant_sle.warehouse.as_("dependant_warehouse"),
+			)
+			.distinct()
+			.where(
+				(sle.is_cancelled == 0)
+				& (dependant_sle.is_cancelled == 0)
+				& (dependant_sle.name != sle.name)
+				& (sle.dependant_sle_voucher_detail_no.isnotnull())
+				& (sle.dependant_sle_voucher_detail_no != "")
+				& (sle.posting_date >= posting_date)
+				& (sle.item_code.isin(list({item_code for item_code, _warehouse in to_check})))
+			)
+		).run(as_dict=True)
+
+		to_check = []
+		for link in links:
+			key = (link.item_code, link.warehouse)
+			if key not in checked:
+				continue
+
+			dependant_key = (link.dependant_item_code, link.dependant_warehouse)
+			chains[find(dependant_key)] = find(key)
+			if dependant_key not in checked and dependant_key not in to_check:
+				to_check.append(dependant_key)
+
+	return {key: find(key) for key in checked}
+
+
+def get_shared_voucher_item_warehouses(item_warehouses, posting_date, condition=None) -> list:
+	"""Returns the item-warehouses, out of `item_warehouses`, of every voucher posted on or after
+	`posting_date` with SLEs for more than one of them. Only SLEs matching `condition` are
+	considered if it is passed.
+
+	GL Entries of a voucher are reposted as a whole, so such item-warehouses can't be reposted
+	independently of each other even if their valuations don't depend on each other."""
+	item_warehouses = set(item_warehouses)
+	if not item_warehouses:
+		return []
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	query = (
+		frappe.qb.from_(sle)
+		.select(sle.voucher_type, sle.voucher_no, sle.item_code, sle.warehouse)
+		.distinct()
+		.where(
+			(sle.is_cancelled == 0)
+			& (sle.posting_date >= posting_date)
+			& (sle.item_code.isin(list({item_code for item_code, _warehouse in item_warehouses})))
+		)
+	)
+	if condition is not None:
+		query = query.where(condition)
+
+	sles = query.run(as_dict=True)
+
+	item_warehouses_by_voucher = {}
+	for row in sles:
+		key = (row.item_code, row.warehouse)
+		if key in item_warehouses:
+			item_warehouses_by_voucher.setdefault((row.voucher_type, row.voucher_no), set()).add(key)
+
+	return [keys for keys in item_warehouses_by_voucher.values() if len(keys) > 1]
+
+
 def get_current_index(doc=None):
 	if doc and doc.current_index:
 		return doc.current_index
@@ -562,6 +803,7 @@ class update_entries_after(object):
 			{
 				"prev_stock_value": previous_sle.stock_value or 0.0,
 				"stock_queue": json.loads(previous_sle.stock_queue or "[]"),
+				"valuation_queue": None,
 				"stock_value_difference": 0.0,
 			}
 		)
@@ -736,6 +978,7 @@ class update_entries_after(object):
 				)
 				if self.valuation_method != "Moving Average":
 					self.wh_data.stock_queue = [[self.wh_data.qty_after_transaction, self.wh_data.valuation_rate]]
+					self.wh_data.valuation_queue = None
 			else:
 				if self.valuation_method == "Moving Average":
 					self.get_moving_average_values(sle)
@@ -1086,10 +1329,7 @@ class update_entries_after(object):
 			self.wh_data.qty_after_transaction + actual_qty
 		)
 
-		if self.valuation_method == "LIFO":
-			stock_queue = LIFOValuation(self.wh_data.stock_queue)
-		else:
-			stock_queue = FIFOValuation(self.wh_data.stock_queue)
+		stock_queue = self.get_valuation_queue()
 
 		_prev_qty, prev_stock_value = stock_queue.get_total_stock_and_value()
 
@@ -1114,19 +1354,32 @@ class update_entries_after(object):
 
 		stock_value_difference = stock_value - prev_stock_value
 
-		self.wh_data.stock_queue = stock_queue.state
 		self.wh_data.stock_value = round_off_if_near_zero(
 			self.wh_data.stock_value + stock_value_difference
 		)
 
-		if not self.wh_data.stock_queue:
-			self.wh_data.stock_queue.append(
-				[0, sle.incoming_rate or sle.outgoing_rate or self.wh_data.valuation_rate]
+		if not len(stock_queue):
+			stock_queue.reset_state(
+				[[0, sle.incoming_rate or sle.outgoing_rate or self.wh_data.valuation_rate]]
 			)
 
+		# bins are shared with the queue, they are copied only when serialized into the SLE
+		self.wh_data.stock_queue = stock_queue.state
+
 		if self.wh_data.qty_after_transaction:
 			self.wh_data.valuation_rate = self.wh_data.stock_value / self.wh_data.qty_after_transaction
 
+	def get_valuation_queue(self):
+		"""FIFO/LIFO queue of the current warehouse.
+
+		The queue is built once from the previous SLE and kept in memory for all the
+		entries processed in this repost, only its state is serialized per SLE."""
+		if self.wh_data.get("valuation_queue") is None:
+			ValuationKlass = LIFOValuation if self.valuation_method == "LIFO" else FIFOValuation
+			self.wh_data.valuation_queue = ValuationKlass(self.wh_data.stock_queue)
+
+		return self.wh_data.valuation_queue
+
 	def update_batched_values(self, sle):
 		incoming_rate = flt(sle.incoming_rate)
 		actual_qty = flt(sle.actual_qty)
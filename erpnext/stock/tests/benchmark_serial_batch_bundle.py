@@ -0,0 +1,87 @@
+"""Time taken to receive many serialized units through one Serial and Batch Bundle.
+
+Creates the Serial Nos from the naming series of an item and submits a bundle with an
+entry for each of them, like an inward Stock Ledger Entry without a bundle does. Entries
+are written with multi-row queries from `BULK_ENTRIES_THRESHOLD` entries on; each size is
+also run with the threshold out of reach, writing them row by row. Every run is rolled back.
+
+Usage:
+        bench --site <site> execute erpnext.stock.tests.benchmark_serial_batch_bundle.run_benchmark \
+                --kwargs "{'sizes': [10000, 100000]}"
+"""
+
+from time import perf_counter
+from unittest.mock import patch
+
+import frappe
+
+from erpnext.stock.serial_batch_bundle import SerialBatchCreation
+
+ITEM_CODE = "_Benchmark Serial Bundle Item"
+
+
+def get_item(company):
+	from erpnext.stock.doctype.item.test_item import make_item
+
+	return make_item(
+		ITEM_CODE,
+		{
+			"has_serial_no": 1,
+			"serial_no_series": "BENCH-SN-.########",
+			"is_stock_item": 1,
+			"item_defaults": [{"company": company}],
+		},
+	).name
+
+
+def receive_serial_nos(item_code, warehouse, company, qty):
+	"""Create `qty` Serial Nos and submit their bundle, return time taken in seconds"""
+	start = perf_counter()
+	SerialBatchCreation(
+		{
+			"item_code": item_code,
+			"warehouse": warehouse,
+			"voucher_type": "Stock Entry",
+			"qty": qty,
+			"type_of_transaction": "Inward",
+			"company": company,
+		}
+	).make_serial_and_batch_bundle()
+
+	return perf_counter() - start
+
+
+def run_benchmark(sizes=(10000, 100000), company=None, warehouse=None):
+	company = company or frappe.db.get_single_value("Global Defaults", "default_company")
+	warehouse = warehouse or frappe.db.get_value(
+		"Warehouse", {"company": company, "is_group": 0}, "name"
+	)
+
+	item_code = get_item(company)
+	frappe.db.commit()
+
+	results = []
+	for qty in sizes:
+		for bulk in (True, False):
+			threshold = 1 if bulk else int(qty) + 1
+			with patch(
+				"erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle."
+				"BULK_ENTRIES_THRESHOLD",
+				threshold,
+			):
+				elapsed = receive_serial_nos(item_code, warehouse, company, int(qty))
+
+			frappe.db.rollback()
+			results.append(
+				{
+					"serial_nos": int(qty),
+					"bulk_entries": bulk,
+					"total_seconds": round(elapsed, 3),
+					"microseconds_per_serial_no": round(elapsed / int(qty) * 1e6, 2),
+				}
+			)
+
+	for row in results:
+		print(row)
+
+	return results
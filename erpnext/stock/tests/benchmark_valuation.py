@@ -0,0 +1,79 @@
+"""Per-SLE cost of FIFO/LIFO valuation on long stock ledger histories.
+
+Mimics what `update_entries_after` does for every SLE while reposting an
+item-warehouse: consume or add stock, compute totals before and after and
+serialize the resulting queue. No database access is required.
+
+Usage:
+        bench --site <site> execute erpnext.stock.tests.benchmark_valuation.run_benchmark \
+                --kwargs "{'entries': 50000, 'open_bins': 500}"
+"""
+
+import json
+import random
+from time import perf_counter
+
+from erpnext.stock.valuation import FIFOValuation, LIFOValuation
+
+
+def simulate_repost(ValuationKlass, transactions, keep_queue=True):
+	"""Replay `transactions` and return time taken in seconds.
+
+	keep_queue=False rebuilds the valuation queue from the deserialized state of
+	the previous SLE on every entry, like reposting used to do."""
+	stock_queue = ValuationKlass([])
+	serialized = "[]"
+
+	start = perf_counter()
+	for qty, rate in transactions:
+		if not keep_queue:
+			stock_queue = ValuationKlass(json.loads(serialized))
+
+		_prev_qty, prev_value = stock_queue.get_total_stock_and_value()
+		if qty > 0:
+			stock_queue.add_stock(qty, rate)
+		else:
+			stock_queue.remove_stock(abs(qty))
+		_qty, value = stock_queue.get_total_stock_and_value()
+
+		serialized = json.dumps(stock_queue.state)
+
+	return perf_counter() - start
+
+
+def get_transactions(entries, open_bins=200, seed=42):
+	"""Receipts at a new rate each time, followed by alternating issues and receipts
+	of the same qty, so that the queue holds about `open_bins` bins throughout."""
+	rng = random.Random(seed)
+	transactions = [(rng.choice((5, 10, 20)), rng.uniform(1, 100)) for _ in range(open_bins)]
+
+	while len(transactions) < entries:
+		qty = rng.choice((5, 10, 20))
+		transactions.append((-qty, 0.0))
+		transactions.append((qty, rng.uniform(1, 100)))
+
+	return transactions[:entries]
+
+
+def run_benchmark(entries=20000, open_bins=200):
+	entries = int(entries)
+	transactions = get_transactions(entries, int(open_bins))
+
+	results = []
+	for ValuationKlass in (FIFOValuation, LIFOValuation):
+		for keep_queue in (False, True):
+			elapsed = simulate_repost(ValuationKlass, transactions, keep_queue=keep_queue)
+			results.append(
+				{
+					"method": ValuationKlass.__name__,
+					"queue_kept_in_memory": keep_queue,
+					"entries": entries,
+					"total_seconds": round(elapsed, 3),
+					"microseconds_per_sle": round(elapsed / entries * 1e6, 2),
+				}
+			)
+
+	for row in results:
+		print(row)
+
+	return results
@@ -4,7 +4,7 @@ import frappe
 from frappe.test_runner import make_test_records
 from frappe.tests.utils import FrappeTestCase
 
-from erpnext.stock.get_item_details import get_item_details
+from erpnext.stock.get_item_details import get_item_details, get_items_details_batch
 
 test_ignore = ["BOM"]
 test_dependencies = ["Customer", "Supplier", "Item", "Price List", "Item Price"]
@@ -38,3 +38,31 @@ class TestGetItemDetail(FrappeTestCase):
 		)
 		details = get_item_details(args)
 		self.assertEqual(details.get("price_list_rate"), 100)
+
+	def test_get_items_details_batch(self):
+		args_list = []
+		for doctype, party_field, party, price_list in (
+			("Sales Order", "customer", "_Test Customer", "_Test Price List"),
+			("Purchase Order", "supplier", "_Test Supplier", "_Test Buying Price List"),
+		):
+			for item_code in ("_Test Item", "_Test Item 2", "_Test Item Home Desktop 100"):
+				args_list.append(
+					frappe._dict(
+						{
+							"item_code": item_code,
+							"company": "_Test Company",
+							party_field: party,
+							"conversion_rate": 1.0,
+							"plc_conversion_rate": 1.0,
+							"doctype": doctype,
+							"warehouse": "_Test Warehouse - _TC",
+							"transaction_date": frappe.utils.nowdate(),
+							"price_list": price_list,
+							"ignore_pricing_rule": 1,
+							"qty": 1,
+						}
+					)
+				)
+
+		expected = [get_item_details(args.copy()) for args in args_list]
+		self.assertEqual(get_items_details_batch(json.dumps(args_list, default=str)), expected)
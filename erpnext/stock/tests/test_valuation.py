@@ -109,6 +109,36 @@ class TestFIFOValuation(unittest.TestCase):
 		self.queue.remove_stock(1.0 - 1e-9)
 		self.assertTotalQty(0)
 
+	def test_totals_after_reset_state(self):
+		self.queue.add_stock(2, 10)
+		self.assertEqual(self.queue.get_total_stock_and_value(), (2, 20))
+
+		self.queue.reset_state([[5, 3]])
+		self.assertEqual(self.queue.get_total_stock_and_value(), (5, 15))
+
+		self.queue.remove_stock(1)
+		self.assertEqual(self.queue.get_total_stock_and_value(), (4, 12))
+
+	def test_state_shares_bins_with_queue(self):
+		# a new bin is not added to the state read before
+		self.queue.add_stock(1, 10)
+		state = self.queue.state
+		self.queue.add_stock(1, 20)
+		self.assertEqual(state, [[1, 10]])
+		self.assertEqual(self.queue, [[1, 10], [1, 20]])
+
+	def test_serialized_state_is_kept(self):
+		# same rate, merged into the last bin which the state shares
+		self.queue.add_stock(1, 10)
+		state = self.queue.state
+		serialized_state = json.dumps(state)
+		self.queue.add_stock(1, 10)
+		self.assertEqual(state, [[2, 10]])
+
+		self.queue.remove_stock(1)
+		self.assertEqual(json.loads(serialized_state), [[1, 10]])
+		self.assertEqual(self.queue, [[1, 10]])
+
 	def test_rounding_off_near_zero(self):
 		self.assertEqual(round_off_if_near_zero(0), 0)
 		self.assertEqual(round_off_if_near_zero(1), 1)
@@ -215,6 +245,18 @@ class TestLIFOValuation(unittest.TestCase):
 			sum(q * r for q, r in self.stack), value, msg=f"stack: {self.stack}", places=2
 		)
 
+	def test_serialized_state_is_kept(self):
+		# same rate, merged into the last bin which the state shares
+		self.stack.add_stock(1, 10)
+		state = self.stack.state
+		serialized_state = json.dumps(state)
+		self.stack.add_stock(1, 10)
+		self.assertEqual(state, [[2, 10]])
+
+		self.stack.remove_stock(1)
+		self.assertEqual(json.loads(serialized_state), [[1, 10]])
+		self.assertEqual(self.stack, [[1, 10]])
+
 	def test_simple_addition(self):
 		self.stack.add_stock(1, 10)
 		self.assertTotalQty(1)
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod, abstractproperty
-from typing import Callable, List, NewType, Optional, Tuple
+from collections import deque
+from typing import Callable, Deque, List, NewType, Optional, Tuple
 
 from frappe.utils import flt
 
@@ -25,21 +26,38 @@ class BinWiseValuation(ABC):
 	def state(self) -> List[StockBin]:
 		pass
 
+	@abstractmethod
+	def reset_state(self, state: List[StockBin]) -> None:
+		pass
+
 	def get_total_stock_and_value(self) -> Tuple[float, float]:
+		# totals are cached until the bins change
+		if self._totals is not None:
+			return self._totals
+
 		total_qty = 0.0
 		total_value = 0.0
 
-		for qty, rate in self.state:
+		for qty, rate in self._bins():
 			total_qty += flt(qty)
 			total_value += flt(qty) * flt(rate)
 
-		return round_off_if_near_zero(total_qty), round_off_if_near_zero(total_value)
+		self._totals = round_off_if_near_zero(total_qty), round_off_if_near_zero(total_value)
+		return self._totals
+
+	@abstractmethod
+	def _bins(self):
+		"""Underlying container of bins, iterated without copying."""
+		pass
+
+	def __len__(self):
+		return len(self._bins())
 
 	def __repr__(self):
 		return str(self.state)
 
 	def __iter__(self):
-		return iter(self.state)
+		return iter(self._bins())
 
 	def __eq__(self, other):
 		if isinstance(other, list):
@@ -53,21 +71,34 @@ class FIFOValuation(BinWiseValuation):
 	New stock is added at end of the queue.
 	Qty consumption happens on First In First Out basis.
 
-	Queue is implemented using "bins" of [qty, rate].
+	Queue is implemented using a deque of "bins" of [qty, rate], so consuming from
+	the front does not shift the remaining bins. The object is meant to be kept alive
+	across all the entries of an item-warehouse while reposting.
 
 	ref: https://en.wikipedia.org/wiki/FIFO_and_LIFO_accounting
 	"""
 
 	# specifying the attributes to save resources
 	# ref: https://docs.python.org/3/reference/datamodel.html#slots
-	__slots__ = ["queue"]
+	__slots__ = ["queue", "_totals"]
 
 	def __init__(self, state: Optional[List[StockBin]]):
-		self.queue: List[StockBin] = state if state is not None else []
+		self.queue: Deque[StockBin] = deque()
+		self.reset_state(state)
 
 	@property
 	def state(self) -> List[StockBin]:
-		"""Get current state of queue."""
+		"""Get current state of queue.
+
+		The bins are shared with the queue and change with it, serialize the state to keep it."""
+		return list(self.queue)
+
+	def reset_state(self, state: Optional[List[StockBin]]) -> None:
+		"""Replace the queue with `state`."""
+		self.queue = deque(state) if state is not None else deque()
+		self._totals = None
+
+	def _bins(self):
 		return self.queue
 
 	def add_stock(self, qty: float, rate: float) -> None:
@@ -77,6 +108,7 @@ class FIFOValuation(BinWiseValuation):
 		        qty: new quantity to add
 		        rate: incoming rate of new quantity"""
 
+		self._totals = None
 		if not len(self.queue):
 			self.queue.append([0, 0])
 
@@ -107,6 +139,7 @@ class FIFOValuation(BinWiseValuation):
 		if not rate_generator:
 			rate_generator = lambda: 0.0  # noqa
 
+		self._totals = None
 		consumed_bins = []
 		while qty:
 			if not len(self.queue):
@@ -132,7 +165,11 @@ class FIFOValuation(BinWiseValuation):
 			if qty >= fifo_bin[QTY]:
 				# consume current bin
 				qty = round_off_if_near_zero(qty - fifo_bin[QTY])
-				to_consume = self.queue.pop(index)
+				if index == 0:
+					to_consume = self.queue.popleft()
+				else:
+					to_consume = self.queue[index]
+					del self.queue[index]
 				consumed_bins.append(list(to_consume))
 
 				if not self.queue and qty:
@@ -164,14 +201,24 @@ class LIFOValuation(BinWiseValuation):
 
 	# specifying the attributes to save resources
 	# ref: https://docs.python.org/3/reference/datamodel.html#slots
-	__slots__ = ["stack"]
+	__slots__ = ["stack", "_totals"]
 
 	def __init__(self, state: Optional[List[StockBin]]):
-		self.stack: List[StockBin] = state if state is not None else []
+		self.reset_state(state)
 
 	@property
 	def state(self) -> List[StockBin]:
-		"""Get current state of stack."""
+		"""Get current state of stack.
+
+		The bins are shared with the stack and change with it, serialize the state to keep it."""
+		return self.stack
+
+	def reset_state(self, state: Optional[List[StockBin]]) -> None:
+		"""Replace the stack with `state`."""
+		self.stack: List[StockBin] = state if state is not None else []
+		self._totals = None
+
+	def _bins(self):
 		return self.stack
 
 	def add_stock(self, qty: float, rate: float) -> None:
@@ -183,6 +230,7 @@ class LIFOValuation(BinWiseValuation):
 
 		Behaviour of this is same as FIFO valuation.
 		"""
+		self._totals = None
 		if not len(self.stack):
 			self.stack.append([0, 0])
 
@@ -213,6 +261,7 @@ class LIFOValuation(BinWiseValuation):
 		if not rate_generator:
 			rate_generator = lambda: 0.0  # noqa
 
+		self._totals = None
 		consumed_bins = []
 		while qty:
 			if not len(self.stack):
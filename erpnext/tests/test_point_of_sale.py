@@ -7,6 +7,7 @@ import frappe
 
 from erpnext.accounts.doctype.pos_profile.test_pos_profile import make_pos_profile
 from erpnext.selling.page.point_of_sale.point_of_sale import get_items
+from erpnext.setup.doctype.link_search_term.link_search_term import rebuild_link_search_index
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
 
@@ -61,3 +62,48 @@ class TestPointOfSale(unittest.TestCase):
 
 		self.assertEqual(len(filtered_items), 1)
 		self.assertEqual(filtered_items[0]["item_code"], item2.item_code)
+
+	def test_item_search_with_index(self):
+		pos_profile = make_pos_profile(name="Test POS Profile for Indexed Search")
+
+		frappe.db.set_single_value("Global Defaults", "use_link_search_index", 1)
+		try:
+			rebuild_link_search_index(["Item"])
+			self.check_item_search_with_index(pos_profile)
+		finally:
+			frappe.db.set_single_value("Global Defaults", "use_link_search_index", 0)
+			rebuild_link_search_index(["Item"])
+
+	def check_item_search_with_index(self, pos_profile):
+		item = make_item(
+			"Test Indexed Search Item",
+			{
+				"is_stock_item": 1,
+				"item_name": "Red Cotton Shirt",
+				"barcodes": [{"barcode": "8901234500011"}],
+			},
+		)
+
+		def search(search_term):
+			result = get_items(
+				start=0,
+				page_length=20,
+				price_list=None,
+				item_group=item.item_group,
+				pos_profile=pos_profile.name,
+				search_term=search_term,
+			)
+			return [row["item_code"] for row in (result.get("items") if result else [])]
+
+		# matched by the start of the code, name or a word of the name, and barcode
+		for search_term in ("test indexed", "Red Cot", "cotton sh", "89012345"):
+			self.assertEqual(search(search_term), [item.name])
+
+		# but not in the middle of a word
+		self.assertEqual(search("otton"), [])
+
+		item.item_name = "Blue Linen Shirt"
+		item.save()
+
+		self.assertEqual(search("cotton"), [])
+		self.assertEqual(search("linen"), [item.name])
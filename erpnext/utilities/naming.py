@@ -1,11 +1,20 @@
 import frappe
-from frappe.model.naming import get_default_naming_series
+from frappe import _
+from frappe.model.naming import get_default_naming_series, parse_naming_series
+from frappe.utils import cint
+
+# stands for the number in names parsed from a naming series, until numbers are reserved
+NUMBER_PLACEHOLDER = "\x00"
 
 
 class NamingSeriesNotSetError(frappe.ValidationError):
 	pass
 
 
+class InvalidNamingSeriesError(frappe.ValidationError):
+	pass
+
+
 def set_by_naming_series(
 	doctype, fieldname, naming_series, hide_name_field=True, make_mandatory=1
 ):
@@ -58,3 +67,53 @@ def set_by_naming_series(
 					doctype=doctype, fieldname=fieldname
 				)
 			)
+
+
+def make_autonames(key, doctype, count):
+	"""`count` names from the naming series `key`, same as calling `make_autoname` as many
+	times, with the counter of the series moved once for all of them"""
+	if count <= 0:
+		return []
+
+	if "#" not in key:
+		key += ".#####"
+
+	numbers = frappe._dict()
+
+	def reserve_numbers(prefix, digits):
+		numbers.start = reserve_series_numbers(prefix, count)
+		numbers.digits = digits
+		return NUMBER_PLACEHOLDER
+
+	name = parse_naming_series(key, doctype=doctype, number_generator=reserve_numbers)
+	if numbers.start is None:
+		frappe.throw(
+			_("Invalid naming series {0}: the number part should be separated with a dot (.)").format(
+				frappe.bold(key)
+			),
+			InvalidNamingSeriesError,
+		)
+
+	return [
+		name.replace(NUMBER_PLACEHOLDER, ("%0" + str(numbers.digits) + "d") % number)
+		for number in range(numbers.start, numbers.start + count)
+	]
+
+
+def reserve_series_numbers(prefix, count):
+	"""Move the counter of the series `prefix` by `count` and return the first number reserved"""
+	series = frappe.qb.DocType("Series")
+	current = (
+		frappe.qb.from_(series).select(series.current).where(series.name == prefix).for_update()
+	).run()
+
+	if current and current[0][0] is not None:
+		(
+			frappe.qb.update(series)
+			.set(series.current, series.current + count)
+			.where(series.name == prefix)
+		).run()
+		return cint(current[0][0]) + 1
+
+	frappe.qb.into(series).columns(series.name, series.current).insert(prefix, count).run()
+	return 1